@@ -1,18 +1,56 @@
-import json
+import hashlib
 import os
 import secrets
 import sqlite3
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
-from flask import Flask, Response, jsonify, redirect, request, session
+from flask import Flask, Response, g, jsonify, redirect, request, session
 from flask_cors import CORS
-from google.oauth2 import id_token
 from google_auth_oauthlib.flow import Flow
-from google.auth.transport import requests as google_requests
 from jose import JWTError, jwt
-from werkzeug.security import check_password_hash, generate_password_hash
+
+from auth_common import (
+    CLIENT_SECTION_KEY,
+    GOOGLE_SCOPES,
+    USERS_TABLE_SQL,
+    GoogleConfigLoader,
+    allowed_client_origins,
+    google_profile_fields,
+    oauth_complete_page,
+    to_user_dict,
+    token_payload,
+)
+from calendar_cache import (
+    CALENDAR_READ_SCOPE,
+    GOOGLE_CALENDAR_API,
+    CalendarCache,
+    GoogleCalendarClient,
+    range_bound,
+)
+from db_pool import SQLitePool
+from google_certs import GOOGLE_CERTS_URL, GoogleCertCache
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import MetricsRegistry, snapshot_lines
+from password_hasher import HasherBusy, PasswordHasher
+from sampling_profiler import MAX_INTERVAL, MIN_INTERVAL, SamplingProfiler
+from sync_engine import (
+    DEFAULT_PULL_LIMIT,
+    MAX_BODY_BYTES,
+    MAX_PUSH_BATCH,
+    BodyTooLarge,
+    accepts_gzip,
+    apply_push,
+    decode_body,
+    encode_body,
+    init_server_schema,
+    pull_changes,
+    validate_change,
+)
+from ttl_cache import TTLCache
+from user_import import import_ndjson, upsert_user
 
 load_dotenv()
 
@@ -26,19 +64,7 @@ def create_app() -> Flask:
         JSON_AS_ASCII=False,
     )
 
-    raw_origins = os.getenv("CLIENT_ORIGINS", "")
-    allowed_origins = [
-        origin.strip()
-        for origin in raw_origins.split(",")
-        if origin.strip()
-    ]
-    if not allowed_origins:
-        allowed_origins = [
-            "http://localhost:8081",
-            "http://127.0.0.1:8081",
-            "http://localhost:19006",
-            "http://127.0.0.1:19006",
-        ]
+    allowed_origins = allowed_client_origins()
 
     CORS(
         app,
@@ -56,63 +82,196 @@ def create_app() -> Flask:
     google_redirect_uri = os.getenv(
         "GOOGLE_REDIRECT_URI", "http://localhost:5000/auth/google/callback"
     )
-    google_scopes = [
-        "openid",
-        "https://www.googleapis.com/auth/userinfo.email",
-        "https://www.googleapis.com/auth/userinfo.profile",
-    ]
-    google_userinfo_endpoint = "https://openidconnect.googleapis.com/v1/userinfo"
+    calendar_sync_enabled = os.getenv("GOOGLE_CALENDAR_SYNC", "false").lower() in {"1", "true", "yes"}
+    google_scopes = GOOGLE_SCOPES + [CALENDAR_READ_SCOPE] if calendar_sync_enabled else GOOGLE_SCOPES
     success_redirect = os.getenv("GOOGLE_OAUTH_SUCCESS_REDIRECT")
-    client_section_key = "app"
+    client_section_key = CLIENT_SECTION_KEY
+    google_config_loader = GoogleConfigLoader(
+        google_redirect_uri,
+        base_dir=os.path.dirname(__file__),
+        client_section_key=client_section_key,
+    )
+
+    admin_token = os.getenv("ADMIN_TOKEN")
+
+    metrics = MetricsRegistry(namespace="bluebird")
+    request_latency = metrics.histogram(
+        "http_request_duration_seconds",
+        "Request latency by route.",
+        ("method", "route", "status"),
+    )
+    phase_latency = metrics.histogram(
+        "phase_duration_seconds",
+        "Time spent in internal phases (db, kdf, jwt_sign, jwt_verify, google_*).",
+        ("phase",),
+    )
+    requests_in_flight = metrics.gauge(
+        "http_requests_in_flight", "Requests currently being served.", ("route",)
+    )
+    app.extensions["metrics"] = metrics
+
+    profiler = SamplingProfiler(interval=float(os.getenv("PROFILER_INTERVAL", "0.005")))
+    if os.getenv("PROFILER_ENABLED", "false").lower() in {"1", "true", "yes"}:
+        profiler.start()
+    app.extensions["profiler"] = profiler
+
+    db_pool = SQLitePool(
+        database_path,
+        max_size=int(os.getenv("DB_POOL_SIZE", "8")),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024))),
+        cache_size_kib=int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(16 * 1024))),
+        statement_observer=lambda seconds: phase_latency.observe(seconds, phase="db"),
+    )
+    app.extensions["db_pool"] = db_pool
+
+    password_hasher = PasswordHasher(
+        method=os.getenv("PASSWORD_HASH_METHOD", "scrypt"),
+        workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))),
+        queue_size=int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16")),
+        timeout=float(os.getenv("PASSWORD_HASH_TIMEOUT", "10")),
+    )
+    app.extensions["password_hasher"] = password_hasher
+
+    token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+        max_entries=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+        default_ttl=token_ttl_seconds,
+    )
+    user_cache: TTLCache[Dict[str, Any]] = TTLCache(
+        max_entries=int(os.getenv("USER_CACHE_SIZE", "10000")),
+        default_ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "300")),
+    )
+
+    google_certs = GoogleCertCache(
+        certs_url=os.getenv("GOOGLE_CERTS_URL", GOOGLE_CERTS_URL),
+        default_ttl=int(os.getenv("GOOGLE_CERTS_DEFAULT_TTL", "300")),
+        fetch_observer=lambda seconds: phase_latency.observe(
+            seconds, phase="google_certs_fetch"
+        ),
+    )
+    app.extensions["google_certs"] = google_certs
+
+    calendar_cache = CalendarCache(
+        db_pool.connection,
+        GoogleCalendarClient(
+            base_url=os.getenv("GOOGLE_CALENDAR_API_URL", GOOGLE_CALENDAR_API),
+            timeout=float(os.getenv("GOOGLE_CALENDAR_TIMEOUT", "10")),
+            fetch_observer=lambda seconds: phase_latency.observe(
+                seconds, phase="google_calendar_fetch"
+            ),
+        ),
+        min_interval=float(os.getenv("CALENDAR_SYNC_MIN_INTERVAL", "30")),
+        workers=int(os.getenv("CALENDAR_SYNC_WORKERS", "4")),
+    )
+    app.extensions["calendar_cache"] = calendar_cache
+
+    def collect_runtime_metrics() -> list[str]:
+        pool = db_pool.stats()
+        lines = []
+        for name, key, kind, documentation in (
+            ("checkouts_total", "checkouts", "counter", "Connections handed out by the SQLite pool."),
+            ("wait_seconds_total", "wait_seconds_total", "counter", "Time spent waiting for a pooled connection."),
+            ("timeouts_total", "timeouts", "counter", "Pool checkouts that timed out."),
+            ("lock_retries_total", "lock_retries", "counter", "Statements retried after 'database is locked'."),
+            ("lock_failures_total", "lock_failures", "counter", "Statements still locked after SQLITE_BUSY_TIMEOUT_MS."),
+            ("lock_wait_seconds_total", "lock_wait_seconds", "counter", "Time statements spent waiting on SQLite locks (busy waits and backoff)."),
+            ("connections_in_use", "in_use", "gauge", "Pooled connections currently checked out."),
+        ):
+            lines += snapshot_lines(f"bluebird_db_pool_{name}", kind, documentation, pool[key])
+        for cache_name, cache in (("token", token_cache), ("user", user_cache)):
+            stats = cache.stats()
+            for key in ("hits", "misses"):
+                lines += snapshot_lines(
+                    f"bluebird_{cache_name}_cache_{key}_total",
+                    "counter",
+                    f"{cache_name} cache {key}.",
+                    stats[key],
+                )
+        return lines
+
+    metrics.register_collector(collect_runtime_metrics)
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.request_started = time.perf_counter()
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        requests_in_flight.inc(route=g.metrics_route)
+
+    @app.after_request
+    def remember_status(response: Response) -> Response:
+        g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_timer(exc: Optional[BaseException]) -> None:
+        started = g.pop("request_started", None)
+        if started is None:
+            return
+        route = g.pop("metrics_route")
+        requests_in_flight.dec(route=route)
+        request_latency.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route,
+            status=str(g.pop("response_status", 500)),
+        )
 
     def get_db() -> sqlite3.Connection:
-        conn = sqlite3.connect(database_path)
-        conn.row_factory = sqlite3.Row
+        conn = g.get("db_conn")
+        if conn is None:
+            conn = db_pool.acquire()
+            g.db_conn = conn
         return conn
 
+    @app.teardown_appcontext
+    def release_db(exc: Optional[BaseException]) -> None:
+        conn = g.pop("db_conn", None)
+        if conn is not None:
+            db_pool.release(conn)
+
     def init_db() -> None:
-        with get_db() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT,
-                    nickname TEXT,
-                    google_id TEXT UNIQUE,
-                    google_picture TEXT,
-                    created_at TEXT NOT NULL
-                )
-                """
-            )
+        with db_pool.connection() as conn:
+            conn.execute(USERS_TABLE_SQL)
+            init_server_schema(conn)
+            CalendarCache.init_schema(conn)
             conn.commit()
 
     init_db()
 
-    def to_user_dict(row: sqlite3.Row) -> Dict[str, Any]:
-        return {
-            "id": row["id"],
-            "email": row["email"],
-            "nickname": row["nickname"],
-            "google_picture": row["google_picture"],
-        }
-
     def issue_token(user: sqlite3.Row) -> str:
-        now = datetime.utcnow()
-        payload = {
-            "sub": str(user["id"]),
-            "email": user["email"],
-            "nickname": user["nickname"],
-            "iat": int(now.timestamp()),
-            "exp": int((now + timedelta(seconds=token_ttl_seconds)).timestamp()),
-        }
-        return jwt.encode(payload, jwt_secret, algorithm=jwt_algorithm)
+        payload = token_payload(user, token_ttl_seconds)
+        with phase_latency.time(phase="jwt_sign"):
+            return jwt.encode(payload, jwt_secret, algorithm=jwt_algorithm)
 
     def decode_token(token: str) -> Optional[Dict[str, Any]]:
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        payload = token_cache.get(cache_key)
+        if payload is not None:
+            return payload
         try:
-            return jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
+            with phase_latency.time(phase="jwt_verify"):
+                payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
         except JWTError:
             return None
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            token_cache.set(cache_key, payload, expires_at=expires_at)
+        return payload
+
+    def load_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+        profile = user_cache.get(user_id)
+        if profile is not None:
+            return profile
+        user = get_db().execute(
+            "SELECT * FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        if not user:
+            return None
+        profile = to_user_dict(user)
+        user_cache.set(user_id, profile)
+        return profile
 
     def sync_google_user(
         email: str,
@@ -120,110 +279,124 @@ def create_app() -> Flask:
         nickname: Optional[str],
         picture: Optional[str],
     ) -> sqlite3.Row:
+        created_at = datetime.utcnow().isoformat()
         with get_db() as conn:
-            user = conn.execute(
-                "SELECT * FROM users WHERE google_id = ? OR email = ?",
-                (google_id, email),
-            ).fetchone()
-
-            if user:
-                conn.execute(
-                    """
-                    UPDATE users
-                    SET google_id = ?, google_picture = ?, nickname = COALESCE(?, nickname)
-                    WHERE id = ?
-                    """,
-                    (google_id, picture, nickname, user["id"]),
-                )
-            else:
-                created_at = datetime.utcnow().isoformat()
-                conn.execute(
-                    """
-                    INSERT INTO users (email, nickname, google_id, google_picture, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (email, nickname, google_id, picture, created_at),
-                )
-            conn.commit()
-            user = conn.execute(
-                "SELECT * FROM users WHERE google_id = ?", (google_id,)
-            ).fetchone()
+            user = upsert_user(conn, (email, nickname, google_id, picture, created_at))
 
         if not user:
             raise RuntimeError("Failed to synchronize Google user information.")
+        user_cache.invalidate(str(user["id"]))
         return user
 
     def require_google_config() -> Dict[str, Any]:
-        client_id = os.getenv("GOOGLE_CLIENT_ID")
-        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-        project_id = os.getenv("GOOGLE_PROJECT_ID")
-        redirect_uris: list[str] = []
-
-        secrets_locations = [
-            os.getenv("GOOGLE_CLIENT_SECRETS_FILE"),
-            os.path.join(os.path.dirname(__file__), "client_secret.json"),
-            os.path.join(os.path.dirname(__file__), "Calendar", "client_secret.json"),
-        ]
-
-        def load_from_section(section: Dict[str, Any]) -> None:
-            nonlocal client_id, client_secret, project_id, redirect_uris
-            client_id = client_id or section.get("client_id")
-            client_secret = client_secret or section.get("client_secret")
-            project_id = project_id or section.get("project_id")
-            redirect_candidates = section.get("redirect_uris") or section.get(
-                "redirectUris"
-            )
-            if redirect_candidates:
-                redirect_uris = list({*redirect_uris, *redirect_candidates})
-
-        for path in secrets_locations:
-            if not path:
-                continue
-            if not os.path.exists(path):
-                continue
-            try:
-                with open(path, "r", encoding="utf-8") as file:
-                    raw_config = json.load(file)
-            except (OSError, json.JSONDecodeError):
-                continue
-
-            if isinstance(raw_config, dict):
-                for key in (client_section_key, "web", "installed"):
-                    section = raw_config.get(key)
-                    if isinstance(section, dict):
-                        load_from_section(section)
-                        if client_id:
-                            break
-            if client_id:
-                break
-
-        if not client_id:
-            raise RuntimeError("Google OAuth is not configured. Set GOOGLE_CLIENT_ID.")
-
-        project_id = project_id or "hack-bluebird"
-        if not redirect_uris:
-            redirect_uris = [google_redirect_uri]
-        elif google_redirect_uri not in redirect_uris:
-            redirect_uris.append(google_redirect_uri)
-
-        config = {
-            client_section_key: {
-                "client_id": client_id,
-                "project_id": project_id,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": redirect_uris,
-                "userinfo_endpoint": google_userinfo_endpoint,
-            }
-        }
-        if client_secret:
-            config[client_section_key]["client_secret"] = client_secret
-        return config
+        return google_config_loader.get()
+
+    def build_flow(client_config: Dict[str, Any], **kwargs: Any) -> Flow:
+        # Flow only accepts "web"/"installed" client sections.
+        return Flow.from_client_config(
+            {"web": client_config[client_section_key]},
+            scopes=google_scopes,
+            redirect_uri=google_redirect_uri,
+            **kwargs,
+        )
+
+    def hasher_busy_response(exc: HasherBusy) -> Response:
+        response = jsonify({"error": "요청이 많아 잠시 후 다시 시도해주세요"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(exc.retry_after)
+        return response
+
+    def is_admin_request() -> bool:
+        if not admin_token:
+            return False
+        provided = request.headers.get("X-Admin-Token", "")
+        return secrets.compare_digest(provided, admin_token)
 
     @app.get("/")
     def index() -> Response:
         return jsonify({"status": "ok", "service": "Hack BlueBird API"})
 
+    @app.get("/admin/db/pool")
+    def db_pool_stats() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify({"pool": db_pool.stats()})
+
+    @app.get("/admin/cache")
+    def cache_stats() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify(
+            {
+                "token_cache": token_cache.stats(),
+                "user_cache": user_cache.stats(),
+                "google_certs": google_certs.stats(),
+                "calendar": calendar_cache.stats(),
+            }
+        )
+
+    @app.get("/metrics")
+    def metrics_endpoint() -> Response:
+        return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+    @app.get("/admin/profiler")
+    def profiler_status() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify({"profiler": profiler.status()})
+
+    @app.post("/admin/profiler")
+    def profiler_control() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        data = request.get_json(silent=True) or {}
+        action = data.get("action")
+        if action == "start":
+            interval = data.get("interval")
+            if interval is not None:
+                if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not (
+                    MIN_INTERVAL <= interval <= MAX_INTERVAL
+                ):
+                    return (
+                        jsonify({"error": f"interval은 {MIN_INTERVAL}~{MAX_INTERVAL}초 사이의 숫자여야 합니다"}),
+                        400,
+                    )
+                interval = float(interval)
+            profiler.start(interval=interval)
+        elif action == "stop":
+            profiler.stop()
+        elif action == "reset":
+            profiler.reset()
+        else:
+            return jsonify({"error": "action은 start, stop, reset 중 하나여야 합니다"}), 400
+        return jsonify({"profiler": profiler.status()})
+
+    @app.get("/admin/profiler/stacks")
+    def profiler_stacks() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return Response(profiler.collapsed(), mimetype="text/plain")
+
+    @app.post("/admin/users/import")
+    def import_users() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        import_id = request.args.get("import_id") or None
+        batch_size = request.args.get("batch_size", default=5000, type=int)
+
+        def invalidate_batch(user_ids: list[int]) -> None:
+            for user_id in user_ids:
+                user_cache.invalidate(str(user_id))
+
+        report = import_ndjson(
+            get_db(),
+            request.stream,
+            import_id,
+            batch_size=max(1, batch_size),
+            on_batch=invalidate_batch,
+        )
+        return jsonify(report)
+
     @app.post("/auth/register")
     def register() -> Response:
         data = request.get_json(silent=True) or {}
@@ -237,7 +410,11 @@ def create_app() -> Flask:
         if len(password) < 6:
             return jsonify({"error": "비밀번호는 6자 이상이어야 합니다"}), 400
 
-        password_hash = generate_password_hash(password)
+        try:
+            with phase_latency.time(phase="kdf"):
+                password_hash = password_hasher.hash(password)
+        except HasherBusy as exc:
+            return hasher_busy_response(exc)
         created_at = datetime.utcnow().isoformat()
 
         with get_db() as conn:
@@ -257,6 +434,7 @@ def create_app() -> Flask:
                 "SELECT * FROM users WHERE email = ?", (email,)
             ).fetchone()
 
+        user_cache.invalidate(str(user["id"]))
         token = issue_token(user)
         return (
             jsonify(
@@ -286,31 +464,147 @@ def create_app() -> Flask:
         if not user or not user["password_hash"]:
             return jsonify({"error": "이메일 또는 비밀번호가 올바르지 않습니다"}), 401
 
-        if not check_password_hash(user["password_hash"], password):
+        try:
+            with phase_latency.time(phase="kdf"):
+                verified = password_hasher.verify(user["password_hash"], password)
+        except HasherBusy as exc:
+            return hasher_busy_response(exc)
+        if not verified:
             return jsonify({"error": "이메일 또는 비밀번호가 올바르지 않습니다"}), 401
 
+        if password_hasher.needs_rehash(user["password_hash"]):
+            try:
+                with phase_latency.time(phase="kdf"):
+                    upgraded_hash = password_hasher.hash(password)
+            except HasherBusy:
+                # The upgrade is opportunistic; it will be retried on the next login.
+                upgraded_hash = None
+            if upgraded_hash:
+                with get_db() as conn:
+                    conn.execute(
+                        "UPDATE users SET password_hash = ? WHERE id = ?",
+                        (upgraded_hash, user["id"]),
+                    )
+
         token = issue_token(user)
         return jsonify({"message": "로그인에 성공했습니다", "token": token, "user": to_user_dict(user)})
 
+    def bearer_payload() -> Optional[Dict[str, Any]]:
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return None
+        return decode_token(auth_header.split(" ", 1)[1])
+
     @app.get("/auth/me")
     def me() -> Response:
         auth_header = request.headers.get("Authorization", "")
         if not auth_header.startswith("Bearer "):
             return jsonify({"error": "인증 토큰이 필요합니다"}), 401
-        token = auth_header.split(" ", 1)[1]
-        payload = decode_token(token)
+        payload = bearer_payload()
         if not payload:
             return jsonify({"error": "유효하지 않은 토큰입니다"}), 401
 
-        with get_db() as conn:
-            user = conn.execute(
-                "SELECT * FROM users WHERE id = ?", (payload["sub"],)
-            ).fetchone()
-
+        user = load_user_profile(str(payload["sub"]))
         if not user:
             return jsonify({"error": "사용자를 찾을 수 없습니다"}), 404
 
-        return jsonify({"user": to_user_dict(user)})
+        return jsonify({"user": user})
+
+    def sync_response(payload: Dict[str, Any]) -> Response:
+        body, encoding = encode_body(payload, accepts_gzip(request.headers.get("Accept-Encoding")))
+        response = Response(body, content_type="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+    @app.get("/sync/pull")
+    def sync_pull() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        cursor = request.args.get("cursor", default=0, type=int)
+        limit = request.args.get("limit", default=DEFAULT_PULL_LIMIT, type=int)
+        with phase_latency.time(phase="sync_pull"):
+            page = pull_changes(
+                get_db(),
+                int(payload["sub"]),
+                max(0, cursor),
+                limit,
+                exclude_origin=request.args.get("exclude_origin") or None,
+            )
+        return sync_response(page)
+
+    @app.post("/sync/push")
+    def sync_push() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        try:
+            raw_body = request.stream.read(MAX_BODY_BYTES + 1)
+            if len(raw_body) > MAX_BODY_BYTES:
+                raise BodyTooLarge(f"body exceeds {MAX_BODY_BYTES} bytes")
+            data = decode_body(raw_body, request.headers.get("Content-Encoding"))
+            raw_changes = data.get("changes") if isinstance(data, dict) else None
+            if not isinstance(raw_changes, list):
+                raise ValueError("changes 목록이 필요합니다")
+            if len(raw_changes) > MAX_PUSH_BATCH:
+                raise ValueError(f"한 번에 최대 {MAX_PUSH_BATCH}건까지 보낼 수 있습니다")
+            changes = [validate_change(raw) for raw in raw_changes]
+        except BodyTooLarge as exc:
+            return jsonify({"error": "동기화 요청이 너무 큽니다", "detail": str(exc)}), 413
+        except (OSError, ValueError) as exc:
+            return jsonify({"error": "잘못된 동기화 요청입니다", "detail": str(exc)}), 400
+        with phase_latency.time(phase="sync_push"):
+            result = apply_push(get_db(), int(payload["sub"]), changes)
+        return sync_response(result)
+
+    @app.post("/calendar/sync")
+    def calendar_sync() -> Response:
+        # Mobile sign-in (/auth/google/token) only carries an ID token, so the app
+        # hands over its Google access token here to refresh the cached calendar.
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        data = request.get_json(silent=True) or {}
+        access_token = (data.get("access_token") or "").strip()
+        if not access_token:
+            return jsonify({"error": "access_token 필드가 필요합니다"}), 400
+        calendar_id = data.get("calendar_id") or "primary"
+        future = calendar_cache.sync_in_background(int(payload["sub"]), access_token, calendar_id)
+        if not data.get("wait"):
+            return jsonify({"status": "accepted", "calendar_id": calendar_id}), 202
+        try:
+            report = future.result(timeout=float(os.getenv("GOOGLE_CALENDAR_TIMEOUT", "10")) * 3)
+        except Exception as exc:  # noqa: BLE001
+            return jsonify({"error": "캘린더 동기화에 실패했습니다", "detail": str(exc)}), 502
+        return jsonify({"status": "synced", "calendar_id": calendar_id, "sync": report})
+
+    @app.get("/calendar/events")
+    def calendar_events() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        calendar_id = request.args.get("calendar_id") or "primary"
+        try:
+            start = range_bound(request.args["start"])
+            end = range_bound(request.args["end"])
+        except (KeyError, ValueError):
+            return jsonify({"error": "start, end는 YYYY-MM-DD 또는 ISO 8601 형식이어야 합니다"}), 400
+        if end <= start:
+            return jsonify({"error": "end는 start보다 뒤여야 합니다"}), 400
+
+        user_id = int(payload["sub"])
+        with phase_latency.time(phase="calendar_read"):
+            etag, body = CalendarCache.read_snapshot(
+                get_db(), user_id, calendar_id, start, end, request.if_none_match.contains
+            )
+        if etag is None:
+            return jsonify({"error": "아직 동기화된 캘린더가 없습니다"}), 404
+        response = Response(status=304) if body is None else jsonify(body)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
 
     def wants_json_response() -> bool:
         format_hint = (
@@ -327,8 +621,6 @@ def create_app() -> Flask:
             return True
         return False
 
-    client_section_key = "app"
-
     @app.get("/auth/google/login")
     def google_login() -> Response:
         client_config = require_google_config()
@@ -343,12 +635,7 @@ def create_app() -> Flask:
                 ),
                 501,
             )
-        flow = Flow.from_client_config(
-            client_config,
-            scopes=google_scopes,
-            redirect_uri=google_redirect_uri,
-            client_type=client_section_key,
-        )
+        flow = build_flow(client_config)
 
         authorization_url, state = flow.authorization_url(
             access_type="offline",
@@ -356,6 +643,7 @@ def create_app() -> Flask:
             prompt="consent",
         )
         session["google_oauth_state"] = state
+        session["google_oauth_code_verifier"] = flow.code_verifier
         redirect_to = request.args.get("redirect_to")
         if redirect_to:
             session["google_oauth_redirect_to"] = redirect_to
@@ -382,43 +670,43 @@ def create_app() -> Flask:
                 ),
                 501,
             )
-        flow = Flow.from_client_config(
+        flow = build_flow(
             client_config,
-            scopes=google_scopes,
             state=state,
-            redirect_uri=google_redirect_uri,
-            client_type=client_section_key,
+            code_verifier=session.get("google_oauth_code_verifier"),
         )
 
         try:
-            flow.fetch_token(authorization_response=request.url)
+            with phase_latency.time(phase="google_token_exchange"):
+                flow.fetch_token(authorization_response=request.url)
         except Exception as exc:  # noqa: BLE001
             return jsonify({"error": "토큰을 가져오지 못했습니다", "detail": str(exc)}), 400
 
         session.pop("google_oauth_state", None)
+        session.pop("google_oauth_code_verifier", None)
 
         credentials = flow.credentials
         if not credentials.id_token:
             return jsonify({"error": "ID 토큰을 확인할 수 없습니다"}), 400
 
         try:
-            google_profile = id_token.verify_oauth2_token(
-                credentials.id_token,
-                google_requests.Request(),
-                audience=client_section["client_id"],
-            )
+            with phase_latency.time(phase="google_id_token_verify"):
+                google_profile = google_certs.verify_oauth2_token(
+                    credentials.id_token,
+                    audience=client_section["client_id"],
+                )
         except Exception as exc:  # noqa: BLE001
             return jsonify({"error": "ID 토큰 검증에 실패했습니다", "detail": str(exc)}), 400
 
-        email = google_profile.get("email", "").lower()
-        google_id = google_profile.get("sub")
-        nickname = google_profile.get("name") or (email.split("@")[0] if email else None)
-        picture = google_profile.get("picture")
+        email, google_id, nickname, picture = google_profile_fields(google_profile)
 
         if not email or not google_id:
             return jsonify({"error": "Google 계정 정보를 가져오지 못했습니다"}), 400
 
         user = sync_google_user(email, google_id, nickname, picture)
+        if calendar_sync_enabled and credentials.token:
+            # Incremental (sync-token) refresh; sign-in does not wait for it.
+            calendar_cache.sync_in_background(user["id"], credentials.token)
 
         token = issue_token(user)
         result = {
@@ -435,35 +723,7 @@ def create_app() -> Flask:
             separator = "&" if "?" in redirect_to else "?"
             return redirect(f"{redirect_to}{separator}token={token}")
 
-        payload = json.dumps(result)
-        script = f"""
-        <!doctype html>
-        <html lang="ko">
-        <head>
-            <meta charset="utf-8" />
-            <title>Google OAuth 완료</title>
-        </head>
-        <body>
-            <script>
-                (function () {{
-                    var payload = {payload!r};
-                    try {{
-                        var data = JSON.parse(payload);
-                        if (window.opener) {{
-                            window.opener.postMessage(data, "*");
-                        }} else if (window.parent && window.parent !== window) {{
-                            window.parent.postMessage(data, "*");
-                        }}
-                    }} catch (err) {{
-                        console.error("Failed to postMessage", err);
-                    }}
-                    window.close();
-                }})();
-            </script>
-            <p>로그인이 완료되었습니다. 이 창을 닫아주세요.</p>
-        </body>
-        </html>
-        """
+        script = oauth_complete_page(result)
         return Response(script, mimetype="text/html")
 
     @app.post("/auth/google/token")
@@ -478,18 +738,15 @@ def create_app() -> Flask:
             return jsonify({"error": "id_token 필드가 필요합니다"}), 400
 
         try:
-            google_profile = id_token.verify_oauth2_token(
-                raw_id_token,
-                google_requests.Request(),
-                audience=client_id,
-            )
+            with phase_latency.time(phase="google_id_token_verify"):
+                google_profile = google_certs.verify_oauth2_token(
+                    raw_id_token,
+                    audience=client_id,
+                )
         except Exception as exc:  # noqa: BLE001
             return jsonify({"error": "ID 토큰 검증에 실패했습니다", "detail": str(exc)}), 400
 
-        email = (google_profile.get("email") or "").lower()
-        google_id = google_profile.get("sub")
-        nickname = google_profile.get("name") or (email.split("@")[0] if email else None)
-        picture = google_profile.get("picture")
+        email, google_id, nickname, picture = google_profile_fields(google_profile)
 
         if not email or not google_id:
             return jsonify({"error": "Google 계정 정보를 가져오지 못했습니다"}), 400
@@ -0,0 +1,879 @@
+"""ASGI (Quart) variant of the auth API in ``app.py``.
+
+Routes and JSON contracts are the same as the Flask app, but Google's token
+exchange and certificate fetches go through ``httpx.AsyncClient`` and SQLite
+through ``aiosqlite``, so a slow OAuth handshake only parks a coroutine rather
+than a worker thread. Routes built on the synchronous helpers shared with
+``app.py`` (sync engine, calendar cache, user import) call them through
+``AsyncSQLitePool.run_sync`` on a pooled connection's thread. Run it with any
+ASGI server, e.g.::
+
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import secrets
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import httpx
+from dotenv import load_dotenv
+from jose import JWTError, jwt
+from quart import Quart, Response, g, jsonify, redirect, request, session
+from quart_cors import cors
+
+from auth_common import (
+    CLIENT_SECTION_KEY,
+    GOOGLE_SCOPES,
+    USERS_TABLE_SQL,
+    GoogleConfigLoader,
+    allowed_client_origins,
+    google_profile_fields,
+    oauth_complete_page,
+    to_user_dict,
+    token_payload,
+)
+from calendar_cache import (
+    CALENDAR_READ_SCOPE,
+    GOOGLE_CALENDAR_API,
+    CalendarCache,
+    GoogleCalendarClient,
+    range_bound,
+)
+from db_pool import AsyncSQLitePool, SQLitePool
+from google_certs import GOOGLE_CERTS_URL, AsyncGoogleCertCache
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import MetricsRegistry, snapshot_lines
+from password_hasher import HasherBusy, PasswordHasher
+from sampling_profiler import MAX_INTERVAL, MIN_INTERVAL, SamplingProfiler
+from sync_engine import (
+    DEFAULT_PULL_LIMIT,
+    MAX_BODY_BYTES,
+    MAX_PUSH_BATCH,
+    BodyTooLarge,
+    accepts_gzip,
+    apply_push,
+    decode_body,
+    encode_body,
+    init_server_schema,
+    pull_changes,
+    validate_change,
+)
+from ttl_cache import TTLCache
+from user_import import UPSERT_USER_SQL, import_ndjson
+
+load_dotenv()
+
+
+def pkce_pair() -> tuple[str, str]:
+    verifier = secrets.token_urlsafe(64)
+    digest = hashlib.sha256(verifier.encode("ascii")).digest()
+    challenge = base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+    return verifier, challenge
+
+
+def create_app() -> Quart:
+    app = Quart(__name__)
+
+    app.config.update(
+        SECRET_KEY=os.getenv("FLASK_SECRET_KEY", secrets.token_hex(32)),
+        SESSION_COOKIE_NAME=os.getenv("SESSION_COOKIE_NAME", "hack_bluebird_session"),
+        JSON_AS_ASCII=False,
+        # Quart caps request bodies (Flask does not); raise it for large NDJSON imports.
+        MAX_CONTENT_LENGTH=int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024))),
+    )
+    app = cors(
+        app,
+        allow_origin=allowed_client_origins(),
+        allow_credentials=True,
+    )
+
+    database_path = os.getenv(
+        "DATABASE_URL", os.path.join(os.path.dirname(__file__), "app.db")
+    )
+    jwt_secret = os.getenv("JWT_SECRET", app.config["SECRET_KEY"])
+    jwt_algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+    token_ttl_seconds = int(os.getenv("JWT_TTL_SECONDS", "3600"))
+
+    google_redirect_uri = os.getenv(
+        "GOOGLE_REDIRECT_URI", "http://localhost:5000/auth/google/callback"
+    )
+    calendar_sync_enabled = os.getenv("GOOGLE_CALENDAR_SYNC", "false").lower() in {"1", "true", "yes"}
+    google_scopes = GOOGLE_SCOPES + [CALENDAR_READ_SCOPE] if calendar_sync_enabled else GOOGLE_SCOPES
+    success_redirect = os.getenv("GOOGLE_OAUTH_SUCCESS_REDIRECT")
+    client_section_key = CLIENT_SECTION_KEY
+    google_config_loader = GoogleConfigLoader(
+        google_redirect_uri,
+        base_dir=os.path.dirname(__file__),
+        client_section_key=client_section_key,
+    )
+
+    admin_token = os.getenv("ADMIN_TOKEN")
+
+    metrics = MetricsRegistry(namespace="bluebird")
+    request_latency = metrics.histogram(
+        "http_request_duration_seconds",
+        "Request latency by route.",
+        ("method", "route", "status"),
+    )
+    phase_latency = metrics.histogram(
+        "phase_duration_seconds",
+        "Time spent in internal phases (db, kdf, jwt_sign, jwt_verify, google_*).",
+        ("phase",),
+    )
+    requests_in_flight = metrics.gauge(
+        "http_requests_in_flight", "Requests currently being served.", ("route",)
+    )
+    app.extensions["metrics"] = metrics
+
+    profiler = SamplingProfiler(interval=float(os.getenv("PROFILER_INTERVAL", "0.005")))
+    if os.getenv("PROFILER_ENABLED", "false").lower() in {"1", "true", "yes"}:
+        profiler.start()
+    app.extensions["profiler"] = profiler
+
+    db_pool = AsyncSQLitePool(
+        database_path,
+        max_size=int(os.getenv("DB_POOL_SIZE", "8")),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024))),
+        cache_size_kib=int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(16 * 1024))),
+        statement_observer=lambda seconds: phase_latency.observe(seconds, phase="db"),
+    )
+    app.extensions["db_pool"] = db_pool
+
+    password_hasher = PasswordHasher(
+        method=os.getenv("PASSWORD_HASH_METHOD", "scrypt"),
+        workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))),
+        queue_size=int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16")),
+        timeout=float(os.getenv("PASSWORD_HASH_TIMEOUT", "10")),
+    )
+    app.extensions["password_hasher"] = password_hasher
+
+    token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+        max_entries=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+        default_ttl=token_ttl_seconds,
+    )
+    user_cache: TTLCache[Dict[str, Any]] = TTLCache(
+        max_entries=int(os.getenv("USER_CACHE_SIZE", "10000")),
+        default_ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "300")),
+    )
+
+    google_http_timeout = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "10"))
+    google_certs = AsyncGoogleCertCache(
+        certs_url=os.getenv("GOOGLE_CERTS_URL", GOOGLE_CERTS_URL),
+        default_ttl=int(os.getenv("GOOGLE_CERTS_DEFAULT_TTL", "300")),
+        timeout=google_http_timeout,
+        fetch_observer=lambda seconds: phase_latency.observe(
+            seconds, phase="google_certs_fetch"
+        ),
+    )
+    app.extensions["google_certs"] = google_certs
+    http_clients: Dict[str, httpx.AsyncClient] = {}
+
+    # Calendar syncs run on CalendarCache's worker threads, which need blocking
+    # sqlite3 connections of their own rather than the event loop's aiosqlite ones.
+    calendar_workers = int(os.getenv("CALENDAR_SYNC_WORKERS", "4"))
+    calendar_db_pool = SQLitePool(
+        database_path,
+        max_size=calendar_workers,
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        statement_observer=lambda seconds: phase_latency.observe(seconds, phase="db"),
+    )
+    calendar_cache = CalendarCache(
+        calendar_db_pool.connection,
+        GoogleCalendarClient(
+            base_url=os.getenv("GOOGLE_CALENDAR_API_URL", GOOGLE_CALENDAR_API),
+            timeout=float(os.getenv("GOOGLE_CALENDAR_TIMEOUT", "10")),
+            fetch_observer=lambda seconds: phase_latency.observe(
+                seconds, phase="google_calendar_fetch"
+            ),
+        ),
+        min_interval=float(os.getenv("CALENDAR_SYNC_MIN_INTERVAL", "30")),
+        workers=calendar_workers,
+    )
+    app.extensions["calendar_cache"] = calendar_cache
+
+    # Upper bound on concurrent Google round trips held by this process.
+    max_inflight = int(os.getenv("ASGI_MAX_INFLIGHT", "1000"))
+    inflight_wait = float(os.getenv("ASGI_INFLIGHT_TIMEOUT", "5"))
+    inflight_limit: Dict[str, asyncio.Semaphore] = {}
+
+    def collect_runtime_metrics() -> list[str]:
+        pool = db_pool.stats()
+        lines = []
+        for name, key, kind, documentation in (
+            ("checkouts_total", "checkouts", "counter", "Connections handed out by the SQLite pool."),
+            ("wait_seconds_total", "wait_seconds_total", "counter", "Time spent waiting for a pooled connection."),
+            ("timeouts_total", "timeouts", "counter", "Pool checkouts that timed out."),
+            ("lock_retries_total", "lock_retries", "counter", "Statements retried after 'database is locked'."),
+            ("lock_failures_total", "lock_failures", "counter", "Statements still locked after SQLITE_BUSY_TIMEOUT_MS."),
+            ("lock_wait_seconds_total", "lock_wait_seconds", "counter", "Time statements spent waiting on SQLite locks (busy waits and backoff)."),
+            ("connections_in_use", "in_use", "gauge", "Pooled connections currently checked out."),
+        ):
+            lines += snapshot_lines(f"bluebird_db_pool_{name}", kind, documentation, pool[key])
+        for cache_name, cache in (("token", token_cache), ("user", user_cache)):
+            stats = cache.stats()
+            for key in ("hits", "misses"):
+                lines += snapshot_lines(
+                    f"bluebird_{cache_name}_cache_{key}_total",
+                    "counter",
+                    f"{cache_name} cache {key}.",
+                    stats[key],
+                )
+        return lines
+
+    metrics.register_collector(collect_runtime_metrics)
+
+    @app.before_serving
+    async def startup() -> None:
+        limits = httpx.Limits(
+            max_connections=max_inflight,
+            max_keepalive_connections=min(max_inflight, 100),
+        )
+        http_clients["google"] = httpx.AsyncClient(
+            timeout=google_http_timeout, limits=limits
+        )
+        google_certs.client = http_clients["google"]
+        inflight_limit["google"] = asyncio.Semaphore(max_inflight)
+        async with db_pool.connection_async() as conn:
+            await conn.execute(USERS_TABLE_SQL)
+            await conn.commit()
+        await db_pool.run_sync(init_server_schema)
+        await db_pool.run_sync(CalendarCache.init_schema)
+
+    @app.after_serving
+    async def shutdown() -> None:
+        await google_certs.aclose()
+        await db_pool.close_async()
+        await asyncio.to_thread(calendar_cache.shutdown)
+        calendar_db_pool.close()
+        password_hasher.shutdown()
+        profiler.stop()
+
+    @app.before_request
+    async def start_request_timer() -> None:
+        g.request_started = time.perf_counter()
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        requests_in_flight.inc(route=g.metrics_route)
+
+    @app.after_request
+    async def remember_status(response: Response) -> Response:
+        g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    async def finish_request_timer(exc: Optional[BaseException]) -> None:
+        started = g.pop("request_started", None)
+        if started is None:
+            return
+        route = g.pop("metrics_route")
+        requests_in_flight.dec(route=route)
+        request_latency.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route,
+            status=str(g.pop("response_status", 500)),
+        )
+
+    def issue_token(user: sqlite3.Row) -> str:
+        payload = token_payload(user, token_ttl_seconds)
+        with phase_latency.time(phase="jwt_sign"):
+            return jwt.encode(payload, jwt_secret, algorithm=jwt_algorithm)
+
+    def decode_token(token: str) -> Optional[Dict[str, Any]]:
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        payload = token_cache.get(cache_key)
+        if payload is not None:
+            return payload
+        try:
+            with phase_latency.time(phase="jwt_verify"):
+                payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
+        except JWTError:
+            return None
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            token_cache.set(cache_key, payload, expires_at=expires_at)
+        return payload
+
+    async def fetch_one(sql: str, params: tuple) -> Optional[sqlite3.Row]:
+        async with db_pool.connection_async() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def load_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+        profile = user_cache.get(user_id)
+        if profile is not None:
+            return profile
+        user = await fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+        if not user:
+            return None
+        profile = to_user_dict(user)
+        user_cache.set(user_id, profile)
+        return profile
+
+    async def sync_google_user(
+        email: str,
+        google_id: str,
+        nickname: Optional[str],
+        picture: Optional[str],
+    ) -> sqlite3.Row:
+        created_at = datetime.utcnow().isoformat()
+        async with db_pool.connection_async() as conn:
+            async with conn.execute(
+                UPSERT_USER_SQL, (email, nickname, google_id, picture, created_at)
+            ) as cursor:
+                user = await cursor.fetchone()
+            await conn.commit()
+
+        if not user:
+            raise RuntimeError("Failed to synchronize Google user information.")
+        user_cache.invalidate(str(user["id"]))
+        return user
+
+    def require_google_config() -> Dict[str, Any]:
+        return google_config_loader.get()
+
+    def hasher_busy_response(exc: HasherBusy) -> Response:
+        response = jsonify({"error": "요청이 많아 잠시 후 다시 시도해주세요"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(exc.retry_after)
+        return response
+
+    def overloaded_response() -> Response:
+        response = jsonify({"error": "요청이 많아 잠시 후 다시 시도해주세요"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+
+    async def acquire_inflight_slot() -> bool:
+        try:
+            await asyncio.wait_for(inflight_limit["google"].acquire(), inflight_wait)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def is_admin_request() -> bool:
+        if not admin_token:
+            return False
+        provided = request.headers.get("X-Admin-Token", "")
+        return secrets.compare_digest(provided, admin_token)
+
+    def wants_json_response() -> bool:
+        format_hint = (
+            request.args.get("format")
+            or request.args.get("response_type")
+            or ""
+        ).lower()
+        if format_hint == "json":
+            return True
+        if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+            return True
+        accept = request.headers.get("Accept") or ""
+        if "application/json" in accept and "text/html" not in accept:
+            return True
+        return False
+
+    @app.get("/")
+    async def index() -> Response:
+        return jsonify({"status": "ok", "service": "Hack BlueBird API"})
+
+    @app.get("/admin/db/pool")
+    async def db_pool_stats() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify({"pool": db_pool.stats()})
+
+    @app.get("/admin/cache")
+    async def cache_stats() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify(
+            {
+                "token_cache": token_cache.stats(),
+                "user_cache": user_cache.stats(),
+                "google_certs": google_certs.stats(),
+                "calendar": calendar_cache.stats(),
+            }
+        )
+
+    @app.get("/metrics")
+    async def metrics_endpoint() -> Response:
+        return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+    @app.get("/admin/profiler")
+    async def profiler_status() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return jsonify({"profiler": profiler.status()})
+
+    @app.post("/admin/profiler")
+    async def profiler_control() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        data = await request.get_json(silent=True) or {}
+        action = data.get("action")
+        if action == "start":
+            interval = data.get("interval")
+            if interval is not None:
+                if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not (
+                    MIN_INTERVAL <= interval <= MAX_INTERVAL
+                ):
+                    return (
+                        jsonify({"error": f"interval은 {MIN_INTERVAL}~{MAX_INTERVAL}초 사이의 숫자여야 합니다"}),
+                        400,
+                    )
+                interval = float(interval)
+            profiler.start(interval=interval)
+        elif action == "stop":
+            profiler.stop()
+        elif action == "reset":
+            profiler.reset()
+        else:
+            return jsonify({"error": "action은 start, stop, reset 중 하나여야 합니다"}), 400
+        return jsonify({"profiler": profiler.status()})
+
+    @app.get("/admin/profiler/stacks")
+    async def profiler_stacks() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        return Response(profiler.collapsed(), mimetype="text/plain")
+
+    @app.post("/admin/users/import")
+    async def import_users() -> Response:
+        if not is_admin_request():
+            return jsonify({"error": "관리자 권한이 필요합니다"}), 403
+        import_id = request.args.get("import_id") or None
+        batch_size = request.args.get("batch_size", default=5000, type=int)
+
+        def invalidate_batch(user_ids: list[int]) -> None:
+            for user_id in user_ids:
+                user_cache.invalidate(str(user_id))
+
+        # import_ndjson reads lines synchronously on the connection thread, so the
+        # upload is spooled first (to disk past 8 MiB) instead of held in memory.
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as upload:
+            async for chunk in request.body:
+                upload.write(chunk)
+            upload.seek(0)
+            report = await db_pool.run_sync(
+                import_ndjson,
+                upload,
+                import_id,
+                batch_size=max(1, batch_size),
+                on_batch=invalidate_batch,
+            )
+        return jsonify(report)
+
+    @app.post("/auth/register")
+    async def register() -> Response:
+        data = await request.get_json(silent=True) or {}
+        email = (data.get("email") or "").strip().lower()
+        password = data.get("password") or ""
+        nickname = (data.get("nickname") or "").strip()
+
+        if not email or not password or not nickname:
+            return jsonify({"error": "필수 항목이 누락되었습니다"}), 400
+
+        if len(password) < 6:
+            return jsonify({"error": "비밀번호는 6자 이상이어야 합니다"}), 400
+
+        try:
+            with phase_latency.time(phase="kdf"):
+                password_hash = await password_hasher.hash_async(password)
+        except HasherBusy as exc:
+            return hasher_busy_response(exc)
+        created_at = datetime.utcnow().isoformat()
+
+        async with db_pool.connection_async() as conn:
+            try:
+                await conn.execute(
+                    """
+                    INSERT INTO users (email, password_hash, nickname, created_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (email, password_hash, nickname, created_at),
+                )
+                await conn.commit()
+            except sqlite3.IntegrityError:
+                return jsonify({"error": "이미 사용 중인 이메일입니다"}), 409
+
+            async with conn.execute(
+                "SELECT * FROM users WHERE email = ?", (email,)
+            ) as cursor:
+                user = await cursor.fetchone()
+
+        user_cache.invalidate(str(user["id"]))
+        token = issue_token(user)
+        return (
+            jsonify(
+                {
+                    "message": "회원가입이 완료되었습니다",
+                    "token": token,
+                    "user": to_user_dict(user),
+                }
+            ),
+            201,
+        )
+
+    @app.post("/auth/login")
+    async def login() -> Response:
+        data = await request.get_json(silent=True) or {}
+        email = (data.get("email") or "").strip().lower()
+        password = data.get("password") or ""
+
+        if not email or not password:
+            return jsonify({"error": "이메일과 비밀번호를 모두 입력해주세요"}), 400
+
+        user = await fetch_one("SELECT * FROM users WHERE email = ?", (email,))
+
+        if not user or not user["password_hash"]:
+            return jsonify({"error": "이메일 또는 비밀번호가 올바르지 않습니다"}), 401
+
+        try:
+            with phase_latency.time(phase="kdf"):
+                verified = await password_hasher.verify_async(user["password_hash"], password)
+        except HasherBusy as exc:
+            return hasher_busy_response(exc)
+        if not verified:
+            return jsonify({"error": "이메일 또는 비밀번호가 올바르지 않습니다"}), 401
+
+        if password_hasher.needs_rehash(user["password_hash"]):
+            try:
+                with phase_latency.time(phase="kdf"):
+                    upgraded_hash = await password_hasher.hash_async(password)
+            except HasherBusy:
+                # The upgrade is opportunistic; it will be retried on the next login.
+                upgraded_hash = None
+            if upgraded_hash:
+                async with db_pool.connection_async() as conn:
+                    await conn.execute(
+                        "UPDATE users SET password_hash = ? WHERE id = ?",
+                        (upgraded_hash, user["id"]),
+                    )
+                    await conn.commit()
+
+        token = issue_token(user)
+        return jsonify({"message": "로그인에 성공했습니다", "token": token, "user": to_user_dict(user)})
+
+    def bearer_payload() -> Optional[Dict[str, Any]]:
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return None
+        return decode_token(auth_header.split(" ", 1)[1])
+
+    @app.get("/auth/me")
+    async def me() -> Response:
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "유효하지 않은 토큰입니다"}), 401
+
+        user = await load_user_profile(str(payload["sub"]))
+        if not user:
+            return jsonify({"error": "사용자를 찾을 수 없습니다"}), 404
+
+        return jsonify({"user": user})
+
+    def sync_response(payload: Dict[str, Any]) -> Response:
+        body, encoding = encode_body(payload, accepts_gzip(request.headers.get("Accept-Encoding")))
+        response = Response(body, content_type="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+    @app.get("/sync/pull")
+    async def sync_pull() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        cursor = request.args.get("cursor", default=0, type=int)
+        limit = request.args.get("limit", default=DEFAULT_PULL_LIMIT, type=int)
+        with phase_latency.time(phase="sync_pull"):
+            page = await db_pool.run_sync(
+                pull_changes,
+                int(payload["sub"]),
+                max(0, cursor),
+                limit,
+                exclude_origin=request.args.get("exclude_origin") or None,
+            )
+        return sync_response(page)
+
+    @app.post("/sync/push")
+    async def sync_push() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        try:
+            raw_body = bytearray()
+            async for chunk in request.body:
+                raw_body += chunk
+                if len(raw_body) > MAX_BODY_BYTES:
+                    raise BodyTooLarge(f"body exceeds {MAX_BODY_BYTES} bytes")
+            data = decode_body(bytes(raw_body), request.headers.get("Content-Encoding"))
+            raw_changes = data.get("changes") if isinstance(data, dict) else None
+            if not isinstance(raw_changes, list):
+                raise ValueError("changes 목록이 필요합니다")
+            if len(raw_changes) > MAX_PUSH_BATCH:
+                raise ValueError(f"한 번에 최대 {MAX_PUSH_BATCH}건까지 보낼 수 있습니다")
+            changes = [validate_change(raw) for raw in raw_changes]
+        except BodyTooLarge as exc:
+            return jsonify({"error": "동기화 요청이 너무 큽니다", "detail": str(exc)}), 413
+        except (OSError, ValueError) as exc:
+            return jsonify({"error": "잘못된 동기화 요청입니다", "detail": str(exc)}), 400
+        with phase_latency.time(phase="sync_push"):
+            result = await db_pool.run_sync(apply_push, int(payload["sub"]), changes)
+        return sync_response(result)
+
+    @app.post("/calendar/sync")
+    async def calendar_sync() -> Response:
+        # Mobile sign-in (/auth/google/token) only carries an ID token, so the app
+        # hands over its Google access token here to refresh the cached calendar.
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        data = await request.get_json(silent=True) or {}
+        access_token = (data.get("access_token") or "").strip()
+        if not access_token:
+            return jsonify({"error": "access_token 필드가 필요합니다"}), 400
+        calendar_id = data.get("calendar_id") or "primary"
+        future = calendar_cache.sync_in_background(int(payload["sub"]), access_token, calendar_id)
+        if not data.get("wait"):
+            return jsonify({"status": "accepted", "calendar_id": calendar_id}), 202
+        try:
+            report = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                float(os.getenv("GOOGLE_CALENDAR_TIMEOUT", "10")) * 3,
+            )
+        except Exception as exc:  # noqa: BLE001
+            return jsonify({"error": "캘린더 동기화에 실패했습니다", "detail": str(exc)}), 502
+        return jsonify({"status": "synced", "calendar_id": calendar_id, "sync": report})
+
+    @app.get("/calendar/events")
+    async def calendar_events() -> Response:
+        payload = bearer_payload()
+        if not payload:
+            return jsonify({"error": "인증 토큰이 필요합니다"}), 401
+        calendar_id = request.args.get("calendar_id") or "primary"
+        try:
+            start = range_bound(request.args["start"])
+            end = range_bound(request.args["end"])
+        except (KeyError, ValueError):
+            return jsonify({"error": "start, end는 YYYY-MM-DD 또는 ISO 8601 형식이어야 합니다"}), 400
+        if end <= start:
+            return jsonify({"error": "end는 start보다 뒤여야 합니다"}), 400
+
+        user_id = int(payload["sub"])
+        with phase_latency.time(phase="calendar_read"):
+            etag, body = await db_pool.run_sync(
+                CalendarCache.read_snapshot,
+                user_id,
+                calendar_id,
+                start,
+                end,
+                request.if_none_match.contains,
+            )
+        if etag is None:
+            return jsonify({"error": "아직 동기화된 캘린더가 없습니다"}), 404
+        response = Response(status=304) if body is None else jsonify(body)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    @app.get("/auth/google/login")
+    async def google_login() -> Response:
+        client_config = require_google_config()
+        client_section = client_config.get(client_section_key, {})
+        if "client_secret" not in client_section:
+            return (
+                jsonify(
+                    {
+                        "error": "서버에서 Google OAuth 코드를 처리하려면 GOOGLE_CLIENT_SECRET이 필요합니다.",
+                        "hint": "모바일 앱에서는 POST /auth/google/token 엔드포인트에 ID 토큰을 전달하세요.",
+                    }
+                ),
+                501,
+            )
+
+        state = secrets.token_urlsafe(30)
+        code_verifier, code_challenge = pkce_pair()
+        query = urlencode(
+            {
+                "response_type": "code",
+                "client_id": client_section["client_id"],
+                "redirect_uri": google_redirect_uri,
+                "scope": " ".join(google_scopes),
+                "state": state,
+                "access_type": "offline",
+                "include_granted_scopes": "true",
+                "prompt": "consent",
+                "code_challenge": code_challenge,
+                "code_challenge_method": "S256",
+            }
+        )
+        authorization_url = f"{client_section['auth_uri']}?{query}"
+
+        session["google_oauth_state"] = state
+        session["google_oauth_code_verifier"] = code_verifier
+        redirect_to = request.args.get("redirect_to")
+        if redirect_to:
+            session["google_oauth_redirect_to"] = redirect_to
+        if wants_json_response():
+            return jsonify({"authorization_url": authorization_url, "state": state})
+
+        return redirect(authorization_url)
+
+    @app.get("/auth/google/callback")
+    async def google_callback() -> Response:
+        state = session.get("google_oauth_state")
+        if not state:
+            return jsonify({"error": "OAuth 세션이 만료되었습니다"}), 400
+
+        client_config = require_google_config()
+        client_section = client_config.get(client_section_key, {})
+        if "client_secret" not in client_section:
+            return (
+                jsonify(
+                    {
+                        "error": "GOOGLE_CLIENT_SECRET이 없어 OAuth 코드를 처리할 수 없습니다.",
+                        "hint": "대신 POST /auth/google/token 엔드포인트를 사용하세요.",
+                    }
+                ),
+                501,
+            )
+
+        code = request.args.get("code")
+        if request.args.get("error") or not code:
+            detail = request.args.get("error") or "missing code"
+            return jsonify({"error": "토큰을 가져오지 못했습니다", "detail": detail}), 400
+        if not secrets.compare_digest(request.args.get("state", ""), state):
+            return jsonify({"error": "토큰을 가져오지 못했습니다", "detail": "state mismatch"}), 400
+
+        if not await acquire_inflight_slot():
+            return overloaded_response()
+        try:
+            try:
+                with phase_latency.time(phase="google_token_exchange"):
+                    response = await http_clients["google"].post(
+                        client_section["token_uri"],
+                        data={
+                            "grant_type": "authorization_code",
+                            "code": code,
+                            "redirect_uri": google_redirect_uri,
+                            "client_id": client_section["client_id"],
+                            "client_secret": client_section["client_secret"],
+                            "code_verifier": session.get("google_oauth_code_verifier") or "",
+                        },
+                    )
+                response.raise_for_status()
+                token_response = response.json()
+            except Exception as exc:  # noqa: BLE001
+                return jsonify({"error": "토큰을 가져오지 못했습니다", "detail": str(exc)}), 400
+
+            session.pop("google_oauth_state", None)
+            session.pop("google_oauth_code_verifier", None)
+
+            raw_id_token = token_response.get("id_token")
+            if not raw_id_token:
+                return jsonify({"error": "ID 토큰을 확인할 수 없습니다"}), 400
+
+            try:
+                with phase_latency.time(phase="google_id_token_verify"):
+                    google_profile = await google_certs.verify_oauth2_token_async(
+                        raw_id_token,
+                        audience=client_section["client_id"],
+                    )
+            except Exception as exc:  # noqa: BLE001
+                return jsonify({"error": "ID 토큰 검증에 실패했습니다", "detail": str(exc)}), 400
+        finally:
+            inflight_limit["google"].release()
+
+        email, google_id, nickname, picture = google_profile_fields(google_profile)
+
+        if not email or not google_id:
+            return jsonify({"error": "Google 계정 정보를 가져오지 못했습니다"}), 400
+
+        user = await sync_google_user(email, google_id, nickname, picture)
+        if calendar_sync_enabled and token_response.get("access_token"):
+            # Incremental (sync-token) refresh; sign-in does not wait for it.
+            calendar_cache.sync_in_background(user["id"], token_response["access_token"])
+
+        token = issue_token(user)
+        result = {
+            "message": "Google OAuth 로그인에 성공했습니다",
+            "token": token,
+            "user": to_user_dict(user),
+        }
+
+        if wants_json_response():
+            return jsonify(result)
+
+        redirect_to = session.pop("google_oauth_redirect_to", None) or success_redirect
+        if redirect_to:
+            separator = "&" if "?" in redirect_to else "?"
+            return redirect(f"{redirect_to}{separator}token={token}")
+
+        return Response(oauth_complete_page(result), mimetype="text/html")
+
+    @app.post("/auth/google/token")
+    async def google_token_login() -> Response:
+        client_config = require_google_config()
+        client_section = client_config.get(client_section_key, {})
+        client_id = client_section["client_id"]
+
+        data = await request.get_json(silent=True) or {}
+        raw_id_token = (data.get("id_token") or "").strip()
+        if not raw_id_token:
+            return jsonify({"error": "id_token 필드가 필요합니다"}), 400
+
+        if not await acquire_inflight_slot():
+            return overloaded_response()
+        try:
+            with phase_latency.time(phase="google_id_token_verify"):
+                google_profile = await google_certs.verify_oauth2_token_async(
+                    raw_id_token,
+                    audience=client_id,
+                )
+        except Exception as exc:  # noqa: BLE001
+            return jsonify({"error": "ID 토큰 검증에 실패했습니다", "detail": str(exc)}), 400
+        finally:
+            inflight_limit["google"].release()
+
+        email, google_id, nickname, picture = google_profile_fields(google_profile)
+
+        if not email or not google_id:
+            return jsonify({"error": "Google 계정 정보를 가져오지 못했습니다"}), 400
+
+        user = await sync_google_user(email, google_id, nickname, picture)
+        token = issue_token(user)
+        return jsonify(
+            {
+                "message": "Google OAuth 로그인에 성공했습니다",
+                "token": token,
+                "user": to_user_dict(user),
+            }
+        )
+
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("PORT", "5000"))
+    debug = os.getenv("FLASK_DEBUG", "false").lower() in {"1", "true", "yes"}
+    app.run(host="0.0.0.0", port=port, debug=debug)
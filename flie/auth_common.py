@@ -0,0 +1,223 @@
+import copy
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+USERS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT,
+    nickname TEXT,
+    google_id TEXT UNIQUE,
+    google_picture TEXT,
+    created_at TEXT NOT NULL
+)
+"""
+
+GOOGLE_SCOPES = [
+    "openid",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "https://www.googleapis.com/auth/userinfo.profile",
+]
+GOOGLE_USERINFO_ENDPOINT = "https://openidconnect.googleapis.com/v1/userinfo"
+GOOGLE_AUTH_URI = "https://accounts.google.com/o/oauth2/auth"
+GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
+CLIENT_SECTION_KEY = "app"
+
+DEFAULT_CLIENT_ORIGINS = [
+    "http://localhost:8081",
+    "http://127.0.0.1:8081",
+    "http://localhost:19006",
+    "http://127.0.0.1:19006",
+]
+
+
+def allowed_client_origins() -> List[str]:
+    raw_origins = os.getenv("CLIENT_ORIGINS", "")
+    allowed_origins = [
+        origin.strip()
+        for origin in raw_origins.split(",")
+        if origin.strip()
+    ]
+    return allowed_origins or list(DEFAULT_CLIENT_ORIGINS)
+
+
+def to_user_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "email": row["email"],
+        "nickname": row["nickname"],
+        "google_picture": row["google_picture"],
+    }
+
+
+def token_payload(user: Mapping[str, Any], ttl_seconds: int) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "sub": str(user["id"]),
+        "email": user["email"],
+        "nickname": user["nickname"],
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(seconds=ttl_seconds)).timestamp()),
+    }
+
+
+def google_profile_fields(
+    google_profile: Mapping[str, Any],
+) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    email = (google_profile.get("email") or "").lower()
+    google_id = google_profile.get("sub")
+    nickname = google_profile.get("name") or (email.split("@")[0] if email else None)
+    picture = google_profile.get("picture")
+    return email, google_id, nickname, picture
+
+
+def oauth_complete_page(result: Dict[str, Any]) -> str:
+    payload = json.dumps(result)
+    return f"""
+        <!doctype html>
+        <html lang="ko">
+        <head>
+            <meta charset="utf-8" />
+            <title>Google OAuth 완료</title>
+        </head>
+        <body>
+            <script>
+                (function () {{
+                    var payload = {payload!r};
+                    try {{
+                        var data = JSON.parse(payload);
+                        if (window.opener) {{
+                            window.opener.postMessage(data, "*");
+                        }} else if (window.parent && window.parent !== window) {{
+                            window.parent.postMessage(data, "*");
+                        }}
+                    }} catch (err) {{
+                        console.error("Failed to postMessage", err);
+                    }}
+                    window.close();
+                }})();
+            </script>
+            <p>로그인이 완료되었습니다. 이 창을 닫아주세요.</p>
+        </body>
+        </html>
+        """
+
+
+class GoogleConfigLoader:
+    """Builds the Google OAuth client config once and reuses it.
+
+    The config is rebuilt only when one of the ``GOOGLE_*`` environment variables
+    or the mtime of a ``client_secret.json`` candidate changes, so a request only
+    pays for a few ``stat`` calls instead of re-reading and parsing JSON files.
+    """
+
+    def __init__(
+        self,
+        redirect_uri: str,
+        base_dir: str,
+        client_section_key: str = CLIENT_SECTION_KEY,
+    ) -> None:
+        self.redirect_uri = redirect_uri
+        self.base_dir = base_dir
+        self.client_section_key = client_section_key
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[tuple] = None
+        self._config: Optional[Dict[str, Any]] = None
+
+    def secrets_locations(self) -> List[Optional[str]]:
+        return [
+            os.getenv("GOOGLE_CLIENT_SECRETS_FILE"),
+            os.path.join(self.base_dir, "client_secret.json"),
+            os.path.join(self.base_dir, "Calendar", "client_secret.json"),
+        ]
+
+    def fingerprint(self, secrets_locations: List[Optional[str]]) -> tuple:
+        mtimes = []
+        for path in secrets_locations:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns if path else None)
+            except OSError:
+                mtimes.append(None)
+        return (
+            os.getenv("GOOGLE_CLIENT_ID"),
+            os.getenv("GOOGLE_CLIENT_SECRET"),
+            os.getenv("GOOGLE_PROJECT_ID"),
+            os.getenv("GOOGLE_AUTH_URI"),
+            os.getenv("GOOGLE_TOKEN_URI"),
+            tuple(secrets_locations),
+            tuple(mtimes),
+        )
+
+    def get(self) -> Dict[str, Any]:
+        secrets_locations = self.secrets_locations()
+        fingerprint = self.fingerprint(secrets_locations)
+        with self._lock:
+            if self._fingerprint != fingerprint or self._config is None:
+                self._config = self.load(secrets_locations)
+                self._fingerprint = fingerprint
+            return copy.deepcopy(self._config)
+
+    def load(self, secrets_locations: List[Optional[str]]) -> Dict[str, Any]:
+        client_id = os.getenv("GOOGLE_CLIENT_ID")
+        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+        project_id = os.getenv("GOOGLE_PROJECT_ID")
+        redirect_uris: list[str] = []
+
+        def load_from_section(section: Dict[str, Any]) -> None:
+            nonlocal client_id, client_secret, project_id, redirect_uris
+            client_id = client_id or section.get("client_id")
+            client_secret = client_secret or section.get("client_secret")
+            project_id = project_id or section.get("project_id")
+            redirect_candidates = section.get("redirect_uris") or section.get(
+                "redirectUris"
+            )
+            if redirect_candidates:
+                redirect_uris = list({*redirect_uris, *redirect_candidates})
+
+        for path in secrets_locations:
+            if not path:
+                continue
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    raw_config = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                continue
+
+            if isinstance(raw_config, dict):
+                for key in (self.client_section_key, "web", "installed"):
+                    section = raw_config.get(key)
+                    if isinstance(section, dict):
+                        load_from_section(section)
+                        if client_id:
+                            break
+            if client_id:
+                break
+
+        if not client_id:
+            raise RuntimeError("Google OAuth is not configured. Set GOOGLE_CLIENT_ID.")
+
+        project_id = project_id or "hack-bluebird"
+        if not redirect_uris:
+            redirect_uris = [self.redirect_uri]
+        elif self.redirect_uri not in redirect_uris:
+            redirect_uris.append(self.redirect_uri)
+
+        config = {
+            self.client_section_key: {
+                "client_id": client_id,
+                "project_id": project_id,
+                "auth_uri": os.getenv("GOOGLE_AUTH_URI", GOOGLE_AUTH_URI),
+                "token_uri": os.getenv("GOOGLE_TOKEN_URI", GOOGLE_TOKEN_URI),
+                "redirect_uris": redirect_uris,
+                "userinfo_endpoint": GOOGLE_USERINFO_ENDPOINT,
+            }
+        }
+        if client_secret:
+            config[self.client_section_key]["client_secret"] = client_secret
+        return config
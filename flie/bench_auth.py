@@ -0,0 +1,257 @@
+"""Latency/throughput benchmark for the Flask auth API in ``app.py``.
+
+Boots ``create_app()`` on a temporary SQLite database behind a threaded
+werkzeug server, replaces Google ID-token verification with an offline stub,
+and drives ``/auth/register``, ``/auth/login``, ``/auth/me`` and
+``/auth/google/token`` at a fixed concurrency. Results are written as JSON so
+runs from different commits can be compared::
+
+    python bench_auth.py --requests 2000 --concurrency 32 --output before.json
+    python bench_auth.py --requests 2000 --concurrency 32 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest_oauth import free_port, percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ("register", "login", "me", "google_token")
+STUB_CLIENT_ID = "bench-client"
+
+
+def stub_verify_oauth2_token(token: str, audience: Optional[str] = None) -> Dict[str, Any]:
+    """Offline stand-in for Google verification; tokens look like ``stub:<n>``."""
+    prefix, _, suffix = token.partition(":")
+    if prefix != "stub" or not suffix:
+        raise ValueError("not a stub token")
+    return {
+        "iss": "https://accounts.google.com",
+        "aud": audience,
+        "sub": f"google-{suffix}",
+        "email": f"google{suffix}@bench.example",
+        "name": f"google {suffix}",
+    }
+
+
+def boot_server(database_path: str) -> Tuple[str, Callable[[], None]]:
+    os.environ["DATABASE_URL"] = database_path
+    os.environ.setdefault("GOOGLE_CLIENT_ID", STUB_CLIENT_ID)
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from app import create_app
+
+    app = create_app()
+    app.extensions["google_certs"].verify_oauth2_token = stub_verify_oauth2_token
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):  # type: ignore[override]
+            pass
+
+    port = free_port()
+    server = make_server("127.0.0.1", port, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        server.shutdown()
+        app.extensions["password_hasher"].shutdown()
+        app.extensions["db_pool"].close()
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def run_scenario(
+    name: str,
+    requests_count: int,
+    concurrency: int,
+    call: Callable[[requests.Session, int], requests.Response],
+    expected_status: int = 200,
+) -> Tuple[Dict[str, Any], List[requests.Response]]:
+    local = threading.local()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    responses: List[Optional[requests.Response]] = [None] * requests_count
+    lock = threading.Lock()
+
+    def one(index: int) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = call(session, index)
+            status = str(response.status_code)
+        except requests.RequestException as exc:
+            response = None
+            status = type(exc).__name__
+        elapsed = time.perf_counter() - started
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if response is not None and response.status_code == expected_status:
+                latencies.append(elapsed)
+            responses[index] = response
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests_count)))
+    elapsed = time.perf_counter() - started
+
+    errors = requests_count - len(latencies)
+    result = {
+        "requests": requests_count,
+        "errors": errors,
+        "error_rate": round(errors / requests_count, 4) if requests_count else 0.0,
+        "statuses": statuses,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+        },
+    }
+    print(
+        f"  {name:<13} {result['throughput_per_second']:>9.1f} req/s  "
+        f"p50 {result['latency_ms']['p50']:>8.2f} ms  p95 {result['latency_ms']['p95']:>8.2f} ms  "
+        f"p99 {result['latency_ms']['p99']:>8.2f} ms  errors {result['error_rate']:.2%}"
+    )
+    return result, [response for response in responses if response is not None]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\n--- vs baseline {baseline.get('meta', {}).get('commit')} ---")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric in ("p50", "p95", "p99"):
+            old, new = before["latency_ms"][metric], result["latency_ms"][metric]
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"  {name:<13} {metric}: {old:>8.2f} -> {new:>8.2f} ms ({change:+.1f}%)")
+        old_tp, new_tp = before["throughput_per_second"], result["throughput_per_second"]
+        change = (new_tp - old_tp) / old_tp * 100 if old_tp else 0.0
+        print(f"  {name:<13} req/s: {old_tp:>8.1f} -> {new_tp:>8.1f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="bench_auth_")
+    base_url, stop = boot_server(os.path.join(workdir, "bench.db"))
+    password = "bench-password"
+    emails: List[str] = []
+    tokens: List[str] = []
+    results: Dict[str, Any] = {}
+
+    print(f"--- bench_auth: {args.requests} requests x {args.concurrency} workers ({base_url}) ---")
+    try:
+        # /auth/login and /auth/me need accounts, so registration always runs.
+        result, responses = run_scenario(
+            "register",
+            args.requests,
+            args.concurrency,
+            lambda s, i: s.post(
+                f"{base_url}/auth/register",
+                json={"email": f"user{i}@bench.example", "password": password, "nickname": f"user{i}"},
+            ),
+            expected_status=201,
+        )
+        if "register" in scenarios:
+            results["register"] = result
+        # Only accounts that really registered (not 429s or errors) are used below,
+        # otherwise logins for missing users would count 401s as latency samples.
+        registered = [r.json() for r in responses if r.status_code == 201]
+        emails = [body["user"]["email"] for body in registered]
+        tokens = [body["token"] for body in registered]
+        if not tokens:
+            raise RuntimeError("registration failed; nothing to benchmark")
+
+        if "login" in scenarios:
+            results["login"], _ = run_scenario(
+                "login",
+                args.requests,
+                args.concurrency,
+                lambda s, i: s.post(
+                    f"{base_url}/auth/login",
+                    json={"email": emails[i % len(emails)], "password": password},
+                ),
+            )
+        if "me" in scenarios:
+            results["me"], _ = run_scenario(
+                "me",
+                args.requests,
+                args.concurrency,
+                lambda s, i: s.get(
+                    f"{base_url}/auth/me",
+                    headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"},
+                ),
+            )
+        if "google_token" in scenarios:
+            results["google_token"], _ = run_scenario(
+                "google_token",
+                args.requests,
+                args.concurrency,
+                lambda s, i: s.post(f"{base_url}/auth/google/token", json={"id_token": f"stub:{i}"}),
+            )
+    finally:
+        stop()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "password_hash_method": os.getenv("PASSWORD_HASH_METHOD", "scrypt"),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
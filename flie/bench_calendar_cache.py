@@ -0,0 +1,291 @@
+"""Checks and times the calendar read cache against a local fake Calendar API.
+
+Starts a fake ``events.list`` server that supports ``pageToken`` and
+``syncToken`` and answers ``410`` once tokens are expired. It then boots
+``create_app()`` on a temporary database with ``GOOGLE_CALENDAR_API_URL``
+pointing at the fake, and walks through the sign-in refresh path:
+
+1. a first sync (full listing) of ``--events`` events
+2. ``--changes`` edits, cancellations and inserts, then an incremental sync
+3. ``GET /calendar/events`` for a week: 200, then 304 with ``If-None-Match``
+4. another change: the ETag must change
+5. expired sync tokens: the 410 path must fall back to one full listing
+
+After each sync the cached events are compared with the fake's live events.
+The process exits non-zero on any mismatch::
+
+    python bench_calendar_cache.py --events 5000 --changes 50 --output calendar_cache.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ZONES = [timezone(timedelta(hours=9)), timezone.utc, timezone(timedelta(hours=-5))]
+
+
+class FakeCalendar:
+    """In-memory calendar with a change sequence; sync tokens are ``s<seq>``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.seq = 0
+        self.min_valid_seq = 0
+        self.requests = 0
+        self.bytes_sent = 0
+
+    def put(self, event: Dict[str, Any]) -> None:
+        with self.lock:
+            self.seq += 1
+            event["updated"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            event["_seq"] = self.seq
+            self.events[event["id"]] = event
+
+    def cancel(self, event_id: str) -> None:
+        with self.lock:
+            self.seq += 1
+            self.events[event_id] = {"id": event_id, "status": "cancelled", "_seq": self.seq}
+
+    def expire_tokens(self) -> None:
+        with self.lock:
+            self.min_valid_seq = self.seq + 1
+
+    def live(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {key: value for key, value in self.events.items() if value.get("status") != "cancelled"}
+
+    def list(self, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        page_size = min(int(query.get("maxResults", "250")), 2500)
+        with self.lock:
+            if "pageToken" in query:
+                since, snapshot, offset = (int(part) for part in query["pageToken"].split(":"))
+                include_deleted = since > 0
+            elif "syncToken" in query:
+                since = int(query["syncToken"].lstrip("s"))
+                if since < self.min_valid_seq:
+                    return 410, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required.", "errors": [{"reason": "fullSyncRequired"}]}}
+                snapshot, offset, include_deleted = self.seq, 0, True
+            else:
+                since, snapshot, offset, include_deleted = 0, self.seq, 0, query.get("showDeleted") == "true"
+            matching = sorted(
+                (
+                    event for event in self.events.values()
+                    if since < event["_seq"] <= snapshot
+                    and (include_deleted or event.get("status") != "cancelled")
+                ),
+                key=lambda event: event["_seq"],
+            )
+        page = matching[offset:offset + page_size]
+        body: Dict[str, Any] = {
+            "kind": "calendar#events",
+            "items": [{key: value for key, value in event.items() if key != "_seq"} for event in page],
+        }
+        if offset + page_size < len(matching):
+            body["nextPageToken"] = f"{since}:{snapshot}:{offset + page_size}"
+        else:
+            body["nextSyncToken"] = f"s{snapshot}"
+        return 200, body
+
+
+def start_fake_calendar(calendar: FakeCalendar) -> Tuple[str, ThreadingHTTPServer]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            parsed = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                status, payload = 401, {"error": {"code": 401, "message": "Login Required"}}
+            elif not parsed.path.endswith("/events"):
+                status, payload = 404, {"error": {"code": 404, "message": "Not Found"}}
+            else:
+                status, payload = calendar.list(query)
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            with calendar.lock:
+                calendar.requests += 1
+                calendar.bytes_sent += len(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/calendar/v3", server
+
+
+def random_event(rng: random.Random, index: int) -> Dict[str, Any]:
+    base = datetime(2025, 9, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randrange(24 * 240))
+    if rng.random() < 0.1:
+        day = base.date()
+        start: Dict[str, Any] = {"date": day.isoformat()}
+        end: Dict[str, Any] = {"date": (day + timedelta(days=rng.randint(1, 3))).isoformat()}
+    else:
+        zone = rng.choice(ZONES)
+        local = base.astimezone(zone)
+        start = {"dateTime": local.isoformat(), "timeZone": "Asia/Seoul"}
+        end = {"dateTime": (local + timedelta(minutes=rng.choice([30, 60, 90]))).isoformat(), "timeZone": "Asia/Seoul"}
+    return {
+        "id": f"evt{index:06d}",
+        "status": "confirmed",
+        "summary": f"일정 {index}",
+        "description": "회의에서 정한 후속 일정입니다. " * rng.randint(1, 5),
+        "start": start,
+        "end": end,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--changes", type=int, default=30, help="events edited/cancelled/added between syncs")
+    parser.add_argument("--reads", type=int, default=200, help="GET /calendar/events repetitions per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    calendar = FakeCalendar()
+    api_url, server = start_fake_calendar(calendar)
+    for index in range(args.events):
+        calendar.put(random_event(rng, index))
+
+    workdir = tempfile.mkdtemp(prefix="bench_calendar_cache_")
+    os.environ["DATABASE_URL"] = os.path.join(workdir, "bench.db")
+    os.environ["GOOGLE_CALENDAR_API_URL"] = api_url
+    os.environ["CALENDAR_SYNC_MIN_INTERVAL"] = "0"
+
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    token = client.post(
+        "/auth/register",
+        json={"email": "calendar@bench.example", "password": "bench-password", "nickname": "calendar"},
+    ).get_json()["token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    failures: List[str] = []
+
+    def sync(label: str) -> Dict[str, Any]:
+        requests_before, bytes_before = calendar.requests, calendar.bytes_sent
+        started = time.perf_counter()
+        response = client.post("/calendar/sync", json={"access_token": "fake-access-token", "wait": True}, headers=auth)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            failures.append(f"{label}: sync returned {response.status_code} {response.get_data(as_text=True)[:200]}")
+            return {}
+        cached = client.get("/calendar/events?start=2000-01-01&end=2100-01-01", headers=auth).get_json()["events"]
+        expected = {key: {k: v for k, v in value.items() if k != "_seq"} for key, value in calendar.live().items()}
+        if {event["id"]: event for event in cached} != expected:
+            failures.append(f"{label}: cache has {len(cached)} events, calendar has {len(expected)}")
+        return {
+            **response.get_json()["sync"],
+            "wall_seconds": round(elapsed, 3),
+            "api_requests": calendar.requests - requests_before,
+            "api_bytes": calendar.bytes_sent - bytes_before,
+            "cached_events": len(cached),
+        }
+
+    def mutate(count: int) -> None:
+        ids = list(calendar.live())
+        for _ in range(count):
+            roll = rng.random()
+            if roll < 0.5:
+                event = dict(calendar.live()[rng.choice(ids)])
+                event["summary"] += " (변경)"
+                calendar.put(event)
+            elif roll < 0.75:
+                victim = rng.choice(ids)
+                if victim in calendar.live():
+                    calendar.cancel(victim)
+            else:
+                calendar.put(random_event(rng, len(calendar.events)))
+
+    def timed_reads(headers: Dict[str, str], expected_status: int) -> Dict[str, float]:
+        latencies = []
+        for _ in range(args.reads):
+            started = time.perf_counter()
+            response = client.get("/calendar/events?start=2025-11-10&end=2025-11-17", headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != expected_status:
+                failures.append(f"read: expected {expected_status}, got {response.status_code}")
+                break
+        latencies.sort()
+        return {
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        }
+
+    print(f"--- bench_calendar_cache: {args.events} events, {args.changes} changes per round ({api_url}) ---")
+    report: Dict[str, Any] = {"first_sync": sync("first sync")}
+    mutate(args.changes)
+    report["incremental_sync"] = sync("incremental sync")
+
+    first = client.get("/calendar/events?start=2025-11-10&end=2025-11-17", headers=auth)
+    etag = first.headers.get("ETag")
+    report["week_read"] = {
+        "events": len(first.get_json()["events"]),
+        "bytes": len(first.get_data()),
+        "etag": etag,
+        "full_200": timed_reads(auth, 200),
+        "conditional_304": timed_reads({**auth, "If-None-Match": etag}, 304),
+    }
+
+    mutate(args.changes)
+    report["second_incremental_sync"] = sync("second incremental sync")
+    after = client.get("/calendar/events?start=2025-11-10&end=2025-11-17", headers={**auth, "If-None-Match": etag})
+    report["etag_after_change"] = {"status": after.status_code, "etag": after.headers.get("ETag")}
+    if after.status_code != 200 or after.headers.get("ETag") == etag:
+        failures.append("ETag did not change after the calendar changed")
+
+    idle = sync("no-change sync")
+    report["no_change_sync"] = idle
+    if client.get("/calendar/events?start=2025-11-10&end=2025-11-17", headers={**auth, "If-None-Match": after.headers.get("ETag")}).status_code != 304:
+        failures.append("a sync without changes invalidated the ETag")
+
+    calendar.expire_tokens()
+    mutate(args.changes)
+    report["expired_token_sync"] = sync("expired token sync")
+    report["cache_stats"] = app.extensions["calendar_cache"].stats()
+
+    app.extensions["calendar_cache"].shutdown()
+    app.extensions["password_hasher"].shutdown()
+    app.extensions["db_pool"].close()
+    server.shutdown()
+
+    report["failures"] = failures
+    report["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "events": args.events,
+        "changes_per_round": args.changes,
+        "reads": args.reads,
+        "seed": args.seed,
+    }
+    print(json.dumps({key: value for key, value in report.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+    if failures:
+        print("❌ " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
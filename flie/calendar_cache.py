@@ -0,0 +1,374 @@
+"""Per-user cache of Google Calendar events, refreshed incrementally with sync tokens.
+
+Listing every event on each sign-in costs one ``events.list`` page per 250
+events and grows with the calendar. Instead, the first sync for a
+``(user, calendar)`` lists everything once and keeps ``nextSyncToken``. Every
+later sync sends that token and receives only the events created, changed or
+cancelled since then. If Google answers ``410 Gone`` (the token expired or was
+invalidated), the cache drops the calendar's rows and does one full listing
+again.
+
+Each sync that changes something bumps ``calendar_sync_state.version``.
+Range reads derive their ETag from that version and the requested range, so a
+conditional ``GET /calendar/events`` is answered with ``304`` from a single
+primary-key lookup, without reading any event rows.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+GOOGLE_CALENDAR_API = "https://www.googleapis.com/calendar/v3"
+CALENDAR_READ_SCOPE = "https://www.googleapis.com/auth/calendar.readonly"
+EVENT_FIELDS = (
+    "id", "status", "summary", "description", "location",
+    "start", "end", "updated", "htmlLink", "recurringEventId",
+)
+
+CALENDAR_CACHE_SQL = """
+CREATE TABLE IF NOT EXISTS calendar_events (
+    user_id INTEGER NOT NULL,
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_at TEXT NOT NULL,
+    end_at TEXT NOT NULL,
+    updated TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (user_id, calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_calendar_events_range
+    ON calendar_events (user_id, calendar_id, start_at);
+CREATE TABLE IF NOT EXISTS calendar_sync_state (
+    user_id INTEGER NOT NULL,
+    calendar_id TEXT NOT NULL,
+    sync_token TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    synced_at TEXT,
+    PRIMARY KEY (user_id, calendar_id)
+);
+"""
+
+
+class SyncTokenExpired(Exception):
+    """Google rejected the stored sync token (410); a full sync is required."""
+
+
+def to_utc(value: Dict[str, Any]) -> str:
+    """Normalises an event ``start``/``end`` to a sortable UTC timestamp string."""
+    if value.get("dateTime"):
+        parsed = datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if value.get("date"):
+        return f"{value['date']}T00:00:00Z"
+    raise ValueError("event time has neither dateTime nor date")
+
+
+def range_bound(value: str) -> str:
+    """Accepts ``YYYY-MM-DD`` or an ISO datetime and returns the same UTC form as :func:`to_utc`."""
+    if len(value) == 10:
+        return f"{date.fromisoformat(value).isoformat()}T00:00:00Z"
+    return to_utc({"dateTime": value})
+
+
+class GoogleCalendarClient:
+    """Minimal ``events.list`` client on one pooled ``httpx.Client``."""
+
+    def __init__(
+        self,
+        base_url: str = GOOGLE_CALENDAR_API,
+        timeout: float = 10.0,
+        max_connections: int = 16,
+        page_size: int = 250,
+        fetch_observer: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.fetch_observer = fetch_observer
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def list_pages(
+        self, access_token: str, calendar_id: str, sync_token: Optional[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields ``events.list`` pages until the one carrying ``nextSyncToken``."""
+        params: Dict[str, Any] = {"maxResults": self.page_size, "singleEvents": "true"}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            # Cancelled events only matter for incremental syncs.
+            params["showDeleted"] = "false"
+        url = f"{self.base_url}/calendars/{quote(calendar_id, safe='')}/events"
+        while True:
+            started = time.perf_counter()
+            response = self._client.get(
+                url, params=params, headers={"Authorization": f"Bearer {access_token}"}
+            )
+            if self.fetch_observer is not None:
+                self.fetch_observer(time.perf_counter() - started)
+            if response.status_code == 410:
+                raise SyncTokenExpired(response.text[:200])
+            response.raise_for_status()
+            page = response.json()
+            yield page
+            if not page.get("nextPageToken"):
+                return
+            params["pageToken"] = page["nextPageToken"]
+
+
+class CalendarCache:
+    """Keeps ``calendar_events`` in the app database in step with each user's calendar."""
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any],
+        client: GoogleCalendarClient,
+        min_interval: float = 30.0,
+        workers: int = 4,
+    ) -> None:
+        self._connection = connection_factory
+        self.client = client
+        self.min_interval = min_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-sync")
+        self._locks: Dict[Tuple[int, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._last_sync: Dict[Tuple[int, str], float] = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "full_syncs": 0,
+            "incremental_syncs": 0,
+            "skipped_syncs": 0,
+            "expired_tokens": 0,
+            "failed_syncs": 0,
+            "pages": 0,
+            "events_applied": 0,
+            "events_deleted": 0,
+        }
+
+    @staticmethod
+    def init_schema(conn: sqlite3.Connection) -> None:
+        conn.executescript(CALENDAR_CACHE_SQL)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    def _count(self, **amounts: int) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _lock_for(self, key: Tuple[int, str]) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    # -- sync ---------------------------------------------------------------
+
+    def sync(
+        self, user_id: int, access_token: str, calendar_id: str = "primary", force: bool = False
+    ) -> Dict[str, Any]:
+        """Brings the user's cached calendar up to date and reports what was fetched."""
+        key = (user_id, calendar_id)
+        with self._lock_for(key):
+            last = self._last_sync.get(key)
+            if not force and last is not None and time.monotonic() - last < self.min_interval:
+                self._count(skipped_syncs=1)
+                return {"mode": "skipped"}
+            started = time.perf_counter()
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT sync_token FROM calendar_sync_state WHERE user_id = ? AND calendar_id = ?",
+                    key,
+                ).fetchone()
+                sync_token = row["sync_token"] if row else None
+                try:
+                    try:
+                        report = self._fetch_and_apply(conn, user_id, access_token, calendar_id, sync_token)
+                    except SyncTokenExpired:
+                        self._count(expired_tokens=1)
+                        report = self._fetch_and_apply(conn, user_id, access_token, calendar_id, None)
+                except Exception:
+                    self._count(failed_syncs=1)
+                    raise
+            self._last_sync[key] = time.monotonic()
+        report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+    def sync_in_background(
+        self, user_id: int, access_token: str, calendar_id: str = "primary"
+    ) -> "Future[Dict[str, Any]]":
+        """Runs :meth:`sync` off the request thread so sign-in does not wait on Google."""
+        return self._executor.submit(self.sync, user_id, access_token, calendar_id)
+
+    def _fetch_and_apply(
+        self,
+        conn: sqlite3.Connection,
+        user_id: int,
+        access_token: str,
+        calendar_id: str,
+        sync_token: Optional[str],
+    ) -> Dict[str, Any]:
+        # Fetch everything first so the rows and the new token land in one transaction;
+        # a sync that fails half-way leaves the previous consistent state in place.
+        changed: List[Dict[str, Any]] = []
+        next_token = None
+        pages = 0
+        for page in self.client.list_pages(access_token, calendar_id, sync_token):
+            pages += 1
+            changed.extend(page.get("items") or [])
+            next_token = page.get("nextSyncToken") or next_token
+
+        full = sync_token is None
+        upserts = []
+        deletes = []
+        for item in changed:
+            if item.get("status") == "cancelled":
+                deletes.append((user_id, calendar_id, item["id"]))
+                continue
+            try:
+                start_at, end_at = to_utc(item["start"]), to_utc(item["end"])
+            except (KeyError, ValueError):
+                # An event we cannot place in time cannot be served from a range read either;
+                # dropping it keeps an older, parseable version from lingering in the cache.
+                deletes.append((user_id, calendar_id, item["id"]))
+                continue
+            payload = {name: item[name] for name in EVENT_FIELDS if name in item}
+            upserts.append(
+                (user_id, calendar_id, item["id"], start_at, end_at, item.get("updated"),
+                 json.dumps(payload, ensure_ascii=False))
+            )
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if full:
+                conn.execute(
+                    "DELETE FROM calendar_events WHERE user_id = ? AND calendar_id = ?",
+                    (user_id, calendar_id),
+                )
+            conn.executemany(
+                "DELETE FROM calendar_events WHERE user_id = ? AND calendar_id = ? AND event_id = ?",
+                deletes,
+            )
+            conn.executemany(
+                """
+                INSERT INTO calendar_events
+                    (user_id, calendar_id, event_id, start_at, end_at, updated, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id, calendar_id, event_id) DO UPDATE SET
+                    start_at = excluded.start_at,
+                    end_at = excluded.end_at,
+                    updated = excluded.updated,
+                    payload = excluded.payload
+                """,
+                upserts,
+            )
+            conn.execute(
+                """
+                INSERT INTO calendar_sync_state (user_id, calendar_id, sync_token, version, synced_at)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(user_id, calendar_id) DO UPDATE SET
+                    sync_token = excluded.sync_token,
+                    version = version + ?,
+                    synced_at = excluded.synced_at
+                """,
+                (user_id, calendar_id, next_token, datetime.utcnow().isoformat(),
+                 1 if (full or changed) else 0),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        self._count(
+            pages=pages,
+            events_applied=len(upserts),
+            events_deleted=len(deletes),
+            **{"full_syncs" if full else "incremental_syncs": 1},
+        )
+        return {
+            "mode": "full" if full else "incremental",
+            "pages": pages,
+            "changes": len(changed),
+            "upserted": len(upserts),
+            "deleted": len(deletes),
+        }
+
+    # -- reads --------------------------------------------------------------
+
+    @staticmethod
+    def etag(conn: sqlite3.Connection, user_id: int, calendar_id: str, start: str, end: str) -> Optional[str]:
+        """Strong ETag value (unquoted) for a range; ``None`` until the calendar has been synced once."""
+        row = conn.execute(
+            "SELECT version FROM calendar_sync_state WHERE user_id = ? AND calendar_id = ?",
+            (user_id, calendar_id),
+        ).fetchone()
+        if row is None:
+            return None
+        digest = hashlib.sha256(f"{calendar_id}|{start}|{end}".encode("utf-8")).hexdigest()[:16]
+        return f"{row['version']}-{digest}"
+
+    @staticmethod
+    def read_snapshot(
+        conn: sqlite3.Connection,
+        user_id: int,
+        calendar_id: str,
+        start: str,
+        end: str,
+        not_modified: Callable[[str], bool],
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """ETag and events for a range from one read transaction, so a concurrent sync cannot
+        land between them and pair a body with another version's ETag.
+
+        Returns ``(etag, body)``; ``body`` is ``None`` when the calendar was never synced or
+        ``not_modified(etag)`` says the client already has this version.
+        """
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        try:
+            etag = CalendarCache.etag(conn, user_id, calendar_id, start, end)
+            if etag is None or not_modified(etag):
+                return etag, None
+            return etag, CalendarCache.read_range(conn, user_id, calendar_id, start, end)
+        finally:
+            conn.commit()
+
+    @staticmethod
+    def read_range(
+        conn: sqlite3.Connection, user_id: int, calendar_id: str, start: str, end: str
+    ) -> Dict[str, Any]:
+        """Events overlapping ``[start, end)`` (UTC strings from :func:`range_bound`), by start time."""
+        rows = conn.execute(
+            """
+            SELECT payload FROM calendar_events
+            WHERE user_id = ? AND calendar_id = ? AND start_at < ? AND end_at > ?
+            ORDER BY start_at, event_id
+            """,
+            (user_id, calendar_id, end, start),
+        ).fetchall()
+        state = conn.execute(
+            "SELECT synced_at FROM calendar_sync_state WHERE user_id = ? AND calendar_id = ?",
+            (user_id, calendar_id),
+        ).fetchone()
+        return {
+            "calendar_id": calendar_id,
+            "events": [json.loads(row["payload"]) for row in rows],
+            "synced_at": state["synced_at"] if state else None,
+        }
@@ -0,0 +1,367 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+LOCKED_MESSAGES = ("database is locked", "database table is locked")
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    return isinstance(exc, sqlite3.OperationalError) and any(
+        message in str(exc) for message in LOCKED_MESSAGES
+    )
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.created = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.lock_retries = 0
+        self.lock_failures = 0
+        self.lock_wait_seconds = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            average = self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "created": self.created,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(average, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "timeouts": self.timeouts,
+                "lock_retries": self.lock_retries,
+                "lock_failures": self.lock_failures,
+                "lock_wait_seconds": round(self.lock_wait_seconds, 6),
+            }
+
+
+def _run_with_lock_retry(conn: "PooledConnection", call: Callable[[], Any]) -> Any:
+    """Runs ``call`` and retries it while SQLite reports a lock, up to ``conn.lock_timeout`` in total.
+
+    Each attempt blocks in SQLite's own busy handler for at most the short
+    per-connection ``busy_timeout`` slice, so the whole statement is bounded by
+    ``lock_timeout`` and every second spent waiting on a lock (busy waits that
+    ended in ``database is locked`` plus the backoff sleeps) lands in
+    ``lock_wait_seconds``.
+    """
+    metrics = conn.metrics
+    started = time.perf_counter()
+    deadline = started + conn.lock_timeout
+    attempt = 0
+    try:
+        while True:
+            attempt_started = time.perf_counter()
+            try:
+                return call()
+            except sqlite3.OperationalError as exc:
+                if not is_lock_error(exc):
+                    raise
+                now = time.perf_counter()
+                waited = now - attempt_started
+                backoff = min(conn.lock_retry_backoff * (2 ** attempt), 0.2, max(0.0, deadline - now))
+                if metrics is not None:
+                    metrics.incr("lock_wait_seconds", waited + backoff)
+                if now + backoff >= deadline:
+                    if metrics is not None:
+                        metrics.incr("lock_failures")
+                    raise
+                attempt += 1
+                if metrics is not None:
+                    metrics.incr("lock_retries")
+                time.sleep(backoff)
+    finally:
+        if conn.observer is not None:
+            conn.observer(time.perf_counter() - started)
+
+
+class PooledCursor(sqlite3.Cursor):
+    """Cursor whose ``execute``/``executemany`` share the connection's lock retry."""
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:  # type: ignore[override]
+        return _run_with_lock_retry(self.connection, lambda: super(PooledCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:  # type: ignore[override]
+        # Materialise generators so a retry sees the same rows again.
+        rows = seq_of_parameters if isinstance(seq_of_parameters, (list, tuple)) else list(seq_of_parameters)
+        return _run_with_lock_retry(self.connection, lambda: super(PooledCursor, self).executemany(sql, rows))
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements retry on `database is locked` within ``lock_timeout``.
+
+    ``executescript`` is not retried: a script commits first and may have
+    applied some statements before the lock, so it is only used for schema setup.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+    observer: Optional[Callable[[float], None]] = None
+    lock_timeout = 5.0
+    lock_retry_backoff = 0.01
+
+    def cursor(self, factory: Any = PooledCursor) -> sqlite3.Cursor:  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class SQLitePool:
+    """Bounded pool of WAL-mode SQLite connections shared by the app's worker threads.
+
+    Connections are opened lazily up to ``max_size`` and reused afterwards, so the
+    per-connection statement cache (``cached_statements``) keeps prepared
+    statements warm across requests.
+
+    ``busy_timeout_ms`` is the total time one statement may wait for a lock.
+    SQLite's busy handler only gets ``lock_slice_ms`` of it per attempt; the rest
+    is spent in :class:`PooledConnection`'s retry loop, where it is measured.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        max_size: int = 8,
+        timeout: float = 5.0,
+        busy_timeout_ms: int = 5000,
+        lock_slice_ms: int = 100,
+        synchronous: str = "NORMAL",
+        mmap_size: int = 64 * 1024 * 1024,
+        cache_size_kib: int = 16 * 1024,
+        cached_statements: int = 256,
+        statement_observer: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.database_path = database_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock_slice_ms = max(1, min(lock_slice_ms, busy_timeout_ms))
+        self.synchronous = synchronous.upper()
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.cached_statements = cached_statements
+        self.statement_observer = statement_observer
+        self.metrics = PoolMetrics()
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._closed = False
+
+    def connect_kwargs(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.lock_slice_ms / 1000,
+            "check_same_thread": False,
+            "cached_statements": self.cached_statements,
+            "factory": PooledConnection,
+        }
+
+    def pragmas(self) -> List[str]:
+        return [
+            "PRAGMA journal_mode=WAL",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA busy_timeout={int(self.lock_slice_ms)}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            # A negative cache_size is interpreted by SQLite as KiB rather than pages.
+            f"PRAGMA cache_size=-{int(self.cache_size_kib)}",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA foreign_keys=ON",
+        ]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database_path, **self.connect_kwargs())
+        conn.metrics = self.metrics
+        conn.observer = self.statement_observer
+        conn.lock_timeout = self.busy_timeout_ms / 1000
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas():
+            conn.execute(pragma)
+        self.metrics.incr("created")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._size_lock:
+                if self._size < self.max_size:
+                    self._size += 1
+                    grow = True
+                else:
+                    grow = False
+            if grow:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._size_lock:
+                        self._size -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    self.metrics.incr("timeouts")
+                    raise TimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a database connection."
+                    ) from None
+
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._size_lock:
+            size = self._size
+        idle = self._idle.qsize()
+        return {
+            "database_path": self.database_path,
+            "max_size": self.max_size,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            **self.metrics.snapshot(),
+        }
+
+
+class AsyncSQLitePool(SQLitePool):
+    """asyncio counterpart of :class:`SQLitePool` built on ``aiosqlite``.
+
+    Each pooled ``aiosqlite`` connection owns a worker thread, so up to
+    ``max_size`` queries run concurrently without blocking the event loop.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._async_idle: Optional["asyncio.LifoQueue[Any]"] = None
+
+    async def _connect_async(self) -> Any:
+        import aiosqlite
+
+        conn = await aiosqlite.connect(self.database_path, **self.connect_kwargs())
+        conn.row_factory = sqlite3.Row
+        # The wrapped sqlite3 connection is a PooledConnection running on aiosqlite's thread.
+        raw = conn._conn
+        raw.metrics = self.metrics
+        raw.observer = self.statement_observer
+        raw.lock_timeout = self.busy_timeout_ms / 1000
+        for pragma in self.pragmas():
+            await conn.execute(pragma)
+        self.metrics.incr("created")
+        return conn
+
+    async def acquire_async(self) -> Any:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        if self._async_idle is None:
+            self._async_idle = asyncio.LifoQueue()
+
+        started = time.perf_counter()
+        if self._async_idle.empty() and self._size < self.max_size:
+            self._size += 1
+            try:
+                conn = await self._connect_async()
+            except Exception:
+                self._size -= 1
+                raise
+        else:
+            try:
+                conn = await asyncio.wait_for(self._async_idle.get(), self.timeout)
+            except asyncio.TimeoutError:
+                self.metrics.incr("timeouts")
+                raise TimeoutError(
+                    f"Timed out after {self.timeout}s waiting for a database connection."
+                ) from None
+
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return conn
+
+    async def release_async(self, conn: Any) -> None:
+        if conn.in_transaction:
+            await conn.rollback()
+        if self._closed or self._async_idle is None:
+            await conn.close()
+            return
+        self._async_idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def connection_async(self) -> AsyncIterator[Any]:
+        conn = await self.acquire_async()
+        try:
+            yield conn
+        finally:
+            await self.release_async(conn)
+
+    async def run_sync(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Calls ``func(conn, *args, **kwargs)`` with a pooled connection's plain ``sqlite3`` handle.
+
+        The call runs on that connection's ``aiosqlite`` thread, so the
+        synchronous helpers ``app.py`` uses (sync engine, calendar cache, user
+        import) serve the ASGI app unchanged without blocking the event loop.
+        """
+        async with self.connection_async() as conn:
+            return await conn._execute(func, conn._conn, *args, **kwargs)
+
+    async def close_async(self) -> None:
+        self._closed = True
+        while self._async_idle is not None and not self._async_idle.empty():
+            conn = self._async_idle.get_nowait()
+            await conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        if self._async_idle is not None:
+            stats["idle"] = self._async_idle.qsize()
+            stats["in_use"] = stats["size"] - stats["idle"]
+        return stats
@@ -0,0 +1,188 @@
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import requests
+from google.auth import jwt as google_jwt
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+def parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    if not cache_control:
+        return None
+    directives = cache_control.lower()
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    match = _MAX_AGE_RE.search(directives)
+    return int(match.group(1)) if match else None
+
+
+class GoogleCertCache:
+    """Keeps Google's ID-token signing certificates in memory.
+
+    Certificates are fetched over one shared keep-alive ``requests.Session`` and
+    reused until the ``Cache-Control: max-age`` of the last response runs out, so
+    verifying an ID token is normally a local signature check. A token signed
+    with an unknown key id forces one early refresh to pick up key rotation.
+    """
+
+    def __init__(
+        self,
+        certs_url: str = GOOGLE_CERTS_URL,
+        session: Optional[requests.Session] = None,
+        default_ttl: int = 300,
+        min_refresh_interval: int = 30,
+        timeout: float = 5.0,
+        clock_skew_in_seconds: int = 10,
+        fetch_observer: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.certs_url = certs_url
+        self.session = session or requests.Session()
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.clock_skew_in_seconds = clock_skew_in_seconds
+        self.fetch_observer = fetch_observer
+
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def _store(self, certs: Any, cache_control: Optional[str]) -> None:
+        if not isinstance(certs, dict) or not certs:
+            raise ValueError(f"Unexpected certificate payload from {self.certs_url}")
+
+        max_age = parse_max_age(cache_control)
+        ttl = self.default_ttl if max_age is None else max_age
+        now = time.time()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + ttl
+        self.fetches += 1
+
+    def _needs_refresh(self, force_refresh: bool) -> bool:
+        now = time.time()
+        if force_refresh:
+            # Avoid hammering the endpoint with tokens carrying bogus key ids.
+            return now - self._fetched_at >= self.min_refresh_interval
+        return not self._certs or now >= self._expires_at
+
+    def _decode(
+        self, token: str, certs: Mapping[str, str], audience: Optional[str]
+    ) -> Mapping[str, Any]:
+        claims = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=self.clock_skew_in_seconds,
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(
+                f"Wrong issuer. 'iss' should be one of the following: {GOOGLE_ISSUERS}"
+            )
+        return claims
+
+    def _observe_fetch(self, started: float) -> None:
+        if self.fetch_observer is not None:
+            self.fetch_observer(time.perf_counter() - started)
+
+    def _refresh(self) -> None:
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.certs_url, timeout=self.timeout)
+        finally:
+            self._observe_fetch(started)
+        response.raise_for_status()
+        self._store(response.json(), response.headers.get("Cache-Control"))
+
+    def get_certs(self, force_refresh: bool = False) -> Mapping[str, str]:
+        with self._lock:
+            if self._needs_refresh(force_refresh):
+                self._refresh()
+            elif not force_refresh:
+                self.hits += 1
+            return self._certs
+
+    def verify_oauth2_token(
+        self, token: str, audience: Optional[str] = None
+    ) -> Mapping[str, Any]:
+        """Drop-in replacement for ``google.oauth2.id_token.verify_oauth2_token``."""
+        kid = google_jwt.decode_header(token).get("kid")
+        certs = self.get_certs()
+        if kid and kid not in certs:
+            certs = self.get_certs(force_refresh=True)
+
+        return self._decode(token, certs, audience)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "certs_url": self.certs_url,
+                "keys": len(self._certs),
+                "fetches": self.fetches,
+                "hits": self.hits,
+                "expires_in": max(0, round(self._expires_at - time.time())),
+            }
+
+
+class AsyncGoogleCertCache(GoogleCertCache):
+    """asyncio flavour of :class:`GoogleCertCache` backed by ``httpx.AsyncClient``.
+
+    Concurrent verifications that find the cache stale share a single fetch.
+    """
+
+    def __init__(self, *args: Any, client: Any = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.client = client
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    def _get_client(self) -> Any:
+        if self.client is None:
+            import httpx
+
+            self.client = httpx.AsyncClient(timeout=self.timeout)
+        return self.client
+
+    async def _refresh_async(self) -> None:
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(self.certs_url)
+        finally:
+            self._observe_fetch(started)
+        response.raise_for_status()
+        self._store(response.json(), response.headers.get("Cache-Control"))
+
+    async def get_certs_async(self, force_refresh: bool = False) -> Mapping[str, str]:
+        if not self._needs_refresh(force_refresh):
+            if not force_refresh:
+                self.hits += 1
+            return self._certs
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self._needs_refresh(force_refresh):
+                await self._refresh_async()
+            return self._certs
+
+    async def verify_oauth2_token_async(
+        self, token: str, audience: Optional[str] = None
+    ) -> Mapping[str, Any]:
+        kid = google_jwt.decode_header(token).get("kid")
+        certs = await self.get_certs_async()
+        if kid and kid not in certs:
+            certs = await self.get_certs_async(force_refresh=True)
+        return self._decode(token, certs, audience)
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
@@ -0,0 +1,307 @@
+"""Load test comparing the Flask (``app.py``) and ASGI (``asgi_app.py``) servers.
+
+Both servers are pointed at a local stub of Google's token and certificate
+endpoints that answers after ``--token-delay`` seconds, and each virtual user
+runs the full ``/auth/google/login`` -> ``/auth/google/callback`` handshake.
+Servers run in their own subprocesses so they do not share a GIL with the
+load generator::
+
+    python loadtest_oauth.py --handshakes 2000 --concurrency 500 --token-delay 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLIENT_ID = "loadtest-client"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start within {timeout}s")
+
+
+# ----------------------------------------------------
+# Stub Google endpoints
+# ----------------------------------------------------
+
+def serve_stub(port: int, token_delay: float) -> None:
+    import datetime as dt
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    from google.auth import crypt
+    from google.auth import jwt as google_jwt
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    from quart import Quart, jsonify, request
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "loadtest-stub")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(minutes=5))
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    certs = {"stub-key": cert.public_bytes(serialization.Encoding.PEM).decode()}
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    signer = crypt.RSASigner.from_string(private_pem, key_id="stub-key")
+
+    stub = Quart(__name__)
+
+    @stub.get("/certs")
+    async def get_certs():
+        response = jsonify(certs)
+        response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+    @stub.post("/token")
+    async def exchange_code():
+        form = await request.form
+        code = form.get("code", "anonymous")
+        await asyncio.sleep(token_delay)
+        issued_at = int(time.time())
+        id_token = google_jwt.encode(
+            signer,
+            {
+                "iss": "https://accounts.google.com",
+                "aud": CLIENT_ID,
+                "sub": f"google-{code}",
+                "email": f"{code}@loadtest.example",
+                "name": f"user {code}",
+                "iat": issued_at,
+                "exp": issued_at + 3600,
+            },
+        ).decode()
+        return jsonify(
+            {
+                "access_token": f"access-{code}",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "id_token": id_token,
+            }
+        )
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.accesslog = None
+    config.backlog = 4096
+    asyncio.run(serve(stub, config))
+
+
+# ----------------------------------------------------
+# Servers under test
+# ----------------------------------------------------
+
+def serve_flask(port: int, threads: int) -> None:
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+    from app import create_app
+
+    executor = ThreadPoolExecutor(max_workers=threads)
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):  # type: ignore[override]
+            pass
+
+    class PooledWSGIServer(BaseWSGIServer):
+        # Fixed worker threads, like gunicorn's gthread worker.
+        request_queue_size = 4096
+
+        def process_request(self, req, client_address):  # type: ignore[override]
+            executor.submit(self._handle, req, client_address)
+
+        def _handle(self, req, client_address):
+            try:
+                self.finish_request(req, client_address)
+            except Exception:  # noqa: BLE001
+                self.handle_error(req, client_address)
+            finally:
+                self.shutdown_request(req)
+
+    PooledWSGIServer("127.0.0.1", port, create_app(), handler=QuietHandler).serve_forever()
+
+
+def serve_asgi(port: int) -> None:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    from asgi_app import create_app
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.accesslog = None
+    config.backlog = 4096
+    asyncio.run(serve(create_app(), config))
+
+
+# ----------------------------------------------------
+# Load generator
+# ----------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def drive(base_url: str, handshakes: int, concurrency: int) -> Dict[str, Any]:
+    import httpx
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency * 2)
+
+    async def handshake(index: int) -> None:
+        async with semaphore:
+            async with httpx.AsyncClient(
+                base_url=base_url, timeout=60.0, limits=limits
+            ) as client:
+                started = time.perf_counter()
+                try:
+                    login = await client.get("/auth/google/login", params={"format": "json"})
+                    login.raise_for_status()
+                    state = login.json()["state"]
+                    callback = await client.get(
+                        "/auth/google/callback",
+                        params={"state": state, "code": f"u{index}", "format": "json"},
+                    )
+                    if callback.status_code != 200:
+                        key = f"http_{callback.status_code}"
+                        errors[key] = errors.get(key, 0) + 1
+                        return
+                except httpx.HTTPError as exc:
+                    key = type(exc).__name__
+                    errors[key] = errors.get(key, 0) + 1
+                    return
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handshake(index) for index in range(handshakes)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "handshakes": handshakes,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        },
+    }
+
+
+def spawn(mode: str, port: int, env: Dict[str, str], extra: List[str]) -> subprocess.Popen:
+    command = [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port), *extra]
+    return subprocess.Popen(command, cwd=HERE, env=env)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handshakes", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.3,
+                        help="seconds the stub token endpoint waits before answering")
+    parser.add_argument("--flask-threads", type=int, default=32)
+    parser.add_argument("--servers", default="flask,asgi")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--serve", choices=["stub", "flask", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve == "stub":
+        serve_stub(args.port, args.token_delay)
+        return
+    if args.serve == "flask":
+        serve_flask(args.port, args.flask_threads)
+        return
+    if args.serve == "asgi":
+        serve_asgi(args.port)
+        return
+
+    stub_port = free_port()
+    workdir = tempfile.mkdtemp(prefix="loadtest_oauth_")
+    stub = spawn("stub", stub_port, dict(os.environ), ["--token-delay", str(args.token_delay)])
+    report: Dict[str, Any] = {"token_delay_seconds": args.token_delay, "servers": {}}
+    try:
+        wait_for_port(stub_port)
+        for mode in [name.strip() for name in args.servers.split(",") if name.strip()]:
+            port = free_port()
+            env = dict(os.environ)
+            env.update(
+                {
+                    "DATABASE_URL": os.path.join(workdir, f"{mode}.db"),
+                    "GOOGLE_CLIENT_ID": CLIENT_ID,
+                    "GOOGLE_CLIENT_SECRET": "loadtest-secret",
+                    "GOOGLE_TOKEN_URI": f"http://127.0.0.1:{stub_port}/token",
+                    "GOOGLE_CERTS_URL": f"http://127.0.0.1:{stub_port}/certs",
+                    "GOOGLE_REDIRECT_URI": f"http://127.0.0.1:{port}/auth/google/callback",
+                    "OAUTHLIB_INSECURE_TRANSPORT": "1",
+                }
+            )
+            server = spawn(mode, port, env, ["--flask-threads", str(args.flask_threads)])
+            try:
+                wait_for_port(port)
+                print(f"▶ {mode}: {args.handshakes} handshakes, concurrency {args.concurrency}")
+                result = asyncio.run(
+                    drive(f"http://127.0.0.1:{port}", args.handshakes, args.concurrency)
+                )
+                report["servers"][mode] = result
+                print(json.dumps(result, indent=2))
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+    finally:
+        stub.terminate()
+        stub.wait(timeout=10)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HasherBusy(Exception):
+    """Raised when the KDF queue is full or a hash timed out; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Password hasher is saturated, retry after {retry_after}s.")
+        self.retry_after = retry_after
+
+
+def _hash_password(password: str, method: str) -> str:
+    return generate_password_hash(password, method=method)
+
+
+def _verify_password(password_hash: str, password: str) -> bool:
+    return check_password_hash(password_hash, password)
+
+
+def hash_params(password_hash: str) -> str:
+    return password_hash.split("$", 1)[0]
+
+
+class PasswordHasher:
+    """Runs werkzeug's password KDF in a bounded process pool.
+
+    At most ``workers + queue_size`` hashes are admitted at once; anything beyond
+    that is rejected immediately with :class:`HasherBusy` instead of piling up
+    behind the pool. With ``workers=0`` hashing happens inline on the caller's
+    thread, which is handy for local development.
+    """
+
+    def __init__(
+        self,
+        method: str = "scrypt",
+        workers: int = 2,
+        queue_size: int = 8,
+        timeout: float = 10.0,
+    ) -> None:
+        self.method = method
+        self.workers = max(0, workers)
+        self.timeout = timeout
+        self.capacity = max(1, self.workers + max(0, queue_size))
+
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._avg_seconds = 0.05
+        self._stats_lock = threading.Lock()
+        # Normalise e.g. "scrypt" to "scrypt:32768:8:1" so stored hashes can be compared.
+        self.params = hash_params(generate_password_hash("", method=method))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _retry_after(self) -> int:
+        with self._stats_lock:
+            average = self._avg_seconds
+        return max(1, math.ceil(self.capacity * average / max(1, self.workers)))
+
+    def _record(self, elapsed: float) -> None:
+        with self._stats_lock:
+            self._avg_seconds = self._avg_seconds * 0.9 + elapsed * 0.1
+
+    def _release_slot(self, future: "Future[object] | asyncio.Future[object]") -> None:
+        # Called when the job really finishes, not when the caller stops waiting,
+        # so a timed-out hash keeps its slot while it still occupies a worker.
+        if not future.cancelled():
+            future.exception()
+        self._slots.release()
+
+    def _submit(self, func: Callable[..., object], *args: str) -> Future:
+        try:
+            future: Future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _run(self, func: Callable[..., object], *args: str) -> object:
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy(self._retry_after())
+
+        started = time.perf_counter()
+        if self.workers == 0:
+            try:
+                result = func(*args)
+            finally:
+                self._slots.release()
+        else:
+            future = self._submit(func, *args)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                raise HasherBusy(self._retry_after()) from None
+
+        self._record(time.perf_counter() - started)
+        return result
+
+    async def _run_async(self, func: Callable[..., object], *args: str) -> object:
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy(self._retry_after())
+
+        started = time.perf_counter()
+        if self.workers == 0:
+            pending = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            pending.add_done_callback(self._release_slot)
+        else:
+            pending = asyncio.wrap_future(self._submit(func, *args))
+        try:
+            # shield: a timeout or a cancelled request must not cancel the job the slot is tied to.
+            result = await asyncio.wait_for(asyncio.shield(pending), self.timeout)
+        except asyncio.TimeoutError:
+            raise HasherBusy(self._retry_after()) from None
+
+        self._record(time.perf_counter() - started)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash_password, password, self.method)  # type: ignore[return-value]
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return bool(self._run(_verify_password, password_hash, password))
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash_password, password, self.method)  # type: ignore[return-value]
+
+    async def verify_async(self, password_hash: str, password: str) -> bool:
+        return bool(await self._run_async(_verify_password, password_hash, password))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return hash_params(password_hash) != self.params
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
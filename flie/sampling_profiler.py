@@ -0,0 +1,91 @@
+"""Low-overhead sampling profiler that can be switched on and off at runtime.
+
+A daemon thread snapshots every thread's Python stack with
+``sys._current_frames()`` at a fixed interval and counts identical stacks. The
+result is exported in the "collapsed stack" format understood by
+``flamegraph.pl`` and speedscope.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+MIN_INTERVAL = 0.001
+MAX_INTERVAL = 1.0
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_depth: int = 64) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self._stacks: "Counter[str]" = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if self.running:
+            return
+        if interval:
+            self.interval = min(MAX_INTERVAL, max(MIN_INTERVAL, interval))
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            collapsed: List[str] = []
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                stack: List[str] = []
+                depth = 0
+                while frame is not None and depth < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                    depth += 1
+                collapsed.append(";".join(reversed(stack)))
+            with self._lock:
+                self._stacks.update(collapsed)
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        with self._lock:
+            items = self._stacks.most_common()
+        return "\n".join(f"{stack} {count}" for stack, count in items) + "\n"
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            distinct = len(self._stacks)
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "distinct_stacks": distinct,
+            "started_at": self.started_at,
+        }
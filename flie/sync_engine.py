@@ -0,0 +1,617 @@
+"""Incremental two-way sync of schedules between local SQLite replicas and the server.
+
+Every schedule row carries a globally unique ``uid`` (generated by whichever
+replica created it), a Lamport ``version`` and the ``origin`` replica that wrote
+that version. Deletes are tombstones (``deleted = 1``) so they travel like any
+other change.
+
+Server
+    ``sync_schedules`` stamps each accepted write with a monotonically
+    increasing ``seq``. ``GET /sync/pull?cursor=<seq>`` pages through a user's
+    rows with ``seq > cursor``; ``POST /sync/push`` applies a batch of client
+    changes in one ``BEGIN IMMEDIATE`` transaction.
+
+Conflicts
+    Last writer wins on ``(version, origin)``. Every replica applies the same
+    rule, so all replicas converge whichever order changes arrive in. A rejected
+    push returns the winning server row for the client to adopt. Pushing the
+    same ``(version, origin)`` twice is a no-op, so retrying after a lost
+    response is safe.
+
+Client
+    :class:`LocalReplica` keeps the same rows in its own SQLite file, with a
+    ``dirty`` flag for unpushed edits and the pull cursor in ``sync_meta``.
+    :class:`SyncClient` pushes dirty rows and then pulls, in batches, with
+    gzip-compressed bodies, retrying transport failures with backoff. The pull
+    cursor is committed together with the rows it covers, so an interrupted
+    sync resumes where it stopped.
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SYNC_FIELDS = ("schedule_date", "start_time", "title", "content")
+MAX_PUSH_BATCH = 500
+MAX_PULL_LIMIT = 1000
+DEFAULT_PULL_LIMIT = 500
+GZIP_MIN_BYTES = 1024
+# Upper bound for a sync body after decompression; a few KB of gzip can otherwise
+# expand to gigabytes inside a request thread.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_UID_LENGTH = 64
+
+SERVER_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS sync_schedules (
+    uid TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    schedule_date TEXT,
+    start_time TEXT,
+    title TEXT,
+    content TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL,
+    origin TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_schedules_seq ON sync_schedules (seq);
+CREATE INDEX IF NOT EXISTS idx_sync_schedules_user_seq ON sync_schedules (user_id, seq);
+"""
+
+REPLICA_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS local_schedules (
+    uid TEXT PRIMARY KEY,
+    schedule_date TEXT,
+    start_time TEXT,
+    title TEXT,
+    content TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL,
+    origin TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_local_schedules_dirty ON local_schedules (dirty) WHERE dirty = 1;
+CREATE TABLE IF NOT EXISTS sync_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+Change = Dict[str, Any]
+# (version, origin); the larger key wins.
+VersionKey = Tuple[int, str]
+
+
+def version_key(row: Any) -> VersionKey:
+    return (int(row["version"]), str(row["origin"]))
+
+
+def row_to_change(row: Any) -> Change:
+    change = {"uid": row["uid"], "deleted": bool(row["deleted"])}
+    for field in SYNC_FIELDS + ("version", "origin", "updated_at"):
+        change[field] = row[field]
+    return change
+
+
+def validate_change(raw: Any) -> Change:
+    """Normalises one pushed change; raises ``ValueError`` on malformed input."""
+    if not isinstance(raw, dict):
+        raise ValueError("change must be a JSON object")
+    uid = raw.get("uid")
+    if not isinstance(uid, str) or not uid or len(uid) > MAX_UID_LENGTH:
+        raise ValueError("uid must be a non-empty string")
+    version = raw.get("version")
+    if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+        raise ValueError(f"{uid}: version must be a positive integer")
+    origin = raw.get("origin")
+    if not isinstance(origin, str) or not origin:
+        raise ValueError(f"{uid}: origin is required")
+    change: Change = {
+        "uid": uid,
+        "version": version,
+        "origin": origin,
+        "deleted": bool(raw.get("deleted", False)),
+        "updated_at": str(raw.get("updated_at") or datetime.utcnow().isoformat()),
+    }
+    for field in SYNC_FIELDS:
+        value = raw.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"{uid}: {field} must be a string")
+        change[field] = value
+    return change
+
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+
+
+def encode_body(payload: Any, compress: bool) -> Tuple[bytes, Optional[str]]:
+    """Serialises ``payload``; gzips it when asked and worth it. Returns (body, encoding)."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if compress and len(body) >= GZIP_MIN_BYTES:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
+
+
+class BodyTooLarge(ValueError):
+    """The (decompressed) body is larger than ``MAX_BODY_BYTES``."""
+
+
+def decode_body(body: bytes, encoding: Optional[str], max_size: int = MAX_BODY_BYTES) -> Any:
+    """Parses a JSON body, gunzipping it first if needed, without ever producing more than ``max_size`` bytes."""
+    if encoding and encoding.lower() == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            decoded = decompressor.decompress(body, max_size + 1)
+        except zlib.error as exc:
+            raise ValueError(f"invalid gzip body: {exc}") from None
+        if len(decoded) > max_size:
+            raise BodyTooLarge(f"decompressed body exceeds {max_size} bytes")
+        if not decompressor.eof or decompressor.unused_data:
+            raise ValueError("truncated or trailing data in gzip body")
+        body = decoded
+    elif len(body) > max_size:
+        raise BodyTooLarge(f"body exceeds {max_size} bytes")
+    return json.loads(body.decode("utf-8")) if body else None
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    return "gzip" in (accept_encoding or "").lower()
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+def init_server_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(SERVER_SCHEMA_SQL)
+
+
+def pull_changes(
+    conn: sqlite3.Connection,
+    user_id: int,
+    cursor: int,
+    limit: int = DEFAULT_PULL_LIMIT,
+    exclude_origin: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Returns the user's rows changed after ``cursor`` in ``seq`` order, one page at a time.
+
+    ``exclude_origin`` leaves out rows whose current version the caller wrote
+    itself (it already has them), but the cursor still moves past them.
+    """
+    limit = max(1, min(limit, MAX_PULL_LIMIT))
+    sql = "SELECT * FROM sync_schedules WHERE user_id = ? AND seq > ?"
+    params: List[Any] = [user_id, cursor]
+    if exclude_origin:
+        sql += " AND origin != ?"
+        params.append(exclude_origin)
+    # One read transaction, so the last-page cursor below matches the rows returned.
+    conn.execute("BEGIN")
+    try:
+        rows = conn.execute(sql + " ORDER BY seq LIMIT ?", (*params, limit + 1)).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if has_more:
+            next_cursor = rows[-1]["seq"]
+        else:
+            latest = conn.execute(
+                "SELECT MAX(seq) FROM sync_schedules WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+            next_cursor = max(cursor, latest or 0)
+    finally:
+        conn.rollback()
+    return {
+        "changes": [row_to_change(row) for row in rows],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+def apply_push(conn: sqlite3.Connection, user_id: int, changes: Sequence[Change]) -> Dict[str, Any]:
+    """Applies validated client ``changes`` for ``user_id`` in one transaction.
+
+    Returns ``applied`` (uids now stored with the pushed version, including
+    re-pushes of an identical version) and ``conflicts`` (the server rows that
+    beat the pushed version and should replace the client's copy).
+    """
+    applied: List[str] = []
+    conflicts: List[Change] = []
+    rejected: List[Dict[str, str]] = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        uids = [change["uid"] for change in changes]
+        existing: Dict[str, sqlite3.Row] = {}
+        for start in range(0, len(uids), 500):
+            chunk = uids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT * FROM sync_schedules WHERE uid IN ({placeholders})", chunk
+            ):
+                existing[row["uid"]] = row
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sync_schedules").fetchone()[0]
+
+        winners: List[Tuple[Any, ...]] = []
+        for change in changes:
+            current = existing.get(change["uid"])
+            if current is not None and current["user_id"] != user_id:
+                rejected.append({"uid": change["uid"], "error": "uid belongs to another user"})
+                continue
+            if current is not None:
+                if version_key(change) == version_key(current):
+                    applied.append(change["uid"])
+                    continue
+                if version_key(change) < version_key(current):
+                    conflicts.append(row_to_change(current))
+                    continue
+            seq += 1
+            winners.append(
+                (
+                    change["uid"],
+                    user_id,
+                    *(change[field] for field in SYNC_FIELDS),
+                    int(change["deleted"]),
+                    change["version"],
+                    change["origin"],
+                    change["updated_at"],
+                    seq,
+                )
+            )
+            # A later change for the same uid in this batch competes with this one.
+            existing[change["uid"]] = {**change, "user_id": user_id}  # type: ignore[assignment]
+            applied.append(change["uid"])
+
+        conn.executemany(
+            """
+            INSERT INTO sync_schedules
+                (uid, user_id, schedule_date, start_time, title, content,
+                 deleted, version, origin, updated_at, seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(uid) DO UPDATE SET
+                schedule_date = excluded.schedule_date,
+                start_time = excluded.start_time,
+                title = excluded.title,
+                content = excluded.content,
+                deleted = excluded.deleted,
+                version = excluded.version,
+                origin = excluded.origin,
+                updated_at = excluded.updated_at,
+                seq = excluded.seq
+            """,
+            winners,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {
+        "applied": applied,
+        "conflicts": conflicts,
+        "rejected": rejected,
+        "cursor": seq,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+class LocalReplica:
+    """A device's own SQLite copy of the user's schedules."""
+
+    def __init__(self, path: str, replica_id: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(REPLICA_SCHEMA_SQL)
+        stored = self._meta("replica_id")
+        if stored is None:
+            stored = replica_id or uuid.uuid4().hex
+            self._set_meta("replica_id", stored)
+        self.replica_id = stored
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM sync_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute(
+            "INSERT INTO sync_meta (key, value) VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def _clock(self) -> int:
+        return int(self._meta("clock") or 0)
+
+    def _observe(self, version: int) -> None:
+        if version > self._clock():
+            self._set_meta("clock", version)
+
+    @property
+    def cursor(self) -> int:
+        with self._lock:
+            return int(self._meta("pull_cursor") or 0)
+
+    # -- local edits --------------------------------------------------------
+
+    def _write(self, uid: str, fields: Dict[str, Optional[str]], deleted: bool) -> Change:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._conn.execute(
+                    "SELECT * FROM local_schedules WHERE uid = ?", (uid,)
+                ).fetchone()
+                base = dict(current) if current is not None else {field: None for field in SYNC_FIELDS}
+                base.update({key: value for key, value in fields.items() if key in SYNC_FIELDS})
+                version = max(self._clock(), current["version"] if current else 0) + 1
+                self._set_meta("clock", version)
+                change = {
+                    "uid": uid,
+                    **{field: base[field] for field in SYNC_FIELDS},
+                    "deleted": deleted,
+                    "version": version,
+                    "origin": self.replica_id,
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+                self._store(change, dirty=True)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return change
+
+    def upsert(self, fields: Dict[str, Optional[str]], uid: Optional[str] = None) -> str:
+        """Creates or edits a schedule locally and returns its uid."""
+        uid = uid or uuid.uuid4().hex
+        self._write(uid, fields, deleted=False)
+        return uid
+
+    def delete(self, uid: str) -> None:
+        self._write(uid, {}, deleted=True)
+
+    def _store(self, change: Change, dirty: bool) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO local_schedules
+                (uid, schedule_date, start_time, title, content,
+                 deleted, version, origin, updated_at, dirty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(uid) DO UPDATE SET
+                schedule_date = excluded.schedule_date,
+                start_time = excluded.start_time,
+                title = excluded.title,
+                content = excluded.content,
+                deleted = excluded.deleted,
+                version = excluded.version,
+                origin = excluded.origin,
+                updated_at = excluded.updated_at,
+                dirty = excluded.dirty
+            """,
+            (
+                change["uid"],
+                *(change[field] for field in SYNC_FIELDS),
+                int(change["deleted"]),
+                change["version"],
+                change["origin"],
+                change["updated_at"],
+                int(dirty),
+            ),
+        )
+
+    # -- sync bookkeeping ---------------------------------------------------
+
+    def pending_changes(self, limit: int = MAX_PUSH_BATCH) -> List[Change]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM local_schedules WHERE dirty = 1 ORDER BY version LIMIT ?", (limit,)
+            ).fetchall()
+        return [row_to_change(row) for row in rows]
+
+    def mark_pushed(self, pushed: Iterable[Change], applied: Iterable[str], conflicts: Iterable[Change]) -> None:
+        """Clears ``dirty`` for pushed rows the server kept, and adopts the rows that beat ours."""
+        pushed_keys = {change["uid"]: version_key(change) for change in pushed}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for uid in applied:
+                    # Only if the row was not edited again while the push was in flight.
+                    version, origin = pushed_keys[uid]
+                    self._conn.execute(
+                        "UPDATE local_schedules SET dirty = 0 WHERE uid = ? AND version = ? AND origin = ?",
+                        (uid, version, origin),
+                    )
+                self._apply(conflicts)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def apply_remote(self, changes: Sequence[Change], cursor: int) -> int:
+        """Applies pulled ``changes`` and advances the pull cursor atomically; returns rows taken."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                taken = self._apply(changes)
+                self._set_meta("pull_cursor", cursor)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return taken
+
+    def _apply(self, changes: Iterable[Change]) -> int:
+        taken = 0
+        for change in changes:
+            self._observe(int(change["version"]))
+            current = self._conn.execute(
+                "SELECT version, origin FROM local_schedules WHERE uid = ?", (change["uid"],)
+            ).fetchone()
+            # A newer local edit wins and stays dirty; it reaches the server on the next push.
+            if current is not None and version_key(current) >= version_key(change):
+                continue
+            self._store(change, dirty=False)
+            taken += 1
+        return taken
+
+    # -- reads --------------------------------------------------------------
+
+    def schedules(self, include_deleted: bool = False) -> List[Change]:
+        sql = "SELECT * FROM local_schedules"
+        if not include_deleted:
+            sql += " WHERE deleted = 0"
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY schedule_date, start_time, uid").fetchall()
+        return [row_to_change(row) for row in rows]
+
+    def snapshot(self) -> Dict[str, VersionKey]:
+        """``uid -> (version, origin)`` for every row, tombstones included (for convergence checks)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT uid, version, origin FROM local_schedules").fetchall()
+        return {row["uid"]: version_key(row) for row in rows}
+
+
+# A transport sends (method, path, body, headers) and returns (status, headers, body).
+# It raises ``ConnectionError`` when the request or response was lost.
+Transport = Callable[[str, str, bytes, Dict[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+
+class HttpTransport:
+    """:data:`Transport` over HTTP to the Flask API, authenticated with the user's JWT."""
+
+    def __init__(self, base_url: str, token: str, timeout: float = 10.0) -> None:
+        import httpx
+
+        self._httpx = httpx
+        self._client = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    def __call__(
+        self, method: str, path: str, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            # Read the raw body: httpx would gunzip .content but keep the Content-Encoding header.
+            with self._client.stream(method, path, content=body or None, headers=headers) as response:
+                raw = b"".join(response.iter_raw())
+        except self._httpx.TransportError as exc:
+            raise ConnectionError(str(exc)) from exc
+        return response.status_code, dict(response.headers), raw
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class SyncError(RuntimeError):
+    pass
+
+
+class SyncClient:
+    """Pushes a :class:`LocalReplica`'s dirty rows and pulls everything newer than its cursor."""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        replica: LocalReplica,
+        transport: Transport,
+        batch_size: int = 200,
+        compress: bool = True,
+        retries: int = 6,
+        backoff: float = 0.05,
+    ) -> None:
+        self.replica = replica
+        self.transport = transport
+        self.batch_size = max(1, min(batch_size, MAX_PUSH_BATCH))
+        self.compress = compress
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "pushed": 0,
+            "pulled": 0,
+            "conflicts": 0,
+        }
+
+    def _call(self, method: str, path: str, payload: Any = None) -> Any:
+        headers = {"Accept-Encoding": "gzip" if self.compress else "identity"}
+        body = b""
+        if payload is not None:
+            body, encoding = encode_body(payload, self.compress)
+            headers["Content-Type"] = "application/json"
+            if encoding:
+                headers["Content-Encoding"] = encoding
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += len(body)
+            try:
+                status, response_headers, response_body = self.transport(method, path, body, headers)
+            except ConnectionError:
+                continue
+            self.stats["bytes_received"] += len(response_body)
+            if status in self.RETRY_STATUSES:
+                continue
+            lowered = {key.lower(): value for key, value in response_headers.items()}
+            data = decode_body(response_body, lowered.get("content-encoding"))
+            if status >= 400:
+                raise SyncError(f"{method} {path} failed with {status}: {data}")
+            return data
+        raise SyncError(f"{method} {path} failed after {self.retries + 1} attempts")
+
+    def push(self) -> int:
+        pushed = 0
+        while True:
+            batch = self.replica.pending_changes(self.batch_size)
+            if not batch:
+                return pushed
+            result = self._call("POST", "/sync/push", {"changes": batch})
+            if result["rejected"]:
+                raise SyncError(f"server rejected changes: {result['rejected']}")
+            self.replica.mark_pushed(batch, result["applied"], result["conflicts"])
+            # Rows edited again while the push was in flight stay dirty and go out next round.
+            pushed += len(batch)
+            self.stats["pushed"] += len(batch)
+            self.stats["conflicts"] += len(result["conflicts"])
+
+    def pull(self) -> int:
+        pulled = 0
+        while True:
+            cursor = self.replica.cursor
+            page = self._call(
+                "GET",
+                f"/sync/pull?cursor={cursor}&limit={self.batch_size}&exclude_origin={self.replica.replica_id}",
+            )
+            self.replica.apply_remote(page["changes"], page["next_cursor"])
+            pulled += len(page["changes"])
+            self.stats["pulled"] += len(page["changes"])
+            if not page["has_more"]:
+                return pulled
+
+    def sync(self) -> Dict[str, int]:
+        """One full round: push local edits, then pull remote ones."""
+        return {"pushed": self.push(), "pulled": self.pull()}
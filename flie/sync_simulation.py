@@ -0,0 +1,228 @@
+"""Two-replica sync simulation over a flaky link, checked for convergence.
+
+Boots ``create_app()`` on a temporary database and gives two devices their own
+:class:`sync_engine.LocalReplica` SQLite files. Each round, both devices make
+random creates, edits and deletes. Some of the edits hit the same rows, so
+conflicts happen. Each device then syncs through Flask's test client wrapped
+in a transport that drops requests and responses and sometimes answers 503.
+At the end, both devices sync over a reliable link. The script exits non-zero
+unless both replicas and the server hold exactly the same rows and versions::
+
+    python sync_simulation.py --rounds 50 --ops 40 --drop 0.2 --seed 7
+    python sync_simulation.py --no-gzip --output sync_plain.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Tuple
+
+from sync_engine import LocalReplica, SyncClient, SyncError, encode_body, row_to_change, version_key
+
+
+class TestClientTransport:
+    """:data:`sync_engine.Transport` that calls the app in-process through Flask's test client."""
+
+    def __init__(self, app: Any, token: str) -> None:
+        self.client = app.test_client()
+        self.token = token
+
+    def __call__(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        response = self.client.open(
+            path,
+            method=method,
+            data=body,
+            headers={**headers, "Authorization": f"Bearer {self.token}"},
+        )
+        return response.status_code, dict(response.headers), response.get_data()
+
+
+class FlakyTransport:
+    """Loses the request, loses the response (after the server applied it), or returns 503."""
+
+    def __init__(self, inner: Any, drop: float, rng: random.Random) -> None:
+        self.inner = inner
+        self.drop = drop
+        self.rng = rng
+        self.enabled = True
+        self.faults = {"request_lost": 0, "response_lost": 0, "unavailable": 0}
+
+    def __call__(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if self.enabled:
+            roll = self.rng.random()
+            if roll < self.drop / 3:
+                self.faults["request_lost"] += 1
+                raise ConnectionError("request lost")
+            if roll < self.drop * 2 / 3:
+                self.faults["unavailable"] += 1
+                return 503, {}, b""
+        result = self.inner(method, path, body, headers)
+        if self.enabled and self.rng.random() < self.drop / 3:
+            self.faults["response_lost"] += 1
+            raise ConnectionError("response lost")
+        return result
+
+
+def random_fields(rng: random.Random) -> Dict[str, str]:
+    day = date(2025, 11, 1) + timedelta(days=rng.randrange(90))
+    topic = rng.choice(["예산", "마케팅", "QA", "배포", "디자인", "채용"])
+    return {
+        "schedule_date": day.isoformat(),
+        "start_time": f"{rng.randint(9, 18):02d}:{rng.choice(['00', '30'])}",
+        "title": f"{topic} 회의",
+        "content": f"{topic} 관련 후속 논의. " * rng.randint(1, 4),
+    }
+
+
+def mutate(replica: LocalReplica, rng: random.Random, ops: int) -> Dict[str, int]:
+    counts = {"created": 0, "edited": 0, "deleted": 0}
+    for _ in range(ops):
+        visible = [row["uid"] for row in replica.schedules()]
+        roll = rng.random()
+        if not visible or roll < 0.4:
+            replica.upsert(random_fields(rng))
+            counts["created"] += 1
+        elif roll < 0.85:
+            uid = rng.choice(visible)
+            replica.upsert({"title": random_fields(rng)["title"] + f" (수정 {rng.randrange(100)})"}, uid=uid)
+            counts["edited"] += 1
+        else:
+            replica.delete(rng.choice(visible))
+            counts["deleted"] += 1
+    return counts
+
+
+def server_snapshot(database_path: str) -> Dict[str, Tuple[int, str]]:
+    conn = sqlite3.connect(database_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute("SELECT * FROM sync_schedules").fetchall()
+    finally:
+        conn.close()
+    return {row["uid"]: version_key(row) for row in rows}
+
+
+def full_table_bytes(database_path: str, compress: bool) -> int:
+    """Size of shipping the whole table once: what a naive "send everything" sync costs per pull."""
+    conn = sqlite3.connect(database_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = [row_to_change(row) for row in conn.execute("SELECT * FROM sync_schedules")]
+    finally:
+        conn.close()
+    return len(encode_body({"changes": rows}, compress)[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--ops", type=int, default=25, help="local operations per device per round")
+    parser.add_argument("--drop", type=float, default=0.2, help="fault probability per request")
+    parser.add_argument("--offline", type=float, default=0.2, help="chance a device skips syncing in a round")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="sync_sim_")
+    database_path = os.path.join(workdir, "server.db")
+    os.environ["DATABASE_URL"] = database_path
+
+    from app import create_app
+
+    app = create_app()
+    response = app.test_client().post(
+        "/auth/register",
+        json={"email": "sync@sim.example", "password": "sync-password", "nickname": "sync"},
+    )
+    token = response.get_json()["token"]
+
+    rng = random.Random(args.seed)
+    devices = {}
+    for name in ("laptop", "phone"):
+        replica = LocalReplica(os.path.join(workdir, f"{name}.db"))
+        link = FlakyTransport(TestClientTransport(app, token), args.drop, random.Random(rng.random()))
+        client = SyncClient(replica, link, batch_size=args.batch_size, compress=not args.no_gzip, backoff=0.0)
+        devices[name] = (replica, link, client)
+
+    print(f"--- sync_simulation: {args.rounds} rounds x {args.ops} ops, drop={args.drop} ({workdir}) ---")
+    operations = {"created": 0, "edited": 0, "deleted": 0}
+    syncs = 0
+    failed_syncs = 0
+    for _ in range(args.rounds):
+        for replica, _, client in devices.values():
+            for key, value in mutate(replica, rng, args.ops).items():
+                operations[key] += value
+        for replica, _, client in devices.values():
+            if rng.random() < args.offline:
+                continue
+            syncs += 1
+            try:
+                client.sync()
+            except SyncError:
+                # Out of retries on a bad link; the next round picks up from the saved cursor.
+                failed_syncs += 1
+
+    # Settle over a reliable link: laptop, phone, laptop.
+    for name in ("laptop", "phone", "laptop"):
+        _, link, client = devices[name]
+        link.enabled = False
+        client.sync()
+        syncs += 1
+
+    server = server_snapshot(database_path)
+    snapshots = {name: replica.snapshot() for name, (replica, _, _) in devices.items()}
+    converged = all(snapshot == server for snapshot in snapshots.values())
+    dirty_left = sum(len(replica.pending_changes()) for replica, _, _ in devices.values())
+
+    totals = {key: sum(client.stats[key] for _, _, client in devices.values()) for key in devices["laptop"][2].stats}
+    faults = {key: sum(link.faults[key] for _, link, _ in devices.values()) for key in devices["laptop"][1].faults}
+    full_bytes = full_table_bytes(database_path, not args.no_gzip)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "rounds": args.rounds,
+            "ops_per_round": args.ops,
+            "drop": args.drop,
+            "batch_size": args.batch_size,
+            "gzip": not args.no_gzip,
+            "seed": args.seed,
+        },
+        "converged": converged and dirty_left == 0,
+        "server_rows": len(server),
+        "live_rows": sum(1 for _ in devices["laptop"][0].schedules()),
+        "operations": operations,
+        "syncs": syncs,
+        "failed_syncs": failed_syncs,
+        "faults": faults,
+        "client": totals,
+        "transfer": {
+            "bytes_total": totals["bytes_sent"] + totals["bytes_received"],
+            "bytes_per_sync": round((totals["bytes_sent"] + totals["bytes_received"]) / syncs),
+            "full_table_bytes_once": full_bytes,
+        },
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    for replica, _, _ in devices.values():
+        replica.close()
+    app.extensions["password_hasher"].shutdown()
+    app.extensions["db_pool"].close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+    if not report["converged"]:
+        print("❌ replicas diverged")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
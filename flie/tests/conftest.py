@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The flie modules import each other by top-level name (db_pool, sync_engine, ...).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def asgi(tmp_path, monkeypatch):
+    """The Quart app on a temporary database, with startup/shutdown hooks run around each test."""
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "asgi.db"))
+    monkeypatch.setenv("ADMIN_TOKEN", "admin-secret")
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "1")
+    from asgi_app import create_app
+
+    return create_app()
+
+
+def run(app, scenario):
+    async def main():
+        async with app.test_app() as test_app:
+            return await scenario(test_app.test_client())
+
+    return asyncio.run(main())
+
+
+async def register(client, email="asgi@test.example"):
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": "asgi-password", "nickname": "asgi"}
+    )
+    assert response.status_code == 201
+    return (await response.get_json())["token"]
+
+
+def test_run_sync_uses_the_pooled_connection(asgi):
+    async def scenario(client):
+        token = await register(client)
+        pool = asgi.extensions["db_pool"]
+        count = await pool.run_sync(lambda conn: conn.execute("SELECT COUNT(*) FROM users").fetchone()[0])
+        me = await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+        return count, me.status_code, pool.stats()
+
+    count, status, stats = run(asgi, scenario)
+    assert count == 1
+    assert status == 200
+    assert stats["in_use"] == 0
+
+
+def test_admin_import_streams_ndjson_and_resumes(asgi):
+    body = b"\n".join(
+        [
+            b'{"email": "kim@test.example", "nickname": "kim"}',
+            b"not json",
+            b'{"email": "lee@test.example", "nickname": "lee"}',
+        ]
+    )
+    admin = {"X-Admin-Token": "admin-secret"}
+
+    async def scenario(client):
+        forbidden = await client.post("/admin/users/import", data=body)
+        first = await client.post("/admin/users/import?import_id=batch-1", data=body, headers=admin)
+        again = await client.post("/admin/users/import?import_id=batch-1", data=body, headers=admin)
+        emails = await asgi.extensions["db_pool"].run_sync(
+            lambda conn: [row[0] for row in conn.execute("SELECT email FROM users ORDER BY email")]
+        )
+        return forbidden.status_code, await first.get_json(), await again.get_json(), emails
+
+    forbidden, first, again, emails = run(asgi, scenario)
+    assert forbidden == 403
+    assert (first["upserted"], first["skipped"], first["errors"][0]["line"]) == (2, 1, 2)
+    assert (again["resumed_from_line"], again["upserted"], again["skipped"]) == (3, 0, 0)
+    assert emails == ["kim@test.example", "lee@test.example"]
+
+
+def test_metrics_and_profiler_routes(asgi):
+    admin = {"X-Admin-Token": "admin-secret"}
+
+    async def scenario(client):
+        await register(client)
+        metrics = await (await client.get("/metrics")).get_data(as_text=True)
+        bad = await client.post("/admin/profiler", json={"action": "start", "interval": 0}, headers=admin)
+        started = await client.post("/admin/profiler", json={"action": "start", "interval": 0.01}, headers=admin)
+        stopped = await client.post("/admin/profiler", json={"action": "stop"}, headers=admin)
+        stacks = await client.get("/admin/profiler/stacks")
+        return metrics, bad.status_code, await started.get_json(), await stopped.get_json(), stacks.status_code
+
+    metrics, bad, started, stopped, stacks = run(asgi, scenario)
+    assert 'bluebird_http_request_duration_seconds_count{method="POST",route="/auth/register",status="201"} 1' in metrics
+    assert 'phase="kdf"' in metrics and 'phase="db"' in metrics
+    assert "bluebird_db_pool_checkouts_total" in metrics
+    assert bad == 400
+    assert started["profiler"]["running"] and not stopped["profiler"]["running"]
+    assert stacks == 403
+
+
+def test_sync_push_and_pull_match_the_flask_contract(asgi, tmp_path):
+    from sync_engine import LocalReplica, MAX_BODY_BYTES, decode_body, encode_body
+
+    replica = LocalReplica(str(tmp_path / "laptop.db"), replica_id="laptop")
+    uid = replica.upsert({"schedule_date": "2025-11-10", "start_time": "10:00", "title": "design review"})
+    body, encoding = encode_body({"changes": replica.pending_changes()}, compress=True)
+    replica.close()
+
+    async def scenario(client):
+        token = await register(client)
+        auth = {"Authorization": f"Bearer {token}"}
+        unauthorized = await client.get("/sync/pull")
+        pushed = await client.post(
+            "/sync/push", data=body, headers={**auth, "Content-Encoding": encoding or "identity"}
+        )
+        mislabelled = await client.post(
+            "/sync/push", data=b'{"changes": []}', headers={**auth, "Content-Encoding": "gzip"}
+        )
+        pulled = await client.get("/sync/pull?cursor=0", headers={**auth, "Accept-Encoding": "gzip"})
+        too_large = await client.post("/sync/push", data=b" " * (MAX_BODY_BYTES + 1), headers=auth)
+        return (
+            unauthorized.status_code,
+            decode_body(await pushed.get_data(), pushed.headers.get("Content-Encoding")),
+            pulled.headers.get("Content-Encoding"),
+            decode_body(await pulled.get_data(), pulled.headers.get("Content-Encoding")),
+            too_large.status_code,
+            mislabelled.status_code,
+        )
+
+    unauthorized, pushed, pull_encoding, pulled, too_large, mislabelled = run(asgi, scenario)
+    assert unauthorized == 401
+    assert pushed["applied"] == [uid] and pushed["conflicts"] == []
+    assert pull_encoding in {None, "gzip"}
+    assert [change["uid"] for change in pulled["changes"]] == [uid]
+    assert pulled["has_more"] is False and pulled["next_cursor"] > 0
+    assert too_large == 413
+    assert mislabelled == 400
+
+
+def test_calendar_sync_and_conditional_events_read(asgi):
+    import httpx
+
+    from bench_calendar_cache import FakeCalendar
+
+    calendar = FakeCalendar()
+    calendar.put(
+        {
+            "id": "evt0001",
+            "status": "confirmed",
+            "summary": "weekly sync",
+            "start": {"dateTime": "2025-11-10T10:00:00+09:00"},
+            "end": {"dateTime": "2025-11-10T11:00:00+09:00"},
+        }
+    )
+    cache = asgi.extensions["calendar_cache"]
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        status, payload = calendar.list(dict(request.url.params))
+        return httpx.Response(status, json=payload)
+
+    cache.client._client = httpx.Client(transport=httpx.MockTransport(handle))
+    window = "/calendar/events?start=2025-11-10&end=2025-11-11"
+
+    async def scenario(client):
+        auth = {"Authorization": f"Bearer {await register(client)}"}
+        before = await client.get(window, headers=auth)
+        synced = await client.post("/calendar/sync", json={"access_token": "google", "wait": True}, headers=auth)
+        events = await client.get(window, headers=auth)
+        etag = events.headers["ETag"]
+        unchanged = await client.get(window, headers={**auth, "If-None-Match": etag})
+        bad_range = await client.get("/calendar/events?start=2025-11-11&end=2025-11-10", headers=auth)
+        return before.status_code, await synced.get_json(), await events.get_json(), unchanged.status_code, bad_range.status_code
+
+    before, synced, events, unchanged, bad_range = run(asgi, scenario)
+    assert before == 404
+    assert synced["status"] == "synced" and synced["sync"]["mode"] == "full"
+    assert [item["id"] for item in events["events"]] == ["evt0001"]
+    assert unchanged == 304
+    assert bad_range == 400
+
+
+def test_routes_match_the_flask_app(asgi):
+    from app import create_app as create_flask_app
+
+    def routes(app):
+        return {
+            (rule.rule, method)
+            for rule in app.url_map.iter_rules()
+            if rule.endpoint != "static"
+            for method in rule.methods - {"HEAD", "OPTIONS"}
+        }
+
+    flask_app = create_flask_app()
+    try:
+        assert routes(asgi) == routes(flask_app)
+    finally:
+        flask_app.extensions["calendar_cache"].shutdown()
+        flask_app.extensions["password_hasher"].shutdown()
+        flask_app.extensions["db_pool"].close()
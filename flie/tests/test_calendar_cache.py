@@ -0,0 +1,230 @@
+from typing import Any, Dict
+
+import httpx
+import pytest
+
+from bench_calendar_cache import FakeCalendar
+from calendar_cache import CalendarCache, GoogleCalendarClient, range_bound, to_utc
+from db_pool import SQLitePool
+
+USER = 1
+
+
+def event(index: int, day: int = 10, hour: int = 9) -> Dict[str, Any]:
+    return {
+        "id": f"evt{index:04d}",
+        "status": "confirmed",
+        "summary": f"event {index}",
+        "start": {"dateTime": f"2025-11-{day:02d}T{hour:02d}:00:00+09:00"},
+        "end": {"dateTime": f"2025-11-{day:02d}T{hour + 1:02d}:00:00+09:00"},
+    }
+
+
+class Harness:
+    """A CalendarCache on a temporary pool, talking to a FakeCalendar through httpx.MockTransport."""
+
+    def __init__(self, tmp_path, page_size: int = 3) -> None:
+        self.calendar = FakeCalendar()
+        self.requests = []
+        self.fail_on_request = None
+        self.pool = SQLitePool(str(tmp_path / "calendar.db"), max_size=2)
+        with self.pool.connection() as conn:
+            CalendarCache.init_schema(conn)
+            conn.commit()
+        client = GoogleCalendarClient(base_url="http://calendar.test/calendar/v3", page_size=page_size)
+        client._client = httpx.Client(transport=httpx.MockTransport(self.handle))
+        self.cache = CalendarCache(self.pool.connection, client, min_interval=0)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(dict(request.url.params))
+        assert request.headers["Authorization"] == "Bearer token"
+        assert request.url.path == "/calendar/v3/calendars/primary/events"
+        if self.fail_on_request == len(self.requests):
+            return httpx.Response(500, json={"error": {"code": 500}})
+        status, payload = self.calendar.list(dict(request.url.params))
+        return httpx.Response(status, json=payload)
+
+    def sync(self, **kwargs: Any) -> Dict[str, Any]:
+        self.requests.clear()
+        return self.cache.sync(USER, "token", **kwargs)
+
+    def cached_ids(self):
+        with self.pool.connection() as conn:
+            events = CalendarCache.read_range(conn, USER, "primary", "2000-01-01T00:00:00Z", "2100-01-01T00:00:00Z")
+        return {item["id"] for item in events["events"]}
+
+    def etag(self):
+        with self.pool.connection() as conn:
+            return CalendarCache.etag(conn, USER, "primary", "a", "b")
+
+    def close(self) -> None:
+        self.cache.shutdown()
+        self.pool.close()
+
+
+@pytest.fixture
+def harness(tmp_path):
+    harness = Harness(tmp_path)
+    yield harness
+    harness.close()
+
+
+def test_first_sync_lists_every_page(harness):
+    for index in range(7):
+        harness.calendar.put(event(index))
+    assert harness.etag() is None
+
+    report = harness.sync()
+    assert report["mode"] == "full"
+    assert report["pages"] == 3
+    assert "syncToken" not in harness.requests[0]
+    assert harness.cached_ids() == set(harness.calendar.live())
+    assert harness.etag() is not None
+
+
+def test_incremental_sync_applies_only_changes(harness):
+    for index in range(5):
+        harness.calendar.put(event(index))
+    harness.sync()
+    etag = harness.etag()
+
+    changed = event(1)
+    changed["summary"] = "moved"
+    harness.calendar.put(changed)
+    harness.calendar.cancel("evt0002")
+    harness.calendar.put(event(9))
+
+    report = harness.sync()
+    assert report["mode"] == "incremental"
+    assert (report["changes"], report["upserted"], report["deleted"]) == (3, 2, 1)
+    assert harness.requests[0]["syncToken"]
+    assert harness.cached_ids() == set(harness.calendar.live())
+    assert harness.etag() != etag
+
+
+def test_sync_without_changes_keeps_etag(harness):
+    harness.calendar.put(event(0))
+    harness.sync()
+    etag = harness.etag()
+    report = harness.sync()
+    assert (report["mode"], report["changes"]) == ("incremental", 0)
+    assert harness.etag() == etag
+
+
+def test_expired_token_falls_back_to_one_full_sync(harness):
+    for index in range(4):
+        harness.calendar.put(event(index))
+    harness.sync()
+
+    harness.calendar.expire_tokens()
+    harness.calendar.cancel("evt0000")
+    harness.calendar.put(event(5))
+
+    report = harness.sync()
+    assert report["mode"] == "full"
+    assert "syncToken" in harness.requests[0]
+    assert all("syncToken" not in params for params in harness.requests[1:])
+    assert harness.cached_ids() == set(harness.calendar.live())
+    assert harness.cache.stats()["expired_tokens"] == 1
+    assert harness.cache.stats()["full_syncs"] == 2
+
+    # The new token is valid again, so the next sync is incremental.
+    assert harness.sync()["mode"] == "incremental"
+
+
+def test_failed_sync_keeps_previous_state(harness):
+    for index in range(7):
+        harness.calendar.put(event(index))
+    harness.sync()
+    etag = harness.etag()
+
+    harness.calendar.expire_tokens()
+    harness.calendar.put(event(8))
+    harness.fail_on_request = 3  # 410, first full page, then 500
+    with pytest.raises(httpx.HTTPStatusError):
+        harness.sync()
+    assert "evt0008" not in harness.cached_ids()
+    assert len(harness.cached_ids()) == 7
+    assert harness.etag() == etag
+    assert harness.cache.stats()["failed_syncs"] == 1
+
+    harness.fail_on_request = None
+    assert harness.sync()["mode"] == "full"
+    assert harness.cached_ids() == set(harness.calendar.live())
+
+
+def test_min_interval_skips_repeated_syncs(tmp_path):
+    harness = Harness(tmp_path)
+    harness.cache.min_interval = 60
+    try:
+        harness.calendar.put(event(0))
+        assert harness.sync()["mode"] == "full"
+        assert harness.sync() == {"mode": "skipped"}
+        assert harness.requests == []
+        assert harness.sync(force=True)["mode"] == "incremental"
+    finally:
+        harness.close()
+
+
+def test_read_range_uses_overlap_in_utc(harness):
+    harness.calendar.put(event(0, day=10, hour=9))   # 00:00-01:00 UTC on the 10th
+    harness.calendar.put(event(1, day=11, hour=9))
+    all_day = {"id": "allday", "status": "confirmed", "start": {"date": "2025-11-12"}, "end": {"date": "2025-11-13"}}
+    harness.calendar.put(all_day)
+    harness.sync()
+
+    with harness.pool.connection() as conn:
+        events = CalendarCache.read_range(conn, USER, "primary", range_bound("2025-11-10"), range_bound("2025-11-11"))
+    assert [item["id"] for item in events["events"]] == ["evt0000"]
+    with harness.pool.connection() as conn:
+        events = CalendarCache.read_range(conn, USER, "primary", range_bound("2025-11-11"), range_bound("2025-11-13"))
+    assert [item["id"] for item in events["events"]] == ["evt0001", "allday"]
+
+
+def test_to_utc():
+    assert to_utc({"dateTime": "2025-11-10T09:00:00+09:00"}) == "2025-11-10T00:00:00Z"
+    assert to_utc({"dateTime": "2025-11-10T09:00:00Z"}) == "2025-11-10T09:00:00Z"
+    assert to_utc({"date": "2025-11-10"}) == "2025-11-10T00:00:00Z"
+    with pytest.raises(ValueError):
+        to_utc({})
+
+
+def test_unparseable_incremental_item_drops_cached_event(harness):
+    harness.calendar.put(event(0))
+    harness.calendar.put(event(1))
+    harness.sync()
+
+    broken = event(1)
+    broken["start"] = {"dateTime": "not a time"}
+    harness.calendar.put(broken)
+    report = harness.sync()
+    assert report["deleted"] == 1
+    assert harness.cached_ids() == {"evt0000"}
+
+
+def test_read_snapshot_pairs_etag_with_its_body(harness):
+    harness.calendar.put(event(0))
+    harness.sync()
+    start, end = range_bound("2025-11-01"), range_bound("2025-12-01")
+
+    def sync_in_between(etag):
+        # A sync that commits after the ETag was read must not leak into the same response.
+        harness.calendar.put(event(1))
+        harness.sync()
+        return False
+
+    with harness.pool.connection() as conn:
+        etag, body = CalendarCache.read_snapshot(conn, USER, "primary", start, end, sync_in_between)
+    assert [item["id"] for item in body["events"]] == ["evt0000"]
+
+    with harness.pool.connection() as conn:
+        fresh_etag, fresh = CalendarCache.read_snapshot(conn, USER, "primary", start, end, lambda tag: False)
+        assert not conn.in_transaction
+        assert CalendarCache.read_snapshot(conn, USER, "primary", start, end, lambda tag: tag == fresh_etag) == (fresh_etag, None)
+    assert fresh_etag != etag
+    assert [item["id"] for item in fresh["events"]] == ["evt0000", "evt0001"]
+
+
+def test_read_snapshot_before_first_sync(harness):
+    with harness.pool.connection() as conn:
+        assert CalendarCache.read_snapshot(conn, USER, "primary", "a", "b", lambda tag: False) == (None, None)
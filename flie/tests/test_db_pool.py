@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db_pool import SQLitePool
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "pool.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    return path
+
+
+@pytest.fixture
+def blocker(database):
+    """A second writer holding the write lock until released."""
+    conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    yield conn
+    if conn.in_transaction:
+        conn.rollback()
+    conn.close()
+
+
+def test_connections_are_reused_and_transactions_rolled_back(database):
+    pool = SQLitePool(database, max_size=2)
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+    with pool.connection() as again:
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        assert again.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    stats = pool.stats()
+    assert (stats["created"], stats["checkouts"], stats["in_use"]) == (1, 2, 0)
+    pool.close()
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted(database):
+    pool = SQLitePool(database, max_size=1, timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    stats = pool.stats()
+    assert (stats["timeouts"], stats["in_use"]) == (1, 1)
+
+    # A release hands the connection to the next waiter.
+    threading.Timer(0.02, pool.release, args=(held,)).start()
+    pool.timeout = 5
+    assert pool.acquire() is held
+    pool.close()
+
+
+def test_lock_wait_is_bounded_by_busy_timeout_and_accounted(database, blocker):
+    observed = []
+    pool = SQLitePool(database, busy_timeout_ms=300, lock_slice_ms=20, statement_observer=observed.append)
+    with pool.connection() as conn:
+        started = time.perf_counter()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            conn.execute("INSERT INTO items (name) VALUES ('blocked')")
+        elapsed = time.perf_counter() - started
+
+    stats = pool.stats()
+    assert 0.25 <= elapsed < 1.0
+    assert stats["lock_failures"] == 1
+    assert stats["lock_retries"] >= 2
+    # Busy waits and backoff sleeps both count, and add up to about the whole wait.
+    assert 0.25 <= stats["lock_wait_seconds"] <= elapsed + 0.05
+    assert observed and observed[-1] == pytest.approx(elapsed, abs=0.05)
+    pool.close()
+
+
+def test_statement_succeeds_once_the_lock_is_released(database, blocker):
+    pool = SQLitePool(database, busy_timeout_ms=2000, lock_slice_ms=20)
+    threading.Timer(0.15, blocker.rollback).start()
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('eventually')")
+        conn.commit()
+        assert conn.execute("SELECT name FROM items").fetchall()[0][0] == "eventually"
+
+    stats = pool.stats()
+    assert stats["lock_failures"] == 0
+    assert stats["lock_retries"] >= 1
+    assert 0.1 <= stats["lock_wait_seconds"] < 1.0
+    pool.close()
+
+
+def test_executemany_retries_with_the_same_rows(database, blocker):
+    pool = SQLitePool(database, busy_timeout_ms=2000, lock_slice_ms=20)
+    threading.Timer(0.1, blocker.rollback).start()
+    with pool.connection() as conn:
+        conn.executemany("INSERT INTO items (name) VALUES (?)", ((name,) for name in ("a", "b", "c")))
+        conn.commit()
+        assert [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")] == ["a", "b", "c"]
+    assert pool.stats()["lock_retries"] >= 1
+    pool.close()
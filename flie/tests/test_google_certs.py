@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from google_certs import AsyncGoogleCertCache, GoogleCertCache, parse_max_age
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("public, max-age=19302, must-revalidate, no-transform", 19302),
+        ("Max-Age = 60", 60),
+        ("no-cache", 0),
+        ("private, no-store, max-age=600", 0),
+        ("public", None),
+        (None, None),
+    ],
+)
+def test_parse_max_age(header, expected):
+    assert parse_max_age(header) == expected
+
+
+class FakeResponse:
+    def __init__(self, certs, cache_control):
+        self._certs = certs
+        self.headers = {"Cache-Control": cache_control} if cache_control else {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._certs
+
+
+class FakeSession:
+    def __init__(self, cache_control="public, max-age=100"):
+        self.cache_control = cache_control
+        self.calls = 0
+
+    def get(self, url, timeout):
+        self.calls += 1
+        return FakeResponse({f"kid{self.calls}": "cert"}, self.cache_control)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr("google_certs.time.time", lambda: now[0])
+    return now
+
+
+def test_certs_are_reused_until_max_age_runs_out(clock):
+    session = FakeSession()
+    cache = GoogleCertCache(session=session, default_ttl=5)
+
+    assert cache.get_certs() == {"kid1": "cert"}
+    clock[0] += 99
+    assert cache.get_certs() == {"kid1": "cert"}
+    clock[0] += 1
+    assert cache.get_certs() == {"kid2": "cert"}
+    stats = cache.stats()
+    assert (stats["fetches"], stats["hits"], stats["expires_in"]) == (2, 1, 100)
+
+
+def test_missing_max_age_falls_back_to_default_ttl(clock):
+    session = FakeSession(cache_control=None)
+    cache = GoogleCertCache(session=session, default_ttl=5)
+    cache.get_certs()
+    clock[0] += 4
+    cache.get_certs()
+    clock[0] += 1
+    cache.get_certs()
+    assert session.calls == 2
+
+
+def test_no_cache_refetches_every_time(clock):
+    session = FakeSession(cache_control="no-cache")
+    cache = GoogleCertCache(session=session)
+    cache.get_certs()
+    cache.get_certs()
+    assert session.calls == 2
+
+
+def test_forced_refresh_is_rate_limited(clock):
+    session = FakeSession()
+    cache = GoogleCertCache(session=session, min_refresh_interval=30)
+    cache.get_certs()
+    # An unknown key id may force a refresh, but not more than once per interval.
+    clock[0] += 10
+    assert cache.get_certs(force_refresh=True) == {"kid1": "cert"}
+    clock[0] += 20
+    assert cache.get_certs(force_refresh=True) == {"kid2": "cert"}
+    assert session.calls == 2
+
+
+def test_async_cache_shares_one_fetch(clock):
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        return httpx.Response(200, json={"kid": "cert"}, headers={"Cache-Control": "max-age=60"})
+
+    async def main():
+        cache = AsyncGoogleCertCache(
+            certs_url="http://certs.test/certs",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handle)),
+        )
+        try:
+            results = await asyncio.gather(*(cache.get_certs_async() for _ in range(5)))
+            clock[0] += 60
+            await cache.get_certs_async()
+        finally:
+            await cache.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert all(result == {"kid": "cert"} for result in results)
+    assert len(requests) == 2
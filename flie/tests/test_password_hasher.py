@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from password_hasher import HasherBusy, PasswordHasher, hash_params
+
+FAST = "pbkdf2:sha256:1000"
+
+
+def test_inline_hash_and_verify():
+    hasher = PasswordHasher(method=FAST, workers=0)
+    password_hash = hasher.hash("secret-password")
+    assert hash_params(password_hash) == FAST
+    assert hasher.verify(password_hash, "secret-password")
+    assert not hasher.verify(password_hash, "wrong-password")
+
+
+def test_needs_rehash_compares_kdf_parameters():
+    fast = PasswordHasher(method=FAST, workers=0)
+    stronger = PasswordHasher(method="pbkdf2:sha256:2000", workers=0)
+    password_hash = fast.hash("secret-password")
+    assert not fast.needs_rehash(password_hash)
+    assert stronger.needs_rehash(password_hash)
+    # "scrypt" is normalised to its full parameter string.
+    scrypt = PasswordHasher(method="scrypt", workers=0)
+    assert scrypt.params.startswith("scrypt:")
+    assert not scrypt.needs_rehash(f"{scrypt.params}$salt$hash")
+
+
+def test_saturated_hasher_rejects_immediately():
+    hasher = PasswordHasher(method=FAST, workers=0, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(*_):
+        started.set()
+        release.wait(5)
+        return "done"
+
+    worker = threading.Thread(target=hasher._run, args=(slow,))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(HasherBusy) as busy:
+            hasher.hash("secret-password")
+        assert busy.value.retry_after >= 1
+    finally:
+        release.set()
+        worker.join()
+    assert hasher.verify(hasher.hash("secret-password"), "secret-password")
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher(method=FAST, workers=1, queue_size=0, timeout=0.05)
+    try:
+        with pytest.raises(HasherBusy):
+            hasher._run(time.sleep, 0.5)
+        # The sleep still occupies the only worker, so the next job is turned away.
+        with pytest.raises(HasherBusy):
+            hasher.hash("secret-password")
+        time.sleep(0.6)
+        hasher.timeout = 10
+        assert hasher.verify(hasher.hash("secret-password"), "secret-password")
+    finally:
+        hasher.shutdown()
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    apps = []
+
+    def make(method):
+        monkeypatch.setenv("DATABASE_URL", str(tmp_path / "app.db"))
+        monkeypatch.setenv("PASSWORD_HASH_METHOD", method)
+        monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+        monkeypatch.setenv("PASSWORD_HASH_QUEUE_SIZE", "0")
+        from app import create_app
+
+        apps.append(create_app())
+        return apps[-1]
+
+    yield make
+    for app in apps:
+        app.extensions["calendar_cache"].shutdown()
+        app.extensions["password_hasher"].shutdown()
+        app.extensions["db_pool"].close()
+
+
+def test_busy_hasher_answers_429_with_retry_after(make_app):
+    app = make_app(FAST)
+    client = app.test_client()
+    account = {"email": "busy@test.example", "password": "busy-password", "nickname": "busy"}
+    slots = app.extensions["password_hasher"]._slots
+
+    slots.acquire()
+    try:
+        response = client.post("/auth/register", json=account)
+    finally:
+        slots.release()
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    assert client.post("/auth/register", json=account).status_code == 201
+    slots.acquire()
+    try:
+        assert client.post("/auth/login", json=account).status_code == 429
+    finally:
+        slots.release()
+
+
+def test_login_upgrades_an_outdated_hash(make_app):
+    account = {"email": "old@test.example", "password": "old-password", "nickname": "old"}
+    make_app(FAST).test_client().post("/auth/register", json=account)
+
+    app = make_app("pbkdf2:sha256:2000")
+    assert app.test_client().post("/auth/login", json=account).status_code == 200
+    with app.extensions["db_pool"].connection() as conn:
+        stored = conn.execute("SELECT password_hash FROM users WHERE email = ?", (account["email"],)).fetchone()[0]
+    assert hash_params(stored) == "pbkdf2:sha256:2000"
+    assert app.test_client().post("/auth/login", json=account).status_code == 200
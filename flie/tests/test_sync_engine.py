@@ -0,0 +1,200 @@
+import gzip
+import json
+import random
+
+import pytest
+
+from sync_engine import (
+    MAX_BODY_BYTES,
+    BodyTooLarge,
+    LocalReplica,
+    SyncClient,
+    SyncError,
+    decode_body,
+    encode_body,
+)
+import sync_simulation
+from sync_simulation import FlakyTransport, mutate, server_snapshot
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    database_path = str(tmp_path / "server.db")
+    monkeypatch.setenv("DATABASE_URL", database_path)
+    from app import create_app
+
+    app = create_app()
+    token = app.test_client().post(
+        "/auth/register",
+        json={"email": "sync@test.example", "password": "sync-password", "nickname": "sync"},
+    ).get_json()["token"]
+    yield app, token, database_path
+    app.extensions["calendar_cache"].shutdown()
+    app.extensions["password_hasher"].shutdown()
+    app.extensions["db_pool"].close()
+
+
+def device(tmp_path, app, token, name, transport=None, **options):
+    replica = LocalReplica(str(tmp_path / f"{name}.db"), replica_id=name)
+    link = transport or sync_simulation.TestClientTransport(app, token)
+    return replica, SyncClient(replica, link, backoff=0.0, **options)
+
+
+def assert_converged(database_path, *replicas):
+    expected = server_snapshot(database_path)
+    for replica in replicas:
+        assert replica.snapshot() == expected
+        assert replica.pending_changes() == []
+
+
+# ---------------------------------------------------------------------------
+# Convergence
+# ---------------------------------------------------------------------------
+
+
+def test_two_replicas_converge_and_last_writer_wins(tmp_path, server):
+    app, token, database_path = server
+    laptop, laptop_sync = device(tmp_path, app, token, "laptop")
+    phone, phone_sync = device(tmp_path, app, token, "phone")
+
+    uid = laptop.upsert({"schedule_date": "2025-11-10", "start_time": "10:00", "title": "design review"})
+    doomed = laptop.upsert({"schedule_date": "2025-11-11", "start_time": "11:00", "title": "budget"})
+    assert laptop_sync.sync() == {"pushed": 2, "pulled": 0}
+    assert phone_sync.sync() == {"pushed": 0, "pulled": 2}
+
+    # Both devices edit the same row offline; "phone" > "laptop" breaks the version tie.
+    laptop.upsert({"title": "design review (laptop)"}, uid=uid)
+    phone.upsert({"title": "design review (phone)"}, uid=uid)
+    phone.delete(doomed)
+
+    phone_sync.sync()
+    laptop_sync.sync()  # the server already holds phone's newer edit: a conflict laptop adopts
+    phone_sync.sync()
+
+    assert_converged(database_path, laptop, phone)
+    assert [row["title"] for row in laptop.schedules()] == ["design review (phone)"]
+    assert laptop.schedules() == phone.schedules()
+    assert laptop_sync.stats["conflicts"] == 1
+
+
+def test_later_edit_beats_concurrent_older_edit(tmp_path, server):
+    app, token, database_path = server
+    laptop, laptop_sync = device(tmp_path, app, token, "laptop")
+    phone, phone_sync = device(tmp_path, app, token, "phone")
+
+    uid = phone.upsert({"title": "v1"})
+    phone_sync.sync()
+    laptop_sync.sync()
+    laptop.upsert({"title": "laptop v2"}, uid=uid)
+    laptop.upsert({"title": "laptop v3"}, uid=uid)
+    phone.upsert({"title": "phone v2"}, uid=uid)
+
+    phone_sync.sync()
+    laptop_sync.sync()
+    phone_sync.sync()
+
+    assert_converged(database_path, laptop, phone)
+    assert [row["title"] for row in phone.schedules()] == ["laptop v3"]
+
+
+def test_lost_push_response_is_safe_to_retry(tmp_path, server):
+    app, token, database_path = server
+    inner = sync_simulation.TestClientTransport(app, token)
+    lost = []
+
+    def lose_first_push_response(method, path, body, headers):
+        result = inner(method, path, body, headers)
+        if path == "/sync/push" and not lost:
+            lost.append(path)
+            raise ConnectionError("response lost")
+        return result
+
+    laptop, laptop_sync = device(tmp_path, app, token, "laptop", transport=lose_first_push_response)
+    for index in range(3):
+        laptop.upsert({"title": f"event {index}"})
+    assert laptop_sync.sync()["pushed"] == 3
+    assert laptop_sync.stats["retries"] == 1
+    assert len(server_snapshot(database_path)) == 3
+    assert_converged(database_path, laptop)
+
+
+def test_paged_pull_resumes_from_cursor(tmp_path, server):
+    app, token, database_path = server
+    laptop, laptop_sync = device(tmp_path, app, token, "laptop", batch_size=4)
+    phone, phone_sync = device(tmp_path, app, token, "phone", batch_size=4)
+    for index in range(10):
+        laptop.upsert({"title": f"event {index}"})
+    laptop_sync.sync()
+
+    assert phone_sync.pull() == 10
+    assert phone_sync.stats["requests"] == 3
+    assert phone_sync.pull() == 0
+    assert phone.cursor > 0
+    assert_converged(database_path, laptop, phone)
+
+
+def test_random_edits_converge_over_a_flaky_link(tmp_path, server):
+    app, token, database_path = server
+    rng = random.Random(3)
+    devices = []
+    for name in ("laptop", "phone"):
+        link = FlakyTransport(sync_simulation.TestClientTransport(app, token), 0.3, random.Random(rng.random()))
+        devices.append((*device(tmp_path, app, token, name, transport=link, batch_size=7, retries=3), link))
+
+    for _ in range(8):
+        for replica, _, _ in devices:
+            mutate(replica, rng, 6)
+        for _, client, _ in devices:
+            try:
+                client.sync()
+            except SyncError:
+                pass
+
+    for replica, client, link in devices + devices[:1]:
+        link.enabled = False
+        client.sync()
+    assert sum(sum(link.faults.values()) for _, _, link in devices) > 0
+    assert_converged(database_path, *(replica for replica, _, _ in devices))
+
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+
+
+def test_body_roundtrip():
+    payload = {"changes": [{"uid": "a", "title": "한글" * 600}]}
+    body, encoding = encode_body(payload, compress=True)
+    assert encoding == "gzip"
+    assert decode_body(body, encoding) == payload
+    small, encoding = encode_body({"changes": []}, compress=True)
+    assert encoding is None
+    assert decode_body(small, None) == {"changes": []}
+
+
+def test_decode_body_limits():
+    bomb = gzip.compress(b" " * (MAX_BODY_BYTES + 1))
+    with pytest.raises(BodyTooLarge):
+        decode_body(bomb, "gzip")
+    with pytest.raises(BodyTooLarge):
+        decode_body(b"[]" + b" " * 100, None, max_size=10)
+    truncated = gzip.compress(json.dumps({"changes": []}).encode())[:-4]
+    with pytest.raises(ValueError):
+        decode_body(truncated, "gzip")
+    with pytest.raises(ValueError):
+        decode_body(gzip.compress(b"{}") + b"junk", "gzip")
+    with pytest.raises(ValueError):
+        decode_body(b"{}", "gzip")
+
+
+def test_push_rejects_oversized_and_malformed_bodies(server):
+    app, token, _ = server
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+    bomb = gzip.compress(b" " * (MAX_BODY_BYTES + 1))
+    assert client.post("/sync/push", data=bomb, headers=headers).status_code == 413
+    truncated = gzip.compress(b'{"changes": []}')[:-4]
+    assert client.post("/sync/push", data=truncated, headers=headers).status_code == 400
+    bad = json.dumps({"changes": [{"uid": "a", "version": 0, "origin": "x"}]}).encode()
+    assert client.post("/sync/push", data=bad, headers={**headers, "Content-Encoding": "identity"}).status_code == 400
@@ -0,0 +1,83 @@
+import pytest
+
+from ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr("ttl_cache.time.time", lambda: now[0])
+    return now
+
+
+def test_entry_expires_at_default_ttl(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("a", 1)
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_explicit_ttl_and_absolute_deadline(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("short", 1, ttl=1)
+    # JWT claims are cached until their own ``exp``, not the default TTL.
+    cache.set("token", 2, expires_at=clock[0] + 100)
+    cache.set("expired", 3, expires_at=clock[0] - 1)
+    assert cache.get("expired") is None
+    clock[0] += 50
+    assert cache.get("short") is None
+    assert cache.get("token") == 2
+    clock[0] += 50
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2, default_ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_and_stats(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    cache.set("b", 2)
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"], stats["hit_ratio"]) == (1, 1, 1, 0.5)
+
+
+def test_auth_me_is_served_from_the_caches(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "app.db"))
+    monkeypatch.setenv("ADMIN_TOKEN", "admin-secret")
+    from app import create_app
+
+    app = create_app()
+    try:
+        client = app.test_client()
+        token = client.post(
+            "/auth/register",
+            json={"email": "cache@test.example", "password": "cache-password", "nickname": "before"},
+        ).get_json()["token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        assert client.get("/auth/me", headers=auth).get_json()["user"]["nickname"] == "before"
+        assert client.get("/auth/me", headers=auth).status_code == 200
+
+        stats = client.get("/admin/cache", headers={"X-Admin-Token": "admin-secret"}).get_json()
+        assert (stats["token_cache"]["hits"], stats["token_cache"]["misses"]) == (1, 1)
+        assert (stats["user_cache"]["hits"], stats["user_cache"]["misses"]) == (1, 1)
+        assert client.get("/auth/me", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 401
+    finally:
+        app.extensions["calendar_cache"].shutdown()
+        app.extensions["password_hasher"].shutdown()
+        app.extensions["db_pool"].close()
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from auth_common import USERS_TABLE_SQL
+from db_pool import SQLitePool
+from user_import import import_ndjson, load_checkpoint
+
+
+@pytest.fixture
+def conn(tmp_path):
+    pool = SQLitePool(str(tmp_path / "import.db"), max_size=1)
+    with pool.connection() as conn:
+        conn.execute(USERS_TABLE_SQL)
+        conn.commit()
+        yield conn
+    pool.close()
+
+
+def ndjson(*records):
+    return [json.dumps(record) + "\n" for record in records]
+
+
+def emails(conn):
+    return [row["email"] for row in conn.execute("SELECT email FROM users ORDER BY id")]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(lines, count):
+    for index, line in enumerate(lines):
+        if index == count:
+            raise Interrupted
+        yield line
+
+
+def test_interrupted_import_resumes_after_the_last_committed_batch(conn):
+    lines = ndjson(*({"email": f"user{index}@test.example"} for index in range(5)))
+    batches = []
+
+    with pytest.raises(Interrupted):
+        import_ndjson(conn, interrupt_after(lines, 3), "legacy", batch_size=2, on_batch=batches.append)
+    # Line 3 was parsed but its batch never committed.
+    assert load_checkpoint(conn, "legacy") == 2
+    assert emails(conn) == ["user0@test.example", "user1@test.example"]
+
+    report = import_ndjson(conn, lines, "legacy", batch_size=2, on_batch=batches.append)
+    assert (report["resumed_from_line"], report["lines_read"], report["upserted"]) == (2, 5, 3)
+    assert emails(conn) == [f"user{index}@test.example" for index in range(5)]
+    assert load_checkpoint(conn, "legacy") == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    again = import_ndjson(conn, lines, "legacy", batch_size=2)
+    assert (again["resumed_from_line"], again["upserted"]) == (5, 0)
+
+
+def test_import_without_id_keeps_no_checkpoint(conn):
+    lines = ndjson({"email": "solo@test.example"})
+    import_ndjson(conn, lines)
+    report = import_ndjson(conn, lines)
+    assert (report["resumed_from_line"], report["upserted"]) == (0, 1)
+    assert conn.execute("SELECT COUNT(*) FROM import_checkpoints").fetchone()[0] == 0
+
+
+def test_rejected_row_rolls_back_alone(conn):
+    conn.execute(
+        """
+        CREATE TRIGGER reject_blocked BEFORE INSERT ON users
+        WHEN NEW.email LIKE '%@blocked.example'
+        BEGIN SELECT RAISE(ABORT, 'blocked domain'); END
+        """
+    )
+    import_ndjson(conn, ndjson({"email": "kim@test.example", "google_id": "g-kim"}))
+    report = import_ndjson(
+        conn,
+        ndjson(
+            {"email": "park@test.example", "nickname": "park"},
+            {"email": "spam@blocked.example"},
+            # Kim's google_id under a new e-mail updates Kim's row instead of failing.
+            {"email": "kim@new.example", "google_id": "g-kim", "nickname": "kim"},
+        ),
+        "migration",
+        batch_size=10,
+    )
+
+    assert (report["upserted"], report["skipped"]) == (2, 1)
+    assert report["errors"] == [{"line": 2, "error": "blocked domain"}]
+    rows = {row["email"]: row["nickname"] for row in conn.execute("SELECT * FROM users")}
+    assert rows == {"kim@test.example": "kim", "park@test.example": "park"}
+    assert load_checkpoint(conn, "migration") == 3
+
+
+def test_malformed_lines_are_reported_and_skipped(conn):
+    lines = ["not json\n", "[1, 2]\n", "\n", json.dumps({"nickname": "no email"}) + "\n"] + ndjson(
+        {"email": "ok@test.example"}
+    )
+    report = import_ndjson(conn, lines, max_errors_reported=2)
+    assert (report["upserted"], report["skipped"]) == (1, 3)
+    assert [error["line"] for error in report["errors"]] == [1, 2]
+    assert emails(conn) == ["ok@test.example"]
@@ -0,0 +1,222 @@
+"""Bulk user upsert for migrating accounts from another IdP.
+
+Reads newline-delimited JSON user records and applies them in large
+transactions with ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``. The
+number of consumed lines is committed together with each batch in the
+``import_checkpoints`` table, so re-running an interrupted import with the same
+``import_id`` skips what was already applied::
+
+    python user_import.py users.ndjson --database app.db --import-id legacy-idp
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+IMPORT_CHECKPOINTS_SQL = """
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+    import_id TEXT PRIMARY KEY,
+    lines_done INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+# A row may already exist under the same google_id (e.g. the Google account's
+# e-mail changed) or under the same e-mail (password account linking Google).
+UPSERT_USER_SQL = """
+INSERT INTO users (email, nickname, google_id, google_picture, created_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(google_id) DO UPDATE SET
+    google_picture = COALESCE(excluded.google_picture, google_picture),
+    nickname = COALESCE(excluded.nickname, nickname)
+ON CONFLICT(email) DO UPDATE SET
+    google_id = COALESCE(excluded.google_id, google_id),
+    google_picture = COALESCE(excluded.google_picture, google_picture),
+    nickname = COALESCE(excluded.nickname, nickname)
+RETURNING *
+"""
+
+UserParams = Tuple[str, Optional[str], Optional[str], Optional[str], str]
+
+
+def user_params(record: Dict[str, Any], created_at: str) -> UserParams:
+    email = (record.get("email") or "").strip().lower()
+    if not email:
+        raise ValueError("email is required")
+    nickname = (record.get("nickname") or record.get("name") or "").strip() or None
+    google_id = record.get("google_id") or record.get("sub") or None
+    picture = record.get("google_picture") or record.get("picture") or None
+    return (email, nickname, google_id, picture, created_at)
+
+
+def upsert_user(conn: sqlite3.Connection, params: UserParams) -> sqlite3.Row:
+    return conn.execute(UPSERT_USER_SQL, params).fetchone()
+
+
+def upsert_users(
+    conn: sqlite3.Connection, batch: Sequence[Tuple[int, UserParams]]
+) -> Tuple[List[int], List[Tuple[int, str]]]:
+    """Upserts ``(line, params)`` rows in the caller's transaction.
+
+    Each row runs under its own savepoint, so a row rejected by a constraint or
+    trigger on ``users`` is rolled back alone. (Clashing e-mail/google_id pairs
+    are not such rows: the google_id conflict clause takes them.) Returns the
+    affected ids and ``(line, error)`` failures.
+    """
+    user_ids: List[int] = []
+    failures: List[Tuple[int, str]] = []
+    for line, params in batch:
+        conn.execute("SAVEPOINT import_row")
+        try:
+            user_ids.append(upsert_user(conn, params)["id"])
+        except sqlite3.IntegrityError as exc:
+            conn.execute("ROLLBACK TO import_row")
+            failures.append((line, str(exc)))
+        conn.execute("RELEASE import_row")
+    return user_ids, failures
+
+
+def load_checkpoint(conn: sqlite3.Connection, import_id: str) -> int:
+    row = conn.execute(
+        "SELECT lines_done FROM import_checkpoints WHERE import_id = ?", (import_id,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def save_checkpoint(conn: sqlite3.Connection, import_id: str, lines_done: int) -> None:
+    conn.execute(
+        """
+        INSERT INTO import_checkpoints (import_id, lines_done, updated_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(import_id) DO UPDATE SET
+            lines_done = excluded.lines_done,
+            updated_at = excluded.updated_at
+        """,
+        (import_id, lines_done, datetime.utcnow().isoformat()),
+    )
+
+
+def import_ndjson(
+    conn: sqlite3.Connection,
+    lines: Iterable[Any],
+    import_id: Optional[str] = None,
+    batch_size: int = 5000,
+    max_errors_reported: int = 20,
+    on_batch: Optional[Callable[[List[int]], None]] = None,
+) -> Dict[str, Any]:
+    """Applies NDJSON user records from ``lines`` (``str`` or ``bytes``).
+
+    Each batch and its checkpoint are committed in one ``BEGIN IMMEDIATE``
+    transaction, after which ``on_batch`` receives the ids it touched. Rows that
+    fail to parse or hit a constraint are counted in ``skipped`` and listed in
+    ``errors``; they do not abort the import.
+    Returns a report with counts and rows/second.
+    """
+    conn.execute(IMPORT_CHECKPOINTS_SQL)
+    conn.commit()
+    resume_from = load_checkpoint(conn, import_id) if import_id else 0
+
+    started = time.perf_counter()
+    created_at = datetime.utcnow().isoformat()
+    batch: List[Tuple[int, UserParams]] = []
+    upserted = 0
+    errors: List[Dict[str, Any]] = []
+    skipped = 0
+    line_no = 0
+
+    def record_error(line: int, message: str) -> None:
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < max_errors_reported:
+            errors.append({"line": line, "error": message})
+
+    def flush() -> None:
+        nonlocal upserted
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            user_ids, failures = upsert_users(conn, batch)
+            if import_id:
+                save_checkpoint(conn, import_id, line_no)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        upserted += len(user_ids)
+        for line, message in failures:
+            record_error(line, message)
+        batch.clear()
+        if on_batch is not None:
+            on_batch(user_ids)
+
+    for raw_line in lines:
+        line_no += 1
+        if line_no <= resume_from:
+            continue
+        if isinstance(raw_line, bytes):
+            raw_line = raw_line.decode("utf-8")
+        raw_line = raw_line.strip()
+        if not raw_line:
+            continue
+        try:
+            record = json.loads(raw_line)
+            if not isinstance(record, dict):
+                raise ValueError("record must be a JSON object")
+            batch.append((line_no, user_params(record, created_at)))
+        except ValueError as exc:
+            record_error(line_no, str(exc))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch or (import_id and line_no > resume_from):
+        flush()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "import_id": import_id,
+        "resumed_from_line": resume_from,
+        "lines_read": line_no,
+        "upserted": upserted,
+        "skipped": skipped,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(upserted / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    from auth_common import USERS_TABLE_SQL
+    from db_pool import SQLitePool
+
+    parser = argparse.ArgumentParser(description="Bulk upsert users from an NDJSON file.")
+    parser.add_argument("source", help="NDJSON file with one user object per line ('-' for stdin)")
+    parser.add_argument(
+        "--database",
+        default=os.getenv("DATABASE_URL", os.path.join(os.path.dirname(__file__), "app.db")),
+    )
+    parser.add_argument("--import-id", help="checkpoint key (defaults to the source path)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    pool = SQLitePool(args.database, max_size=1)
+    import_id = args.import_id or (None if args.source == "-" else os.path.abspath(args.source))
+    with pool.connection() as conn:
+        conn.execute(USERS_TABLE_SQL)
+        conn.commit()
+        if args.source == "-":
+            report = import_ndjson(conn, sys.stdin, import_id, args.batch_size)
+        else:
+            with open(args.source, "r", encoding="utf-8") as file:
+                report = import_ndjson(conn, file, import_id, args.batch_size)
+    pool.close()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,50 @@
 import os
 import json
 from datetime import date
-from google import genai
-from google.genai import types
 from pydantic import ValidationError
-from data_schema import MeetingAnalysisResult 
+# data_schema가 hackton/을 sys.path 끝에 추가하므로, hackton 모듈도 그 안에서 쓰는 최상위 이름으로 임포트합니다.
+# (hackton.xxx로 임포트하면 같은 파일이 다른 모듈로 한 번 더 로드되어 클래스와 공용 클라이언트가 둘이 됩니다.)
+from data_schema import MeetingAnalysisResult
+# 속도 제한/재시도/연결 풀을 갖춘 공용 Gemini 클라이언트 (hackton/gemini_client.py)
+from gemini_client import generate_json_async, generate_json_sync, shared_client
+# 한국어 상대 날짜 표현 규칙 기반 해석기 (hackton/korean_dates.py)
+from korean_dates import format_date_hints, quick_extract, resolve_temporal_expressions
+# v1(event_details) <-> v2(next_schedules) 결과 형식 변환 (hackton/meeting_schema)
+from meeting_schema import to_v1
 
 # 1. API 클라이언트 초기화 및 API 키 설정 확인
 try:
     if not os.getenv("GEMINI_API_KEY"):
          raise EnvironmentError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
          
-    client = genai.Client()
+    client = shared_client()
 except Exception as e:
     print(f"❌ 클라이언트 초기화 오류: {e}")
     print("GEMINI_API_KEY 환경 변수가 설정되었는지 확인하세요.")
     exit()
 
-def extract_meeting_data(meeting_text: str, reference_date: str) -> dict:
-    """
-    회의록 텍스트와 기준 날짜를 기반으로 Gemini API를 호출하여 구조화된 JSON을 추출합니다.
-    """
-    
+def build_prompt(meeting_text: str, reference_date: str) -> str:
+    # 규칙 기반으로 계산된 날짜가 있으면 날짜 계산 지시 대신 계산 결과를 힌트로 넣습니다.
+    hints = format_date_hints(resolve_temporal_expressions(meeting_text, reference_date))
+    if hints:
+        date_instruction = (
+            "2.  **날짜 및 시간:** 아래 [날짜 힌트]는 기준 날짜로 이미 계산한 YYYY-MM-DD 절대 날짜(event_date)입니다. "
+            "그대로 사용하고, 힌트에 없는 표현만 기준 날짜로 계산하세요.\n    [날짜 힌트]\n"
+            + "\n".join(f"    {line}" for line in hints.splitlines())
+        )
+    else:
+        date_instruction = (
+            "2.  **날짜 및 시간 계산:** 사건과 관련된 날짜 표현(예: '다음 주 금요일', '모레')을 "
+            "**기준 날짜를 기반으로 계산**하여 YYYY-MM-DD 형식의 절대 날짜(event_date)로 변환하세요."
+        )
+
     # 2. 프롬프트 정의: '사건(Subject)' 중심으로 지시사항 수정
-    prompt = f"""
+    return f"""
     당신은 회의록 분석 및 날짜 계산 전문가입니다. 이 회의록 분석의 **기준 날짜는 {reference_date}** 입니다.
     당신의 주 임무는 Google 캘린더에 등록할 **가장 중요하고 명확한 하나의 사건(일정)**을 추출하는 것입니다.
 
     1.  **사건(event_subject) 추출:** 회의록 내에서 결정된 다음 회의, 마감일, 미팅 준비 등 **가장 핵심적인 하나의 후속 사건의 내용**을 명확하게 추출하세요.
-    2.  **날짜 및 시간 계산:** 사건과 관련된 날짜 표현(예: '다음 주 금요일', '모레')을 **기준 날짜를 기반으로 계산**하여 YYYY-MM-DD 형식의 절대 날짜(event_date)로 변환하세요.
+    {date_instruction}
     3.  **시간 추출:** 추출된 시간(event_time)은 HH:MM (24시간) 형식으로 합니다. 시간이 없다면 10:00을 사용하세요.
     4.  **요약:** 회의록 전체 내용 중 **결론 및 배경**을 담아 3~4문장으로 요약하여 meeting_summary 필드를 채우세요.
 
@@ -38,30 +54,57 @@ def extract_meeting_data(meeting_text: str, reference_date: str) -> dict:
     회의록 텍스트:
     {meeting_text}
     """
-    
-    # 3. 모델 설정 및 API 호출
+
+
+def quick_result(meeting_text: str, reference_date: str) -> dict:
+    """짧고 날짜가 분명한 회의록을 규칙 기반으로 분석합니다. 해당하지 않으면 None."""
+    quick = quick_extract(meeting_text, reference_date)
+    if quick is None:
+        return None
+    # 규칙 기반 결과는 v2 형식이므로 이 스크립트의 v1 형식으로 바꿉니다.
+    return to_v1(quick).model_dump(mode="json")
+
+
+def extract_meeting_data(meeting_text: str, reference_date: str) -> dict:
+    """
+    회의록 텍스트와 기준 날짜를 기반으로 Gemini API를 호출하여 구조화된 JSON을 추출합니다.
+    429/5xx 응답은 공용 클라이언트가 백오프하며 재시도합니다.
+    짧고 날짜가 분명한 회의록은 규칙 기반 해석기로 바로 답하고 API를 호출하지 않습니다.
+    """
+    quick = quick_result(meeting_text, reference_date)
+    if quick is not None:
+        return quick
+
+    # 3. 모델 설정 및 API 호출 + 4. Pydantic을 사용하여 유효성 검사 및 딕셔너리로 변환
     try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=MeetingAnalysisResult,
-            )
-        )
-        
-        # 4. JSON 문자열을 파이썬 딕셔너리로 변환
-        json_data = response.text.strip()
-        
-        # Pydantic을 사용하여 유효성 검사 및 딕셔너리로 변환
-        parsed_data = MeetingAnalysisResult.model_validate_json(json_data).model_dump()
-        
-        return parsed_data
+        return generate_json_sync(
+            build_prompt(meeting_text, reference_date), MeetingAnalysisResult
+        ).model_dump(mode="json")
     
     except ValidationError as e:
         # 모델이 스키마를 따르지 못했을 경우의 오류 처리
         print(f"❌ Pydantic 유효성 검사 오류: 모델이 스키마를 따르지 않았습니다.")
-        print(f"모델 출력 원본: {json_data}")
+        print(f"오류: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ Gemini API 호출 중 오류 발생: {e}")
+        return None
+
+
+async def extract_meeting_data_async(meeting_text: str, reference_date: str) -> dict:
+    """extract_meeting_data()의 비동기 버전. 수백 건을 동시에 요청해도 분당 한도 안에서 처리됩니다."""
+    quick = quick_result(meeting_text, reference_date)
+    if quick is not None:
+        return quick
+
+    try:
+        result = await generate_json_async(
+            build_prompt(meeting_text, reference_date), MeetingAnalysisResult
+        )
+        return result.model_dump(mode="json")
+
+    except ValidationError as e:
+        print("❌ Pydantic 유효성 검사 오류: 모델이 스키마를 따르지 않았습니다.")
         print(f"오류: {e}")
         return None
     except Exception as e:
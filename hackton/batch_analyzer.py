@@ -0,0 +1,325 @@
+"""
+여러 녹음/회의록 파일을 한 번에 분석하는 배치 파이프라인.
+
+    python batch_analyzer.py recordings/                      # 디렉터리 안의 오디오/텍스트 파일 전체
+    python batch_analyzer.py manifest.jsonl --output-dir out  # {"path": ..., "id": ...} 한 줄에 하나
+    python batch_analyzer.py recordings/ --stt-workers 4 --llm-concurrency 16 --queue-size 8
+
+1단계(STT)는 프로세스 풀에서, 2단계(Gemini 추출)는 asyncio I/O로 실행하며 두 단계는
+크기가 제한된 큐로 연결됩니다. 큐가 가득 차면 STT가 잠시 멈추므로(backpressure)
+변환된 회의록이 메모리에 무한히 쌓이지 않고, 두 단계가 동시에 진행됩니다.
+결과(analysis_output_<id>_<타임스탬프>.json)는 파일별로 완료되는 즉시 저장되고,
+마지막에 처리량과 단계별 지연 시간 요약(batch_summary_<타임스탬프>.json)을 남깁니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from meeting_extractor import extract_meeting_data_async, get_client, save_analysis_output
+from stt_module import (
+    STT_LANGUAGE,
+    create_stt_pool,
+    lookup_transcript,
+    stt_settings,
+    store_transcript,
+    transcribe_in_pool,
+)
+
+AUDIO_EXTENSIONS = {".m4a", ".mp3", ".wav", ".flac", ".ogg", ".webm", ".mp4", ".aac"}
+TEXT_EXTENSIONS = {".txt"}
+
+
+@dataclass
+class BatchItem:
+    item_id: str
+    path: str
+    kind: str  # "audio" 또는 "text"
+    transcript: str = ""
+    audio_seconds: float = 0.0
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    stt_cached: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+    enqueued_at: float = 0.0
+    started_at: float = 0.0
+
+
+# ----------------------------------------------------
+# 1. 입력 수집 (디렉터리 또는 매니페스트)
+# ----------------------------------------------------
+
+def _item_for(path: str, item_id: Optional[str] = None) -> Optional[BatchItem]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in AUDIO_EXTENSIONS:
+        kind = "audio"
+    elif ext in TEXT_EXTENSIONS:
+        kind = "text"
+    else:
+        return None
+    stem = item_id or os.path.splitext(os.path.basename(path))[0]
+    return BatchItem(item_id=re.sub(r"[^\w.-]+", "_", stem), path=path, kind=kind)
+
+
+def collect_items(target: str) -> List[BatchItem]:
+    """디렉터리면 지원하는 확장자의 파일을 모두, .jsonl이면 매니페스트로, 그 외에는 단일 파일로 읽습니다."""
+    items: List[BatchItem] = []
+    if os.path.isdir(target):
+        for name in sorted(os.listdir(target)):
+            item = _item_for(os.path.join(target, name))
+            if item is not None:
+                items.append(item)
+    elif target.endswith(".jsonl"):
+        base_dir = os.path.dirname(os.path.abspath(target))
+        with open(target, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                path = entry["path"]
+                if not os.path.isabs(path):
+                    path = os.path.join(base_dir, path)
+                item = _item_for(path, entry.get("id"))
+                if item is None:
+                    print(f"⚠️ 지원하지 않는 파일 형식이라 건너뜁니다: {path}")
+                    continue
+                items.append(item)
+    else:
+        item = _item_for(target)
+        if item is not None:
+            items.append(item)
+
+    # 같은 id가 여러 번 나오면 결과 파일명이 겹치지 않도록 번호를 붙입니다.
+    seen: Dict[str, int] = {}
+    for item in items:
+        count = seen.get(item.item_id, 0)
+        seen[item.item_id] = count + 1
+        if count:
+            item.item_id = f"{item.item_id}_{count}"
+    return items
+
+
+# ----------------------------------------------------
+# 2. 파이프라인 (STT 프로세스 풀 -> 제한 큐 -> Gemini 비동기 호출)
+# ----------------------------------------------------
+
+async def run_batch(
+    items: List[BatchItem],
+    stt_workers: int,
+    llm_concurrency: int,
+    queue_size: int,
+    output_dir: str,
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Optional[BatchItem]]" = asyncio.Queue(maxsize=queue_size)
+    stt_slots = asyncio.Semaphore(stt_workers)
+    pool: Optional[ProcessPoolExecutor] = None
+    model_load_seconds = 0.0
+
+    if any(item.kind == "audio" for item in items):
+        print(f"⏳ STT 프로세스 풀 시작 중 (워커 {stt_workers}개)...")
+        started = time.perf_counter()
+        pool = await loop.run_in_executor(None, create_stt_pool, stt_workers)
+        model_load_seconds = time.perf_counter() - started
+        print(f"✅ STT 프로세스 풀 준비 완료: {model_load_seconds:.1f}초")
+
+    async def transcribe(item: BatchItem) -> None:
+        # 큐에 넣는 것까지 슬롯 안에서 하므로, 큐가 가득 차면 다음 STT가 시작되지 않습니다.
+        async with stt_slots:
+            item.started_at = time.perf_counter()
+            try:
+                if item.kind == "text":
+                    with open(item.path, "r", encoding="utf-8") as f:
+                        item.transcript = f.read()
+                else:
+                    key, cached = await asyncio.to_thread(lookup_transcript, item.path, "file", 1)
+                    if cached is not None:
+                        item.transcript = cached["text"]
+                        item.audio_seconds = cached.get("audio_seconds", 0.0)
+                        item.stt_cached = True
+                    else:
+                        result = await loop.run_in_executor(
+                            pool, transcribe_in_pool, os.path.abspath(item.path), STT_LANGUAGE
+                        )
+                        item.transcript = result["text"]
+                        item.audio_seconds = result["audio_seconds"]
+                        store_transcript(
+                            key,
+                            {
+                                "text": result["text"],
+                                "audio_seconds": result["audio_seconds"],
+                                "settings": stt_settings("file", 1),
+                            },
+                        )
+                        print(
+                            f"🔊 [{item.item_id}] STT 완료: 오디오 {result['audio_seconds']}초 / "
+                            f"처리 {result['elapsed_seconds']}초 (RTF {result['real_time_factor']})"
+                        )
+            except Exception as e:
+                item.error = f"STT 실패: {e}"
+            item.timings["stt"] = time.perf_counter() - item.started_at
+            if item.error is None and not item.transcript.strip():
+                item.error = "STT 결과가 비어 있습니다"
+            if item.error is not None:
+                print(f"❌ [{item.item_id}] {item.error}")
+                return
+            item.enqueued_at = time.perf_counter()
+            await queue.put(item)
+
+    async def produce() -> None:
+        await asyncio.gather(*(transcribe(item) for item in items))
+        for _ in range(llm_concurrency):
+            await queue.put(None)
+
+    async def analyze() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            item.timings["queue_wait"] = time.perf_counter() - item.enqueued_at
+            started = time.perf_counter()
+            extracted_data = await extract_meeting_data_async(item.transcript)
+            item.timings["llm"] = time.perf_counter() - started
+            if extracted_data is None:
+                item.error = "Gemini 추출 실패"
+                print(f"❌ [{item.item_id}] 데이터 추출에 실패했습니다.")
+            else:
+                try:
+                    item.output_path = save_analysis_output(extracted_data, output_dir, item.item_id)
+                    print(f"✅ [{item.item_id}] JSON 파일 저장 성공: {item.output_path}")
+                except IOError as e:
+                    item.error = f"JSON 파일 저장 오류: {e}"
+                    print(f"❌ [{item.item_id}] {item.error}")
+            item.timings["total"] = time.perf_counter() - item.started_at
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(produce(), *(analyze() for _ in range(llm_concurrency)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    wall_seconds = time.perf_counter() - started
+
+    return summarize(
+        items,
+        wall_seconds,
+        {
+            "stt_workers": stt_workers,
+            "llm_concurrency": llm_concurrency,
+            "queue_size": queue_size,
+            "stt_pool_start_seconds": round(model_load_seconds, 3),
+        },
+    )
+
+
+# ----------------------------------------------------
+# 3. 요약 (처리량, 단계별 지연 시간)
+# ----------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def summarize(items: List[BatchItem], wall_seconds: float, settings: Dict[str, Any]) -> Dict[str, Any]:
+    succeeded = [item for item in items if item.output_path]
+    audio_seconds = sum(item.audio_seconds for item in items)
+    stages = {
+        stage: latency_stats([item.timings[stage] for item in items if stage in item.timings])
+        for stage in ("stt", "queue_wait", "llm", "total")
+    }
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": settings,
+        "files": len(items),
+        "succeeded": len(succeeded),
+        "failed": len(items) - len(succeeded),
+        "stt_cache_hits": sum(1 for item in items if item.stt_cached),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_files_per_minute": round(len(succeeded) / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        "audio_seconds_total": round(audio_seconds, 3),
+        "audio_seconds_per_wall_second": round(audio_seconds / wall_seconds, 3) if wall_seconds else 0.0,
+        "stages_seconds": stages,
+        "items": [
+            {
+                "id": item.item_id,
+                "path": item.path,
+                "kind": item.kind,
+                "output": item.output_path,
+                "error": item.error,
+                "stt_cached": item.stt_cached,
+                "timings": {name: round(value, 3) for name, value in item.timings.items()},
+            }
+            for item in items
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="회의 녹음/회의록 배치 분석 파이프라인")
+    parser.add_argument("target", help="오디오/텍스트 파일이 있는 디렉터리, .jsonl 매니페스트 또는 단일 파일")
+    parser.add_argument("--output-dir", default=".", help="analysis_output_*.json을 저장할 디렉터리")
+    parser.add_argument("--stt-workers", type=int, default=max(1, (os.cpu_count() or 1) // 4))
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=4, help="STT와 Gemini 단계 사이 큐 크기")
+    args = parser.parse_args()
+
+    items = collect_items(args.target)
+    if not items:
+        parser.error(f"분석할 파일이 없습니다: {args.target}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # API 클라이언트 초기화 (환경 변수 GEMINI_API_KEY 사용)
+    try:
+        get_client()
+    except Exception as e:
+        print(f"❌ 클라이언트 초기화 오류: {e}")
+        raise SystemExit(1)
+
+    print(f"--- 배치 분석 시작: 파일 {len(items)}개 ---")
+    summary = asyncio.run(
+        run_batch(
+            items,
+            max(1, args.stt_workers),
+            max(1, args.llm_concurrency),
+            max(1, args.queue_size),
+            args.output_dir,
+        )
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_path = os.path.join(args.output_dir, f"batch_summary_{timestamp}.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=4)
+
+    print(
+        f"\n✅ 완료: {summary['succeeded']}/{summary['files']}개 성공, "
+        f"{summary['wall_seconds']}초, {summary['throughput_files_per_minute']}개/분"
+    )
+    for stage, stats in summary["stages_seconds"].items():
+        print(f"  {stage:<10} p50 {stats['p50']:>8.2f}초  p95 {stats['p95']:>8.2f}초  max {stats['max']:>8.2f}초")
+    print(f"✅ 요약 저장: {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
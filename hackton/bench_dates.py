@@ -0,0 +1,161 @@
+"""
+korean_dates.py 규칙 기반 날짜 해석기의 정확도/지연 시간 벤치마크.
+
+    python bench_dates.py                          # date_corpus.jsonl 전체
+    python bench_dates.py --repeat 200 --verbose   # 틀린 문장 출력
+    python bench_dates.py --output bench_dates_result.json
+
+말뭉치의 각 줄은 {"text", "reference_date", "expected": {"next_schedule_date", "start_time"} | null}
+형식이며, 해석기가 신뢰도 HINT_MIN_CONFIDENCE 이상으로 내놓은 첫 번째 후보를 예측값으로 봅니다.
+quick_extract()가 LLM 없이 답한 비율(적용률)과, 날짜 정확도와 따로 그 답들만의 정밀도를 계산합니다.
+정밀도에는 답하지 말아야 할 문장(부정, "보낼게요"처럼 날짜 말이 든 동사 등)에 답한 경우가 오답으로 들어가며,
+그런 문장 수(negative_cases)와 그중 답해 버린 수(false_positives)도 따로 보고합니다.
+"quick" 키가 있는 줄은 quick_extract()의 회귀 사례입니다: null이면 LLM으로 넘겨야 하고(취소, 부정,
+과거형, 질문 등), dict이면 그 날짜/시간/제목으로 답해야 합니다. 하나라도 어긋나면 종료 코드 1로 끝납니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from korean_dates import HINT_MIN_CONFIDENCE, quick_extract, resolve_temporal_expressions
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "date_corpus.jsonl")
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def predict(case: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    for candidate in resolve_temporal_expressions(case["text"], case["reference_date"]):
+        if candidate.confidence >= HINT_MIN_CONFIDENCE:
+            return {"next_schedule_date": candidate.next_schedule_date, "start_time": candidate.start_time}
+    return None
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="한국어 날짜 표현 해석기 정확도/지연 시간 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=100, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--verbose", action="store_true", help="틀린 문장을 출력")
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    date_hits = time_hits = exact_hits = false_positives = misses = 0
+    quick_answered = quick_correct = quick_false_positives = quick_negatives = 0
+    mistakes = []
+    quick_regressions = []
+
+    for case in corpus:
+        expected = case["expected"]
+        predicted = predict(case)
+        if expected is None:
+            if predicted is None:
+                date_hits += 1
+                time_hits += 1
+                exact_hits += 1
+            else:
+                false_positives += 1
+                mistakes.append({**case, "predicted": predicted})
+        elif predicted is None:
+            misses += 1
+            mistakes.append({**case, "predicted": None})
+        else:
+            same_date = predicted["next_schedule_date"] == expected["next_schedule_date"]
+            same_time = predicted["start_time"] == expected["start_time"]
+            date_hits += same_date
+            time_hits += same_time
+            exact_hits += same_date and same_time
+            if not (same_date and same_time):
+                mistakes.append({**case, "predicted": predicted})
+
+        quick = quick_extract(case["text"], case["reference_date"])
+        # 시간만 있는 발화처럼 해석기 기대값과 quick 기대값이 다른 경우 quick 쪽이 정답입니다.
+        truth = case.get("quick", expected)
+        quick_negatives += truth is None
+        if quick is not None:
+            quick_answered += 1
+            schedule = quick["next_schedules"][0]
+            # 답하지 말아야 할 발화(부정, 날짜 말이 든 동사 등)에 답하면 Gemini 없이 틀린 일정이 확정됩니다.
+            quick_false_positives += truth is None
+            if truth is not None and schedule["next_schedule_date"] == truth["next_schedule_date"] and (
+                schedule["start_time"] == (truth["start_time"] or "10:00")
+            ):
+                quick_correct += 1
+        if "quick" in case:
+            actual = None
+            if quick is not None:
+                schedule = quick["next_schedules"][0]
+                actual = {key: schedule[key] for key in ("next_schedule_date", "start_time", "event_title")}
+            if actual != case["quick"]:
+                quick_regressions.append({**case, "quick_actual": actual})
+
+    # 지연 시간: 말뭉치 전체를 repeat번 해석하며 문장당 시간을 잽니다.
+    latencies = []
+    for _ in range(args.repeat):
+        for case in corpus:
+            started = time.perf_counter()
+            resolve_temporal_expressions(case["text"], case["reference_date"])
+            latencies.append((time.perf_counter() - started) * 1e6)
+
+    total = len(corpus)
+    result = {
+        "cases": total,
+        "accuracy": {
+            "date": round(date_hits / total, 4),
+            "time": round(time_hits / total, 4),
+            "exact": round(exact_hits / total, 4),
+            "false_positives": false_positives,
+            "misses": misses,
+        },
+        "quick_extract": {
+            "answered": quick_answered,
+            "coverage": round(quick_answered / total, 4),
+            # 날짜 정확도(accuracy)와 별개로, Gemini를 건너뛴 답만 놓고 잰 정밀도입니다.
+            "precision": round(quick_correct / quick_answered, 4) if quick_answered else 0.0,
+            "negative_cases": quick_negatives,
+            "false_positives": quick_false_positives,
+            "regressions": len(quick_regressions),
+        },
+        "latency_us": {
+            "mean": round(sum(latencies) / len(latencies), 1),
+            "p50": round(percentile(latencies, 0.50), 1),
+            "p95": round(percentile(latencies, 0.95), 1),
+            "p99": round(percentile(latencies, 0.99), 1),
+        },
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "corpus": os.path.basename(args.corpus),
+            "repeat": args.repeat,
+        },
+    }
+
+    print(f"--- bench_dates: {total}문장 ---")
+    print(json.dumps({key: value for key, value in result.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.verbose:
+        for mistake in mistakes:
+            print(f"❌ {mistake['text']} ({mistake['reference_date']}): 기대 {mistake['expected']} / 예측 {mistake['predicted']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({**result, "mistakes": mistakes, "quick_regressions": quick_regressions}, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+    for regression in quick_regressions:
+        print(f"❌ quick_extract 회귀: {regression['text']}: 기대 {regression['quick']} / 실제 {regression['quick_actual']}")
+    if quick_regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+schedule_store.py 적재/조회 지연 시간 벤치마크 (기본 100만 일정).
+
+    python bench_schedule_store.py                         # 임시 DB에 100만 건 적재 후 조회 측정
+    python bench_schedule_store.py --events 200000 --queries 500 --explain
+    python bench_schedule_store.py --output bench_schedule_store_result.json
+
+조회 항목
+- week:             전체 사용자, 일주일 범위 첫 페이지(50건)
+- week_user:        한 사용자의 일주일 범위 첫 페이지
+- title_prefix:     제목 앞부분 일치 첫 페이지
+- keyset_page_100:  커서로 100페이지째 (커서를 미리 받아 둔 상태에서 한 페이지 조회)
+- offset_page_100:  비교용 LIMIT/OFFSET 100페이지째
+- week_count:       일주일 범위 COUNT(*)
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from schedule_store import ScheduleStore
+
+TOPICS = ["예산", "마케팅", "로그인", "QA", "배포", "디자인", "채용", "보안", "데이터", "고객"]
+KINDS = ["회의", "점검", "보고", "리뷰", "워크숍", "마감"]
+START = date(2025, 1, 1)
+DAYS = 730
+
+
+def generate(events: int, users: int, seed: int = 0) -> Iterator[Tuple[Dict[str, Any], str]]:
+    rng = random.Random(seed)
+    produced = 0
+    meeting = 0
+    while produced < events:
+        count = min(rng.randint(1, 4), events - produced)
+        schedules = []
+        for _ in range(count):
+            topic, kind = rng.choice(TOPICS), rng.choice(KINDS)
+            schedules.append(
+                {
+                    "next_schedule_date": (START + timedelta(days=rng.randrange(DAYS))).isoformat(),
+                    "start_time": f"{rng.randint(8, 19):02d}:{rng.choice([0, 30]):02d}",
+                    "event_title": f"{topic} {kind} {meeting % 1000}",
+                    "event_content": f"{topic} 관련 후속 {kind}입니다.",
+                }
+            )
+        yield {"meeting_summary": f"회의 {meeting} 요약", "next_schedules": schedules}, f"user{rng.randrange(users)}"
+        produced += count
+        meeting += 1
+
+
+def measure(queries: int, func: Callable[[random.Random], Any]) -> Dict[str, float]:
+    rng = random.Random(1)
+    latencies: List[float] = []
+    for _ in range(queries):
+        started = time.perf_counter()
+        func(rng)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+    }
+
+
+def random_week(rng: random.Random) -> Tuple[str, str]:
+    start = START + timedelta(days=rng.randrange(DAYS - 7))
+    return start.isoformat(), (start + timedelta(days=6)).isoformat()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일정 저장소 적재/조회 벤치마크")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=20_000, help="트랜잭션당 회의 수")
+    parser.add_argument("--db", help="DB 경로 (기본: 임시 파일, 끝나면 삭제)")
+    parser.add_argument("--explain", action="store_true", help="주요 조회의 실행 계획 출력")
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    directory = None
+    path = args.db
+    if path is None:
+        directory = tempfile.mkdtemp(prefix="bench_schedule_store_")
+        path = os.path.join(directory, "schedules.db")
+    store = ScheduleStore(path)
+
+    print(f"--- bench_schedule_store: 일정 {args.events:,}건 적재 중 ({path}) ---")
+    started = time.perf_counter()
+    batch: List[Tuple[Dict[str, Any], str]] = []
+    meetings = 0
+    for record in generate(args.events, args.users):
+        batch.append(record)
+        if len(batch) >= args.batch:
+            meetings += store.ingest_many(batch)["added"]
+            batch = []
+    if batch:
+        meetings += store.ingest_many(batch)["added"]
+    ingest_seconds = time.perf_counter() - started
+
+    # 같은 데이터를 다시 넣으면 전부 건너뛰어야 합니다 (멱등성).
+    sample = [record for _, record in zip(range(10_000), generate(args.events, args.users))]
+    started = time.perf_counter()
+    again = store.ingest_many(sample)
+    reingest_seconds = time.perf_counter() - started
+
+    # 100페이지째 커서를 미리 구해 둡니다.
+    cursors = []
+    for week_seed in range(5):
+        week = random_week(random.Random(week_seed))
+        cursor = None
+        for _ in range(99):
+            cursor = store.query(*week, cursor=cursor)["next_cursor"]
+            if cursor is None:
+                break
+        if cursor:
+            cursors.append((week, cursor))
+
+    conn = store._conn
+    cases: Dict[str, Callable[[random.Random], Any]] = {
+        "week": lambda rng: store.query(*random_week(rng)),
+        "week_user": lambda rng: store.query(*random_week(rng), user_id=f"user{rng.randrange(args.users)}"),
+        "title_prefix": lambda rng: store.query(title=f"{rng.choice(TOPICS)} {rng.choice(KINDS)}"),
+        "offset_page_100": lambda rng: conn.execute(
+            "SELECT * FROM schedules WHERE schedule_date BETWEEN ? AND ?"
+            " ORDER BY schedule_date, start_time, id LIMIT 50 OFFSET 4950",
+            random_week(rng),
+        ).fetchall(),
+        "week_count": lambda rng: conn.execute(
+            "SELECT COUNT(*) FROM schedules WHERE schedule_date BETWEEN ? AND ?", random_week(rng)
+        ).fetchone(),
+    }
+    if cursors:
+        def keyset_page(rng: random.Random) -> Any:
+            week, cursor = rng.choice(cursors)
+            return store.query(*week, cursor=cursor)
+
+        cases["keyset_page_100"] = keyset_page
+
+    results = {name: measure(args.queries, func) for name, func in cases.items()}
+    stats = store.stats()
+
+    if args.explain:
+        week = random_week(random.Random(0))
+        for label, sql, params in [
+            ("week", "SELECT * FROM schedules WHERE schedule_date >= ? AND schedule_date <= ? ORDER BY schedule_date, start_time, id LIMIT 51", week),
+            ("week_user", "SELECT * FROM schedules WHERE user_id = ? AND schedule_date >= ? AND schedule_date <= ? ORDER BY schedule_date, start_time, id LIMIT 51", ("user1", *week)),
+            ("title_prefix", "SELECT * FROM schedules WHERE title >= ? AND title < ? ORDER BY schedule_date, start_time, id LIMIT 51", ("예산", "예산\U0010ffff")),
+            ("keyset", "SELECT * FROM schedules WHERE schedule_date <= ? AND (schedule_date, start_time, id) > (?, ?, ?) ORDER BY schedule_date, start_time, id LIMIT 51", (week[1], week[0], "12:00", 1)),
+        ]:
+            plan = " / ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            print(f"  [{label}] {plan}")
+
+    store.close()
+    size_mb = sum(
+        os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix)
+    ) / 1024 / 1024
+    result = {
+        "events": stats["schedules"],
+        "meetings": stats["meetings"],
+        "users": stats["users"],
+        "ingest": {
+            "seconds": round(ingest_seconds, 2),
+            "events_per_second": round(stats["schedules"] / ingest_seconds),
+            "reingest_10k_meetings_seconds": round(reingest_seconds, 3),
+            "reingest_added": again["added"],
+            "reingest_skipped": again["skipped"],
+        },
+        "db_size_mb": round(size_mb, 1),
+        "queries": results,
+        "meta": {"timestamp": datetime.now().isoformat(timespec="seconds"), "queries_per_case": args.queries},
+    }
+    print(json.dumps({key: value for key, value in result.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+    if directory is not None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
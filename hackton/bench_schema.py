@@ -0,0 +1,142 @@
+"""
+meeting_schema 검증 비용 마이크로 벤치마크 (1,000건당 시간).
+
+    python bench_schema.py
+    python bench_schema.py --records 5000 --rounds 7 --output bench_schema_result.json
+
+비교 항목
+- legacy_str:            예전 data_schema.py처럼 날짜/시간이 str인 모델 (건별 검증)
+- legacy_str_then_parse: 위 결과를 소비하는 쪽에서 strptime으로 다시 파싱하는 비용까지 포함
+- typed_per_record:      date/time 타입 모델 건별 model_validate
+- typed_bulk:            validate_many() - 목록 전체를 한 번에 검증
+- json_loads_then_bulk:  저장된 JSON 바이트를 json.loads 한 뒤 validate_many()
+- typed_bulk_json:       validate_many_json() - JSON 바이트를 json.loads 없이 바로 검증
+- upgrade_v1_to_v2:      v1(event_details) 레코드를 v2로 변환(검증 포함)
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from pydantic import BaseModel, Field
+
+from meeting_schema import (
+    MeetingAnalysisResult,
+    response_schema,
+    to_v2,
+    validate_many,
+    validate_many_json,
+)
+
+
+class LegacyNextSchedule(BaseModel):
+    next_schedule_date: str = Field(...)
+    start_time: str = Field("10:00")
+    event_title: str = Field(...)
+    event_content: str = Field(...)
+
+
+class LegacyMeetingAnalysisResult(BaseModel):
+    meeting_summary: str = Field(...)
+    next_schedules: List[LegacyNextSchedule] = Field(...)
+
+
+def make_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    start = date(2025, 11, 5)
+    records = []
+    for index in range(count):
+        schedules = [
+            {
+                "next_schedule_date": (start + timedelta(days=rng.randint(0, 60))).isoformat(),
+                "start_time": f"{rng.randint(8, 19):02d}:{rng.choice([0, 30]):02d}",
+                "event_title": f"후속 회의 {index}-{number}",
+                "event_content": "로그인 기능 통합테스트 상황 점검과 UI 최종 확정을 위한 회의입니다.",
+            }
+            for number in range(rng.randint(1, 3))
+        ]
+        records.append({"meeting_summary": f"회의 {index} 요약입니다. " * 3, "next_schedules": schedules})
+    return records
+
+
+def to_v1_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    schedule = record["next_schedules"][0]
+    return {
+        "event_details": {
+            "event_date": schedule["next_schedule_date"],
+            "event_time": schedule["start_time"],
+            "event_subject": schedule["event_title"],
+        },
+        "meeting_summary": record["meeting_summary"],
+    }
+
+
+def best_of(rounds: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="meeting_schema 검증 비용 마이크로 벤치마크")
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5, help="반복 측정 후 최솟값 사용")
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    payload = json.dumps(records, ensure_ascii=False).encode("utf-8")
+    v1_records = [to_v1_record(record) for record in records]
+
+    def legacy_then_parse() -> None:
+        for record in records:
+            result = LegacyMeetingAnalysisResult.model_validate(record)
+            for schedule in result.next_schedules:
+                datetime.strptime(f"{schedule.next_schedule_date} {schedule.start_time}", "%Y-%m-%d %H:%M")
+
+    cases = {
+        "legacy_str": lambda: [LegacyMeetingAnalysisResult.model_validate(record) for record in records],
+        "legacy_str_then_parse": legacy_then_parse,
+        "typed_per_record": lambda: [MeetingAnalysisResult.model_validate(record) for record in records],
+        "typed_bulk": lambda: validate_many(records, MeetingAnalysisResult),
+        "json_loads_then_bulk": lambda: validate_many(json.loads(payload), MeetingAnalysisResult),
+        "typed_bulk_json": lambda: validate_many_json(payload, MeetingAnalysisResult),
+        "upgrade_v1_to_v2": lambda: [to_v2(record) for record in v1_records],
+    }
+
+    # 캐시/검증기 준비를 측정에서 빼기 위해 한 번씩 먼저 실행합니다.
+    for func in cases.values():
+        func()
+    per_thousand_ms = {
+        name: round(best_of(args.rounds, func) / args.records * 1000 * 1000, 3) for name, func in cases.items()
+    }
+
+    schema_calls = 200
+    uncached = best_of(args.rounds, lambda: [MeetingAnalysisResult.model_json_schema() for _ in range(schema_calls)])
+    cached = best_of(args.rounds, lambda: [response_schema(MeetingAnalysisResult) for _ in range(schema_calls)])
+
+    result = {
+        "records": args.records,
+        "ms_per_1000_records": per_thousand_ms,
+        "response_schema_us_per_call": {
+            "model_json_schema": round(uncached / schema_calls * 1e6, 2),
+            "cached": round(cached / schema_calls * 1e6, 3),
+        },
+        "meta": {"timestamp": datetime.now().isoformat(timespec="seconds"), "rounds": args.rounds},
+    }
+    print(f"--- bench_schema: {args.records}건, {args.rounds}회 중 최솟값 ---")
+    print(json.dumps({key: value for key, value in result.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
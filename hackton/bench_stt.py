@@ -0,0 +1,136 @@
+"""
+병렬 STT 벤치마크: 워커(프로세스) 수에 따른 변환 속도 향상을 측정합니다.
+
+    python bench_stt.py                          # voice.m4a, 워커 1,2,4,... 코어 수까지
+    python bench_stt.py --workers 1,8,16,32 --output stt_bench.json
+
+각 워커 수마다 ParallelTranscriber를 새로 띄워(모델 로드 시간은 별도 기록)
+같은 파일을 변환하고, 워커 1개 대비 속도 향상과 코어당 효율을 계산합니다.
+기준값으로 모든 코어를 쓰는 단일 transcribe_file() 호출도 함께 측정합니다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from stt_module import (
+    STT_LANGUAGE,
+    STT_MODEL_NAME,
+    ParallelTranscriber,
+    load_whisper_model,
+    transcribe_file,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_worker_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def run_sequential(audio_path: str, model_name: str) -> Dict[str, Any]:
+    model, load_seconds = load_whisper_model(model_name, os.cpu_count() or 1)
+    result = transcribe_file(model, audio_path, STT_LANGUAGE)
+    result["model_load_seconds"] = round(load_seconds, 3)
+    result["text_length"] = len(result.pop("text"))
+    return result
+
+
+def run_parallel(audio_path: str, model_name: str, workers: int) -> Dict[str, Any]:
+    engine = ParallelTranscriber(model_name, workers)
+    try:
+        engine.start()
+        result = engine.transcribe(audio_path, STT_LANGUAGE)
+    finally:
+        engine.shutdown()
+    return {
+        "workers": workers,
+        "threads_per_worker": engine.threads_per_worker,
+        "model_load_seconds": round(engine.model_load_seconds or 0.0, 3),
+        "audio_seconds": result["audio_seconds"],
+        "elapsed_seconds": result["elapsed_seconds"],
+        "real_time_factor": result["real_time_factor"],
+        "chunks": len({segment["window_start"] for segment in result["segments"]}),
+        "text_length": len(result["text"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="병렬 STT 속도 향상 벤치마크")
+    parser.add_argument("--audio", default=os.path.join(HERE, "voice.m4a"))
+    parser.add_argument("--model", default=STT_MODEL_NAME)
+    parser.add_argument("--workers", help="쉼표로 구분한 워커 수 목록 (기본: 1,2,4,...,코어 수)")
+    parser.add_argument("--skip-sequential", action="store_true", help="단일 호출 기준 측정 생략")
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.audio):
+        parser.error(f"오디오 파일을 찾을 수 없습니다: {args.audio}")
+    worker_counts = (
+        [int(value) for value in args.workers.split(",") if value.strip()]
+        if args.workers
+        else default_worker_counts()
+    )
+
+    print(f"--- bench_stt: {os.path.basename(args.audio)} / 모델 {args.model} / 코어 {os.cpu_count()} ---")
+    sequential = None
+    if not args.skip_sequential:
+        sequential = run_sequential(args.audio, args.model)
+        print(
+            f"  단일 호출      {sequential['elapsed_seconds']:>8.2f}초  "
+            f"RTF {sequential['real_time_factor']}"
+        )
+
+    runs: List[Dict[str, Any]] = []
+    for workers in worker_counts:
+        run = run_parallel(args.audio, args.model, workers)
+        base = runs[0]["elapsed_seconds"] if runs else run["elapsed_seconds"]
+        run["speedup"] = round(base / run["elapsed_seconds"], 2) if run["elapsed_seconds"] else None
+        run["efficiency"] = round(run["speedup"] / workers, 2) if run["speedup"] else None
+        if sequential:
+            run["speedup_vs_sequential"] = round(
+                sequential["elapsed_seconds"] / run["elapsed_seconds"], 2
+            )
+        runs.append(run)
+        print(
+            f"  워커 {workers:>3} x {run['threads_per_worker']:>2}스레드  "
+            f"{run['elapsed_seconds']:>8.2f}초  RTF {run['real_time_factor']}  "
+            f"속도 향상 {run['speedup']}x  효율 {run['efficiency']}"
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "audio": os.path.basename(args.audio),
+            "model": args.model,
+        },
+        "sequential": sequential,
+        "parallel": runs,
+        # ru_maxrss는 KiB 단위의 최고 사용량(누적)입니다. 자식은 병렬 워커 중 최대값입니다.
+        "peak_rss_mb": {
+            "main": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "workers": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        },
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
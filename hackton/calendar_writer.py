@@ -0,0 +1,403 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import unicodedata
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from meeting_schema import NextSchedule, to_v2
+
+# ----------------------------------------------------
+# Google Calendar 일괄 업로드 (배치 요청 + 멱등 키 + 적응형 동시성)
+# ----------------------------------------------------
+
+# README 3단계 "데이터를 Google Calendar에 저장"을 담당합니다.
+# - 일정 하나당 events.insert를 따로 보내지 않고, 최대 50건을 multipart/mixed 배치 요청
+#   하나로 묶어 하나의 httpx 연결 풀로 보냅니다.
+# - 이벤트 id를 (캘린더, 날짜, 시간, 제목)에서 만들어 직접 지정합니다. 같은 일정을 다시 보내면
+#   Calendar가 409(이미 존재)로 거절하므로, 재시도나 재실행으로 일정이 중복 생성되지 않습니다.
+# - 할당량 초과(403 rateLimitExceeded / 429)를 받으면 동시에 보내는 배치 수를 절반으로 줄이고,
+#   문제없이 끝난 배치가 쌓이면 천천히 늘립니다. (AIMD)
+# CALENDAR_BASE_URL을 바꾸면 loadtest_calendar.py의 가짜 Calendar 서버로도 그대로 테스트할 수 있습니다.
+
+CALENDAR_BASE_URL = os.getenv("CALENDAR_BASE_URL", "https://www.googleapis.com")
+GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+CALENDAR_TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
+CALENDAR_EVENT_MINUTES = int(os.getenv("CALENDAR_EVENT_MINUTES", "60"))
+CALENDAR_BATCH_SIZE = int(os.getenv("CALENDAR_BATCH_SIZE", "50"))  # Calendar 권장 상한 50
+CALENDAR_MAX_CONCURRENCY = int(os.getenv("CALENDAR_MAX_CONCURRENCY", "8"))
+CALENDAR_MAX_RETRIES = int(os.getenv("CALENDAR_MAX_RETRIES", "6"))
+CALENDAR_TIMEOUT = float(os.getenv("CALENDAR_TIMEOUT", "30"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"}
+
+_SPACES = re.compile(r"\s+")
+
+
+# ----------------------------------------------------
+# 1. 멱등 키와 이벤트 본문
+# ----------------------------------------------------
+
+def event_id_for(schedule: NextSchedule, calendar_id: str = GOOGLE_CALENDAR_ID) -> str:
+    """
+    일정 내용에서 Calendar 이벤트 id를 만듭니다. (base32hex 소문자 52자: Calendar id 규칙 a-v, 0-9)
+    본문(event_content)은 분석할 때마다 표현이 달라질 수 있어 키에서 뺍니다.
+    """
+    title = _SPACES.sub(" ", unicodedata.normalize("NFC", schedule.event_title)).strip().casefold()
+    material = "|".join(
+        [calendar_id, schedule.next_schedule_date.isoformat(), schedule.start_time.strftime("%H:%M"), title]
+    )
+    digest = hashlib.sha256(material.encode("utf-8")).digest()
+    return base64.b32hexencode(digest).decode("ascii").rstrip("=").lower()
+
+
+def event_body(
+    schedule: NextSchedule,
+    event_id: str,
+    timezone: str = CALENDAR_TIMEZONE,
+    duration_minutes: int = CALENDAR_EVENT_MINUTES,
+) -> Dict[str, Any]:
+    start = datetime.combine(schedule.next_schedule_date, schedule.start_time)
+    end = start + timedelta(minutes=duration_minutes)
+    return {
+        "id": event_id,
+        "summary": schedule.event_title,
+        "description": schedule.event_content,
+        "start": {"dateTime": start.isoformat(timespec="seconds"), "timeZone": timezone},
+        "end": {"dateTime": end.isoformat(timespec="seconds"), "timeZone": timezone},
+    }
+
+
+# ----------------------------------------------------
+# 2. multipart/mixed 배치 요청 만들기/읽기
+# ----------------------------------------------------
+
+def encode_batch(parts: List[Tuple[str, str, Dict[str, Any]]], boundary: str) -> bytes:
+    """(content_id, 경로, JSON 본문) 목록을 Google 배치 요청 본문으로 만듭니다."""
+    chunks: List[str] = []
+    for content_id, path, body in parts:
+        payload = json.dumps(body, ensure_ascii=False)
+        chunks.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <{content_id}>\r\n"
+            "\r\n"
+            f"POST {path} HTTP/1.1\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            f"{payload}\r\n"
+        )
+    chunks.append(f"--{boundary}--\r\n")
+    return "".join(chunks).encode("utf-8")
+
+
+def boundary_of(content_type: str) -> Optional[str]:
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    return match.group(1) if match else None
+
+
+def parse_batch(body: bytes, boundary: str) -> List[Dict[str, Any]]:
+    """
+    배치 응답(또는 요청)을 파트별 dict로 나눕니다.
+    {"content_id", "start_line", "status"(응답일 때), "headers", "body"(JSON이면 dict)}
+    """
+    parts: List[Dict[str, Any]] = []
+    delimiter = f"--{boundary}".encode("ascii")
+    for raw in body.split(delimiter)[1:]:
+        if raw.startswith(b"--"):
+            break
+        raw = raw.lstrip(b"\r\n")
+        outer, _, inner = raw.partition(b"\r\n\r\n")
+        content_id = None
+        for line in outer.decode("utf-8", "replace").split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                content_id = value.strip().strip("<>")
+        head, _, payload = inner.partition(b"\r\n\r\n")
+        lines = head.decode("utf-8", "replace").split("\r\n")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        payload = payload.rstrip(b"\r\n")
+        try:
+            parsed: Any = json.loads(payload) if payload else None
+        except ValueError:
+            parsed = payload.decode("utf-8", "replace")
+        status = None
+        if lines[0].startswith("HTTP/"):
+            status = int(lines[0].split()[1])
+        parts.append(
+            {"content_id": content_id, "start_line": lines[0], "status": status, "headers": headers, "body": parsed}
+        )
+    return parts
+
+
+def is_rate_limited(status: Optional[int], body: Any) -> bool:
+    if status == 429:
+        return True
+    if status != 403 or not isinstance(body, dict):
+        return False
+    errors = (body.get("error") or {}).get("errors") or []
+    return any(error.get("reason") in RATE_LIMIT_REASONS for error in errors if isinstance(error, dict))
+
+
+# ----------------------------------------------------
+# 3. 적응형 동시성 (AIMD)
+# ----------------------------------------------------
+
+class AdaptiveConcurrency:
+    """동시에 보낼 배치 수. 할당량 초과 시 절반으로 줄이고, 한도만큼 배치가 성공할 때마다 1씩 늘립니다."""
+
+    def __init__(self, initial: float, minimum: float = 1.0, maximum: float = 64.0) -> None:
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = min(self.maximum, max(minimum, initial))
+        self.peak = self.limit
+        self.decreases = 0
+        self._last_decrease = 0.0
+
+    @property
+    def slots(self) -> int:
+        return max(1, int(self.limit))
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        self.peak = max(self.peak, self.limit)
+
+    def on_throttle(self) -> None:
+        # 같은 시점에 동시에 돌던 배치들이 한꺼번에 429를 받아도 한 번만 줄입니다.
+        now = time.monotonic()
+        if now - self._last_decrease < 0.2:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+        self.decreases += 1
+
+
+# ----------------------------------------------------
+# 4. 업로드
+# ----------------------------------------------------
+
+@dataclass
+class _PendingEvent:
+    event_id: str
+    body: Dict[str, Any]
+    attempts: int = 0
+
+
+@dataclass
+class UploadReport:
+    created: List[str] = field(default_factory=list)
+    duplicates: List[str] = field(default_factory=list)  # 이미 캘린더에 있던 일정 (재실행/재시도)
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        return {"created": len(self.created), "duplicates": len(self.duplicates), "failed": len(self.failed)}
+
+
+class CalendarWriter:
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        calendar_id: str = GOOGLE_CALENDAR_ID,
+        base_url: str = CALENDAR_BASE_URL,
+        batch_size: int = CALENDAR_BATCH_SIZE,
+        max_concurrency: int = CALENDAR_MAX_CONCURRENCY,
+        max_retries: int = CALENDAR_MAX_RETRIES,
+        timeout: float = CALENDAR_TIMEOUT,
+        timezone: str = CALENDAR_TIMEZONE,
+        duration_minutes: int = CALENDAR_EVENT_MINUTES,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.access_token = access_token or os.getenv("GOOGLE_CALENDAR_TOKEN")
+        if not self.access_token:
+            raise EnvironmentError("GOOGLE_CALENDAR_TOKEN 환경 변수(OAuth 액세스 토큰)가 설정되지 않았습니다.")
+        self.calendar_id = calendar_id
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = max(1, min(batch_size, 50))
+        self.max_retries = max_retries
+        self.timezone = timezone
+        self.duration_minutes = duration_minutes
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.concurrency = AdaptiveConcurrency(initial=max(1, max_concurrency // 2), maximum=max_concurrency)
+        self.events_path = f"/calendar/v3/calendars/{quote(calendar_id, safe='')}/events"
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+        self.http_requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "CalendarWriter":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    async def _send(
+        self, batch: List[_PendingEvent]
+    ) -> Tuple[List[Tuple[_PendingEvent, Optional[int], Any]], Optional[float]]:
+        """
+        배치 하나를 보내고 ([(일정, 상태 코드, 응답 본문)], Retry-After 초)를 돌려줍니다.
+        연결 오류면 상태 코드는 None입니다. 일정이 하나뿐이면 배치 대신 events.insert를 바로 부릅니다.
+        """
+        self.http_requests += 1
+        try:
+            if len(batch) == 1:
+                response = await self._http.post(f"{self.base_url}{self.events_path}", json=batch[0].body)
+                return [(batch[0], response.status_code, _json_or_text(response))], _retry_after(response)
+
+            boundary = f"batch_{uuid.uuid4().hex}"
+            content = encode_batch(
+                [(f"item-{item.event_id}", self.events_path, item.body) for item in batch], boundary
+            )
+            response = await self._http.post(
+                f"{self.base_url}/batch/calendar/v3",
+                content=content,
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            )
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            return [(item, None, repr(e)) for item in batch], None
+
+        response_boundary = boundary_of(response.headers.get("content-type", ""))
+        if response.status_code != 200 or response_boundary is None:
+            # 배치 전체가 거절됨 (401, 할당량, 5xx 등): 모든 일정에 같은 결과를 돌려줍니다.
+            body = _json_or_text(response)
+            return [(item, response.status_code, body) for item in batch], _retry_after(response)
+
+        by_id = {item.event_id: item for item in batch}
+        results = []
+        for part in parse_batch(response.content, response_boundary):
+            event_id = (part["content_id"] or "").rsplit("item-", 1)[-1]
+            if event_id in by_id:
+                results.append((by_id.pop(event_id), part["status"], part["body"]))
+        # 응답에 빠진 파트는 다시 보냅니다.
+        results.extend((item, None, "응답에 파트가 없습니다") for item in by_id.values())
+        return results, _retry_after(response)
+
+    async def _run_batch(self, batch: List[_PendingEvent], report: UploadReport) -> List[_PendingEvent]:
+        """배치를 보내 결과를 report에 반영하고, 다시 보내야 할 일정 목록을 반환합니다."""
+        retry: List[_PendingEvent] = []
+        throttled = False
+        results, retry_after = await self._send(batch)
+        for item, status, body in results:
+            if status in (200, 201):
+                report.created.append(item.event_id)
+            elif status == 409:
+                report.duplicates.append(item.event_id)
+            elif status is None or status in RETRYABLE_STATUS or is_rate_limited(status, body):
+                if is_rate_limited(status, body):
+                    throttled = True
+                retry.append(item)
+            else:
+                report.failed.append({"event_id": item.event_id, "status": status, "error": str(body)[:300]})
+
+        if throttled:
+            self.throttled += 1
+            self.concurrency.on_throttle()
+        elif not retry:
+            self.concurrency.on_success()
+        if retry:
+            # 슬롯을 쥔 채로 기다려, 서버가 회복될 때까지 실제로 보내는 양을 줄입니다.
+            await asyncio.sleep(self._backoff(max(item.attempts for item in retry), retry_after))
+        return retry
+
+    async def insert_many(self, schedules: Iterable[NextSchedule]) -> UploadReport:
+        """일정들을 캘린더에 넣습니다. 같은 일정이 여러 번 들어 있어도 한 번만 보냅니다."""
+        report = UploadReport()
+        pending: Deque[_PendingEvent] = deque()
+        seen = set()
+        for schedule in schedules:
+            event_id = event_id_for(schedule, self.calendar_id)
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+            pending.append(
+                _PendingEvent(event_id, event_body(schedule, event_id, self.timezone, self.duration_minutes))
+            )
+
+        running: Dict["asyncio.Task[List[_PendingEvent]]", None] = {}
+        while pending or running:
+            while pending and len(running) < self.concurrency.slots:
+                batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+                running[asyncio.ensure_future(self._run_batch(batch, report))] = None
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
+                for item in task.result():
+                    item.attempts += 1
+                    if item.attempts > self.max_retries:
+                        report.failed.append({"event_id": item.event_id, "status": None, "error": "재시도 한도 초과"})
+                        continue
+                    self.retries += 1
+                    pending.append(item)
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http_requests": self.http_requests,
+            "retries": self.retries,
+            "throttled_batches": self.throttled,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "concurrency_peak": round(self.concurrency.peak, 2),
+            "concurrency_decreases": self.concurrency.decreases,
+        }
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+def _json_or_text(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text[:300]
+
+
+# ----------------------------------------------------
+# 5. 동기 진입점 (meeting_analyzer_main.py / batch_analyzer.py용)
+# ----------------------------------------------------
+
+def upload_analysis_result(extracted_data: Dict[str, Any], **writer_options: Any) -> Optional[Dict[str, int]]:
+    """분석 결과(v1/v2 dict)의 후속 일정을 캘린더에 올리고 요약을 반환합니다. 실패하면 None."""
+
+    async def run() -> Dict[str, int]:
+        async with CalendarWriter(**writer_options) as writer:
+            report = await writer.insert_many(to_v2(extracted_data).next_schedules)
+        for failure in report.failed:
+            print(f"⚠️ 캘린더 등록 실패: {failure['event_id']} ({failure['status']}: {failure['error']})")
+        return report.summary()
+
+    try:
+        return asyncio.run(run())
+    except Exception as e:
+        print(f"❌ 캘린더 업로드 오류: {e}")
+        return None
@@ -0,0 +1,269 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, Optional, Type
+
+import httpx
+from pydantic import BaseModel
+
+# 분석 결과 캐시 키의 스키마 지문(schema_fingerprint)과 같은 함수로 만들어야 둘이 어긋나지 않습니다.
+from meeting_schema import response_schema
+
+# ----------------------------------------------------
+# Gemini REST 비동기 클라이언트 (속도 제한 + 재시도 + 연결 재사용)
+# ----------------------------------------------------
+
+# google-genai SDK 대신 generateContent REST 엔드포인트를 httpx로 직접 호출합니다.
+# - 토큰 버킷으로 분당 요청 수(GEMINI_RPM)를 넘지 않게 요청을 흘려보냅니다.
+# - 429/5xx와 네트워크 오류는 지터가 섞인 지수 백오프로 재시도하고, Retry-After를 존중합니다.
+# - 요청마다 전체 마감 시간(deadline)이 있어, 재시도를 포함해도 그 시간을 넘기지 않습니다.
+# - 프로세스 전체가 하나의 httpx 연결 풀을 공유합니다.
+# GEMINI_BASE_URL을 바꾸면 loadtest_gemini.py의 가짜 서버로도 그대로 테스트할 수 있습니다.
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+GEMINI_BURST = float(os.getenv("GEMINI_BURST", "0"))  # 0이면 RPM/6 (10초 분량)
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "6"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+GEMINI_DEADLINE = float(os.getenv("GEMINI_DEADLINE", "180"))
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "32"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class GeminiAPIError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GeminiDeadlineExceeded(GeminiAPIError):
+    pass
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 비동기 토큰 버킷."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        # 락을 쥔 채로 기다리므로 먼저 온 요청이 먼저 토큰을 받습니다(FIFO).
+        async with self._lock:
+            started = time.monotonic()
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+            self.wait_seconds += time.monotonic() - started
+
+    def penalize(self) -> None:
+        """429를 받으면 쌓인 토큰을 비워, 서버 쪽 한도가 회복될 때까지 속도를 낮춥니다."""
+        self._tokens = min(self._tokens, 0.0)
+
+
+class AsyncGeminiClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = GEMINI_MODEL,
+        base_url: str = GEMINI_BASE_URL,
+        requests_per_minute: float = GEMINI_RPM,
+        burst: float = GEMINI_BURST,
+        max_retries: int = GEMINI_MAX_RETRIES,
+        timeout: float = GEMINI_TIMEOUT,
+        deadline: float = GEMINI_DEADLINE,
+        max_connections: int = GEMINI_MAX_CONNECTIONS,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not self.api_key:
+            raise EnvironmentError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다. 시스템 환경 변수를 확인하세요.")
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.deadline = deadline
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        rate = requests_per_minute / 60.0
+        self.limiter = TokenBucket(rate, burst or max(1.0, requests_per_minute / 6.0))
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            headers={"x-goog-api-key": self.api_key},
+        )
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncGeminiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # full jitter: [0, min(max_backoff, base * 2^attempt)] 사이에서 무작위로 기다립니다.
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def generate_content(
+        self, body: Dict[str, Any], deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """generateContent 요청을 보내고 응답 JSON을 반환합니다. 재시도 포함 deadline초 안에 끝냅니다."""
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        url = f"{self.base_url}/models/{self.model}:generateContent"
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.limiter.acquire(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+
+            retry_after = None
+            self.requests += 1
+            try:
+                response = await self._http.post(
+                    url, json=body, timeout=min(self.timeout, max(0.001, deadline_at - time.monotonic()))
+                )
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = e
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                last_error = GeminiAPIError(
+                    f"Gemini API 오류 {response.status_code}: {response.text[:300]}",
+                    status=response.status_code,
+                )
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.failures += 1
+                    raise last_error
+                if response.status_code == 429:
+                    self.throttled += 1
+                    self.limiter.penalize()
+                try:
+                    retry_after = float(response.headers.get("retry-after", ""))
+                except ValueError:
+                    retry_after = None
+
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, retry_after)
+            if time.monotonic() + delay >= deadline_at:
+                break
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+        self.failures += 1
+        if last_error is not None and time.monotonic() < deadline_at:
+            if isinstance(last_error, GeminiAPIError):
+                raise last_error
+            raise GeminiAPIError(f"Gemini 요청 실패: {last_error!r}") from last_error
+        raise GeminiDeadlineExceeded(
+            f"Gemini 요청이 {deadline or self.deadline:.0f}초 안에 완료되지 않았습니다 (마지막 오류: {last_error})"
+        )
+
+    async def generate_json(
+        self, prompt: str, schema: Type[BaseModel], deadline: Optional[float] = None
+    ) -> BaseModel:
+        """prompt를 보내 schema 형식의 JSON 응답을 받아 Pydantic으로 검증한 객체를 반환합니다."""
+        body = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "responseMimeType": "application/json",
+                "responseJsonSchema": response_schema(schema),
+            },
+        }
+        data = await self.generate_content(body, deadline)
+        try:
+            text = "".join(
+                part.get("text", "") for part in data["candidates"][0]["content"]["parts"]
+            )
+        except (KeyError, IndexError, TypeError):
+            raise GeminiAPIError(f"Gemini 응답에 후보 텍스트가 없습니다: {str(data)[:300]}")
+        return schema.model_validate_json(text.strip())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "limiter_wait_seconds": round(self.limiter.wait_seconds, 3),
+        }
+
+
+# ----------------------------------------------------
+# 프로세스 공용 클라이언트 (백그라운드 이벤트 루프)
+# ----------------------------------------------------
+
+# 토큰 버킷과 연결 풀을 프로세스 전체에서 하나로 유지하기 위해, 공용 클라이언트는
+# 전용 백그라운드 이벤트 루프에서만 동작합니다. 동기 코드(스레드 파이프라인)와
+# 다른 이벤트 루프(asyncio.run)에서 모두 같은 클라이언트를 통해 호출합니다.
+
+_shared_lock = threading.Lock()
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_client: Optional[AsyncGeminiClient] = None
+
+
+def shared_client() -> AsyncGeminiClient:
+    global _shared_loop, _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            client = AsyncGeminiClient()
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gemini-client", daemon=True).start()
+            _shared_loop, _shared_client = loop, client
+        return _shared_client
+
+
+def _submit(coro: Awaitable[Any]) -> "Future[Any]":
+    shared_client()
+    assert _shared_loop is not None
+    return asyncio.run_coroutine_threadsafe(coro, _shared_loop)  # type: ignore[arg-type]
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """코루틴을 공용 이벤트 루프에서 실행하고 결과를 기다립니다. 호출한 스레드에 이벤트 루프가 돌고 있어도 됩니다."""
+    return _submit(coro).result()
+
+
+def generate_json_sync(
+    prompt: str, schema: Type[BaseModel], deadline: Optional[float] = None
+) -> BaseModel:
+    return _submit(shared_client().generate_json(prompt, schema, deadline)).result()
+
+
+async def generate_json_async(
+    prompt: str, schema: Type[BaseModel], deadline: Optional[float] = None
+) -> BaseModel:
+    return await asyncio.wrap_future(_submit(shared_client().generate_json(prompt, schema, deadline)))
@@ -0,0 +1,379 @@
+"""
+회의가 진행되는 동안 STT 세그먼트를 받아 일정 제안을 점진적으로 내보내는 분석기.
+
+    python incremental_extractor.py voice.m4a            # STT 스트리밍 변환과 동시에 분석
+    python incremental_extractor.py notes.txt --replay 0.5  # 텍스트를 한 줄씩 0.5초 간격으로 흘려보내기
+
+녹음이 끝날 때까지 기다리지 않고, 새로 들어온 발화가 INCREMENTAL_MIN_CHARS 이상 쌓이거나
+INCREMENTAL_MAX_WAIT초가 지나면 그 부분만 Gemini에 보냅니다. 프롬프트에는 새 발화와 함께
+직전 대화 일부(롤링 컨텍스트), 지금까지의 요약, 현재 일정 목록만 들어가므로 요청 크기가 회의
+길이와 무관하게 일정합니다. 결과는 일정 add / update / retract 이벤트와 갱신된 요약으로 나옵니다.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from gemini_client import generate_json_sync
+from map_reduce import same_event
+from meeting_schema import MeetingAnalysisResult, NextSchedule
+
+INCREMENTAL_MIN_CHARS = int(os.getenv("INCREMENTAL_MIN_CHARS", "120"))
+INCREMENTAL_MAX_WAIT = float(os.getenv("INCREMENTAL_MAX_WAIT", "8"))
+INCREMENTAL_CONTEXT_CHARS = int(os.getenv("INCREMENTAL_CONTEXT_CHARS", "1500"))
+# close() 뒤의 마지막 요청은 다음 발화에 묻어갈 수 없으므로, 실패하면 백오프하며 이 횟수만큼 더 시도합니다.
+INCREMENTAL_FINAL_RETRIES = int(os.getenv("INCREMENTAL_FINAL_RETRIES", "3"))
+INCREMENTAL_FINAL_BACKOFF = float(os.getenv("INCREMENTAL_FINAL_BACKOFF", "2"))
+
+INCREMENTAL_PROMPT_TEMPLATE = """
+    당신은 진행 중인 회의를 실시간으로 분석하는 회의록 분석가입니다. 오늘 날짜는 {reference_date}입니다.
+    아래에 지금까지의 요약, 현재까지 제안된 일정 목록, 직전 대화, 그리고 **새로 들어온 발화**가 주어집니다.
+    **새 발화**를 반영하여 제공된 JSON 스키마에 따라 응답하세요.
+
+    **[응답 지시 사항]**
+    1. **'meeting_summary'**: 지금까지의 요약에 새 발화 내용을 반영한 회의 전체 요약(3~4줄)을 작성하세요.
+    2. **'changes'**: 새 발화 때문에 생긴 일정 변경만 나열하세요. 변경이 없으면 빈 리스트로 두세요.
+        a. 새로 결정된 일정은 action='add'와 schedule을 채우세요. (schedule_id는 비워 두세요)
+        b. 기존 일정의 날짜/시간/제목/내용이 바뀌면 action='update', 해당 schedule_id, 바뀐 전체 schedule을 채우세요.
+        c. 기존 일정이 취소되거나 없던 일이 되면 action='retract'와 해당 schedule_id만 채우세요.
+        d. 날짜는 **YYYY-MM-DD**, 시간은 **HH:MM** 형식이며, 시간이 없으면 **'10:00'**을 사용하세요.
+
+    ---
+    지금까지의 요약:
+    {summary}
+
+    현재 일정 목록 (schedule_id: 내용):
+    {schedules}
+
+    직전 대화:
+    {context}
+
+    새 발화:
+    {new_text}
+    """
+
+
+class ScheduleChange(BaseModel):
+    """새 발화로 인한 일정 변경 하나"""
+    action: Literal["add", "update", "retract"] = Field(..., description="add / update / retract 중 하나.")
+    schedule_id: str = Field("", description="update/retract 대상 일정의 schedule_id. add일 때는 빈 문자열.")
+    schedule: Optional[NextSchedule] = Field(None, description="add/update일 때 일정 전체 내용. retract일 때는 null.")
+
+
+class IncrementalUpdate(BaseModel):
+    """점진 분석 한 번의 응답"""
+    meeting_summary: str = Field(..., description="새 발화까지 반영한 회의 전체 3~4줄 요약.")
+    changes: List[ScheduleChange] = Field(..., description="새 발화로 생긴 일정 변경 목록.")
+
+
+class IncrementalAnalysisError(RuntimeError):
+    """close() 시점에 남은 발화를 끝내 분석하지 못했습니다. result는 그때까지의 결과, unprocessed는 빠진 세그먼트입니다."""
+
+    def __init__(self, message: str, result: MeetingAnalysisResult, unprocessed: List[Dict[str, Any]]) -> None:
+        super().__init__(message)
+        self.result = result
+        self.unprocessed = unprocessed
+
+
+@dataclass
+class ScheduleEvent:
+    kind: str  # "add" | "update" | "retract" | "summary"
+    schedule_id: Optional[str] = None
+    schedule: Optional[Dict[str, Any]] = None
+    summary: Optional[str] = None
+    audio_seconds: float = 0.0  # 이 이벤트를 만든 마지막 발화의 녹음 내 위치
+    latency_seconds: float = 0.0  # 발화가 들어온 뒤 이벤트가 나오기까지 걸린 시간
+
+
+class IncrementalAnalyzer:
+    """
+    STT 세그먼트를 feed()로 받고, 백그라운드 스레드에서 새 발화만 모아 Gemini에 보내는 분석기.
+
+        analyzer = IncrementalAnalyzer(on_event=print)
+        analyzer.start()
+        for segment in stream_stt_conversion(path):
+            analyzer.feed(segment)
+        result = analyzer.close()   # 남은 발화까지 분석하고 MeetingAnalysisResult 반환
+
+    요청은 한 번에 하나씩만 보내므로, 요청이 도는 동안 들어온 발화는 다음 요청에 함께 묶입니다.
+    요청이 실패하면 그 발화는 다음 요청에 다시 포함됩니다. close() 뒤의 마지막 요청은 final_retries번까지
+    백오프하며 다시 시도하고, 그래도 실패하면 close()가 IncrementalAnalysisError를 던집니다.
+    """
+
+    def __init__(
+        self,
+        on_event: Optional[Callable[[ScheduleEvent], None]] = None,
+        reference_date: Optional[str] = None,
+        min_chars: int = INCREMENTAL_MIN_CHARS,
+        max_wait: float = INCREMENTAL_MAX_WAIT,
+        context_chars: int = INCREMENTAL_CONTEXT_CHARS,
+        final_retries: int = INCREMENTAL_FINAL_RETRIES,
+        final_backoff: float = INCREMENTAL_FINAL_BACKOFF,
+    ) -> None:
+        self.on_event = on_event
+        self.reference_date = reference_date or date.today().isoformat()
+        self.min_chars = min_chars
+        self.max_wait = max_wait
+        self.context_chars = context_chars
+        self.final_retries = max(0, final_retries)
+        self.final_backoff = final_backoff
+        self.summary = ""
+        self.schedules: Dict[str, NextSchedule] = {}
+        self.events: List[ScheduleEvent] = []
+        self.queries = 0
+        self.failures = 0
+        self.unprocessed: List[Dict[str, Any]] = []
+        self.last_error: Optional[Exception] = None
+        self._context = ""
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_since: Optional[float] = None
+        self._next_id = 1
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="incremental-analyzer", daemon=True)
+        self._thread.start()
+
+    def feed(self, segment: Dict[str, Any]) -> None:
+        """STT 세그먼트({"start", "end", "text"})를 넣습니다. 분석을 기다리지 않고 바로 반환합니다."""
+        if not segment.get("text", "").strip():
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("이미 닫힌 분석기입니다")
+            self._pending.append({**segment, "received_at": time.perf_counter()})
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            self._cond.notify()
+
+    def close(self) -> MeetingAnalysisResult:
+        """
+        입력을 마감하고 남은 발화까지 분석한 뒤 최종 결과를 반환합니다.
+        남은 발화를 재시도 끝에도 분석하지 못하면 IncrementalAnalysisError를 던집니다 (부분 결과 포함).
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        if self.unprocessed:
+            raise IncrementalAnalysisError(
+                f"회의 끝부분 발화 {len(self.unprocessed)}개를 분석하지 못했습니다 (마지막 오류: {self.last_error})",
+                self.result(),
+                self.unprocessed,
+            )
+        return self.result()
+
+    def result(self) -> MeetingAnalysisResult:
+        return MeetingAnalysisResult(meeting_summary=self.summary, next_schedules=list(self.schedules.values()))
+
+    # ------------------------------------------------
+    # 백그라운드 분석 루프
+    # ------------------------------------------------
+
+    def _ready(self) -> bool:
+        if not self._pending:
+            return False
+        if self._closed:
+            return True
+        if sum(len(segment["text"]) for segment in self._pending) >= self.min_chars:
+            return True
+        return time.monotonic() - (self._pending_since or 0.0) >= self.max_wait
+
+    def _run(self) -> None:
+        final_failures = 0
+        while True:
+            with self._cond:
+                while not self._ready():
+                    if self._closed and not self._pending:
+                        return
+                    timeout = None
+                    if self._pending_since is not None:
+                        timeout = max(0.0, self.max_wait - (time.monotonic() - self._pending_since))
+                    self._cond.wait(timeout)
+                batch, self._pending, self._pending_since = self._pending, [], None
+
+            if self._analyze(batch):
+                continue
+            # 실패한 발화는 다음 요청 앞에 다시 붙입니다.
+            with self._cond:
+                self._pending = batch + self._pending
+                self._pending_since = time.monotonic()
+                if not self._closed:
+                    continue
+                # 입력이 마감됐으면 다음 발화를 기다릴 수 없으므로 백오프하며 몇 번 더 시도하고,
+                # 그래도 실패하면 남은 발화를 close()에 넘깁니다.
+                final_failures += 1
+                if final_failures > self.final_retries:
+                    self.unprocessed, self._pending, self._pending_since = self._pending, [], None
+                    return
+            delay = self.final_backoff * 2 ** (final_failures - 1)
+            print(f"⚠️ 마지막 점진 분석 요청 재시도 {final_failures}/{self.final_retries} ({delay:.1f}초 후)")
+            time.sleep(delay)
+
+    def _analyze(self, batch: List[Dict[str, Any]]) -> bool:
+        new_text = " ".join(segment["text"].strip() for segment in batch)
+        schedules = "\n".join(
+            f"{schedule_id}: {schedule.model_dump_json()}"
+            for schedule_id, schedule in self.schedules.items()
+        )
+        prompt = INCREMENTAL_PROMPT_TEMPLATE.format(
+            reference_date=self.reference_date,
+            summary=self.summary or "(아직 없음)",
+            schedules=schedules or "(없음)",
+            context=self._context or "(회의 시작)",
+            new_text=new_text,
+        )
+        self.queries += 1
+        try:
+            update: IncrementalUpdate = generate_json_sync(prompt, IncrementalUpdate)  # type: ignore[assignment]
+        except Exception as e:
+            self.failures += 1
+            self.last_error = e
+            print(f"⚠️ 점진 분석 요청 실패 (다음 요청에 다시 포함): {e}")
+            return False
+
+        self._context = (self._context + " " + new_text).strip()[-self.context_chars:]
+        audio_seconds = float(batch[-1].get("end", 0.0))
+        latency = time.perf_counter() - batch[0]["received_at"]
+        for change in update.changes:
+            self._apply(change, audio_seconds, latency)
+        if update.meeting_summary.strip() and update.meeting_summary != self.summary:
+            self.summary = update.meeting_summary.strip()
+            self._emit(ScheduleEvent("summary", summary=self.summary, audio_seconds=audio_seconds, latency_seconds=latency))
+        return True
+
+    def _apply(self, change: ScheduleChange, audio_seconds: float, latency: float) -> None:
+        """모델이 준 변경을 현재 일정 목록에 반영합니다. 모델의 실수(중복 add, 없는 id)는 여기서 바로잡습니다."""
+        schedule_id: Optional[str] = change.schedule_id or None
+        if change.action == "retract":
+            if schedule_id not in self.schedules:
+                return
+            removed = self.schedules.pop(schedule_id)
+            self._emit(ScheduleEvent("retract", schedule_id, removed.model_dump(mode="json"), audio_seconds=audio_seconds, latency_seconds=latency))
+            return
+
+        schedule = change.schedule
+        if schedule is None:
+            return
+        if schedule_id not in self.schedules:
+            # 이미 있는 일정을 다시 add하면 update로 취급합니다.
+            schedule_id = next(
+                (known_id for known_id, known in self.schedules.items() if same_event(known, schedule)), None
+            )
+        if schedule_id is None:
+            schedule_id = f"s{self._next_id}"
+            self._next_id += 1
+            kind = "add"
+        elif self.schedules[schedule_id] == schedule:
+            return
+        else:
+            kind = "update"
+        self.schedules[schedule_id] = schedule
+        self._emit(ScheduleEvent(kind, schedule_id, schedule.model_dump(mode="json"), audio_seconds=audio_seconds, latency_seconds=latency))
+
+    def _emit(self, event: ScheduleEvent) -> None:
+        self.events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+
+
+def analyze_incrementally(
+    segments: Iterable[Dict[str, Any]],
+    on_event: Optional[Callable[[ScheduleEvent], None]] = None,
+    reference_date: Optional[str] = None,
+) -> MeetingAnalysisResult:
+    """
+    세그먼트 이터러블(예: stream_stt_conversion)을 끝까지 흘려보내며 분석하고 최종 결과를 반환합니다.
+    마지막 발화를 분석하지 못하면 IncrementalAnalysisError를 그대로 던집니다.
+    """
+    analyzer = IncrementalAnalyzer(on_event=on_event, reference_date=reference_date)
+    analyzer.start()
+    for segment in segments:
+        analyzer.feed(segment)
+    return analyzer.close()
+
+
+# ----------------------------------------------------
+# 실행 스크립트
+# ----------------------------------------------------
+
+def replay_text(path: str, interval: float) -> Iterable[Dict[str, Any]]:
+    """텍스트 회의록을 한 줄씩 interval초 간격의 세그먼트로 흘려보냅니다. (STT 없이 시연/테스트용)"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    for index, line in enumerate(lines):
+        if index and interval > 0:
+            time.sleep(interval)
+        yield {"start": index * interval, "end": (index + 1) * interval, "text": line}
+
+
+def print_event(event: ScheduleEvent) -> None:
+    stamp = f"[{event.audio_seconds:7.1f}s +{event.latency_seconds:.1f}s]"
+    if event.kind == "summary":
+        print(f"📝 {stamp} 요약 갱신: {event.summary}")
+        return
+    icon = {"add": "➕", "update": "✏️", "retract": "➖"}[event.kind]
+    schedule = event.schedule or {}
+    print(
+        f"{icon} {stamp} {event.kind} {event.schedule_id}: "
+        f"{schedule.get('next_schedule_date')} {schedule.get('start_time')} {schedule.get('event_title')}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="회의 진행 중 점진적 일정 추출")
+    parser.add_argument("source", help="오디오 파일 또는 텍스트 회의록")
+    parser.add_argument("--replay", type=float, default=1.0, help="텍스트 입력일 때 줄 사이 간격(초)")
+    parser.add_argument("--reference-date", help="날짜 계산 기준일 (기본: 오늘)")
+    parser.add_argument("--output", help="이벤트 기록과 최종 결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    if os.path.splitext(args.source)[1].lower() in {".txt", ".md"}:
+        segments = replay_text(args.source, args.replay)
+    else:
+        from stt_module import stream_stt_conversion
+
+        segments = stream_stt_conversion(args.source)
+
+    analyzer = IncrementalAnalyzer(on_event=print_event, reference_date=args.reference_date)
+    analyzer.start()
+    for segment in segments:
+        analyzer.feed(segment)
+    try:
+        result = analyzer.close()
+    except IncrementalAnalysisError as e:
+        print(f"❌ {e}")
+        result = e.result
+
+    print("\n✅ 최종 분석 결과:" if not analyzer.unprocessed else "\n⚠️ 부분 분석 결과 (끝부분 누락):")
+    print(json.dumps(result.model_dump(mode="json"), ensure_ascii=False, indent=2))
+    print(f"(Gemini 요청 {analyzer.queries}회, 실패 {analyzer.failures}회, 이벤트 {len(analyzer.events)}건)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "result": result.model_dump(mode="json"),
+                    "events": [asdict(event) for event in analyzer.events],
+                    "unprocessed": analyzer.unprocessed,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"✅ 결과 저장: {args.output}")
+    if analyzer.unprocessed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
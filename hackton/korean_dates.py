@@ -0,0 +1,426 @@
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# ----------------------------------------------------
+# 한국어 날짜/시간 표현 규칙 기반 해석기 (LLM 호출 전 단계)
+# ----------------------------------------------------
+
+# "다음주 수요일 오후 두시", "모레", "금욜까지" 같은 상대 표현을 기준 날짜로 계산해
+# (next_schedule_date, start_time) 후보와 신뢰도를 만듭니다.
+# - 짧고 애매하지 않은 발화는 quick_extract()만으로 Gemini 호출 없이 답합니다.
+# - 나머지는 format_date_hints()로 계산 결과를 프롬프트에 힌트로 넣어, 모델이 날짜 계산을
+#   다시 하지 않도록 합니다.
+# 외부 패키지 없이 표준 라이브러리만 쓰므로 루트의 gemini_extractor.py에서도 임포트할 수 있습니다.
+
+QUICK_MAX_CHARS = int(os.getenv("QUICK_EXTRACT_MAX_CHARS", "160"))
+QUICK_MIN_CONFIDENCE = float(os.getenv("QUICK_EXTRACT_MIN_CONFIDENCE", "0.85"))
+HINT_MIN_CONFIDENCE = 0.5
+
+WEEKDAYS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+NATIVE_NUMBERS = {
+    "한": 1, "하나": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "네": 4, "넷": 4, "다섯": 5, "여섯": 6,
+    "일곱": 7, "여덟": 8, "아홉": 9, "열": 10, "열한": 11, "열하나": 11, "열두": 12, "열둘": 12,
+}
+DAY_COUNTS = {"하루": 1, "이틀": 2, "사흘": 3, "나흘": 4, "닷새": 5, "엿새": 6, "이레": 7, "열흘": 10}
+DAY_WORDS = {"오늘": 0, "금일": 0, "내일": 1, "낼": 1, "명일": 1, "모레": 2, "내일모레": 2, "낼모레": 2, "글피": 3}
+WEEK_OFFSETS = {"이번": 0, "금": 0, "다음": 1, "담": 1, "다다음": 2, "저번": -1, "지난": -1}
+
+# "보낼게요"의 '낼', "지금"의 '금', "오늘날"의 '오늘'처럼 낱말 안에 든 날짜 말을 거르기 위한 경계.
+# 날짜 말 앞에는 한글이 올 수 없고, 뒤에는 한글이 아닌 글자, 문장 끝, 조사나 때를 나타내는 말만 올 수 있습니다.
+_WORD_START = r"(?<![가-힣])"
+_WORD_END = (
+    r"(?=[^가-힣]|$|은|는|이|가|에|엔|도|만|까지|부터|쯤|중|로|으로|정도|"
+    r"오전|오후|아침|점심|저녁|밤|새벽|정오)"
+)
+
+_NATIVE = "열두|열둘|열한|열하나|열|다섯|여섯|일곱|여덟|아홉|하나|한|둘|두|셋|세|넷|네"
+_WEEKDAY = r"(?P<weekday>[월화수목금토일])(?:요일|욜)"
+
+# 날짜 패턴: (이름, 정규식, 기본 신뢰도). 겹치면 먼저 시작하는 긴 매치가 이깁니다.
+DATE_PATTERNS = [
+    ("iso", re.compile(r"(?<!\d)(?P<y>\d{4})[-./](?P<m>\d{1,2})[-./](?P<d>\d{1,2})(?!\d)"), 0.98),
+    ("ymd", re.compile(r"(?P<y>\d{4})\s*년\s*(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일"), 0.97),
+    ("md", re.compile(r"(?<!\d)(?P<m>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일"), 0.92),
+    ("slash", re.compile(r"(?<![\d/])(?P<m>\d{1,2})/(?P<d>\d{1,2})(?![\d/])"), 0.8),
+    ("month_day", re.compile(r"(?P<month>이번\s*달|다음\s*달|담달)\s*(?P<d>\d{1,2})\s*일"), 0.88),
+    ("week_day", re.compile(_WORD_START + r"(?P<week>다다음|이번|다음|저번|지난|금|담)\s*주\s*" + _WEEKDAY), 0.93),
+    ("weekday", re.compile(_WORD_START + _WEEKDAY), 0.75),
+    (
+        "day_word",
+        re.compile(_WORD_START + r"(?P<word>내일\s*모레|낼\s*모레|오늘|금일|내일|명일|모레|글피|낼)" + _WORD_END),
+        0.95,
+    ),
+    ("past_day", re.compile(r"어제|그제|그저께|엊그제"), 0.0),
+    ("days_later", re.compile(r"(?P<n>\d{1,3}|하루|이틀|사흘|나흘|닷새|엿새|이레|열흘)\s*(?:일\s*)?(?:뒤|후)"), 0.9),
+    ("weeks_later", re.compile(r"(?P<n>\d{1,2}|" + _NATIVE + r"|일)\s*주(?:일)?\s*(?:뒤|후)"), 0.9),
+    ("bare_day", re.compile(r"(?<![\d월])(?P<d>\d{1,2})\s*일(?=\s*(?:에|까지|날|부터|쯤|$|\s))(?!\s*(?:뒤|후))"), 0.55),
+]
+
+TIME_PATTERNS = [
+    ("hhmm", re.compile(r"(?<![\d:])(?P<h>[01]?\d|2[0-3]):(?P<min>[0-5]\d)(?![\d:])"), 0.97),
+    (
+        "korean",
+        re.compile(
+            r"(?:(?P<ampm>오전|오후|아침|점심|저녁|밤|새벽)\s*)?"
+            r"(?P<h>\d{1,2}|" + _NATIVE + r")\s*시(?!간|작|점|장|험|스템|도)"
+            r"(?:\s*(?P<min>\d{1,2})\s*분|\s*(?P<half>반))?"
+        ),
+        0.9,
+    ),
+    ("noon", re.compile(r"정오"), 0.95),
+]
+
+_SENTENCE_END = re.compile(r"(?<=[.?!。])\s+|\n+")
+_FILLERS = re.compile(r"(?:^|\s)(?:음+|어+|아+|그+|저기|그리고|근데|그러면|예|네)(?=\s|$)")
+_LEADING_PARTICLES = re.compile(r"^(?:에는|에서|에|까지|부터|쯤|으로|로|는|은)\s*")
+# "회의", "주간회의"처럼 '의'로 끝나는 명사가 많아서 '의'는 조사로 떼지 않습니다.
+_TRAILING_PARTICLES = re.compile(r"\s*(?:은|는|이|가|을|를|도)$")
+_TOPIC_OWNER = re.compile(r"\S+(?:은|는)$")
+# 날짜가 일정(회의, 마감 등)을 가리킨다는 단서. quick_extract()는 이 단서가 있는 문장만 답합니다.
+_SCHEDULE_CUES = re.compile(
+    r"회의|미팅|마감|약속|일정|발표|보고|제출|공유|리뷰|점검|워크숍|세미나|면담|킥오프|회식|배포|까지|보자|봅시다|합시다|잡"
+)
+# 날짜가 있어도 새 일정이 아닐 수 있다는 단서. 하나라도 있으면 quick_extract()는 답하지 않고 LLM에 넘깁니다.
+_NEGATION_CUES = re.compile(r"없|않|아니|아님|아닌|아냐|(?:^|\s)안(?=\s|돼|되|해|할)|(?:^|\s)못(?=\s|해|하|할)|말자|말고|마세요|말아")
+_CANCEL_CUES = re.compile(r"취소|캔슬|무산|보류|연기|미루|미뤄|미룰|미뤘|변경|옮기|옮겨|옮길|바꾸|바꿔|바뀌|당기|당겨")
+_PAST_CUES = re.compile(r"었|았|였|했|됐|갔|왔|봤|냈|졌")
+# "공유한다고 했습니다", "하기로 했어요"의 과거형은 말한 시점이지 일정 자체가 아닙니다.
+_REPORTED_PAST = re.compile(r"(?:다고|라고|자고|기로)\s*(?:했|하였)")
+_QUESTION_CUES = re.compile(r"\?|까요|나요|어때|어떠|될까|할까|괜찮|가능할|가능한가|맞나|인가요")
+
+# 일정 제목을 명사구로 만들 때 떼어 낼 서술어. "회의합시다" -> "회의", "정리해서" -> "정리"
+_HA_PREDICATE = re.compile(
+    r"(?<=\S\S)(?:합시다|합니다|하자|하죠|하고|하기로|하기|하면|해요|해서|해야|해주\S*|했\S*|할\S*|한다\S*|하는|됩니다|돼요|됐\S*|될\S*|되\S*)$"
+)
+_PREDICATE_WORD = re.compile(r"(?:요|니다|시다|죠|고요|보자|하자|가자|잡자)$")
+# 일정 이름이 되는 명사. 시간 앞뒤 구절 중 이 명사가 든 쪽을 제목으로 고릅니다. ("보고서 낼게요 세시 회의" -> "회의")
+_EVENT_NOUNS = re.compile(r"회의|미팅|약속|발표|리뷰|점검|워크숍|세미나|면담|킥오프|회식|배포|마감")
+
+
+@dataclass
+class TemporalCandidate:
+    text: str  # 원문에서 해석한 부분 ("다음주 수요일 오후 두시")
+    next_schedule_date: str  # YYYY-MM-DD
+    start_time: Optional[str]  # HH:MM, 시간 표현이 없으면 None
+    confidence: float
+    start: int  # 원문에서의 위치
+    end: int
+    sentence: str = ""
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "next_schedule_date": self.next_schedule_date,
+            "start_time": self.start_time,
+            "confidence": round(self.confidence, 3),
+        }
+
+
+def _to_date(value: Union[str, date, None]) -> date:
+    if value is None:
+        return date.today()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _number(token: str) -> int:
+    return int(token) if token.isdigit() else NATIVE_NUMBERS.get(token, DAY_COUNTS.get(token, 0))
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _add_months(base: date, months: int, day: int) -> Optional[date]:
+    month_index = base.month - 1 + months
+    return _safe_date(base.year + month_index // 12, month_index % 12 + 1, day)
+
+
+def _resolve_date(kind: str, match: "re.Match[str]", ref: date) -> Optional[date]:
+    groups = match.groupdict()
+    if kind in ("iso", "ymd"):
+        return _safe_date(int(groups["y"]), int(groups["m"]), int(groups["d"]))
+    if kind in ("md", "slash"):
+        resolved = _safe_date(ref.year, int(groups["m"]), int(groups["d"]))
+        # 연도가 없는 날짜가 이미 지났으면 내년으로 봅니다 (12월 회의에서 "1월 5일").
+        if resolved is not None and resolved < ref:
+            resolved = _safe_date(ref.year + 1, int(groups["m"]), int(groups["d"]))
+        return resolved
+    if kind == "month_day":
+        offset = 0 if groups["month"].startswith("이번") else 1
+        return _add_months(ref, offset, int(groups["d"]))
+    if kind == "week_day":
+        monday = ref - timedelta(days=ref.weekday())
+        offset = WEEK_OFFSETS[groups["week"]]
+        return monday + timedelta(weeks=offset, days=WEEKDAYS[groups["weekday"]])
+    if kind == "weekday":
+        # 주 표시 없는 요일은 앞으로 다가오는 가장 가까운 그 요일 (오늘이면 다음 주).
+        ahead = (WEEKDAYS[groups["weekday"]] - ref.weekday()) % 7 or 7
+        return ref + timedelta(days=ahead)
+    if kind == "day_word":
+        return ref + timedelta(days=DAY_WORDS[re.sub(r"\s+", "", groups["word"])])
+    if kind == "days_later":
+        return ref + timedelta(days=_number(groups["n"]))
+    if kind == "weeks_later":
+        return ref + timedelta(weeks=1 if groups["n"] == "일" else _number(groups["n"]))
+    if kind == "bare_day":
+        resolved = _safe_date(ref.year, ref.month, int(groups["d"]))
+        if resolved is not None and resolved < ref:
+            resolved = _add_months(ref, 1, int(groups["d"]))
+        return resolved
+    return None
+
+
+def _resolve_time(kind: str, match: "re.Match[str]") -> Optional[Tuple[str, float]]:
+    groups = match.groupdict()
+    if kind == "noon":
+        return "12:00", 0.95
+    hour = _number(groups["h"])
+    minute = 30 if groups.get("half") else int(groups.get("min") or 0)
+    if kind == "hhmm":
+        return f"{hour:02d}:{minute:02d}", 0.97
+    if not 0 <= hour <= 24 or minute > 59:
+        return None
+    ampm = groups.get("ampm")
+    confidence = 0.95
+    if ampm in ("오후", "저녁", "밤"):
+        hour = hour + 12 if hour < 12 else hour
+    elif ampm in ("오전", "아침", "새벽"):
+        hour = 0 if hour == 12 else hour
+    elif ampm == "점심":
+        hour = hour + 12 if hour <= 2 else hour
+    elif hour <= 12:
+        # 오전/오후 표시가 없으면 업무 시간으로 가정합니다: 1~6시는 오후, 7~12시는 그대로.
+        # 1~5시와 9~12시는 업무 시간으로 거의 확실하고, 6~8시는 아침/저녁이 모두 흔해서 애매합니다.
+        hour = hour + 12 if 1 <= hour <= 6 else hour
+        confidence = 0.75 if 6 <= hour % 12 <= 8 else 0.9
+    if hour >= 24:
+        return None
+    return f"{hour:02d}:{minute:02d}", confidence
+
+
+def _non_overlapping(matches: List[Tuple[int, int, Any]]) -> List[Tuple[int, int, Any]]:
+    accepted: List[Tuple[int, int, Any]] = []
+    for start, end, payload in sorted(matches, key=lambda item: (item[0], -(item[1] - item[0]))):
+        if accepted and start < accepted[-1][1]:
+            continue
+        accepted.append((start, end, payload))
+    return accepted
+
+
+def _sentence_bounds(text: str) -> List[Tuple[int, int]]:
+    bounds = []
+    position = 0
+    for separator in _SENTENCE_END.finditer(text):
+        bounds.append((position, separator.start()))
+        position = separator.end()
+    bounds.append((position, len(text)))
+    return bounds
+
+
+def resolve_temporal_expressions(
+    text: str, reference_date: Union[str, date, None] = None
+) -> List[TemporalCandidate]:
+    """
+    text 안의 날짜(+시간) 표현을 기준 날짜로 계산한 후보 목록을 등장 순서대로 반환합니다.
+    기준 날짜보다 이전인 날짜("어제", "지난주 금요일")는 일정이 아니므로 제외합니다.
+    """
+    ref = _to_date(reference_date)
+    date_matches = _non_overlapping(
+        [
+            (match.start(), match.end(), (kind, match, confidence))
+            for kind, pattern, confidence in DATE_PATTERNS
+            for match in pattern.finditer(text)
+        ]
+    )
+    time_matches = _non_overlapping(
+        [
+            (match.start(), match.end(), (kind, match))
+            for kind, pattern, _ in TIME_PATTERNS
+            for match in pattern.finditer(text)
+        ]
+    )
+    sentences = _sentence_bounds(text)
+    used_times = set()
+
+    candidates: List[TemporalCandidate] = []
+    for start, end, (kind, match, confidence) in date_matches:
+        resolved = _resolve_date(kind, match, ref)
+        if resolved is None or resolved < ref or confidence <= 0:
+            continue
+        # 요일만 있어도 "금욜까지"처럼 기한이면 다가오는 그 요일로 거의 확실합니다.
+        if kind == "weekday" and text.startswith("까지", end):
+            confidence = max(confidence, 0.9)
+        sentence_start, sentence_end = next(
+            ((s, e) for s, e in sentences if s <= start <= e), (0, len(text))
+        )
+
+        # 같은 문장 안에서 날짜 바로 뒤(12자 이내) 또는 바로 앞(6자 이내)의 시간 표현을 붙입니다.
+        start_time = None
+        span_start, span_end = start, end
+        for index, (time_start, time_end, (time_kind, time_match)) in enumerate(time_matches):
+            if index in used_times or not sentence_start <= time_start <= sentence_end:
+                continue
+            if 0 <= time_start - end <= 12 or 0 <= start - time_end <= 6:
+                resolved_time = _resolve_time(time_kind, time_match)
+                if resolved_time is None:
+                    continue
+                start_time, time_confidence = resolved_time
+                confidence *= time_confidence
+                span_start, span_end = min(start, time_start), max(end, time_end)
+                used_times.add(index)
+                break
+
+        # "오늘"만 있고 시간이 없으면 대개 일정이 아니라 인사말("오늘은 여기까지")입니다.
+        if kind == "day_word" and resolved == ref and start_time is None:
+            confidence = min(confidence, 0.4)
+
+        candidates.append(
+            TemporalCandidate(
+                text=text[span_start:span_end],
+                next_schedule_date=resolved.isoformat(),
+                start_time=start_time,
+                confidence=confidence,
+                start=span_start,
+                end=span_end,
+                sentence=text[sentence_start:sentence_end].strip(),
+            )
+        )
+    return candidates
+
+
+# ----------------------------------------------------
+# LLM 없이 답하기 / 프롬프트 힌트
+# ----------------------------------------------------
+
+def _noun_phrase(part: str) -> str:
+    """구절에서 군말, 조사, 서술어를 떼고 일정 제목으로 쓸 명사구만 남깁니다."""
+    cleaned = _FILLERS.sub(" ", part)
+    cleaned = _LEADING_PARTICLES.sub("", cleaned.strip())
+    words = re.sub(r"\s+", " ", cleaned).strip(" ,.?!").split()
+    while words:
+        stem = _HA_PREDICATE.sub("", words[-1])
+        if stem != words[-1]:
+            words[-1] = stem
+            break
+        if not _PREDICATE_WORD.search(words[-1]):
+            break
+        words.pop()
+    # "백엔드는 인증 API 문서 정리"처럼 앞의 주제어(담당자)는 제목에서 뺍니다.
+    if len(words) > 1 and _TOPIC_OWNER.match(words[0]):
+        words = words[1:]
+    return _TRAILING_PARTICLES.sub("", " ".join(words))
+
+
+def _guess_title(candidate: TemporalCandidate) -> str:
+    """
+    날짜 표현 앞(없으면 뒤)의 명사구를 일정 제목으로 씁니다. ("다음 회의는 다음주 수요일..." -> "다음 회의")
+    앞뒤 중 한쪽에만 일정 명사가 있으면 그쪽을 씁니다.
+    """
+    sentence = candidate.sentence
+    offset = sentence.find(candidate.text)
+    before = sentence[:offset] if offset >= 0 else ""
+    after = sentence[offset + len(candidate.text):] if offset >= 0 else sentence
+    titles = [title for title in (_noun_phrase(before), _noun_phrase(after)) if len(title) >= 2]
+    if not titles:
+        return "회의"
+    return next((title for title in titles if _EVENT_NOUNS.search(title)), titles[0])[:40]
+
+
+def _needs_llm(text: str) -> bool:
+    """부정, 취소/연기, 과거형, 질문이 섞인 발화는 날짜가 있어도 새 일정이라고 단정할 수 없습니다."""
+    if _NEGATION_CUES.search(text) or _CANCEL_CUES.search(text) or _QUESTION_CUES.search(text):
+        return True
+    return bool(_PAST_CUES.search(_REPORTED_PAST.sub(" ", text)))
+
+
+def _time_only_candidate(text: str, ref: date) -> Optional[TemporalCandidate]:
+    """날짜 없이 시간만 있는 발화("네 시에 회의")를 기준 날짜의 일정 후보로 만듭니다."""
+    # "어제 3시"처럼 지난 날짜가 걸린 시간은 기준 날짜로 옮기면 안 됩니다.
+    if any(pattern.search(text) for _, pattern, _ in DATE_PATTERNS):
+        return None
+    matches = _non_overlapping(
+        [
+            (match.start(), match.end(), (kind, match))
+            for kind, pattern, _ in TIME_PATTERNS
+            for match in pattern.finditer(text)
+        ]
+    )
+    if len(matches) != 1:
+        return None
+    start, end, (kind, match) = matches[0]
+    resolved_time = _resolve_time(kind, match)
+    if resolved_time is None:
+        return None
+    start_time, confidence = resolved_time
+    return TemporalCandidate(
+        text=text[start:end],
+        next_schedule_date=ref.isoformat(),
+        start_time=start_time,
+        confidence=0.95 * confidence,
+        start=start,
+        end=end,
+        sentence=text,
+    )
+
+
+def quick_extract(
+    meeting_text: str,
+    reference_date: Union[str, date, None] = None,
+    max_chars: int = QUICK_MAX_CHARS,
+    min_confidence: float = QUICK_MIN_CONFIDENCE,
+) -> Optional[Dict[str, Any]]:
+    """
+    짧고 애매하지 않은 발화(날짜가 하나뿐이고 신뢰도가 충분한 경우)를 LLM 없이 분석합니다.
+    MeetingAnalysisResult와 같은 모양의 dict를 반환하고, 조건에 맞지 않으면 None을 반환합니다.
+    부정, 취소/연기, 과거형, 질문이 섞인 발화는 항상 None입니다 (LLM이 판단).
+    """
+    text = meeting_text.strip()
+    if not text or len(text) > max_chars or _needs_llm(text):
+        return None
+    candidates = resolve_temporal_expressions(text, reference_date)
+    if not candidates and not _sentence_bounds(text)[1:]:
+        time_only = _time_only_candidate(text, _to_date(reference_date))
+        candidates = [time_only] if time_only is not None else []
+    distinct = {(candidate.next_schedule_date, candidate.start_time) for candidate in candidates}
+    if len(distinct) != 1 or min(candidate.confidence for candidate in candidates) < min_confidence:
+        return None
+
+    candidate = candidates[0]
+    if not _SCHEDULE_CUES.search(candidate.sentence):
+        return None
+    return {
+        "meeting_summary": re.sub(r"\s+", " ", text),
+        "next_schedules": [
+            {
+                "next_schedule_date": candidate.next_schedule_date,
+                "start_time": candidate.start_time or "10:00",
+                "event_title": _guess_title(candidate),
+                "event_content": candidate.sentence or text,
+            }
+        ],
+    }
+
+
+def format_date_hints(
+    candidates: List[TemporalCandidate], min_confidence: float = HINT_MIN_CONFIDENCE
+) -> str:
+    """프롬프트에 넣을 '표현 -> 계산된 날짜' 목록. 쓸 만한 후보가 없으면 빈 문자열."""
+    lines = []
+    seen = set()
+    for candidate in candidates:
+        if candidate.confidence < min_confidence or candidate.text in seen:
+            continue
+        seen.add(candidate.text)
+        when = candidate.next_schedule_date
+        if candidate.start_time:
+            when += f" {candidate.start_time}"
+        lines.append(f"- '{candidate.text}' = {when}")
+    return "\n".join(lines)
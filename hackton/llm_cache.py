@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from meeting_schema import schema_fingerprint
+from transcript_cache import TranscriptCache
+
+# ----------------------------------------------------
+# Gemini 분석 결과 디스크 캐시 (회의록 + 프롬프트 + 스키마 기반)
+# ----------------------------------------------------
+
+# UI에서 재시도하거나 같은 회의록을 다시 분석할 때 Gemini를 다시 호출하지 않도록,
+# 검증을 통과한 결과(model_dump)를 그대로 저장합니다. 적중하면 네트워크 호출과
+# Pydantic 재검증을 모두 건너뜁니다.
+# 키에는 정규화한 회의록, 프롬프트 버전, 모델명, 기준 날짜, 결과 스키마가 들어가므로
+# 프롬프트나 meeting_schema를 바꾸면 이전 항목은 자연스럽게 적중하지 않습니다.
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+LLM_CACHE_DIR = os.getenv(
+    "LLM_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+)
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 0이면 만료 없음
+
+_WHITESPACE = re.compile(r"[ \t\u00a0\u3000]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+
+def normalize_transcript(text: str) -> str:
+    """유니코드(NFC), 줄바꿈, 연속 공백 차이만 있는 회의록이 같은 키가 되도록 정규화합니다."""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n", "\n".join(lines)).strip()
+
+
+def llm_cache_key(
+    meeting_text: str,
+    prompt_version: str,
+    model: str,
+    reference_date: str,
+    schema: Type[BaseModel],
+) -> str:
+    material = json.dumps(
+        {
+            "transcript": hashlib.sha256(normalize_transcript(meeting_text).encode("utf-8")).hexdigest(),
+            "prompt_version": prompt_version,
+            "model": model,
+            "reference_date": reference_date,
+            "schema": schema_fingerprint(schema),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+_llm_cache: Optional[TranscriptCache] = None
+
+
+def get_llm_cache() -> Optional[TranscriptCache]:
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = TranscriptCache(
+            LLM_CACHE_DIR,
+            LLM_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=LLM_CACHE_TTL_HOURS * 3600 if LLM_CACHE_TTL_HOURS > 0 else None,
+        )
+    return _llm_cache
+
+
+def lookup_result(key: str) -> Optional[Dict[str, Any]]:
+    """저장된 분석 결과(이미 검증된 dict)를 반환합니다. 없거나 만료됐으면 None."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    entry = cache.get(key)
+    return entry["result"] if entry is not None else None
+
+
+def store_result(key: str, result: Dict[str, Any]) -> None:
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.set(key, {"result": result})
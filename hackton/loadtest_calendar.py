@@ -0,0 +1,286 @@
+"""
+가짜 Google Calendar 서버를 띄워 CalendarWriter의 업로드 처리량과 멱등성을 오프라인으로 측정합니다.
+
+    python loadtest_calendar.py                                  # 일정 2000건, 배치 vs 단건 비교
+    python loadtest_calendar.py --schedules 5000 --server-qps 300 --drop-rate 0.05
+    python loadtest_calendar.py --mode batched --output calendar_result.json
+
+가짜 서버는 events.insert(POST /calendar/v3/calendars/<id>/events)와 배치 엔드포인트
+(POST /batch/calendar/v3, multipart/mixed)를 흉내 냅니다.
+- 초당 한도(--server-qps, 배치 안의 호출도 하나씩 셈)를 넘으면 403 rateLimitExceeded
+- --error-rate 비율로 503
+- 같은 id의 이벤트를 다시 넣으면 409
+- --drop-rate 비율로 요청을 처리한 뒤 응답 없이 연결을 끊음 (응답 유실 -> 재시도 -> 409로 중복 방지 확인)
+각 모드는 같은 일정 목록을 두 번 올립니다. 두 번째 실행은 전부 duplicates여야 하고,
+서버의 이벤트 수는 고유 일정 수와 같아야 합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import unquote
+
+from calendar_writer import CalendarWriter, boundary_of, parse_batch
+from meeting_schema import NextSchedule
+
+EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/(?P<calendar>[^/]+)/events$")
+EVENT_ID = re.compile(r"^[a-v0-9]{5,1024}$")
+
+
+# ----------------------------------------------------
+# 1. 가짜 Calendar 서버
+# ----------------------------------------------------
+
+class FakeCalendarState:
+    def __init__(self, qps: float, burst: float, latency: float, item_latency: float,
+                 error_rate: float, drop_rate: float) -> None:
+        self.rate = qps
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.latency = latency
+        self.item_latency = item_latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.lock = threading.Lock()
+        self.events: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.counts = {
+            "http_requests": 0, "calls": 0, "created": 0, "duplicate": 0,
+            "rate_limited": 0, "unavailable": 0, "bad_request": 0, "dropped_responses": 0,
+        }
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+    def insert(self, calendar: str, body: Any) -> Tuple[int, Dict[str, Any]]:
+        """events.insert 한 건을 처리하고 (상태 코드, 응답 본문)을 반환합니다."""
+        self.count("calls")
+        if not self.take():
+            self.count("rate_limited")
+            return 403, _error(403, "Rate Limit Exceeded", "rateLimitExceeded")
+        if random.random() < self.error_rate:
+            self.count("unavailable")
+            return 503, _error(503, "Backend Error", "backendError")
+        event_id = body.get("id") if isinstance(body, dict) else None
+        if not event_id or not EVENT_ID.match(event_id) or "start" not in body:
+            self.count("bad_request")
+            return 400, _error(400, "Invalid resource id value.", "invalid")
+        with self.lock:
+            if (calendar, event_id) in self.events:
+                self.counts["duplicate"] += 1
+                return 409, _error(409, "The requested identifier already exists.", "duplicate")
+            event = {**body, "status": "confirmed", "created": datetime.utcnow().isoformat() + "Z"}
+            self.events[(calendar, event_id)] = event
+            self.counts["created"] += 1
+        return 200, event
+
+
+def _error(code: int, message: str, reason: str) -> Dict[str, Any]:
+    return {"error": {"code": code, "message": message, "errors": [{"domain": "global", "reason": reason, "message": message}]}}
+
+
+def make_handler(state: FakeCalendarState):
+    class FakeCalendarHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            if random.random() < state.drop_rate:
+                # 처리는 끝났지만 응답이 사라진 상황 (클라이언트는 연결 오류를 보게 됨)
+                state.count("dropped_responses")
+                self.close_connection = True
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=UTF-8")
+
+        def do_POST(self) -> None:
+            state.count("http_requests")
+            raw = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._send_json(401, _error(401, "Login Required", "required"))
+                return
+            time.sleep(random.uniform(0.5, 1.5) * state.latency)
+
+            match = EVENTS_PATH.match(self.path.split("?")[0])
+            if match:
+                try:
+                    body = json.loads(raw)
+                except ValueError:
+                    body = None
+                status, payload = state.insert(unquote(match.group("calendar")), body)
+                time.sleep(state.item_latency)
+                self._send_json(status, payload)
+                return
+
+            if self.path != "/batch/calendar/v3":
+                self._send_json(404, _error(404, "Not Found", "notFound"))
+                return
+            boundary = boundary_of(self.headers.get("Content-Type", ""))
+            if boundary is None:
+                self._send_json(400, _error(400, "Missing multipart boundary", "invalid"))
+                return
+            parts = parse_batch(raw, boundary)
+            response_boundary = f"batch_{random.getrandbits(64):016x}"
+            chunks: List[str] = []
+            for part in parts:
+                method, path = (part["start_line"].split() + ["", ""])[:2]
+                inner = EVENTS_PATH.match(path)
+                if method != "POST" or inner is None:
+                    status, payload = 404, _error(404, "Not Found", "notFound")
+                else:
+                    status, payload = state.insert(unquote(inner.group("calendar")), part["body"])
+                text = json.dumps(payload, ensure_ascii=False)
+                chunks.append(
+                    f"--{response_boundary}\r\n"
+                    "Content-Type: application/http\r\n"
+                    f"Content-ID: <response-{part['content_id']}>\r\n"
+                    "\r\n"
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    "Content-Type: application/json; charset=UTF-8\r\n"
+                    "\r\n"
+                    f"{text}\r\n"
+                )
+            chunks.append(f"--{response_boundary}--\r\n")
+            time.sleep(state.item_latency * len(parts))
+            self._send(200, "".join(chunks).encode("utf-8"), f"multipart/mixed; boundary={response_boundary}")
+
+    return FakeCalendarHandler
+
+
+def start_fake_server(state: FakeCalendarState) -> Tuple[str, ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-calendar", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+# ----------------------------------------------------
+# 2. 업로드 실행
+# ----------------------------------------------------
+
+TOPICS = ["예산", "마케팅", "QA", "배포", "디자인", "채용", "보안", "고객"]
+
+
+def make_schedules(count: int, seed: int = 0) -> List[NextSchedule]:
+    rng = random.Random(seed)
+    return [
+        NextSchedule(
+            next_schedule_date=date(2025, 11, 1) + timedelta(days=rng.randrange(120)),
+            start_time=dtime(rng.randint(9, 18), rng.choice([0, 30])),
+            event_title=f"{rng.choice(TOPICS)} 회의 #{index}",
+            event_content="회의에서 정한 후속 일정입니다. 자료를 미리 공유해 주세요.",
+        )
+        for index in range(count)
+    ]
+
+
+async def upload(base_url: str, schedules: List[NextSchedule], args: argparse.Namespace,
+                 batch_size: int, calendar_id: str) -> Dict[str, Any]:
+    runs = []
+    async with CalendarWriter(
+        access_token="fake-token",
+        calendar_id=calendar_id,
+        base_url=base_url,
+        batch_size=batch_size,
+        max_concurrency=args.max_concurrency,
+        base_backoff=args.base_backoff,
+        max_retries=args.max_retries,
+    ) as writer:
+        for _ in range(2):  # 두 번째는 재실행: 전부 409(duplicates)여야 함
+            started = time.perf_counter()
+            report = await writer.insert_many(schedules)
+            elapsed = time.perf_counter() - started
+            runs.append({
+                **report.summary(),
+                "elapsed_seconds": round(elapsed, 3),
+                "events_per_second": round((len(report.created) + len(report.duplicates)) / elapsed, 1),
+            })
+        stats = writer.stats()
+    return {"first_run": runs[0], "rerun": runs[1], "client": stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 Calendar 서버 대상 CalendarWriter 업로드 벤치마크")
+    parser.add_argument("--schedules", type=int, default=2000)
+    parser.add_argument("--mode", choices=["both", "batched", "single"], default="both")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--server-qps", type=float, default=500, help="가짜 서버의 초당 호출 한도")
+    parser.add_argument("--server-burst", type=float, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="HTTP 요청당 평균 지연(초)")
+    parser.add_argument("--item-latency", type=float, default=0.0005, help="이벤트 한 건 처리 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="503 응답 비율")
+    parser.add_argument("--drop-rate", type=float, default=0.02, help="처리 후 응답을 버리는 비율")
+    parser.add_argument("--base-backoff", type=float, default=0.2)
+    parser.add_argument("--max-retries", type=int, default=8)
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    state = FakeCalendarState(
+        args.server_qps, args.server_burst, args.latency, args.item_latency, args.error_rate, args.drop_rate
+    )
+    base_url, server = start_fake_server(state)
+    schedules = make_schedules(args.schedules)
+    modes = ["batched", "single"] if args.mode == "both" else [args.mode]
+    print(
+        f"--- loadtest_calendar: 일정 {args.schedules}건 / 서버 {args.server_qps:.0f} QPS / "
+        f"오류 {args.error_rate:.0%}, 응답 유실 {args.drop_rate:.0%} ---"
+    )
+
+    result: Dict[str, Any] = {}
+    try:
+        for mode in modes:
+            before = dict(state.counts)
+            # 모드마다 다른 캘린더에 올려 서로의 이벤트와 섞이지 않게 합니다.
+            calendar_id = f"bench-{mode}@example.com"
+            outcome = asyncio.run(upload(base_url, schedules, args, args.batch_size if mode == "batched" else 1, calendar_id))
+            stored = sum(1 for calendar, _ in state.events if calendar == calendar_id)
+            outcome["server"] = {key: state.counts[key] - before[key] for key in state.counts}
+            outcome["server"]["stored_events"] = stored
+            outcome["idempotent"] = stored == args.schedules and outcome["rerun"]["created"] == 0
+            result[mode] = outcome
+    finally:
+        server.shutdown()
+
+    if len(result) == 2:
+        batched, single = result["batched"]["first_run"], result["single"]["first_run"]
+        result["speedup"] = round(batched["events_per_second"] / single["events_per_second"], 2) if single["events_per_second"] else None
+    result["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+    }
+    print(json.dumps({key: value for key, value in result.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
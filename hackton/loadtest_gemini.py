@@ -0,0 +1,264 @@
+"""
+가짜 Gemini 서버를 띄워 AsyncGeminiClient를 대량 동시 호출로 검증하는 부하 테스트.
+
+    python loadtest_gemini.py                                   # 300건 동시, 서버 한도 120 RPM
+    python loadtest_gemini.py --requests 500 --server-rpm 300 --client-rpm 280 --error-rate 0.05
+    python loadtest_gemini.py --client-rpm 100000               # 속도 제한 없이 -> 429가 쏟아지는 비교군
+
+가짜 서버는 generateContent 엔드포인트를 흉내 내며, 분당 한도(토큰 버킷)를 넘으면
+429 + Retry-After를, --error-rate 비율로 503을 돌려줍니다. 응답 본문은 요청의
+responseJsonSchema에 맞춰 생성하므로 Pydantic 검증까지 실제와 같은 경로를 탑니다.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from meeting_schema import MeetingAnalysisResult
+from gemini_client import AsyncGeminiClient, GeminiAPIError
+
+PATH_PATTERN = re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent$")
+
+
+# ----------------------------------------------------
+# 1. 가짜 Gemini 서버
+# ----------------------------------------------------
+
+def sample_from_schema(schema: Dict[str, Any], defs: Dict[str, Any], name: str = "") -> Any:
+    """JSON 스키마를 만족하는 예시 값을 만듭니다. ($ref, anyOf, enum, object, array, 기본 타입만 지원)"""
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs, name)
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], defs, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema and schema["default"] not in ("", None):
+        return schema["default"]
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            key: sample_from_schema(value, defs, key)
+            for key, value in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {}), defs, name)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if "date" in name:
+        return "2025-11-12"
+    if "time" in name:
+        return "14:00"
+    return f"가짜 {name or '값'}"
+
+
+class FakeGeminiState:
+    def __init__(self, rpm: float, burst: float, latency: float, error_rate: float) -> None:
+        self.rate = rpm / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.counts = {"ok": 0, "rate_limited": 0, "unavailable": 0, "bad_request": 0}
+        self.max_inflight = 0
+        self.inflight = 0
+
+    def take(self) -> Tuple[bool, float]:
+        """(허용 여부, 다음 토큰까지 남은 초)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True, 0.0
+            return False, (1.0 - self.tokens) / self.rate
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+
+def make_handler(state: FakeGeminiState):
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status: int, reason: str, headers: Optional[Dict[str, str]] = None) -> None:
+            self._send(status, {"error": {"code": status, "message": reason, "status": reason}}, headers)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", "0"))
+            raw = self.rfile.read(length)
+            if not PATH_PATTERN.match(self.path) or not self.headers.get("x-goog-api-key"):
+                state.count("bad_request")
+                self._error(404 if not PATH_PATTERN.match(self.path) else 401, "INVALID_ARGUMENT")
+                return
+
+            allowed, wait = state.take()
+            if not allowed:
+                state.count("rate_limited")
+                self._error(429, "RESOURCE_EXHAUSTED", {"Retry-After": str(math.ceil(wait))})
+                return
+            if random.random() < state.error_rate:
+                state.count("unavailable")
+                self._error(503, "UNAVAILABLE")
+                return
+
+            with state.lock:
+                state.inflight += 1
+                state.max_inflight = max(state.max_inflight, state.inflight)
+            try:
+                time.sleep(random.uniform(0.5, 1.5) * state.latency)
+                request = json.loads(raw)
+                schema = request["generationConfig"]["responseJsonSchema"]
+                text = json.dumps(sample_from_schema(schema, schema.get("$defs", {})), ensure_ascii=False)
+            except (KeyError, ValueError):
+                state.count("bad_request")
+                self._error(400, "INVALID_ARGUMENT")
+                return
+            finally:
+                with state.lock:
+                    state.inflight -= 1
+            state.count("ok")
+            self._send(
+                200,
+                {
+                    "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+                    "usageMetadata": {"promptTokenCount": len(raw) // 4, "candidatesTokenCount": len(text) // 4},
+                },
+            )
+
+    return FakeGeminiHandler
+
+
+def start_fake_server(state: FakeGeminiState) -> Tuple[str, ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-gemini", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1beta", server
+
+
+# ----------------------------------------------------
+# 2. 부하 생성
+# ----------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))]
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with AsyncGeminiClient(
+        api_key="fake-key",
+        base_url=base_url,
+        requests_per_minute=args.client_rpm,
+        burst=args.client_burst,
+        deadline=args.deadline,
+        max_connections=args.max_connections,
+        base_backoff=args.base_backoff,
+    ) as client:
+
+        async def one(index: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await client.generate_json(f"회의록 {index}", MeetingAnalysisResult)
+                except GeminiAPIError as e:
+                    name = type(e).__name__ if e.status is None else f"{type(e).__name__}:{e.status}"
+                    errors[name] = errors.get(name, 0) + 1
+                    return
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        client_stats = client.stats()
+
+    return {
+        "requests": args.requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_minute": round(len(latencies) / elapsed * 60, 1) if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+        },
+        "client": client_stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 Gemini 서버 대상 AsyncGeminiClient 부하 테스트")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=300)
+    parser.add_argument("--server-rpm", type=float, default=1200, help="가짜 서버의 분당 한도")
+    parser.add_argument("--server-burst", type=float, default=20)
+    parser.add_argument("--client-rpm", type=float, default=1140, help="클라이언트 토큰 버킷 (한도보다 약간 낮게)")
+    parser.add_argument("--client-burst", type=float, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="가짜 서버 평균 응답 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="503 응답 비율")
+    parser.add_argument("--deadline", type=float, default=120.0)
+    parser.add_argument("--base-backoff", type=float, default=0.5)
+    parser.add_argument("--max-connections", type=int, default=32)
+    parser.add_argument("--output", help="JSON 결과를 저장할 파일")
+    args = parser.parse_args()
+
+    state = FakeGeminiState(args.server_rpm, args.server_burst, args.latency, args.error_rate)
+    base_url, server = start_fake_server(state)
+    print(
+        f"--- loadtest_gemini: {args.requests}건 / 동시 {args.concurrency} / "
+        f"서버 {args.server_rpm:.0f} RPM, 클라이언트 {args.client_rpm:.0f} RPM ---"
+    )
+    try:
+        result = asyncio.run(drive(base_url, args))
+    finally:
+        server.shutdown()
+
+    result["server"] = {**state.counts, "max_inflight": state.max_inflight}
+    result["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+    }
+    print(json.dumps({key: value for key, value in result.items() if key != "meta"}, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
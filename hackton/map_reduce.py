@@ -0,0 +1,214 @@
+import asyncio
+import os
+import re
+from datetime import date
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from gemini_client import generate_json_async
+from korean_dates import format_date_hints, resolve_temporal_expressions
+from meeting_schema import MeetingAnalysisResult, NextSchedule
+
+# ----------------------------------------------------
+# 긴 회의록용 map-reduce 추출
+# ----------------------------------------------------
+
+# 회의록 전체를 한 프롬프트에 넣으면 긴 회의에서는 토큰 비용과 지연이 커지고,
+# 컨텍스트 한도를 넘으면 아예 실패합니다. 대신
+#   map:    회의록을 겹치는 구간으로 나눠 구간별 요약과 후보 일정을 동시에 추출하고
+#   reduce: 후보 일정의 중복을 제거하고, 구간 요약들을 하나의 요약으로 압축해
+# 최종적으로 하나의 MeetingAnalysisResult를 만듭니다.
+
+MAP_REDUCE_THRESHOLD_CHARS = int(os.getenv("MAP_REDUCE_THRESHOLD_CHARS", "12000"))
+MAP_WINDOW_CHARS = int(os.getenv("MAP_WINDOW_CHARS", "6000"))
+MAP_OVERLAP_CHARS = int(os.getenv("MAP_OVERLAP_CHARS", "800"))
+MAP_CONCURRENCY = int(os.getenv("MAP_CONCURRENCY", "4"))
+
+# 프롬프트를 고치면 올립니다. (분석 결과 캐시 키에 들어감)
+MAP_REDUCE_VERSION = "map-reduce-2"
+
+MAP_PROMPT_TEMPLATE = """
+    당신은 전문 회의록 분석가입니다. 아래 텍스트는 긴 회의록을 나눈 {total}개 구간 중 {index}번째 구간이며,
+    앞뒤 구간과 일부 내용이 겹칩니다. 이 구간에 나온 내용만으로 제공된 JSON 스키마에 따라 데이터를 추출하세요.
+    회의 날짜(기준 날짜)는 {reference_date}입니다. '다음주 수요일', '모레' 같은 표현은 이 날짜를 기준으로 계산하세요.
+
+    **[추출 지시 사항]**
+    1. **'meeting_summary'**: 이 구간에서 논의되거나 결정된 핵심 내용을 2~3줄로 요약하세요.
+    2. **'next_schedules'**: 이 구간에서 결정된 다음 회의 또는 후속 일정만 추출하세요. 없으면 빈 리스트로 두세요.
+        a. **next_schedule_date**: 날짜를 **YYYY-MM-DD** 형식으로 추출하세요.
+        b. **start_time**: 시간을 **HH:MM** 형식으로 추출하세요. 시간이 명시되지 않았다면 **기본값 '10:00'**을 사용하세요.
+        c. **event_title**: 구글 캘린더 이벤트의 제목을 추출하세요.
+        d. **event_content**: 구글 캘린더 이벤트의 본문을 **2~3줄**로 작성하세요.
+    {date_hints}
+    ---
+    회의록 구간 ({index}/{total}):
+    {window_text}
+    """
+
+# 구간마다 korean_dates.py로 미리 계산한 날짜를 넣습니다. (meeting_extractor.DATE_HINTS_TEMPLATE과 같은 형식)
+MAP_DATE_HINTS_TEMPLATE = """
+    **[날짜 힌트]** 기준 날짜 {reference_date}로 미리 계산한 값입니다. 아래 표현은 그대로 사용하세요.
+{hints}
+"""
+
+REDUCE_PROMPT_TEMPLATE = """
+    당신은 전문 회의록 분석가입니다. 다음은 하나의 회의록을 순서대로 구간별 요약한 내용입니다.
+    구간끼리 내용이 겹칠 수 있으니 중복을 없애고, 회의 전체 내용에 대한 간결하고 핵심적인 요약(3~4줄)으로
+    압축하여 'meeting_summary'에 작성하세요.
+    ---
+    구간별 요약:
+    {partial_summaries}
+    """
+
+
+class CondensedSummary(BaseModel):
+    """reduce 단계 응답: 구간 요약을 합친 전체 요약"""
+    meeting_summary: str = Field(..., description="회의록 전체 내용에 대한 3~4줄 핵심 요약.")
+
+
+# ----------------------------------------------------
+# 1. 구간 나누기
+# ----------------------------------------------------
+
+# Whisper 결과는 줄바꿈 없이 한 줄로 오는 경우가 많아, 문장 끝(. ? ! 또는 줄바꿈)에서 자릅니다.
+_SENTENCE_END = re.compile(r"(?<=[.?!。])\s+|\n+")
+
+
+def split_transcript(
+    text: str, window_chars: int = MAP_WINDOW_CHARS, overlap_chars: int = MAP_OVERLAP_CHARS
+) -> List[str]:
+    """
+    문장 단위로 최대 window_chars 글자의 구간을 만들고, 각 구간은 앞 구간의 마지막
+    overlap_chars 글자 분량의 문장으로 시작합니다. (경계에 걸친 일정이 잘리지 않도록)
+    """
+    units: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        # 문장 하나가 구간보다 길면 글자 수로 자릅니다.
+        for start in range(0, len(sentence), window_chars):
+            units.append(sentence[start:start + window_chars])
+
+    windows: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        if current and size + len(unit) > window_chars:
+            windows.append(" ".join(current))
+            tail: List[str] = []
+            tail_size = 0
+            for previous in reversed(current):
+                grown = tail_size + len(previous)
+                if grown > overlap_chars or grown + len(unit) > window_chars:
+                    break
+                tail.insert(0, previous)
+                tail_size += len(previous) + 1
+            current, size = tail, tail_size
+        current.append(unit)
+        size += len(unit) + 1
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+
+# ----------------------------------------------------
+# 2. reduce: 일정 중복 제거
+# ----------------------------------------------------
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r"[\s\W_]+", "", title).lower()
+
+
+def same_event(a: NextSchedule, b: NextSchedule) -> bool:
+    if a.next_schedule_date != b.next_schedule_date or a.start_time != b.start_time:
+        return False
+    left, right = _normalize_title(a.event_title), _normalize_title(b.event_title)
+    if not left or not right or left in right or right in left:
+        return True
+    return SequenceMatcher(None, left, right).ratio() >= 0.6
+
+
+def merge_schedules(candidates: List[NextSchedule]) -> List[NextSchedule]:
+    """
+    같은 날짜/시간에 제목이 비슷한 후보를 하나로 합칩니다. (겹치는 구간에서 두 번 추출된 일정)
+    합칠 때는 본문이 더 자세한 쪽을 남기고, 결과는 날짜/시간 순으로 정렬합니다.
+    """
+    merged: List[NextSchedule] = []
+    for candidate in candidates:
+        for index, kept in enumerate(merged):
+            if same_event(kept, candidate):
+                if len(candidate.event_content) > len(kept.event_content):
+                    merged[index] = candidate
+                break
+        else:
+            merged.append(candidate)
+    return sorted(merged, key=lambda item: (item.next_schedule_date, item.start_time))
+
+
+# ----------------------------------------------------
+# 3. map-reduce 실행
+# ----------------------------------------------------
+
+def build_map_prompt(window_text: str, index: int, total: int, reference_date: str) -> str:
+    hints = format_date_hints(resolve_temporal_expressions(window_text, reference_date))
+    date_hints = ""
+    if hints:
+        indented = "\n".join(f"    {line}" for line in hints.splitlines())
+        date_hints = MAP_DATE_HINTS_TEMPLATE.format(reference_date=reference_date, hints=indented)
+    return MAP_PROMPT_TEMPLATE.format(
+        index=index + 1, total=total, window_text=window_text, reference_date=reference_date, date_hints=date_hints
+    )
+
+
+async def map_reduce_extract(
+    meeting_text: str,
+    reference_date: Optional[str] = None,
+    window_chars: int = MAP_WINDOW_CHARS,
+    overlap_chars: int = MAP_OVERLAP_CHARS,
+    concurrency: int = MAP_CONCURRENCY,
+) -> Tuple[MeetingAnalysisResult, Dict[str, int]]:
+    """
+    긴 회의록을 map-reduce로 분석해 (MeetingAnalysisResult, 통계)를 반환합니다.
+    상대 날짜는 reference_date(없으면 오늘) 기준으로 계산하도록 구간마다 기준 날짜와 날짜 힌트를 넣습니다.
+    구간 하나라도 실패하면 일정이 누락될 수 있으므로 예외를 그대로 올립니다.
+    """
+    reference_date = reference_date or date.today().isoformat()
+    windows = split_transcript(meeting_text, window_chars, overlap_chars)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def map_window(index: int, window_text: str) -> MeetingAnalysisResult:
+        prompt = build_map_prompt(window_text, index, len(windows), reference_date)
+        async with semaphore:
+            return await generate_json_async(prompt, MeetingAnalysisResult)  # type: ignore[return-value]
+
+    partials = await asyncio.gather(*(map_window(index, text) for index, text in enumerate(windows)))
+
+    candidates = [schedule for partial in partials for schedule in partial.next_schedules]
+    schedules = merge_schedules(candidates)
+
+    summaries = [partial.meeting_summary.strip() for partial in partials if partial.meeting_summary.strip()]
+    summary: Optional[str] = summaries[0] if len(summaries) == 1 else None
+    if summary is None and summaries:
+        prompt = REDUCE_PROMPT_TEMPLATE.format(
+            partial_summaries="\n".join(f"{number}. {text}" for number, text in enumerate(summaries, 1))
+        )
+        try:
+            condensed = await generate_json_async(prompt, CondensedSummary)
+            summary = condensed.meeting_summary  # type: ignore[attr-defined]
+        except Exception as e:
+            # 요약 압축이 실패해도 일정은 살립니다. 구간 요약을 이어 붙여 대신 씁니다.
+            print(f"⚠️ 요약 압축 실패, 구간 요약을 이어 붙입니다: {e}")
+            summary = " ".join(summaries)
+
+    result = MeetingAnalysisResult(meeting_summary=summary or "", next_schedules=schedules)
+    stats = {
+        "windows": len(windows),
+        "candidate_schedules": len(candidates),
+        "merged_schedules": len(schedules),
+    }
+    return result, stats
+
+
+def needs_map_reduce(meeting_text: str, threshold_chars: int = MAP_REDUCE_THRESHOLD_CHARS) -> bool:
+    return threshold_chars > 0 and len(meeting_text) > threshold_chars
@@ -0,0 +1,191 @@
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+# Gemini API 클라이언트 (속도 제한/재시도/연결 재사용은 gemini_client.py 참고)
+from gemini_client import GEMINI_MODEL, AsyncGeminiClient, generate_json_async, generate_json_sync, run_sync, shared_client
+from pydantic import ValidationError
+from meeting_schema import MeetingAnalysisResult # Pydantic 클래스 임포트 (v2 형식)
+from korean_dates import format_date_hints, quick_extract, resolve_temporal_expressions
+from llm_cache import llm_cache_key, lookup_result, store_result
+from map_reduce import MAP_REDUCE_VERSION, map_reduce_extract, needs_map_reduce
+from schedule_store import get_schedule_store
+
+# ----------------------------------------------------
+# GEMINI 구조화 분석 로직 (여러 실행 스크립트에서 공유)
+# ----------------------------------------------------
+
+# PROMPT_TEMPLATE을 고치면 버전도 올려야 이전 분석 결과 캐시가 적중하지 않습니다.
+PROMPT_VERSION = "meeting-2025-11-05"
+
+PROMPT_TEMPLATE = """
+    당신은 전문 회의록 분석가입니다. 다음 회의록 텍스트를 분석하여,
+    제공된 **MeetingAnalysisResult** JSON 스키마에 따라 데이터를 정확하게 추출하세요.
+
+    **[추출 지시 사항]**
+    1. **'meeting_summary'**: 회의록 전체 내용에 대한 간결하고 핵심적인 요약(3~4줄)을 작성하세요.
+    2. **'next_schedules'**: 다음 회의 또는 후속 일정에 대한 상세 정보 객체를 구성해야 합니다.
+        a. **next_schedule_date**: 후속 일정의 날짜를 **YYYY-MM-DD** 형식으로 추출하세요.
+        b. **start_time**: 후속 일정의 시간을 **HH:MM** 형식으로 추출하세요. 시간이 명시되지 않았다면, **기본값 '10:00'**을 사용해야 합니다.
+        c. **event_title**: 구글 캘린더 이벤트의 **제목 (Title/Summary)**에 들어갈 핵심 제목을 추출하세요.
+        d. **event_content**: 구글 캘린더 이벤트의 **내용/본문 (Content/Description)**에 들어갈 상세 설명을 **2~3줄**로 작성하세요. 이 내용은 해당 후속 조치가 필요한 배경과 목표를 설명해야 합니다.
+
+    분석 결과는 반드시 제공된 JSON 스키마의 중첩 구조를 따라야 합니다.
+    {date_hints}
+    ---
+    회의록 텍스트:
+    {meeting_text}
+    """
+
+
+def get_client() -> AsyncGeminiClient:
+    """
+    프로세스 공용 Gemini 클라이언트를 반환합니다. (환경 변수 GEMINI_API_KEY 사용)
+    모듈 임포트 시점이 아니라 처음 호출될 때 초기화되므로, STT만 쓰는 스크립트에는 영향이 없습니다.
+    """
+    client = shared_client()
+    print(f"✅ Gemini Client 초기화 완료. (모델 {client.model}, 분당 최대 {client.limiter.rate * 60:.0f}건)")
+    return client
+
+
+# korean_dates.py가 미리 계산한 날짜를 넣어, 모델이 상대 날짜를 다시 계산하지 않게 합니다.
+DATE_HINTS_TEMPLATE = """
+    **[날짜 힌트]** 기준 날짜 {reference_date}로 미리 계산한 값입니다. 아래 표현은 그대로 사용하세요.
+{hints}
+"""
+
+
+def build_prompt(meeting_text: str, reference_date: Optional[str] = None) -> str:
+    reference_date = reference_date or date.today().isoformat()
+    hints = format_date_hints(resolve_temporal_expressions(meeting_text, reference_date))
+    date_hints = ""
+    if hints:
+        indented = "\n".join(f"    {line}" for line in hints.splitlines())
+        date_hints = DATE_HINTS_TEMPLATE.format(reference_date=reference_date, hints=indented)
+    return PROMPT_TEMPLATE.format(meeting_text=meeting_text, date_hints=date_hints)
+
+
+def quick_result(meeting_text: str, reference_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """짧고 날짜가 분명한 발화는 규칙 기반으로 바로 답합니다. (해당하지 않으면 None)"""
+    quick = quick_extract(meeting_text, reference_date or date.today().isoformat())
+    if quick is None:
+        return None
+    return MeetingAnalysisResult.model_validate(quick).model_dump(mode="json")
+
+
+async def _map_reduce(meeting_text: str, reference_date: Optional[str] = None) -> Dict[str, Any]:
+    result, stats = await map_reduce_extract(meeting_text, reference_date or date.today().isoformat())
+    print(
+        f"🧩 map-reduce 분석: {len(meeting_text)}자 -> 구간 {stats['windows']}개, "
+        f"후보 일정 {stats['candidate_schedules']}건 -> {stats['merged_schedules']}건"
+    )
+    return result.model_dump(mode="json")
+
+
+def result_cache_key(meeting_text: str, reference_date: Optional[str] = None) -> str:
+    """분석 결과 캐시 키. 기준 날짜를 주지 않으면 오늘 날짜를 씁니다 ('다음 주 수요일' 등은 날짜마다 다르므로)."""
+    # 긴 회의록은 map-reduce 프롬프트로 분석하므로 그 버전도 키에 넣습니다.
+    prompt_version = PROMPT_VERSION
+    if needs_map_reduce(meeting_text):
+        prompt_version = f"{PROMPT_VERSION}+{MAP_REDUCE_VERSION}"
+    return llm_cache_key(
+        meeting_text,
+        prompt_version,
+        GEMINI_MODEL,
+        reference_date or date.today().isoformat(),
+        MeetingAnalysisResult,
+    )
+
+
+def extract_meeting_data(meeting_text: str, reference_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    STT 결과를 받아 구조화된 JSON 데이터를 추출합니다.
+    같은 회의록/기준 날짜로 분석한 결과가 캐시에 있으면 Gemini를 호출하지 않고 그대로 반환합니다.
+    MAP_REDUCE_THRESHOLD_CHARS보다 긴 회의록은 구간별로 나눠 분석한 뒤 합칩니다(map_reduce.py).
+    짧고 날짜가 분명한 발화는 Gemini 없이 규칙 기반으로 답합니다(korean_dates.py).
+    """
+    quick = quick_result(meeting_text, reference_date)
+    if quick is not None:
+        print("⚡ 규칙 기반 날짜 추출로 처리 (Gemini 호출 생략)")
+        return quick
+
+    key = result_cache_key(meeting_text, reference_date)
+    cached = lookup_result(key)
+    if cached is not None:
+        print("♻️ 분석 결과 캐시 적중 (Gemini 호출 생략)")
+        return cached
+
+    try:
+        # 429/5xx는 gemini_client가 백오프하며 재시도하고, 마감 시간을 넘기면 예외가 납니다.
+        if needs_map_reduce(meeting_text):
+            # asyncio.run()은 이미 이벤트 루프가 도는 스레드(ASGI 등)에서 실패하므로 공용 루프에서 실행합니다.
+            result = run_sync(_map_reduce(meeting_text, reference_date))
+        else:
+            result = generate_json_sync(
+                build_prompt(meeting_text, reference_date), MeetingAnalysisResult
+            ).model_dump(mode="json")
+
+    except ValidationError as e:
+        print(f"❌ Pydantic 유효성 검사 오류: 모델이 스키마를 따르지 않았습니다. 오류 상세: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ Gemini API 호출 중 오류 발생: {e}")
+        return None
+
+    store_result(key, result)
+    return result
+
+
+async def extract_meeting_data_async(
+    meeting_text: str, reference_date: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """extract_meeting_data()의 비동기 버전. 이벤트 루프를 막지 않고 여러 건을 동시에 요청할 수 있습니다."""
+    quick = quick_result(meeting_text, reference_date)
+    if quick is not None:
+        return quick
+
+    key = result_cache_key(meeting_text, reference_date)
+    cached = lookup_result(key)
+    if cached is not None:
+        return cached
+
+    try:
+        if needs_map_reduce(meeting_text):
+            result = await _map_reduce(meeting_text, reference_date)
+        else:
+            result = (
+                await generate_json_async(build_prompt(meeting_text, reference_date), MeetingAnalysisResult)
+            ).model_dump(mode="json")
+
+    except ValidationError as e:
+        print(f"❌ Pydantic 유효성 검사 오류: 모델이 스키마를 따르지 않았습니다. 오류 상세: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ Gemini API 호출 중 오류 발생: {e}")
+        return None
+
+    store_result(key, result)
+    return result
+
+
+def save_analysis_output(
+    extracted_data: Dict[str, Any], output_dir: str = ".", label: Optional[str] = None
+) -> str:
+    """
+    분석 결과를 analysis_output_[<label>_]<타임스탬프>.json 파일로 저장하고 경로를 반환합니다.
+    일정 저장소(schedule_store.py)에도 함께 넣어 날짜/제목으로 조회할 수 있게 합니다.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"analysis_output_{label}_{timestamp}.json" if label else f"analysis_output_{timestamp}.json"
+    output_path = os.path.join(output_dir, name)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(extracted_data, f, ensure_ascii=False, indent=4)
+
+    store = get_schedule_store()
+    if store is not None:
+        try:
+            store.ingest_result(extracted_data, source=os.path.abspath(output_path))
+        except Exception as e:
+            print(f"⚠️ 일정 저장소 기록 실패 (JSON 파일은 저장됨): {e}")
+    return output_path
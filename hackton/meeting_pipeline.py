@@ -0,0 +1,131 @@
+"""
+STT(1차) -> Gemini 분석(2차) 2단계 스레드 파이프라인.
+
+    python meeting_pipeline.py voice.m4a meeting2.m4a notes.txt
+    python meeting_pipeline.py --watch recordings/ --stt-workers 2 --llm-workers 4
+
+1차 단계에서 여러 파일이 동시에 변환되고 끝나는 순서가 뒤섞여도, 2차 단계와 최종 결과는
+항상 입력 순서대로 처리/출력됩니다. --watch 모드는 디렉터리에 새로 저장되는 녹음 파일을
+계속 받아들여, 다음 녹음을 변환하는 동안 앞 녹음의 분석이 함께 진행됩니다. (Ctrl+C로 종료)
+"""
+
+import argparse
+import json
+import os
+import threading
+from typing import Any, Dict, Set, Tuple
+
+from batch_analyzer import AUDIO_EXTENSIONS, TEXT_EXTENSIONS
+from meeting_extractor import extract_meeting_data, get_client, save_analysis_output
+from pipeline import Pipeline, Stage
+from stt_module import run_stt_conversion
+
+
+def stt_stage(path: str) -> Tuple[str, str]:
+    """1차: 오디오는 STT로, 텍스트 파일은 그대로 읽어 회의록 텍스트를 만듭니다."""
+    if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+        with open(path, "r", encoding="utf-8") as f:
+            transcript = f.read()
+    else:
+        transcript = run_stt_conversion(path)
+    if not transcript.strip():
+        raise RuntimeError("STT 결과가 비어 있습니다")
+    return path, transcript
+
+
+def make_llm_stage(output_dir: str):
+    def llm_stage(payload: Tuple[str, str]) -> Dict[str, Any]:
+        """2차: Gemini로 구조화 데이터를 추출하고 analysis_output_*.json으로 저장합니다."""
+        path, transcript = payload
+        extracted_data = extract_meeting_data(transcript)
+        if extracted_data is None:
+            raise RuntimeError("Gemini 추출 실패")
+        label = os.path.splitext(os.path.basename(path))[0]
+        return {"output": save_analysis_output(extracted_data, output_dir, label), "data": extracted_data}
+
+    return llm_stage
+
+
+def watch_directory(pipeline: Pipeline, directory: str, interval: float, stop: threading.Event) -> None:
+    """디렉터리를 주기적으로 확인해, 크기 변화가 멈춘(저장이 끝난) 새 파일을 파이프라인에 넣습니다."""
+    seen: Set[str] = set()
+    sizes: Dict[str, int] = {}
+    while not stop.is_set():
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            ext = os.path.splitext(name)[1].lower()
+            if path in seen or ext not in AUDIO_EXTENSIONS | TEXT_EXTENSIONS:
+                continue
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if sizes.get(path) == size and size > 0:
+                seen.add(path)
+                print(f"📥 새 파일 감지: {path} (순번 {pipeline.submit(path)})")
+            sizes[path] = size
+        stop.wait(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="STT -> Gemini 2단계 순서 보장 파이프라인")
+    parser.add_argument("files", nargs="*", help="처리할 오디오/텍스트 파일 (입력 순서대로 결과 출력)")
+    parser.add_argument("--watch", help="새 녹음 파일을 계속 감시할 디렉터리")
+    parser.add_argument("--interval", type=float, default=1.0, help="--watch 확인 주기(초)")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--stt-workers", type=int, default=2)
+    parser.add_argument("--llm-workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=2, help="단계별 입력 큐 크기")
+    args = parser.parse_args()
+    if not args.files and not args.watch:
+        parser.error("파일 목록 또는 --watch 디렉터리를 지정하세요")
+
+    # API 클라이언트 초기화 (환경 변수 GEMINI_API_KEY 사용)
+    try:
+        get_client()
+    except Exception as e:
+        print(f"❌ 클라이언트 초기화 오류: {e}")
+        raise SystemExit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    pipeline = Pipeline(
+        [
+            Stage("stt", stt_stage, workers=args.stt_workers, queue_size=args.queue_size),
+            Stage("llm", make_llm_stage(args.output_dir), workers=args.llm_workers, queue_size=args.queue_size),
+        ]
+    )
+    pipeline.start()
+
+    stop = threading.Event()
+
+    def feed() -> None:
+        for path in args.files:
+            pipeline.submit(path)
+        if args.watch:
+            watch_directory(pipeline, args.watch, args.interval, stop)
+        pipeline.close()
+
+    feeder = threading.Thread(target=feed, name="feeder", daemon=True)
+    feeder.start()
+
+    try:
+        for result in pipeline.results():
+            name = os.path.basename(str(result.item))
+            if result.error is not None:
+                print(f"❌ [{result.seq}] {name}: {result.failed_stage} 단계 실패 - {result.error}")
+                continue
+            timings = ", ".join(f"{key} {value:.1f}초" for key, value in result.timings.items())
+            print(f"✅ [{result.seq}] {name}: {result.value['output']} ({timings})")
+    except KeyboardInterrupt:
+        print("\n⏹️ 입력을 마감하고 남은 작업을 마무리합니다...")
+        stop.set()
+        for result in pipeline.results():
+            status = "실패" if result.error else result.value["output"]
+            print(f"  [{result.seq}] {os.path.basename(str(result.item))}: {status}")
+
+    print("\n--- 단계별 처리 현황 ---")
+    print(json.dumps(pipeline.stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
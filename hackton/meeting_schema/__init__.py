@@ -0,0 +1,42 @@
+"""
+회의 분석 결과 스키마 (버전별 Pydantic 모델 + 변환기 + 검증 도우미).
+
+- v1: 루트 gemini_extractor.py 형식. event_details 하나와 meeting_summary.
+- v2: hackton/ 형식(현재 버전). next_schedules 목록과 meeting_summary.
+
+날짜/시간 필드는 검증 시점에 date / time 객체로 바뀌고, model_dump(mode="json")으로
+내보내면 "YYYY-MM-DD" / "HH:MM" 문자열이 됩니다.
+"""
+
+from . import v1, v2
+from .adapters import detect_version, to_v1, to_v2, v1_to_v2, v2_to_v1
+from .types import ScheduleDate, ScheduleTime
+from .validation import response_schema, schema_fingerprint, validate_many, validate_many_json
+
+SCHEMA_VERSION = v2.SCHEMA_VERSION
+
+MeetingAnalysisResult = v2.MeetingAnalysisResult
+NextSchedule = v2.NextSchedule
+ScheduleEvent = v1.ScheduleEvent
+LegacyMeetingAnalysisResult = v1.MeetingAnalysisResult
+
+__all__ = [
+    "SCHEMA_VERSION",
+    "v1",
+    "v2",
+    "MeetingAnalysisResult",
+    "NextSchedule",
+    "ScheduleEvent",
+    "LegacyMeetingAnalysisResult",
+    "ScheduleDate",
+    "ScheduleTime",
+    "detect_version",
+    "to_v1",
+    "to_v2",
+    "v1_to_v2",
+    "v2_to_v1",
+    "response_schema",
+    "schema_fingerprint",
+    "validate_many",
+    "validate_many_json",
+]
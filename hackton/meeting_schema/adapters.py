@@ -0,0 +1,71 @@
+from typing import Any, Dict, Union
+
+from . import v1, v2
+
+# ----------------------------------------------------
+# v1 <-> v2 변환
+# ----------------------------------------------------
+
+# v1은 "가장 중요한 일정 하나"(event_details), v2는 "후속 일정 목록"(next_schedules)입니다.
+# v1 -> v2는 손실이 없고(본문이 없으므로 event_subject를 제목/본문에 함께 씀),
+# v2 -> v1은 목록의 첫 번째 일정만 남깁니다. (프롬프트가 중요한 일정부터 나열하도록 지시함)
+
+AnyResult = Union[v1.MeetingAnalysisResult, v2.MeetingAnalysisResult]
+
+
+def detect_version(data: Dict[str, Any]) -> int:
+    """저장된 분석 결과 dict의 형식(1 또는 2)을 판별합니다."""
+    if "next_schedules" in data:
+        return v2.SCHEMA_VERSION
+    if "event_details" in data:
+        return v1.SCHEMA_VERSION
+    raise ValueError(f"알 수 없는 분석 결과 형식입니다: {sorted(data)}")
+
+
+def v1_to_v2(result: v1.MeetingAnalysisResult) -> v2.MeetingAnalysisResult:
+    event = result.event_details
+    return v2.MeetingAnalysisResult(
+        meeting_summary=result.meeting_summary,
+        next_schedules=[
+            v2.NextSchedule(
+                next_schedule_date=event.event_date,
+                start_time=event.event_time,
+                event_title=event.event_subject,
+                event_content=event.event_subject,
+            )
+        ],
+    )
+
+
+def v2_to_v1(result: v2.MeetingAnalysisResult) -> v1.MeetingAnalysisResult:
+    if not result.next_schedules:
+        raise ValueError("v1 형식에는 일정이 하나 이상 필요합니다")
+    schedule = result.next_schedules[0]
+    return v1.MeetingAnalysisResult(
+        event_details=v1.ScheduleEvent(
+            event_date=schedule.next_schedule_date,
+            event_time=schedule.start_time,
+            event_subject=schedule.event_title,
+        ),
+        meeting_summary=result.meeting_summary,
+    )
+
+
+def to_v2(data: Union[Dict[str, Any], AnyResult]) -> v2.MeetingAnalysisResult:
+    """v1/v2 어느 형식이든(dict 또는 모델) v2 모델로 맞춥니다."""
+    if isinstance(data, v2.MeetingAnalysisResult):
+        return data
+    if isinstance(data, v1.MeetingAnalysisResult):
+        return v1_to_v2(data)
+    if detect_version(data) == v1.SCHEMA_VERSION:
+        return v1_to_v2(v1.MeetingAnalysisResult.model_validate(data))
+    return v2.MeetingAnalysisResult.model_validate(data)
+
+
+def to_v1(data: Union[Dict[str, Any], AnyResult]) -> v1.MeetingAnalysisResult:
+    """v1/v2 어느 형식이든(dict 또는 모델) v1 모델로 맞춥니다."""
+    if isinstance(data, v1.MeetingAnalysisResult):
+        return data
+    if isinstance(data, dict) and detect_version(data) == v1.SCHEMA_VERSION:
+        return v1.MeetingAnalysisResult.model_validate(data)
+    return v2_to_v1(to_v2(data))
@@ -0,0 +1,46 @@
+import re
+from datetime import date, time
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, PlainSerializer, WithJsonSchema
+
+# ----------------------------------------------------
+# 날짜/시간 필드 타입
+# ----------------------------------------------------
+
+# 검증 단계에서 "YYYY-MM-DD" / "HH:MM" 문자열을 date / time 객체로 바꿔 두므로,
+# 소비하는 쪽(캘린더 등록, 정렬, 중복 제거)은 다시 파싱할 필요가 없습니다.
+# JSON으로 내보낼 때(model_dump(mode="json"))는 예전과 같은 문자열 형식으로 돌아갑니다.
+
+_HHMM = re.compile(r"^\s*(\d{1,2})\s*[:시]\s*(\d{1,2})?\s*분?\s*$")
+
+
+def _parse_time(value: Any) -> Any:
+    # Gemini가 "9:00", "14:00:00", "14시 30분"처럼 내보내도 받아 줍니다.
+    if isinstance(value, str):
+        match = _HHMM.match(value)
+        if match:
+            return time(int(match.group(1)), int(match.group(2) or 0))
+    return value
+
+
+def _parse_date(value: Any) -> Any:
+    # "2025-11-12T00:00:00" 같은 응답은 날짜 부분만 씁니다.
+    if isinstance(value, str) and len(value) > 10 and value[10] in "T ":
+        return value[:10]
+    return value
+
+
+ScheduleDate = Annotated[
+    date,
+    BeforeValidator(_parse_date),
+    PlainSerializer(lambda value: value.isoformat(), return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "format": "date"}),
+]
+
+ScheduleTime = Annotated[
+    time,
+    BeforeValidator(_parse_time),
+    PlainSerializer(lambda value: value.strftime("%H:%M"), return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "pattern": "^([01][0-9]|2[0-3]):[0-5][0-9]$"}),
+]
@@ -0,0 +1,59 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, Type, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# ----------------------------------------------------
+# 스키마 생성 캐시 + 대량 검증
+# ----------------------------------------------------
+
+# model_json_schema()는 호출할 때마다 스키마를 새로 만듭니다. Gemini 요청마다 부르지 않도록
+# 모델 클래스별로 한 번만 만들어 둡니다. (반환된 dict는 공유되므로 수정하지 마세요)
+
+
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Gemini responseJsonSchema에 넣을 JSON 스키마."""
+    return model.model_json_schema()
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint(model: Type[BaseModel]) -> str:
+    """JSON 스키마 해시. 필드나 설명이 바뀌면 달라집니다. (분석 결과 캐시 키에 사용)"""
+    material = json.dumps(response_schema(model), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    # TypeAdapter 생성(검증기 컴파일)은 비싸므로 모델마다 한 번만 만듭니다.
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def validate_many(
+    records: Iterable[Dict[str, Any]], model: Type[BaseModel]
+) -> Tuple[List[BaseModel], List[Tuple[int, str]]]:
+    """
+    저장된 분석 결과 여러 건을 한 번에 검증해 (통과한 모델 목록, [(위치, 오류)])를 반환합니다.
+    전부 유효하면 목록 전체를 한 번의 검증기 호출로 처리하고, 오류가 있을 때만 건별로 다시 검사합니다.
+    """
+    records = list(records)
+    try:
+        return _list_adapter(model).validate_python(records), []
+    except ValidationError:
+        pass
+    valid: List[BaseModel] = []
+    errors: List[Tuple[int, str]] = []
+    for index, record in enumerate(records):
+        try:
+            valid.append(model.model_validate(record))
+        except ValidationError as e:
+            errors.append((index, str(e)))
+    return valid, errors
+
+
+def validate_many_json(payload: Union[str, bytes], model: Type[BaseModel]) -> List[BaseModel]:
+    """JSON 배열 문자열을 json.loads 없이 바로 검증합니다. 하나라도 틀리면 ValidationError."""
+    return _list_adapter(model).validate_json(payload)
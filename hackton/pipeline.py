@@ -0,0 +1,203 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# ----------------------------------------------------
+# 스레드 기반 다단계 파이프라인 (1차 -> 2차 순서 보장)
+# ----------------------------------------------------
+
+# 각 단계는 자기 워커 스레드 수와 크기가 제한된 입력 큐를 가집니다.
+# - 입력 큐가 가득 차면 앞 단계(또는 submit 호출자)가 기다리므로 backpressure가 걸립니다.
+# - 단계 안에서 워커들이 뒤섞인 순서로 끝나더라도, 재정렬 버퍼가 순번(seq) 순서대로만
+#   다음 단계로 넘겨 주므로 2차 단계는 항상 1차 결과를 들어온 순서대로 받습니다.
+
+_STOP = object()
+
+
+@dataclass
+class PipelineResult:
+    seq: int
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    failed_stage: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    queued_at: float = 0.0
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 4
+    ordered: bool = True  # False면 완료되는 즉시 다음 단계로 넘깁니다.
+
+
+class _Reorderer:
+    """순번이 연속될 때만 결과를 내보내는 재정렬 버퍼. window개 이상 앞서 나간 결과는 기다리게 합니다."""
+
+    def __init__(self, window: int, ordered: bool = True) -> None:
+        self.window = window
+        self.ordered = ordered
+        self._next = 0
+        self._pending: Dict[int, PipelineResult] = {}
+        self._cond = threading.Condition()
+
+    def release(self, result: PipelineResult, put: Callable[[PipelineResult], None]) -> None:
+        if not self.ordered:
+            put(result)
+            return
+        with self._cond:
+            while result.seq >= self._next + self.window:
+                self._cond.wait()
+            self._pending[result.seq] = result
+            while self._next in self._pending:
+                put(self._pending.pop(self._next))
+                self._next += 1
+            self._cond.notify_all()
+
+
+class Pipeline:
+    """
+    Stage 목록을 순서대로 연결한 생산자/소비자 파이프라인.
+
+        pipeline = Pipeline([Stage("stt", stt, workers=2), Stage("llm", llm, workers=4)])
+        pipeline.start()
+        pipeline.submit(path)      # 1단계 큐가 가득 차면 대기
+        pipeline.close()           # 더 이상 입력 없음
+        for result in pipeline.results():   # seq 순서대로
+            ...
+
+    한 단계에서 예외가 나면 그 항목은 이후 단계를 건너뛰고 error가 채워진 채로
+    순서를 지켜 결과로 나옵니다.
+    """
+
+    def __init__(self, stages: List[Stage], output_queue_size: int = 16) -> None:
+        if not stages:
+            raise ValueError("파이프라인에는 최소 한 개의 단계가 필요합니다")
+        self.stages = stages
+        self._queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=stage.queue_size) for stage in stages
+        ]
+        self._queues.append(queue.Queue(maxsize=output_queue_size))
+        # 재정렬 창은 워커 수보다 커야, 가장 앞선 순번을 쥔 워커가 막히지 않습니다.
+        self._reorderers = [
+            _Reorderer(max(stage.workers * 2, stage.queue_size, 1), stage.ordered)
+            for stage in stages
+        ]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stopped = [0] * len(stages)
+        self._next_seq = 0
+        self._closed = False
+        self._busy = [0.0] * len(stages)
+        self._processed = [0] * len(stages)
+        self._failed = [0] * len(stages)
+        self._waits = [0.0] * len(stages)
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            for number in range(max(1, stage.workers)):
+                thread = threading.Thread(
+                    target=self._work, args=(index,), name=f"{stage.name}-{number}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, item: Any) -> int:
+        """항목을 1단계에 넣고 순번을 반환합니다. 1단계 큐가 가득 차면 자리가 날 때까지 기다립니다."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("이미 닫힌 파이프라인입니다")
+            seq = self._next_seq
+            self._next_seq += 1
+        result = PipelineResult(seq=seq, item=item, value=item, queued_at=time.perf_counter())
+        self._queues[0].put(result)
+        return seq
+
+    def close(self) -> None:
+        """입력을 마감합니다. 남은 항목이 모두 처리되면 results()가 끝납니다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in range(max(1, self.stages[0].workers)):
+            self._queues[0].put(_STOP)
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1]
+        while True:
+            result = inbox.get()
+            if result is _STOP:
+                with self._lock:
+                    self._stopped[index] += 1
+                    last = self._stopped[index] == max(1, stage.workers)
+                if last:
+                    downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                    for _ in range(max(1, downstream)):
+                        outbox.put(_STOP)
+                return
+
+            started = time.perf_counter()
+            wait = started - result.queued_at
+            result.timings[f"{stage.name}_wait"] = wait
+            if result.error is None:
+                try:
+                    result.value = stage.func(result.value)
+                except Exception as e:
+                    result.error = e
+                    result.failed_stage = stage.name
+                elapsed = time.perf_counter() - started
+                result.timings[stage.name] = elapsed
+                with self._lock:
+                    self._busy[index] += elapsed
+                    self._processed[index] += 1
+                    self._waits[index] += wait
+                    if result.failed_stage == stage.name:
+                        self._failed[index] += 1
+
+            def forward(ready: PipelineResult) -> None:
+                ready.queued_at = time.perf_counter()
+                outbox.put(ready)
+
+            self._reorderers[index].release(result, forward)
+
+    def results(self) -> Iterator[PipelineResult]:
+        """완료된 결과를 순번 순서대로 내보냅니다. close() 후 모든 항목이 나오면 끝납니다."""
+        output = self._queues[-1]
+        while True:
+            result = output.get()
+            if result is _STOP:
+                self.finished_at = time.perf_counter()
+                return
+            yield result
+
+    def stats(self) -> Dict[str, Any]:
+        """단계별 처리 건수, 평균 처리/대기 시간, 가동률(busy / (workers * 경과 시간))."""
+        if self.started_at is None:
+            return {}
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        stages = {}
+        with self._lock:
+            for index, stage in enumerate(self.stages):
+                processed = self._processed[index]
+                capacity = max(1, stage.workers) * elapsed
+                stages[stage.name] = {
+                    "workers": stage.workers,
+                    "processed": processed,
+                    "failed": self._failed[index],
+                    "mean_seconds": round(self._busy[index] / processed, 3) if processed else 0.0,
+                    "mean_wait_seconds": round(self._waits[index] / processed, 3) if processed else 0.0,
+                    "utilization": round(self._busy[index] / capacity, 3) if capacity else 0.0,
+                    "queue_depth": self._queues[index].qsize(),
+                }
+            submitted = self._next_seq
+        return {"elapsed_seconds": round(elapsed, 3), "submitted": submitted, "stages": stages}
@@ -0,0 +1,352 @@
+"""
+회의/요약/후속 일정을 담는 로컬 SQLite 일정 저장소.
+
+    python schedule_store.py ingest .                       # analysis_output_*.json 일괄 적재 (몇 번 돌려도 같음)
+    python schedule_store.py query --from 2025-11-10 --to 2025-11-16
+    python schedule_store.py query --from 2025-11-01 --user kim --title 예산 --limit 20 --cursor <다음 페이지 커서>
+    python schedule_store.py stats
+
+analysis_output_<타임스탬프>.json 파일은 서로 조회할 수 없어 "다음 주 일정 전체"를 찾으려면
+모든 파일을 열어야 했습니다. 저장소는 일정을 한 테이블에 모아 날짜/사용자/제목 인덱스로 찾고,
+(날짜, 시간, id) 키셋 커서로 페이지를 넘기므로 몇 페이지째든 조회 비용이 같습니다.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from meeting_schema import SCHEMA_VERSION, to_v2
+
+SCHEDULE_STORE_ENABLED = os.getenv("SCHEDULE_STORE", "1") != "0"
+SCHEDULE_DB = os.getenv(
+    "SCHEDULE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules.db")
+)
+DEFAULT_USER = os.getenv("SCHEDULE_USER", "default")
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id              INTEGER PRIMARY KEY,
+    content_hash    TEXT NOT NULL UNIQUE,
+    user_id         TEXT NOT NULL,
+    source          TEXT,
+    analyzed_at     TEXT NOT NULL,
+    meeting_summary TEXT NOT NULL,
+    schema_version  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedules (
+    id            INTEGER PRIMARY KEY,
+    meeting_id    INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    user_id       TEXT NOT NULL,
+    schedule_date TEXT NOT NULL,
+    start_time    TEXT NOT NULL,
+    title         TEXT NOT NULL,
+    content       TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    UNIQUE (meeting_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_date ON schedules (schedule_date, start_time, id);
+CREATE INDEX IF NOT EXISTS idx_schedules_user_date ON schedules (user_id, schedule_date, start_time, id);
+CREATE INDEX IF NOT EXISTS idx_schedules_title ON schedules (title, schedule_date);
+CREATE INDEX IF NOT EXISTS idx_meetings_user ON meetings (user_id, analyzed_at);
+"""
+
+_OUTPUT_TIMESTAMP = re.compile(r"(\d{8}_\d{6})\.json$")
+
+DateLike = Union[str, date, None]
+
+
+def _iso(value: DateLike) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def content_hash(data: Dict[str, Any], user_id: str) -> str:
+    """같은 분석 결과를 두 번 넣어도 한 번만 저장되도록 하는 키. (키 순서/공백과 무관)"""
+    material = json.dumps({"user": user_id, "result": data}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    return f"{row['schedule_date']}|{row['start_time']}|{row['id']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    try:
+        schedule_date, start_time, row_id = cursor.split("|")
+        return schedule_date, start_time, int(row_id)
+    except ValueError:
+        raise ValueError(f"잘못된 페이지 커서입니다: {cursor!r}")
+
+
+class ScheduleStore:
+    """
+    WAL 모드 SQLite 위의 일정 저장소. 여러 스레드(파이프라인 워커)가 하나의 객체를 공유합니다.
+
+        store = ScheduleStore()
+        store.ingest_result(extracted_data, source="analysis_output_....json")
+        page = store.query(start="2025-11-10", end="2025-11-16")
+        next_page = store.query(start="2025-11-10", end="2025-11-16", cursor=page["next_cursor"])
+    """
+
+    def __init__(self, path: str = SCHEDULE_DB) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.row_factory = sqlite3.Row
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA foreign_keys=ON",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-65536",
+            "PRAGMA mmap_size=268435456",
+        ):
+            self._conn.execute(pragma)
+        self._conn.executescript(SCHEMA_SQL)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------
+    # 적재 (멱등)
+    # ------------------------------------------------
+
+    def _insert(self, data: Dict[str, Any], user_id: str, source: Optional[str], analyzed_at: str) -> Optional[int]:
+        result = to_v2(data)
+        digest = content_hash(result.model_dump(mode="json"), user_id)
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO meetings (content_hash, user_id, source, analyzed_at, meeting_summary, schema_version)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, user_id, source, analyzed_at, result.meeting_summary, SCHEMA_VERSION),
+        )
+        if cursor.rowcount == 0:
+            return None
+        meeting_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO schedules (meeting_id, user_id, schedule_date, start_time, title, content, position)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    meeting_id,
+                    user_id,
+                    schedule.next_schedule_date.isoformat(),
+                    schedule.start_time.strftime("%H:%M"),
+                    schedule.event_title,
+                    schedule.event_content,
+                    position,
+                )
+                for position, schedule in enumerate(result.next_schedules)
+            ],
+        )
+        return meeting_id
+
+    def ingest_result(
+        self,
+        data: Dict[str, Any],
+        user_id: str = DEFAULT_USER,
+        source: Optional[str] = None,
+        analyzed_at: Optional[str] = None,
+    ) -> Optional[int]:
+        """분석 결과(v1/v2 dict) 하나를 저장하고 meeting id를 반환합니다. 이미 있는 결과면 None."""
+        with self._lock, self._conn:
+            return self._insert(data, user_id, source, analyzed_at or datetime.now().isoformat(timespec="seconds"))
+
+    def ingest_many(self, records: Iterable[Tuple[Dict[str, Any], str]]) -> Dict[str, int]:
+        """(분석 결과, 사용자) 목록을 한 트랜잭션으로 적재합니다. 대량 이전/벤치마크용."""
+        stats = {"added": 0, "skipped": 0}
+        analyzed_at = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            for data, user_id in records:
+                meeting_id = self._insert(data, user_id, None, analyzed_at)
+                stats["added" if meeting_id is not None else "skipped"] += 1
+        return stats
+
+    def ingest_files(self, paths: Iterable[str], user_id: str = DEFAULT_USER) -> Dict[str, int]:
+        """analysis_output_*.json 파일들을 한 트랜잭션으로 적재합니다. 이미 적재된 내용은 건너뜁니다."""
+        stats = {"added": 0, "skipped": 0, "failed": 0}
+        with self._lock, self._conn:
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    meeting_id = self._insert(data, user_id, os.path.abspath(path), self._file_timestamp(path))
+                except Exception as e:
+                    print(f"⚠️ 적재 실패: {path} ({e})")
+                    stats["failed"] += 1
+                    continue
+                stats["added" if meeting_id is not None else "skipped"] += 1
+        return stats
+
+    def ingest_directory(self, directory: str, user_id: str = DEFAULT_USER) -> Dict[str, int]:
+        return self.ingest_files(sorted(glob.glob(os.path.join(directory, "analysis_output_*.json"))), user_id)
+
+    @staticmethod
+    def _file_timestamp(path: str) -> str:
+        # 파일명의 타임스탬프가 곧 분석 시각입니다. 없으면 수정 시각을 씁니다.
+        match = _OUTPUT_TIMESTAMP.search(os.path.basename(path))
+        if match:
+            return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+        return datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+
+    # ------------------------------------------------
+    # 조회
+    # ------------------------------------------------
+
+    def query(
+        self,
+        start: DateLike = None,
+        end: DateLike = None,
+        user_id: Optional[str] = None,
+        title: Optional[str] = None,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        [start, end] 날짜 범위(양 끝 포함)의 일정을 (날짜, 시간, id) 순으로 한 페이지 반환합니다.
+        title은 제목 앞부분 일치(인덱스 사용)입니다. 다음 페이지가 있으면 next_cursor가 채워집니다.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses: List[str] = []
+        params: List[Any] = []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        # 커서가 있으면 시작 날짜 조건은 커서 조건에 포함되므로 빼야, SQLite가 (날짜, 시간) 행 값으로
+        # 인덱스를 바로 찾아 들어갑니다. (같이 두면 시작 날짜부터 훑으며 거르므로 뒤 페이지일수록 느려짐)
+        if start is not None and not cursor:
+            clauses.append("schedule_date >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            clauses.append("schedule_date <= ?")
+            params.append(_iso(end))
+        if title:
+            # LIKE 'x%' 대신 범위 조건으로 써야 제목 인덱스를 탑니다.
+            clauses.append("title >= ? AND title < ?")
+            params.extend([title, title + "\U0010ffff"])
+        if cursor:
+            clauses.append("(schedule_date, start_time, id) > (?, ?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        sql = (
+            "SELECT id, meeting_id, user_id, schedule_date, start_time, title, content FROM schedules"
+            + (" WHERE " + " AND ".join(clauses) if clauses else "")
+            + " ORDER BY schedule_date, start_time, id LIMIT ?"
+        )
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, (*params, limit + 1))]
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {"items": rows, "next_cursor": encode_cursor(rows[-1]) if has_more else None}
+
+    def meeting(self, meeting_id: int) -> Optional[Dict[str, Any]]:
+        """회의 하나와 그 일정 목록을 분석 결과(v2) 형태로 반환합니다."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            schedules = self._conn.execute(
+                "SELECT schedule_date, start_time, title, content FROM schedules WHERE meeting_id = ? ORDER BY position",
+                (meeting_id,),
+            ).fetchall()
+        return {
+            **dict(row),
+            "next_schedules": [
+                {
+                    "next_schedule_date": item["schedule_date"],
+                    "start_time": item["start_time"],
+                    "event_title": item["title"],
+                    "event_content": item["content"],
+                }
+                for item in schedules
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            meetings = self._conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+            schedules = self._conn.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+            users = self._conn.execute("SELECT COUNT(DISTINCT user_id) FROM meetings").fetchone()[0]
+            span = self._conn.execute("SELECT MIN(schedule_date), MAX(schedule_date) FROM schedules").fetchone()
+        return {
+            "path": self.path,
+            "meetings": meetings,
+            "schedules": schedules,
+            "users": users,
+            "first_date": span[0],
+            "last_date": span[1],
+        }
+
+
+_store: Optional[ScheduleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_schedule_store() -> Optional[ScheduleStore]:
+    """프로세스 공용 저장소 (SCHEDULE_STORE=0이면 None)."""
+    global _store
+    if not SCHEDULE_STORE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ScheduleStore()
+        return _store
+
+
+# ----------------------------------------------------
+# 실행 스크립트
+# ----------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 일정 저장소 (SQLite)")
+    parser.add_argument("--db", default=SCHEDULE_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="analysis_output_*.json 적재 (중복은 건너뜀)")
+    ingest.add_argument("targets", nargs="*", default=["."], help="디렉터리 또는 JSON 파일")
+    ingest.add_argument("--user", default=DEFAULT_USER)
+
+    query = commands.add_parser("query", help="날짜 범위/사용자/제목으로 일정 조회")
+    query.add_argument("--from", dest="start")
+    query.add_argument("--to", dest="end")
+    query.add_argument("--user")
+    query.add_argument("--title", help="제목 앞부분")
+    query.add_argument("--limit", type=int, default=PAGE_SIZE)
+    query.add_argument("--cursor")
+
+    commands.add_parser("stats", help="저장된 회의/일정 수")
+    args = parser.parse_args()
+
+    store = ScheduleStore(args.db)
+    if args.command == "ingest":
+        files: List[str] = []
+        for target in args.targets:
+            if os.path.isdir(target):
+                files.extend(sorted(glob.glob(os.path.join(target, "analysis_output_*.json"))))
+            else:
+                files.append(target)
+        stats = store.ingest_files(files, args.user)
+        print(f"✅ 적재 완료: 추가 {stats['added']}건, 중복 {stats['skipped']}건, 실패 {stats['failed']}건")
+    elif args.command == "query":
+        page = store.query(args.start, args.end, args.user, args.title, args.limit, args.cursor)
+        for item in page["items"]:
+            print(f"{item['schedule_date']} {item['start_time']}  [{item['user_id']}] {item['title']}")
+        if page["next_cursor"]:
+            print(f"\n다음 페이지: --cursor '{page['next_cursor']}'")
+    else:
+        print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
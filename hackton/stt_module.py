@@ -1,41 +1,729 @@
 import os
+import queue
+import secrets
+import stat
+import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from transcript_cache import TranscriptCache, audio_digest, cache_key, evict_lru
+
+# ----------------------------------------------------
+# 1. STT 서비스 설정
+# ----------------------------------------------------
+
+# NOTE: STT 워커 프로세스에는 'pip install openai-whisper'와 FFmpeg 설치가 필수입니다.
+# 이 모듈을 임포트하는 것만으로는 Whisper를 로드하지 않습니다. 모델은 별도의
+# 상주(워커) 프로세스에서 한 번만 로드되고, 여러 호출자가 소켓으로 작업을 보냅니다.
+STT_MODEL_NAME = os.getenv("STT_MODEL", "small")  # 한국어 처리에 적합한 'small' 모델
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "ko")
+STT_HOST = os.getenv("STT_HOST", "127.0.0.1")
+STT_PORT = int(os.getenv("STT_PORT", "50765"))
+# 워커 접속 인증 키. multiprocessing 연결은 pickle을 주고받으므로 키를 아는 프로세스는
+# 워커 안에서 코드를 실행할 수 있습니다. 고정 기본값을 두지 않고, STT_AUTHKEY가 없으면
+# 사용자별 키 파일(0600)을 처음 실행할 때 무작위로 만들어 워커와 클라이언트가 함께 읽습니다.
+STT_AUTHKEY_FILE = os.getenv(
+    "STT_AUTHKEY_FILE", os.path.join(os.path.expanduser("~"), ".hackton", "stt_authkey")
+)
+STT_STARTUP_TIMEOUT = float(os.getenv("STT_STARTUP_TIMEOUT", "600"))
+STT_CPU_THREADS = int(os.getenv("STT_CPU_THREADS", "0"))  # 0이면 torch 기본값 사용
+
+# 병렬 모드: STT_WORKERS > 1이면 워커가 청크 단위로 여러 프로세스에 나눠 변환합니다.
+# 프로세스마다 torch 스레드는 (코어 수 / 워커 수)로 제한됩니다.
+STT_WORKERS = int(os.getenv("STT_WORKERS", "1"))
+STT_CHUNK_OVERLAP_SECONDS = float(os.getenv("STT_CHUNK_OVERLAP_SECONDS", "1.0"))
+
+# 변환 결과 캐시: 같은 오디오 + 같은 설정이면 워커를 거치지 않고 바로 반환합니다.
+STT_CACHE_ENABLED = os.getenv("STT_CACHE", "1") != "0"
+STT_CACHE_DIR = os.getenv(
+    "STT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".stt_cache")
+)
+STT_CACHE_MAX_MB = int(os.getenv("STT_CACHE_MAX_MB", "512"))
+
+# 스트리밍 모드: 긴 녹음을 최대 STT_WINDOW_SECONDS 길이의 구간으로 나누되,
+# 구간 끝 STT_CUT_SEARCH_SECONDS 안에서 가장 조용한 지점에서 자릅니다.
+STT_WINDOW_SECONDS = float(os.getenv("STT_WINDOW_SECONDS", "30"))
+STT_CUT_SEARCH_SECONDS = float(os.getenv("STT_CUT_SEARCH_SECONDS", "5"))
+
+SAMPLE_RATE = 16000  # whisper.audio.SAMPLE_RATE
+
+# 디코딩된 PCM 캐시: 오디오를 16kHz 모노 s16le 원시 파일로 한 번만 디코딩해 두고,
+# 이후 변환(재분석, 스트리밍, 병렬 청크)은 모두 np.memmap으로 열어 재사용합니다.
+STT_PCM_CACHE_DIR = os.getenv("STT_PCM_CACHE_DIR", os.path.join(STT_CACHE_DIR, "pcm"))
+STT_PCM_CACHE_MAX_MB = int(os.getenv("STT_PCM_CACHE_MAX_MB", "4096"))
+
+
+def _read_authkey_file(path: str) -> bytes:
+    info = os.stat(path)
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"STT 인증 키 파일의 소유자가 현재 사용자가 아닙니다: {path}")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(f"STT 인증 키 파일 권한이 너무 넓습니다 (0600이어야 함): {path}")
+    with open(path, "rb") as file:
+        key = file.read().strip()
+    if len(key) < 32:
+        raise PermissionError(f"STT 인증 키 파일이 비어 있거나 너무 짧습니다: {path}")
+    return key
+
+
+def load_authkey(path: str = STT_AUTHKEY_FILE) -> bytes:
+    """워커 인증 키를 반환합니다. STT_AUTHKEY가 없으면 키 파일을 읽고, 파일이 없으면 새로 만듭니다."""
+    env_key = os.getenv("STT_AUTHKEY")
+    if env_key:
+        return env_key.encode("utf-8")
+    try:
+        return _read_authkey_file(path)
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    # 임시 파일에 다 쓴 뒤 link로 게시하므로, 동시에 시작한 다른 프로세스가
+    # 반쯤 쓰인 키를 읽거나 서로 다른 키를 쓰는 일이 없습니다(먼저 게시된 키가 이깁니다).
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(secrets.token_hex(32).encode("ascii"))
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(tmp_path)
+    return _read_authkey_file(path)
+
 
 # ----------------------------------------------------
-# 1. WHISPER 라이브러리 및 모델 로드
+# 2. 워커 측: 오디오 디코딩, 모델 로드 및 변환 실행
 # ----------------------------------------------------
 
-# NOTE: 이 모듈을 사용하기 전, 'pip install openai-whisper'와 FFmpeg 설치가 필수입니다.
-try:
+def decode_to_pcm(audio_file_path: str) -> str:
+    """오디오를 PCM 캐시 파일로 디코딩하고 그 경로를 반환합니다. 이미 있으면 디코딩하지 않습니다."""
+    os.makedirs(STT_PCM_CACHE_DIR, exist_ok=True)
+    pcm_path = os.path.join(STT_PCM_CACHE_DIR, f"{audio_digest(audio_file_path)}.pcm")
+    if os.path.exists(pcm_path):
+        os.utime(pcm_path)
+        return pcm_path
+
+    # FFmpeg가 파일에 직접 쓰므로 whisper.load_audio()처럼 파이프를 거쳐
+    # PCM 전체를 파이썬 bytes로 읽은 뒤 다시 배열로 복사하는 과정이 없습니다.
+    tmp_path = f"{pcm_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0", "-y", "-i", audio_file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), tmp_path,
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise RuntimeError(f"Failed to load audio: {proc.stderr.decode(errors='replace').strip()[-500:]}")
+    os.replace(tmp_path, pcm_path)
+    evict_lru(STT_PCM_CACHE_DIR, STT_PCM_CACHE_MAX_MB * 1024 * 1024, ".pcm", keep=pcm_path)
+    return pcm_path
+
+
+def load_pcm(source: Any) -> Any:
+    """
+    오디오 입력을 int16 또는 float32 샘플 배열로 반환합니다.
+
+    - 오디오 파일 경로: PCM 캐시를 읽기 전용 np.memmap(int16)으로 엽니다.
+      실제 메모리에는 접근한 구간의 페이지만 올라갑니다.
+    - .pcm 경로: 디코딩 없이 바로 memmap으로 엽니다.
+    - numpy 배열(이미 디코딩된 버퍼): 복사 없이 그대로 반환합니다.
+    """
+    import numpy as np
+
+    if not isinstance(source, str):
+        return source
+    pcm_path = source if source.endswith(".pcm") else decode_to_pcm(source)
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.int16)
+    return np.memmap(pcm_path, dtype=np.int16, mode="r")
+
+
+def to_float32(samples: Any) -> Any:
+    """
+    Whisper 입력 형식(float32, -1.0~1.0)으로 변환합니다. 이미 float32면 복사하지 않습니다.
+    정수 PCM은 자료형의 최댓값으로 나눠 정규화하고, 실수 버퍼(float64 등)는 이미 -1.0~1.0이라고 보고 형만 바꿉니다.
+    """
+    import numpy as np
+
+    if samples.dtype == np.float32:
+        return samples
+    if not np.issubdtype(samples.dtype, np.integer):
+        return samples.astype(np.float32)
+    info = np.iinfo(samples.dtype)
+    audio = np.asarray(samples, dtype=np.float32)
+    if info.min == 0:
+        # 부호 없는 PCM(8비트 WAV 등)은 가운데 값이 무음입니다.
+        audio -= (info.max + 1) / 2
+        audio *= 2.0 / (info.max + 1)
+    else:
+        audio *= 1.0 / -info.min
+    return audio
+
+
+def load_whisper_model(
+    model_name: str = STT_MODEL_NAME, cpu_threads: int = STT_CPU_THREADS
+) -> Tuple[Any, float]:
+    """Whisper 모델을 CPU에 로드하고 (모델, 로드 시간(초))을 반환합니다."""
     import whisper
-except ImportError:
-    # 라이브러리 설치가 안 된 경우 실행을 중단하고 사용자에게 안내합니다.
-    print("❌ [STT Error] 'openai-whisper' 라이브러리가 설치되지 않았습니다.")
-    print("      설치를 위해 VS Code 터미널에서 'pip install openai-whisper'를 실행하세요.")
-    sys.exit(1)
 
-WHISPER_MODEL = None
-try:
-    # 모델은 모듈 로드 시점에 한 번만 로드하여 성능을 최적화합니다.
-    # 한국어 처리에 적합한 'small' 모델을 로드합니다.
-    WHISPER_MODEL = whisper.load_model("small")
-    print("✅ [STT Module] Whisper 모델 로드 완료: small (최초 실행 시 다운로드될 수 있음)")
-except Exception as e:
-    # FFmpeg 경로 설정 오류 등 환경 문제를 포착합니다.
-    print(f"❌ [STT Error] Whisper 모델 로드 실패. FFmpeg PATH 및 라이브러리 설치 확인 필요.")
-    print(f"      오류 상세: {e}")
-    # FFmpeg 오류로 인해 모델 로드 자체가 안되면, STT 기능을 사용할 수 없으므로 종료합니다.
-    sys.exit(1)
+    if cpu_threads > 0:
+        import torch
+
+        torch.set_num_threads(cpu_threads)
+
+    started = time.perf_counter()
+    model = whisper.load_model(model_name, device="cpu")
+    return model, time.perf_counter() - started
+
+
+def transcribe_file(model: Any, source: Any, language: str = STT_LANGUAGE) -> Dict[str, Any]:
+    """오디오(파일 경로 또는 디코딩된 배열) 하나를 변환하고 텍스트와 실시간 배율(RTF)을 반환합니다."""
+    started = time.perf_counter()
+    audio = to_float32(load_pcm(source))
+    audio_seconds = len(audio) / SAMPLE_RATE
+    # CPU에서는 fp16을 지원하지 않으므로 명시적으로 끕니다.
+    result = model.transcribe(audio, language=language, fp16=False)
+    elapsed = time.perf_counter() - started
+    return {
+        "text": result["text"],
+        "audio_seconds": round(audio_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "real_time_factor": round(elapsed / audio_seconds, 4) if audio_seconds else None,
+    }
+
+
+def find_silence_cut(audio: Any, search_start: int, frame: int = SAMPLE_RATE // 10) -> int:
+    """audio[search_start:] 구간에서 에너지가 가장 낮은 프레임의 중앙 위치(샘플 인덱스)를 반환합니다."""
+    region = to_float32(audio[search_start:])
+    frames = len(region) // frame
+    if frames == 0:
+        return len(audio)
+    energy = (region[: frames * frame].reshape(frames, frame) ** 2).mean(axis=1)
+    return search_start + int(energy.argmin()) * frame + frame // 2
+
+
+def iter_window_bounds(
+    samples: Any,
+    window_seconds: float = STT_WINDOW_SECONDS,
+    search_seconds: float = STT_CUT_SEARCH_SECONDS,
+) -> Iterator[Tuple[int, int]]:
+    """최대 window_seconds 길이로, 구간 끝 search_seconds 안의 무음 지점에서 자른 (시작, 끝) 인덱스."""
+    window = int(window_seconds * SAMPLE_RATE)
+    search = min(int(search_seconds * SAMPLE_RATE), window // 2)
+    total = len(samples)
+    offset = 0
+    while total - offset > window:
+        cut = find_silence_cut(samples[offset : offset + window], window - search)
+        yield offset, offset + cut
+        offset += cut
+    if offset < total:
+        yield offset, total
+
+
+def iter_audio_windows(
+    source: Any,
+    window_seconds: float = STT_WINDOW_SECONDS,
+    search_seconds: float = STT_CUT_SEARCH_SECONDS,
+) -> Iterator[Tuple[float, Any]]:
+    """(구간 시작 시각(초), float32 파형) 쌍을 내보냅니다.
+
+    PCM은 memmap에서 구간 단위로만 float32로 변환하므로, 녹음 길이와 무관하게
+    한 번에 한 구간 분량의 메모리만 사용합니다.
+    """
+    samples = load_pcm(source)
+    for begin, end in iter_window_bounds(samples, window_seconds, search_seconds):
+        yield begin / SAMPLE_RATE, to_float32(samples[begin:end])
+
+
+def transcribe_stream(
+    model: Any, source: Any, language: str = STT_LANGUAGE
+) -> Iterator[Dict[str, Any]]:
+    """구간별로 변환하면서 절대 타임스탬프가 붙은 세그먼트를 완료되는 즉시 내보냅니다."""
+    prompt: Optional[str] = None
+    for window_start, audio in iter_audio_windows(source):
+        window_seconds = len(audio) / SAMPLE_RATE
+        started = time.perf_counter()
+        # 이전 구간의 마지막 문장을 프롬프트로 넘겨 구간 경계에서도 문맥이 이어지게 합니다.
+        result = model.transcribe(audio, language=language, fp16=False, initial_prompt=prompt)
+        elapsed = time.perf_counter() - started
+        for segment in result["segments"]:
+            text = segment["text"].strip()
+            if not text:
+                continue
+            yield {
+                "start": round(window_start + segment["start"], 2),
+                "end": round(window_start + min(segment["end"], window_seconds), 2),
+                "text": text,
+                "window_start": round(window_start, 2),
+                "window_real_time_factor": round(elapsed / window_seconds, 4) if window_seconds else None,
+            }
+        prompt = result["text"].strip()[-200:] or None
+
 
 # ----------------------------------------------------
-# 2. STT 실행 함수
+# 3. 병렬 모드: 청크를 여러 프로세스에서 동시에 변환
 # ----------------------------------------------------
 
+def iter_overlapping_bounds(
+    samples: Any,
+    overlap_seconds: float = STT_CHUNK_OVERLAP_SECONDS,
+    window_seconds: float = STT_WINDOW_SECONDS,
+) -> Iterator[Tuple[int, int, int]]:
+    """(시작 인덱스, 끝 인덱스, 앞 청크와 겹치는 샘플 수)를 내보냅니다.
+
+    무음 지점에서 자른 구간 앞에 직전 구간의 마지막 overlap_seconds를 포함시켜,
+    경계에 걸친 단어가 어느 한쪽 청크에서는 온전히 인식되도록 합니다.
+    """
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    for begin, end in iter_window_bounds(samples, window_seconds):
+        lead = min(overlap, begin)
+        yield begin - lead, end, lead
+
+
+def dedupe_boundary(previous_text: str, text: str, max_words: int = 8) -> str:
+    """앞 텍스트의 끝과 겹치는 단어열을 text 앞부분에서 제거합니다."""
+    previous_words = previous_text.split()[-max_words:]
+    words = text.split()
+    for size in range(min(len(previous_words), len(words)), 0, -1):
+        if previous_words[-size:] == words[:size]:
+            return " ".join(words[size:])
+    return text
+
+
+_chunk_model: Any = None
+_chunk_model_load_seconds = 0.0
+
+
+def _init_chunk_worker(model_name: str, cpu_threads: int) -> None:
+    global _chunk_model, _chunk_model_load_seconds
+    _chunk_model, _chunk_model_load_seconds = load_whisper_model(model_name, cpu_threads)
+
+
+def _chunk_worker_ready(_: int) -> Tuple[int, float]:
+    return os.getpid(), _chunk_model_load_seconds
+
+
+def _transcribe_chunk(
+    source: Any, begin: int, end: int, language: str
+) -> Tuple[List[Tuple[float, float, str]], float]:
+    started = time.perf_counter()
+    # source가 PCM 캐시 경로면 워커가 직접 memmap으로 열어 필요한 구간만 읽습니다.
+    audio = to_float32(load_pcm(source)[begin:end])
+    result = _chunk_model.transcribe(audio, language=language, fp16=False)
+    segments = [(s["start"], s["end"], s["text"]) for s in result["segments"]]
+    return segments, time.perf_counter() - started
+
+
+def create_stt_pool(
+    workers: int, model_name: str = STT_MODEL_NAME, threads_per_worker: int = 0
+) -> ProcessPoolExecutor:
+    """프로세스마다 모델을 한 번씩 로드하는 STT 프로세스 풀을 만들고 워커가 뜰 때까지 기다립니다.
+
+    torch 스레드 수는 (코어 수 / 워커 수)로 제한해 워커끼리 코어를 나눠 씁니다.
+    """
+    workers = max(1, workers)
+    threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    # torch는 fork 이후 스레드 상태가 꼬일 수 있으므로 spawn으로 워커를 띄웁니다.
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_chunk_worker,
+        initargs=(model_name, threads_per_worker),
+    )
+    list(executor.map(_chunk_worker_ready, range(workers)))
+    return executor
+
+
+def transcribe_in_pool(source: Any, language: str = STT_LANGUAGE) -> Dict[str, Any]:
+    """create_stt_pool() 워커 안에서 오디오 하나를 통째로 변환합니다. (파일 단위 병렬 처리용)"""
+    result = transcribe_file(_chunk_model, source, language)
+    result["model_load_seconds"] = _chunk_model_load_seconds
+    result["pid"] = os.getpid()
+    return result
+
+
+class ParallelTranscriber:
+    """무음 경계에서 자른 청크를 프로세스 풀에서 병렬로 변환하고 원래 순서대로 이어 붙입니다.
+
+    각 프로세스는 모델을 한 번씩 로드하며, 코어를 나눠 쓰도록 torch 스레드 수를
+    제한합니다. 파일 입력은 PCM 캐시 경로와 샘플 범위만 워커에 넘기므로 청크 파형을
+    프로세스 간에 복사하지 않으며, 대기 중인 청크는 최대 workers * 2개로 제한합니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str = STT_MODEL_NAME,
+        workers: int = STT_WORKERS,
+        threads_per_worker: int = 0,
+        overlap_seconds: float = STT_CHUNK_OVERLAP_SECONDS,
+        window_seconds: float = STT_WINDOW_SECONDS,
+    ) -> None:
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.overlap_seconds = overlap_seconds
+        self.window_seconds = window_seconds
+        self.model_load_seconds: Optional[float] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        started = time.perf_counter()
+        self._executor = create_stt_pool(self.workers, self.model_name, self.threads_per_worker)
+        self.model_load_seconds = time.perf_counter() - started
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def transcribe_stream(
+        self, source: Any, language: str = STT_LANGUAGE
+    ) -> Iterator[Dict[str, Any]]:
+        """청크가 앞에서부터 순서대로 완료되는 대로 세그먼트를 내보냅니다."""
+        self.start()
+        assert self._executor is not None
+        pcm_path = None
+        if isinstance(source, str):
+            pcm_path = source if source.endswith(".pcm") else decode_to_pcm(source)
+        samples = load_pcm(pcm_path or source)
+        pending: Deque[Tuple[float, float, float, Any]] = deque()
+        previous_text = ""
+
+        def collect(entry: Tuple[float, float, float, Any]) -> Iterator[Dict[str, Any]]:
+            nonlocal previous_text
+            chunk_start, overlap, chunk_seconds, future = entry
+            segments, elapsed = future.result()
+            at_boundary = overlap > 0
+            for start, end, text in segments:
+                # 겹침 구간에서 시작된 세그먼트는 앞 청크가 이미 인식했으므로 버립니다.
+                if (start + end) / 2 < overlap:
+                    continue
+                text = text.strip()
+                if at_boundary:
+                    # 경계 직후 첫 세그먼트에 남은 중복 단어를 텍스트 기준으로 한 번 더 걸러냅니다.
+                    text = dedupe_boundary(previous_text, text)
+                    at_boundary = False
+                if not text:
+                    continue
+                previous_text = text
+                yield {
+                    "start": round(chunk_start + start, 2),
+                    "end": round(chunk_start + min(end, chunk_seconds), 2),
+                    "text": text,
+                    "window_start": round(chunk_start, 2),
+                    "window_real_time_factor": round(elapsed / chunk_seconds, 4) if chunk_seconds else None,
+                }
+
+        for begin, end, lead in iter_overlapping_bounds(
+            samples, self.overlap_seconds, self.window_seconds
+        ):
+            if pcm_path is not None:
+                future = self._executor.submit(_transcribe_chunk, pcm_path, begin, end, language)
+            else:
+                future = self._executor.submit(
+                    _transcribe_chunk, samples[begin:end], 0, end - begin, language
+                )
+            pending.append(
+                (begin / SAMPLE_RATE, lead / SAMPLE_RATE, (end - begin) / SAMPLE_RATE, future)
+            )
+            while len(pending) >= self.workers * 2:
+                yield from collect(pending.popleft())
+        while pending:
+            yield from collect(pending.popleft())
+
+    def transcribe(self, source: Any, language: str = STT_LANGUAGE) -> Dict[str, Any]:
+        """transcribe_file()과 같은 형태의 결과를 반환합니다."""
+        started = time.perf_counter()
+        segments = list(self.transcribe_stream(source, language))
+        elapsed = time.perf_counter() - started
+        audio_seconds = segments[-1]["end"] if segments else 0.0
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "audio_seconds": audio_seconds,
+            "elapsed_seconds": round(elapsed, 3),
+            "real_time_factor": round(elapsed / audio_seconds, 4) if audio_seconds else None,
+        }
+
+
+# ----------------------------------------------------
+# 4. STT 워커(상주 프로세스)
+# ----------------------------------------------------
+
+def validate_request(request: Any) -> Optional[str]:
+    """워커가 받은 요청의 형태를 확인합니다. 문제가 있으면 오류 메시지를, 없으면 None을 반환합니다."""
+    if not isinstance(request, dict):
+        return "요청은 딕셔너리여야 합니다."
+    op = request.get("op")
+    if op == "status":
+        return None
+    if op not in ("transcribe", "transcribe_stream"):
+        return f"알 수 없는 요청: {op!r}"
+    path = request.get("path")
+    if not isinstance(path, str) or not os.path.isabs(path):
+        return "path는 절대 경로 문자열이어야 합니다."
+    if not os.path.isfile(path):
+        return f"오디오 파일이 아닙니다: {path}"
+    language = request.get("language")
+    if language is not None and not (isinstance(language, str) and language.isalpha() and len(language) <= 8):
+        return f"잘못된 language 값: {language!r}"
+    return None
+
+
+class STTServer:
+    """Whisper 모델을 한 번만 로드해 두고 소켓으로 들어오는 변환 작업을 처리하는 상주 워커.
+
+    연결마다 스레드를 하나씩 두어 여러 호출자를 동시에 받되, 모델 추론은
+    단일 추론 스레드에서 순서대로 실행합니다(Whisper 모델은 스레드 안전하지 않음).
+    workers > 1이면 작업 하나를 ParallelTranscriber로 여러 프로세스에 나눠 처리합니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str = STT_MODEL_NAME,
+        address: Tuple[str, int] = (STT_HOST, STT_PORT),
+        authkey: Optional[bytes] = None,
+        workers: int = STT_WORKERS,
+    ) -> None:
+        self.model_name = model_name
+        self.address = address
+        self.authkey = authkey if authkey is not None else load_authkey()
+        self.workers = max(1, workers)
+        self.model: Any = None
+        self.parallel: Optional[ParallelTranscriber] = None
+        self.model_load_seconds: Optional[float] = None
+        self.jobs_done = 0
+        self._jobs: "queue.Queue[Tuple[Dict[str, Any], queue.Queue]]" = queue.Queue()
+
+    def _run_stream(self, job: Dict[str, Any], reply: queue.Queue) -> Dict[str, Any]:
+        started = time.perf_counter()
+        audio_seconds = 0.0
+        language = job.get("language") or STT_LANGUAGE
+        if self.parallel is not None:
+            segments = self.parallel.transcribe_stream(job["path"], language)
+        else:
+            segments = transcribe_stream(self.model, job["path"], language)
+        for segment in segments:
+            audio_seconds = segment["end"]
+            reply.put({"type": "segment", **segment})
+        elapsed = time.perf_counter() - started
+        return {
+            "audio_seconds": audio_seconds,
+            "elapsed_seconds": round(elapsed, 3),
+            "real_time_factor": round(elapsed / audio_seconds, 4) if audio_seconds else None,
+        }
+
+    def _inference_loop(self) -> None:
+        while True:
+            job, reply = self._jobs.get()
+            try:
+                if job["op"] == "transcribe_stream":
+                    result = self._run_stream(job, reply)
+                elif self.parallel is not None:
+                    result = self.parallel.transcribe(job["path"], job.get("language") or STT_LANGUAGE)
+                    result.pop("segments")
+                else:
+                    result = transcribe_file(
+                        self.model, job["path"], job.get("language") or STT_LANGUAGE
+                    )
+                result["ok"] = True
+            except Exception as e:  # noqa: BLE001
+                result = {"ok": False, "error": str(e)}
+            result["type"] = "done"
+            result["model"] = self.model_name
+            result["model_load_seconds"] = self.model_load_seconds
+            result["queue_depth"] = self._jobs.qsize()
+            self.jobs_done += 1
+            reply.put(result)
+
+    def _handle_connection(self, conn: Connection) -> None:
+        reply: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+                error = validate_request(request)
+                if error is not None:
+                    conn.send({"type": "done", "ok": False, "error": error})
+                    continue
+                op = request["op"]
+                if op == "transcribe":
+                    self._jobs.put((request, reply))
+                    conn.send(reply.get())
+                elif op == "transcribe_stream":
+                    # 세그먼트는 추론 스레드가 만드는 즉시 그대로 전달하고, 마지막에 요약을 보냅니다.
+                    self._jobs.put((request, reply))
+                    while True:
+                        message = reply.get()
+                        conn.send(message)
+                        if message["type"] == "done":
+                            break
+                elif op == "status":
+                    conn.send(
+                        {
+                            "ok": True,
+                            "model": self.model_name,
+                            "model_load_seconds": self.model_load_seconds,
+                            "workers": self.workers,
+                            "jobs_done": self.jobs_done,
+                            "queue_depth": self._jobs.qsize(),
+                            "pid": os.getpid(),
+                        }
+                    )
+        finally:
+            conn.close()
+
+    def serve_forever(self) -> None:
+        print(f"⏳ [STT Worker] Whisper 모델 로드 중: {self.model_name} (CPU, 프로세스 {self.workers}개)")
+        if self.workers > 1:
+            self.parallel = ParallelTranscriber(self.model_name, self.workers)
+            self.parallel.start()
+            self.model_load_seconds = self.parallel.model_load_seconds
+        else:
+            self.model, self.model_load_seconds = load_whisper_model(self.model_name)
+        print(f"✅ [STT Worker] 모델 로드 완료: {self.model_load_seconds:.1f}초")
+
+        threading.Thread(target=self._inference_loop, name="stt-inference", daemon=True).start()
+
+        # 모델 로드가 끝난 뒤에 소켓을 열기 때문에, 접속이 되면 곧바로 작업을 받을 수 있습니다.
+        with Listener(self.address, authkey=self.authkey) as listener:
+            print(f"🎧 [STT Worker] 작업 대기 중: {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:  # noqa: BLE001
+                    print(f"⚠️ [STT Worker] 연결 수락 실패: {e}")
+                    continue
+                threading.Thread(
+                    target=self._handle_connection, args=(conn,), daemon=True
+                ).start()
+
+
+# ----------------------------------------------------
+# 5. 클라이언트 측: 워커 연결 및 STT 실행 함수
+# ----------------------------------------------------
+
+_spawn_lock = threading.Lock()
+_transcript_cache: Optional[TranscriptCache] = None
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    global _transcript_cache
+    if not STT_CACHE_ENABLED:
+        return None
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache(STT_CACHE_DIR, STT_CACHE_MAX_MB * 1024 * 1024)
+    return _transcript_cache
+
+
+def stt_settings(mode: str, workers: int = STT_WORKERS) -> Dict[str, Any]:
+    """변환 결과에 영향을 주는 설정값. 하나라도 바뀌면 캐시 키가 달라집니다."""
+    settings: Dict[str, Any] = {
+        "mode": mode,
+        "model": STT_MODEL_NAME,
+        "language": STT_LANGUAGE,
+        "fp16": False,
+    }
+    if mode == "stream" or workers > 1:
+        settings["window_seconds"] = STT_WINDOW_SECONDS
+        settings["cut_search_seconds"] = STT_CUT_SEARCH_SECONDS
+    if workers > 1:
+        settings["chunk_overlap_seconds"] = STT_CHUNK_OVERLAP_SECONDS
+    return settings
+
+
+def lookup_transcript(
+    audio_file_path: str, mode: str = "file", workers: int = STT_WORKERS
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """(캐시 키, 캐시 항목)을 반환합니다. 캐시를 끈 경우 키는 None, 미스인 경우 항목이 None입니다."""
+    cache = get_transcript_cache()
+    if cache is None:
+        return None, None
+    key = cache_key(audio_digest(audio_file_path), stt_settings(mode, workers))
+    entry = cache.get(key)
+    if entry is not None:
+        print(f"♻️ [STT Module] 캐시된 변환 결과를 사용합니다 (STT 생략): {audio_file_path}")
+    return key, entry
+
+
+def store_transcript(key: Optional[str], entry: Dict[str, Any]) -> None:
+    cache = get_transcript_cache()
+    if key is not None and cache is not None:
+        cache.set(key, entry)
+
+
+def _try_connect() -> Optional[Connection]:
+    try:
+        return Client((STT_HOST, STT_PORT), authkey=load_authkey())
+    except (ConnectionRefusedError, FileNotFoundError, OSError):
+        return None
+
+
+def connect_stt_service(autostart: bool = True) -> Optional[Connection]:
+    """STT 워커에 접속합니다. 워커가 없으면 백그라운드로 띄우고 모델 로드를 기다립니다."""
+    try:
+        return _connect_stt_service(autostart)
+    except AuthenticationError:
+        # 포트를 다른 키의 워커(또는 다른 프로세스)가 쓰고 있으므로 새 워커를 띄워도 바인드할 수 없습니다.
+        print(f"❌ [STT Error] {STT_HOST}:{STT_PORT}의 프로세스가 STT 인증 키를 받아들이지 않습니다.")
+        return None
+
+
+def _connect_stt_service(autostart: bool) -> Optional[Connection]:
+    conn = _try_connect()
+    if conn is not None or not autostart:
+        return conn
+
+    with _spawn_lock:
+        conn = _try_connect()
+        if conn is not None:
+            return conn
+        print(f"🚀 [STT Module] STT 워커 프로세스를 시작합니다 (모델: {STT_MODEL_NAME})")
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve"],
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + STT_STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            conn = _try_connect()
+            if conn is not None:
+                return conn
+            time.sleep(0.5)
+
+    print("❌ [STT Error] STT 워커가 제한 시간 안에 준비되지 않았습니다.")
+    return None
+
+
+def stt_service_status() -> Optional[Dict[str, Any]]:
+    conn = connect_stt_service(autostart=False)
+    if conn is None:
+        return None
+    with conn:
+        conn.send({"op": "status"})
+        return conn.recv()
+
+
 def run_stt_conversion(audio_file_path: str) -> str:
     """
-    오디오 파일 경로를 받아 Whisper를 사용하여 텍스트로 변환합니다.
+    오디오 파일 경로를 받아 STT 워커의 Whisper 모델로 텍스트로 변환합니다.
 
-    이 함수는 FFmpeg와 Whisper가 올바르게 설정되었다고 가정하고 실행됩니다.
+    워커 프로세스는 최초 호출 시 자동으로 시작되며, 이후 호출들은 이미 로드된
+    모델을 공유합니다. 여러 스레드/프로세스에서 동시에 호출해도 안전합니다.
 
     :param audio_file_path: 오디오 파일의 절대 또는 상대 경로
     :return: 변환된 회의록 텍스트 (실패 시 빈 문자열)
@@ -43,18 +731,125 @@ def run_stt_conversion(audio_file_path: str) -> str:
     if not os.path.exists(audio_file_path):
         print(f"❌ [STT Error] 오디오 파일 경로를 찾을 수 없습니다: {audio_file_path}")
         return ""
-        
-    if WHISPER_MODEL is None:
-        print("❌ [STT Error] Whisper 모델이 초기화되지 않아 STT를 실행할 수 없습니다.")
+
+    key, cached = lookup_transcript(audio_file_path, "file")
+    if cached is not None:
+        return cached["text"]
+
+    conn = connect_stt_service()
+    if conn is None:
+        print("❌ [STT Error] STT 워커에 연결할 수 없어 STT를 실행할 수 없습니다.")
+        return ""
+
+    print(f"🔊 [STT Module] 오디오 파일 변환 요청: {audio_file_path}")
+    try:
+        with conn:
+            # 워커는 별도 프로세스이므로 절대 경로로 전달합니다.
+            conn.send(
+                {
+                    "op": "transcribe",
+                    "path": os.path.abspath(audio_file_path),
+                    "language": STT_LANGUAGE,
+                }
+            )
+            result = conn.recv()
+    except (EOFError, OSError) as e:
+        print(f"❌ [STT Error] STT 워커와의 통신 중 오류 발생: {e}")
         return ""
 
-    print(f"🔊 [STT Module] 오디오 파일 변환 시작: {audio_file_path}")
+    if not result.get("ok"):
+        print(f"❌ [STT Error] Whisper 변환 중 치명적인 오류 발생: {result.get('error')}")
+        return ""
+
+    print(
+        f"✅ [STT Module] Whisper 변환 성공. 오디오 {result['audio_seconds']}초 / "
+        f"처리 {result['elapsed_seconds']}초 (RTF {result['real_time_factor']}, "
+        f"모델 로드 {result['model_load_seconds']:.1f}초)"
+    )
+    store_transcript(
+        key,
+        {
+            "text": result["text"],
+            "audio_seconds": result["audio_seconds"],
+            "settings": stt_settings("file"),
+        },
+    )
+    return result["text"]
+
+
+def stream_stt_conversion(audio_file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    긴 녹음용 스트리밍 변환. 세그먼트가 완성되는 대로
+    {"start", "end", "text", ...} 딕셔너리를 순서대로 내보냅니다.
+
+    워커는 디코딩된 PCM 캐시를 memmap으로 열어 구간 단위로만 변환하므로 녹음 길이와
+    무관하게 메모리 사용량이 일정하며, 호출 측은 회의가 끝까지 변환되기 전에 앞부분 세그먼트부터 처리할 수 있습니다.
+    실패 시 오류를 출력하고 그 시점에서 생성을 멈춥니다.
+    """
+    if not os.path.exists(audio_file_path):
+        print(f"❌ [STT Error] 오디오 파일 경로를 찾을 수 없습니다: {audio_file_path}")
+        return
+
+    key, cached = lookup_transcript(audio_file_path, "stream")
+    if cached is not None:
+        yield from cached["segments"]
+        return
+
+    conn = connect_stt_service()
+    if conn is None:
+        print("❌ [STT Error] STT 워커에 연결할 수 없어 STT를 실행할 수 없습니다.")
+        return
+
+    print(f"🔊 [STT Module] 스트리밍 변환 요청: {audio_file_path}")
     try:
-        # 한국어 (ko) 지정 및 처리 (정확도 향상)
-        result = WHISPER_MODEL.transcribe(audio_file_path, language="ko")
-        print("✅ [STT Module] Whisper 변환 성공.")
-        return result["text"]
-    except Exception as e:
-        # 변환 중 발생할 수 있는 오류를 처리합니다.
-        print(f"❌ [STT Error] Whisper 변환 중 치명적인 오류 발생: {e}")
-        return ""
\ No newline at end of file
+        with conn:
+            conn.send(
+                {
+                    "op": "transcribe_stream",
+                    "path": os.path.abspath(audio_file_path),
+                    "language": STT_LANGUAGE,
+                }
+            )
+            segments: List[Dict[str, Any]] = []
+            while True:
+                message = conn.recv()
+                if message["type"] == "segment":
+                    segments.append(message)
+                    yield message
+                    continue
+                if not message.get("ok"):
+                    print(f"❌ [STT Error] 스트리밍 변환 중 오류 발생: {message.get('error')}")
+                    return
+                print(
+                    f"✅ [STT Module] 스트리밍 변환 완료. 오디오 {message['audio_seconds']}초 / "
+                    f"처리 {message['elapsed_seconds']}초 (RTF {message['real_time_factor']})"
+                )
+                break
+    except (EOFError, OSError) as e:
+        print(f"❌ [STT Error] STT 워커와의 통신 중 오류 발생: {e}")
+        return
+
+    # 끝까지 성공한 변환만 캐시에 저장합니다.
+    store_transcript(
+        key,
+        {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "audio_seconds": segments[-1]["end"] if segments else 0.0,
+            "settings": stt_settings("stream"),
+        },
+    )
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        STTServer().serve_forever()
+    elif "--status" in sys.argv:
+        print(stt_service_status() or "STT 워커가 실행 중이 아닙니다.")
+    elif "--stream" in sys.argv:
+        for path in [arg for arg in sys.argv[1:] if not arg.startswith("--")]:
+            for segment in stream_stt_conversion(path):
+                print(f"[{segment['start']:>8.2f} - {segment['end']:>8.2f}] {segment['text']}")
+    else:
+        for path in sys.argv[1:]:
+            print(run_stt_conversion(path))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# hackton 모듈들은 서로를 최상위 이름(meeting_schema, gemini_client ...)으로 import 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
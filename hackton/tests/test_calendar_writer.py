@@ -0,0 +1,194 @@
+import asyncio
+import json
+import re
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from calendar_writer import CalendarWriter, boundary_of, encode_batch, event_id_for, parse_batch
+from meeting_schema import NextSchedule
+
+EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/(?P<calendar>[^/]+)/events$")
+
+
+def schedule(day: int, title: str, content: str = "내용", start: str = "10:00") -> NextSchedule:
+    return NextSchedule(
+        next_schedule_date=date(2025, 11, day), start_time=start, event_title=title, event_content=content
+    )
+
+
+class FakeCalendar:
+    """
+    httpx.MockTransport용 가짜 Calendar. events.insert와 배치 엔드포인트를 처리합니다.
+    script에 (event_id -> 상태 코드 목록)을 넣으면 그 일정의 첫 호출들이 해당 코드로 실패합니다.
+    drop에 넣은 event_id는 한 번은 처리한 뒤 응답 대신 연결 오류를 냅니다.
+    """
+
+    def __init__(self) -> None:
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.script: Dict[str, List[int]] = {}
+        self.drop: set = set()
+        self.http_requests = 0
+        self.calls = 0
+
+    def insert(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        self.calls += 1
+        event_id = body["id"]
+        scripted = self.script.get(event_id)
+        if scripted:
+            status = scripted.pop(0)
+            reason = "rateLimitExceeded" if status == 403 else "invalid"
+            return status, {"error": {"code": status, "errors": [{"reason": reason}]}}
+        if event_id in self.events:
+            return 409, {"error": {"code": 409, "errors": [{"reason": "duplicate"}]}}
+        self.events[event_id] = body
+        return 200, {**body, "status": "confirmed"}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.http_requests += 1
+        assert request.headers["Authorization"] == "Bearer test-token"
+        if EVENTS_PATH.match(request.url.path):
+            body = json.loads(request.content)
+            status, payload = self.insert(body)
+            self._maybe_drop(request, [body["id"]])
+            return httpx.Response(status, json=payload)
+
+        assert request.url.path == "/batch/calendar/v3"
+        parts = parse_batch(request.content, boundary_of(request.headers["Content-Type"]))
+        chunks = []
+        for part in parts:
+            status, payload = self.insert(part["body"])
+            chunks.append(
+                "--resp\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{part['content_id']}>\r\n"
+                "\r\n"
+                f"HTTP/1.1 {status} X\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n"
+                "\r\n"
+                f"{json.dumps(payload, ensure_ascii=False)}\r\n"
+            )
+        chunks.append("--resp--\r\n")
+        self._maybe_drop(request, [part["body"]["id"] for part in parts])
+        return httpx.Response(
+            200, content="".join(chunks).encode("utf-8"), headers={"Content-Type": "multipart/mixed; boundary=resp"}
+        )
+
+    def _maybe_drop(self, request: httpx.Request, event_ids: List[str]) -> None:
+        dropped = self.drop.intersection(event_ids)
+        if dropped:
+            self.drop -= dropped
+            raise httpx.ReadError("connection reset", request=request)
+
+
+def upload(calendar: FakeCalendar, schedules: List[NextSchedule], **options: Any):
+    async def run():
+        writer = CalendarWriter(
+            access_token="test-token", base_url="http://calendar.test", base_backoff=0.0, **options
+        )
+        writer._http = httpx.AsyncClient(
+            transport=httpx.MockTransport(calendar.handler), headers={"Authorization": "Bearer test-token"}
+        )
+        async with writer:
+            report = await writer.insert_many(schedules)
+        return report, writer
+
+    return asyncio.run(run())
+
+
+# ----------------------------------------------------
+# 멱등 키
+# ----------------------------------------------------
+
+def test_event_id_is_stable_and_valid():
+    base = event_id_for(schedule(10, "디자인 리뷰", "본문 A"))
+    assert re.fullmatch(r"[a-v0-9]{52}", base)
+    # 본문, 공백, 대소문자는 키에 영향을 주지 않습니다.
+    assert event_id_for(schedule(10, "  디자인   리뷰 ", "본문 B")) == base
+    assert event_id_for(schedule(10, "QA 회의")) == event_id_for(schedule(10, "qa 회의"))
+    # 날짜, 시간, 제목, 캘린더가 다르면 다른 이벤트입니다.
+    assert event_id_for(schedule(11, "디자인 리뷰")) != base
+    assert event_id_for(schedule(10, "디자인 리뷰", start="11:00")) != base
+    assert event_id_for(schedule(10, "예산 정산")) != base
+    assert event_id_for(schedule(10, "디자인 리뷰"), calendar_id="team@example.com") != base
+
+
+def test_batch_roundtrip():
+    body = encode_batch([("item-a", "/calendar/v3/calendars/primary/events", {"id": "a", "summary": "한글"})], "b1")
+    [part] = parse_batch(body, "b1")
+    assert part["content_id"] == "item-a"
+    assert part["start_line"] == "POST /calendar/v3/calendars/primary/events HTTP/1.1"
+    assert part["body"] == {"id": "a", "summary": "한글"}
+
+
+# ----------------------------------------------------
+# 업로드
+# ----------------------------------------------------
+
+def test_upload_batches_and_second_run_is_all_duplicates():
+    calendar = FakeCalendar()
+    schedules = [schedule(10 + index, f"일정 {index}") for index in range(7)]
+
+    report, writer = upload(calendar, schedules, batch_size=3, max_concurrency=2)
+    assert report.summary() == {"created": 7, "duplicates": 0, "failed": 0}
+    assert calendar.http_requests == 3  # 3 + 3 + 1 (마지막 한 건은 events.insert)
+    assert writer.stats()["retries"] == 0
+
+    report, _ = upload(calendar, schedules, batch_size=3)
+    assert report.summary() == {"created": 0, "duplicates": 7, "failed": 0}
+    assert len(calendar.events) == 7
+
+
+def test_repeated_schedules_are_sent_once():
+    calendar = FakeCalendar()
+    report, _ = upload(calendar, [schedule(10, "디자인 리뷰", "a"), schedule(10, "디자인  리뷰", "b")])
+    assert report.summary() == {"created": 1, "duplicates": 0, "failed": 0}
+    assert calendar.calls == 1
+
+
+def test_lost_response_is_retried_and_reported_as_duplicate():
+    calendar = FakeCalendar()
+    schedules = [schedule(10, "디자인 리뷰"), schedule(11, "예산 정산")]
+    calendar.drop.add(event_id_for(schedules[0]))
+
+    report, writer = upload(calendar, schedules)
+    # 서버는 처리했지만 응답을 잃었으므로, 재시도는 409를 받고 중복으로 집계됩니다.
+    assert sorted(report.created + report.duplicates) == sorted(calendar.events)
+    assert len(calendar.events) == 2
+    assert report.failed == []
+    assert writer.stats()["retries"] == 2
+
+
+def test_rate_limited_parts_are_retried_and_slow_down():
+    calendar = FakeCalendar()
+    schedules = [schedule(10 + index, f"일정 {index}") for index in range(4)]
+    calendar.script[event_id_for(schedules[1])] = [403, 429]
+
+    report, writer = upload(calendar, schedules, batch_size=4)
+    assert report.summary() == {"created": 4, "duplicates": 0, "failed": 0}
+    assert writer.stats()["throttled_batches"] == 2
+    assert writer.stats()["concurrency_decreases"] >= 1
+
+
+def test_bad_request_fails_without_retry():
+    calendar = FakeCalendar()
+    schedules = [schedule(10, "디자인 리뷰"), schedule(11, "예산 정산")]
+    bad_id = event_id_for(schedules[0])
+    calendar.script[bad_id] = [400]
+
+    report, writer = upload(calendar, schedules)
+    assert report.created == [event_id_for(schedules[1])]
+    assert [(failure["event_id"], failure["status"]) for failure in report.failed] == [(bad_id, 400)]
+    assert writer.stats()["retries"] == 0
+
+
+def test_gives_up_after_max_retries():
+    calendar = FakeCalendar()
+    item = schedule(10, "디자인 리뷰")
+    calendar.script[event_id_for(item)] = [503] * 10
+
+    report, _ = upload(calendar, [item], max_retries=2)
+    assert report.created == []
+    assert report.failed == [{"event_id": event_id_for(item), "status": None, "error": "재시도 한도 초과"}]
+    assert calendar.calls == 3
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from gemini_client import AsyncGeminiClient, GeminiAPIError, GeminiDeadlineExceeded, TokenBucket
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def ok(payload: str) -> httpx.Response:
+    return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": payload}]}}]})
+
+
+def make_client(handler, **kwargs) -> AsyncGeminiClient:
+    """가짜 전송 계층(httpx.MockTransport)에 붙은 클라이언트. 백오프는 0초로 둡니다."""
+    options = {"requests_per_minute": 6000, "max_retries": 3, "base_backoff": 0.0, **kwargs}
+    client = AsyncGeminiClient(api_key="test-key", **options)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler), headers={"x-goog-api-key": "test-key"})
+    return client
+
+
+def run(client: AsyncGeminiClient, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_generate_json_sends_schema_and_validates():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return ok('{"value": 7}')
+
+    client = make_client(handler, model="gemini-test")
+    answer = run(client, client.generate_json("질문", Answer))
+
+    assert answer == Answer(value=7)
+    assert seen[0].url.path.endswith("/models/gemini-test:generateContent")
+    assert seen[0].headers["x-goog-api-key"] == "test-key"
+    body = json.loads(seen[0].content)
+    assert body["contents"][0]["parts"][0]["text"] == "질문"
+    assert body["generationConfig"]["responseJsonSchema"]["properties"]["value"]["type"] == "integer"
+
+
+def test_retries_transient_errors_then_succeeds():
+    responses = iter([
+        httpx.Response(503, text="overloaded"),
+        httpx.Response(429, headers={"Retry-After": "0"}, text="slow down"),
+        ok('{"value": 1}'),
+    ])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return next(responses)
+
+    client = make_client(handler)
+    assert run(client, client.generate_json("질문", Answer)) == Answer(value=1)
+    assert client.stats()["requests"] == 3
+    assert client.stats()["retries"] == 2
+    assert client.stats()["throttled"] == 1
+    assert client.stats()["failures"] == 0
+
+
+def test_retries_transport_errors():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return ok('{"value": 2}')
+
+    client = make_client(handler)
+    assert run(client, client.generate_json("질문", Answer)) == Answer(value=2)
+    assert len(attempts) == 2
+
+
+def test_non_retryable_status_fails_immediately():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(400, text="bad request")
+
+    client = make_client(handler)
+    with pytest.raises(GeminiAPIError) as excinfo:
+        run(client, client.generate_json("질문", Answer))
+    assert excinfo.value.status == 400
+    assert len(attempts) == 1
+    assert client.stats()["failures"] == 1
+
+
+def test_gives_up_after_max_retries():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(500, text="boom")
+
+    client = make_client(handler, max_retries=2)
+    with pytest.raises(GeminiAPIError) as excinfo:
+        run(client, client.generate_json("질문", Answer))
+    assert excinfo.value.status == 500
+    assert len(attempts) == 3
+
+
+def test_retry_after_past_deadline_raises_deadline_exceeded():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "30"}, text="slow down")
+
+    client = make_client(handler)
+    with pytest.raises(GeminiAPIError):
+        run(client, client.generate_json("질문", Answer, deadline=0.5))
+    assert client.stats()["requests"] == 1
+
+
+def test_timeouts_until_deadline_raise_deadline_exceeded():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.03)
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    client = make_client(handler, max_retries=10)
+    with pytest.raises(GeminiDeadlineExceeded):
+        run(client, client.generate_json("질문", Answer, deadline=0.1))
+    assert 1 < client.stats()["requests"] <= 4
+
+
+def test_missing_candidates_is_an_api_error():
+    client = make_client(lambda request: httpx.Response(200, json={"promptFeedback": {"blockReason": "SAFETY"}}))
+    with pytest.raises(GeminiAPIError):
+        run(client, client.generate_json("질문", Answer))
+
+
+def test_token_bucket_limits_rate():
+    async def main():
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        for _ in range(4):
+            await bucket.acquire()
+        return bucket.wait_seconds
+
+    # 2개는 바로, 나머지 2개는 0.01초 간격으로 채워집니다.
+    assert asyncio.run(main()) >= 0.015
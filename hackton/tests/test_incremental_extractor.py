@@ -0,0 +1,140 @@
+import pytest
+
+import incremental_extractor
+from incremental_extractor import (
+    IncrementalAnalysisError,
+    IncrementalAnalyzer,
+    IncrementalUpdate,
+    ScheduleChange,
+)
+from meeting_schema import NextSchedule
+
+
+def schedule(date: str, time: str, title: str, content: str = "내용") -> NextSchedule:
+    return NextSchedule(next_schedule_date=date, start_time=time, event_title=title, event_content=content)
+
+
+def add(item: NextSchedule, schedule_id: str = "") -> ScheduleChange:
+    return ScheduleChange(action="add", schedule_id=schedule_id, schedule=item)
+
+
+def kinds(analyzer: IncrementalAnalyzer):
+    return [(event.kind, event.schedule_id) for event in analyzer.events]
+
+
+# ----------------------------------------------------
+# _apply: 모델 실수 바로잡기
+# ----------------------------------------------------
+
+def test_add_assigns_new_ids():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰")), 1.0, 0.1)
+    analyzer._apply(add(schedule("2025-11-12", "14:00", "예산 정산")), 2.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1"), ("add", "s2")]
+    assert set(analyzer.schedules) == {"s1", "s2"}
+
+
+def test_duplicate_add_is_deduped_into_update():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰", "짧음")), 1.0, 0.1)
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰 회의", "더 자세한 본문")), 2.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1"), ("update", "s1")]
+    assert analyzer.schedules["s1"].event_content == "더 자세한 본문"
+
+
+def test_identical_add_emits_nothing():
+    analyzer = IncrementalAnalyzer()
+    item = schedule("2025-11-10", "10:00", "디자인 리뷰")
+    analyzer._apply(add(item), 1.0, 0.1)
+    analyzer._apply(add(item), 2.0, 0.1)
+    analyzer._apply(ScheduleChange(action="update", schedule_id="s1", schedule=item), 3.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1")]
+
+
+def test_update_with_known_id_moves_schedule():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰")), 1.0, 0.1)
+    moved = schedule("2025-11-11", "15:00", "디자인 리뷰")
+    analyzer._apply(ScheduleChange(action="update", schedule_id="s1", schedule=moved), 2.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1"), ("update", "s1")]
+    assert analyzer.schedules == {"s1": moved}
+
+
+def test_update_with_unknown_id_becomes_add():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(ScheduleChange(action="update", schedule_id="s9", schedule=schedule("2025-11-10", "10:00", "디자인 리뷰")), 1.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1")]
+
+
+def test_retract_removes_and_ignores_unknown_ids():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰")), 1.0, 0.1)
+    analyzer._apply(ScheduleChange(action="retract", schedule_id="s7"), 2.0, 0.1)
+    analyzer._apply(ScheduleChange(action="retract", schedule_id="s1"), 3.0, 0.1)
+    analyzer._apply(ScheduleChange(action="retract", schedule_id="s1"), 4.0, 0.1)
+    assert kinds(analyzer) == [("add", "s1"), ("retract", "s1")]
+    assert analyzer.schedules == {}
+    assert analyzer.events[-1].schedule["event_title"] == "디자인 리뷰"
+
+
+def test_add_without_schedule_is_ignored():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(ScheduleChange(action="add"), 1.0, 0.1)
+    assert analyzer.events == []
+
+
+def test_ids_are_not_reused_after_retract():
+    analyzer = IncrementalAnalyzer()
+    analyzer._apply(add(schedule("2025-11-10", "10:00", "디자인 리뷰")), 1.0, 0.1)
+    analyzer._apply(ScheduleChange(action="retract", schedule_id="s1"), 2.0, 0.1)
+    analyzer._apply(add(schedule("2025-11-12", "14:00", "예산 정산")), 3.0, 0.1)
+    assert kinds(analyzer)[-1] == ("add", "s2")
+
+
+# ----------------------------------------------------
+# 백그라운드 루프 (Gemini 대역)
+# ----------------------------------------------------
+
+def test_close_flushes_pending_segments(monkeypatch):
+    prompts = []
+
+    def fake_generate(prompt, schema):
+        prompts.append(prompt)
+        return IncrementalUpdate(
+            meeting_summary="디자인 리뷰 일정을 정했습니다.",
+            changes=[add(schedule("2025-11-10", "10:00", "디자인 리뷰"))],
+        )
+
+    monkeypatch.setattr(incremental_extractor, "generate_json_sync", fake_generate)
+    analyzer = IncrementalAnalyzer(min_chars=10_000, max_wait=60)
+    analyzer.start()
+    analyzer.feed({"start": 0.0, "end": 2.0, "text": "다음 주 월요일에 디자인 리뷰 합시다"})
+    analyzer.feed({"start": 2.0, "end": 3.0, "text": "   "})
+    result = analyzer.close()
+
+    assert len(prompts) == 1
+    assert "디자인 리뷰 합시다" in prompts[0]
+    assert result.meeting_summary == "디자인 리뷰 일정을 정했습니다."
+    assert [item.event_title for item in result.next_schedules] == ["디자인 리뷰"]
+    assert [event.kind for event in analyzer.events] == ["add", "summary"]
+    with pytest.raises(RuntimeError):
+        analyzer.feed({"start": 3.0, "end": 4.0, "text": "늦은 발화"})
+
+
+def test_close_raises_with_unprocessed_segments(monkeypatch):
+    calls = []
+
+    def failing_generate(prompt, schema):
+        calls.append(prompt)
+        raise RuntimeError("503 UNAVAILABLE")
+
+    monkeypatch.setattr(incremental_extractor, "generate_json_sync", failing_generate)
+    analyzer = IncrementalAnalyzer(min_chars=10_000, max_wait=60, final_retries=2, final_backoff=0)
+    analyzer.start()
+    analyzer.feed({"start": 0.0, "end": 2.0, "text": "금요일 3시에 예산 정산"})
+
+    with pytest.raises(IncrementalAnalysisError) as excinfo:
+        analyzer.close()
+    assert len(calls) == 3  # 첫 시도 + 재시도 2번
+    assert [segment["text"] for segment in excinfo.value.unprocessed] == ["금요일 3시에 예산 정산"]
+    assert excinfo.value.result.next_schedules == []
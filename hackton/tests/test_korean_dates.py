@@ -0,0 +1,134 @@
+import json
+import os
+
+import pytest
+
+from korean_dates import format_date_hints, quick_extract, resolve_temporal_expressions
+
+REF = "2025-11-05"  # 수요일
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "date_corpus.jsonl")
+
+
+def first(text: str, reference_date: str = REF):
+    candidates = resolve_temporal_expressions(text, reference_date)
+    return (candidates[0].next_schedule_date, candidates[0].start_time) if candidates else None
+
+
+def quick(text: str, reference_date: str = REF):
+    result = quick_extract(text, reference_date)
+    if result is None:
+        return None
+    schedule = result["next_schedules"][0]
+    return schedule["next_schedule_date"], schedule["start_time"], schedule["event_title"]
+
+
+# ----------------------------------------------------
+# 날짜/시간 해석
+# ----------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("다음주 수요일 오후 두시", ("2025-11-12", "14:00")),
+        ("모레 오전 열시", ("2025-11-07", "10:00")),
+        ("낼 오후 한시", ("2025-11-06", "13:00")),
+        ("낼모레까지", ("2025-11-07", None)),
+        ("내일오후 3시", ("2025-11-06", "15:00")),
+        ("금주 목요일 오후 세시 반", ("2025-11-06", "15:30")),
+        ("금일 오후 5시", ("2025-11-05", "17:00")),
+        ("금욜까지", ("2025-11-07", None)),
+        ("다음주금요일", ("2025-11-14", None)),
+        ("1/5 오전 10시", ("2026-01-05", "10:00")),
+        ("3일 뒤", ("2025-11-08", None)),
+    ],
+)
+def test_resolves_relative_expressions(text, expected):
+    assert first(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "자료는 제가 보낼게요",   # 보'낼'게요
+        "보고서 낼게요",          # 낼게요 (내다)
+        "지금일단 시작합시다",    # 지'금일'단
+        "오늘날 회의 문화",       # '오늘'날
+        "세금요일 정산",          # 세'금요일'
+        "어제 회의 내용",         # 지난 날짜
+        "지난주 금요일에 논의한 내용",
+    ],
+)
+def test_day_words_inside_other_words_are_ignored(text):
+    assert resolve_temporal_expressions(text, REF) == []
+
+
+def test_unqualified_hours_default_to_working_hours():
+    assert first("내일 3시") == ("2025-11-06", "15:00")
+    assert first("내일 10시") == ("2025-11-06", "10:00")
+    # 6~8시는 아침/저녁이 모두 흔해서 신뢰도가 낮습니다.
+    assert resolve_temporal_expressions("내일 7시", REF)[0].confidence < 0.85
+
+
+def test_date_hints():
+    hints = format_date_hints(resolve_temporal_expressions("다음주 수요일 오후 두시에 보고, 모레까지 초안", REF))
+    assert hints.splitlines() == ["- '다음주 수요일 오후 두시' = 2025-11-12 14:00", "- '모레' = 2025-11-07"]
+
+
+# ----------------------------------------------------
+# quick_extract: Gemini 없이 답하는 경우와 넘기는 경우
+# ----------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("다음주 수요일 오후 두시에 회의합시다", ("2025-11-12", "14:00", "회의")),
+        ("금욜까지 보고서 제출", ("2025-11-07", "10:00", "보고서 제출")),
+        ("네 시에 회의", ("2025-11-05", "16:00", "회의")),
+        # 날짜 말이 든 동사는 날짜가 아닙니다. 시간만 남으므로 기준 날짜의 일정입니다.
+        ("자료는 제가 보낼게요 3시에 회의합시다", ("2025-11-05", "15:00", "회의")),
+        ("보고서 낼게요 오후 세시 회의", ("2025-11-05", "15:00", "회의")),
+    ],
+)
+def test_quick_extract_answers(text, expected):
+    assert quick(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "내일 회의 10시 아님",          # 명사형 부정
+        "10시 회의 아님",
+        "내일 아닌 모레 회의",
+        "모레 미팅 없어요",
+        "서버 교체는 내일까지 완료 못 합니다",
+        "내일 회의는 취소됐어요",
+        "12월 3일 회의는 연기합니다",
+        "이번 주 금요일에 회의했었죠",
+        "내일 3시 회의 어때요?",
+        "어제 3시에 회의",
+        "지금일단 회의합시다",
+        "지금 주 목요일 회의 자료 봐주세요",  # 요일만으로는 신뢰도가 모자람
+        "오늘은 여기까지입니당",
+    ],
+)
+def test_quick_extract_defers_to_gemini(text):
+    assert quick(text) is None
+
+
+def test_long_text_is_not_answered_locally():
+    assert quick_extract("내일 오후 3시 회의. " * 20, REF) is None
+
+
+def test_corpus_quick_cases():
+    """date_corpus.jsonl의 quick 회귀 사례 전체 (bench_dates.py와 같은 기준)."""
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    failures = []
+    for case in cases:
+        if "quick" not in case:
+            continue
+        actual = quick(case["text"], case["reference_date"])
+        expected = case["quick"] and tuple(case["quick"][key] for key in ("next_schedule_date", "start_time", "event_title"))
+        if actual != expected:
+            failures.append((case["text"], expected, actual))
+    assert failures == []
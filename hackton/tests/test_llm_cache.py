@@ -0,0 +1,111 @@
+import unicodedata
+
+from pydantic import BaseModel, Field
+
+import llm_cache
+import meeting_extractor
+from llm_cache import llm_cache_key, lookup_result, normalize_transcript, store_result
+from meeting_schema import MeetingAnalysisResult
+from transcript_cache import TranscriptCache
+
+TEXT = "예산 검토 회의를 했습니다.\n담당자는 자료를 다시 정리하기로 했습니다."
+
+
+def key(text=TEXT, prompt_version="meeting-1", model="gemini-test", reference_date="2025-11-10", schema=MeetingAnalysisResult):
+    return llm_cache_key(text, prompt_version, model, reference_date, schema)
+
+
+def use_cache(monkeypatch, tmp_path, ttl_seconds=None):
+    cache = TranscriptCache(str(tmp_path / "llm"), ttl_seconds=ttl_seconds)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_llm_cache", cache)
+    return cache
+
+
+# ----------------------------------------------------
+# 캐시 키
+# ----------------------------------------------------
+
+def test_whitespace_and_unicode_form_do_not_change_the_key():
+    # NFD 자모, CRLF, 빈 줄, 전각 공백 차이만 있는 회의록
+    variant = "  " + unicodedata.normalize("NFD", TEXT).replace("\n", "\r\n\r\n").replace(" ", " \u3000") + "\n"
+    assert variant != TEXT
+    assert normalize_transcript(variant) == TEXT
+    assert key(variant) == key()
+
+
+def test_every_input_is_part_of_the_key():
+    keys = {
+        key(),
+        key(TEXT + " 추가"),
+        key(prompt_version="meeting-2"),
+        key(model="gemini-other"),
+        key(reference_date="2025-11-11"),
+    }
+    assert len(keys) == 5
+
+
+def test_schema_change_invalidates_the_key():
+    class Before(BaseModel):
+        meeting_summary: str = Field(..., description="요약")
+
+    class After(BaseModel):
+        meeting_summary: str = Field(..., description="3~4줄 요약")
+
+    class Renamed(BaseModel):
+        summary: str = Field(..., description="요약")
+
+    keys = {key(schema=Before), key(schema=After), key(schema=Renamed)}
+    assert len(keys) == 3
+    # 같은 모델이면 키가 같습니다.
+    assert key(schema=Before) == key(schema=Before)
+
+
+# ----------------------------------------------------
+# 저장 / 조회
+# ----------------------------------------------------
+
+def test_store_and_lookup(monkeypatch, tmp_path):
+    use_cache(monkeypatch, tmp_path)
+    assert lookup_result(key()) is None
+    store_result(key(), {"meeting_summary": "요약", "next_schedules": []})
+    assert lookup_result(key()) == {"meeting_summary": "요약", "next_schedules": []}
+    assert lookup_result(key(reference_date="2025-11-11")) is None
+
+
+def test_expired_entry_is_a_miss(monkeypatch, tmp_path):
+    use_cache(monkeypatch, tmp_path, ttl_seconds=60)
+    now = [1_000_000.0]
+    monkeypatch.setattr("transcript_cache.time.time", lambda: now[0])
+    store_result(key(), {"meeting_summary": "요약", "next_schedules": []})
+
+    now[0] += 59
+    assert lookup_result(key()) is not None
+    now[0] += 2
+    assert lookup_result(key()) is None
+
+
+def test_disabled_cache_stores_nothing(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+    store_result(key(), {"meeting_summary": "요약", "next_schedules": []})
+    assert lookup_result(key()) is None
+
+
+def test_extract_meeting_data_calls_gemini_once_per_key(monkeypatch, tmp_path):
+    use_cache(monkeypatch, tmp_path)
+    calls = []
+
+    def fake_generate(prompt, schema):
+        calls.append(prompt)
+        return schema.model_validate({"meeting_summary": "예산 검토", "next_schedules": []})
+
+    monkeypatch.setattr(meeting_extractor, "generate_json_sync", fake_generate)
+
+    first = meeting_extractor.extract_meeting_data(TEXT, "2025-11-10")
+    second = meeting_extractor.extract_meeting_data(TEXT.replace("\n", "\n\n"), "2025-11-10")
+    assert first == second == {"meeting_summary": "예산 검토", "next_schedules": []}
+    assert len(calls) == 1
+
+    meeting_extractor.extract_meeting_data(TEXT, "2025-11-11")
+    assert len(calls) == 2
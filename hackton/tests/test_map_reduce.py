@@ -0,0 +1,133 @@
+import asyncio
+
+import map_reduce
+from map_reduce import CondensedSummary, map_reduce_extract, merge_schedules, same_event, split_transcript
+from meeting_schema import MeetingAnalysisResult, NextSchedule
+
+
+def schedule(date: str, time: str, title: str, content: str = "내용") -> NextSchedule:
+    return NextSchedule(next_schedule_date=date, start_time=time, event_title=title, event_content=content)
+
+
+# ----------------------------------------------------
+# split_transcript
+# ----------------------------------------------------
+
+def test_short_text_is_one_window():
+    assert split_transcript("안녕하세요. 회의를 시작합니다.", 100, 20) == ["안녕하세요. 회의를 시작합니다."]
+
+
+def test_empty_text_has_no_windows():
+    assert split_transcript("", 100, 20) == []
+
+
+def test_windows_respect_size_and_overlap():
+    sentences = [f"문장{index:02d}입니다." for index in range(40)]
+    windows = split_transcript(" ".join(sentences), 60, 20)
+
+    assert len(windows) > 1
+    assert all(len(window) <= 60 for window in windows)
+    for previous, current in zip(windows, windows[1:]):
+        # 다음 구간은 앞 구간 끝부분(overlap_chars 이내)의 문장으로 시작합니다.
+        first = current.split(" ")[0]
+        assert first in previous.split(" ")
+        assert len(previous) - previous.index(first) <= 20
+    # 어떤 문장도 빠지지 않습니다.
+    joined = " ".join(windows)
+    assert all(sentence in joined for sentence in sentences)
+
+
+def test_window_boundary_is_exact():
+    # 두 문장 합이 정확히 window_chars면 (사이 공백 포함) 한 구간에 들어갑니다.
+    first, second = "가" * 9 + ".", "나" * 10
+    assert split_transcript(f"{first} {second}", 21, 0) == [f"{first} {second}"]
+    assert split_transcript(f"{first} {second}", 20, 0) == [first, second]
+
+
+def test_zero_overlap_does_not_repeat_sentences():
+    windows = split_transcript("하나. 둘. 셋. 넷.", 6, 0)
+    assert windows == ["하나. 둘.", "셋. 넷."]
+
+
+def test_sentence_longer_than_window_is_cut():
+    windows = split_transcript("가" * 25, 10, 3)
+    assert windows == ["가" * 10, "가" * 10, "가" * 5]
+
+
+def test_splits_on_newlines():
+    assert split_transcript("첫 줄\n둘째 줄", 5, 0) == ["첫 줄", "둘째 줄"]
+
+
+# ----------------------------------------------------
+# merge_schedules
+# ----------------------------------------------------
+
+def test_same_event_needs_same_date_and_time():
+    a = schedule("2025-11-10", "10:00", "주간 회의")
+    assert same_event(a, schedule("2025-11-10", "10:00", "주간회의"))
+    assert not same_event(a, schedule("2025-11-10", "11:00", "주간 회의"))
+    assert not same_event(a, schedule("2025-11-11", "10:00", "주간 회의"))
+
+
+def test_same_event_title_similarity():
+    a = schedule("2025-11-10", "10:00", "디자인 리뷰")
+    assert same_event(a, schedule("2025-11-10", "10:00", "디자인 리뷰 회의"))
+    assert not same_event(a, schedule("2025-11-10", "10:00", "예산 정산"))
+    # 제목이 비어 있으면 날짜/시간만으로 같은 일정으로 봅니다.
+    assert same_event(a, schedule("2025-11-10", "10:00", "!!"))
+
+
+def test_merge_keeps_longer_content_and_sorts():
+    merged = merge_schedules([
+        schedule("2025-11-12", "14:00", "예산 정산", "짧음"),
+        schedule("2025-11-10", "10:00", "디자인 리뷰", "짧음"),
+        schedule("2025-11-12", "14:00", "예산 정산 회의", "더 자세한 본문입니다"),
+    ])
+    assert [(str(item.next_schedule_date), item.event_title) for item in merged] == [
+        ("2025-11-10", "디자인 리뷰"),
+        ("2025-11-12", "예산 정산 회의"),
+    ]
+    assert merged[1].event_content == "더 자세한 본문입니다"
+
+
+def test_merge_keeps_distinct_events_at_same_time():
+    merged = merge_schedules([
+        schedule("2025-11-10", "10:00", "디자인 리뷰"),
+        schedule("2025-11-10", "10:00", "예산 정산"),
+    ])
+    assert len(merged) == 2
+
+
+def test_merge_empty():
+    assert merge_schedules([]) == []
+
+
+# ----------------------------------------------------
+# map-reduce 실행 (Gemini 대역)
+# ----------------------------------------------------
+
+def test_map_prompts_carry_reference_date_and_hints(monkeypatch):
+    prompts = []
+
+    async def fake_generate(prompt, schema):
+        prompts.append(prompt)
+        if schema is CondensedSummary:
+            return CondensedSummary(meeting_summary="전체 요약")
+        return MeetingAnalysisResult(
+            meeting_summary=f"구간 {len(prompts)}",
+            next_schedules=[schedule("2025-11-12", "14:00", "디자인 리뷰", "x" * len(prompts))],
+        )
+
+    monkeypatch.setattr(map_reduce, "generate_json_async", fake_generate)
+    text = "다음주 수요일 오후 두시에 디자인 리뷰 합시다. " + "잡담입니다. " * 20 + "모레까지 초안 공유해 주세요."
+    result, stats = asyncio.run(map_reduce_extract(text, "2025-11-05", window_chars=60, overlap_chars=0))
+
+    map_prompts = prompts[:-1]
+    assert stats["windows"] == len(map_prompts) > 2
+    assert all("2025-11-05" in prompt for prompt in map_prompts)
+    assert "- '다음주 수요일 오후 두시' = 2025-11-12 14:00" in map_prompts[0]
+    assert "- '모레' = 2025-11-07" in map_prompts[-1]
+    assert "날짜 힌트" not in map_prompts[1]
+    # 모든 구간이 같은 일정을 내면 하나로 합쳐집니다.
+    assert stats["merged_schedules"] == 1
+    assert result.meeting_summary == "전체 요약"
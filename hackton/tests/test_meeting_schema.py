@@ -0,0 +1,136 @@
+import json
+from datetime import date, time
+
+import pytest
+from pydantic import ValidationError
+
+from meeting_schema import (
+    LegacyMeetingAnalysisResult,
+    MeetingAnalysisResult,
+    detect_version,
+    schema_fingerprint,
+    to_v1,
+    to_v2,
+    v1_to_v2,
+    v2_to_v1,
+    validate_many,
+    validate_many_json,
+)
+
+V1 = {
+    "event_details": {"event_date": "2025-11-12", "event_time": "14:30", "event_subject": "마케팅 전략 검토"},
+    "meeting_summary": "마케팅 예산을 확정했습니다.",
+}
+
+V2 = {
+    "meeting_summary": "배포 일정을 정했습니다.",
+    "next_schedules": [
+        {
+            "next_schedule_date": "2025-11-13",
+            "start_time": "09:00",
+            "event_title": "배포 점검",
+            "event_content": "배포 전 체크리스트를 확인합니다.",
+        },
+        {
+            "next_schedule_date": "2025-11-20",
+            "start_time": "15:00",
+            "event_title": "회고",
+            "event_content": "배포 회고를 진행합니다.",
+        },
+    ],
+}
+
+
+# ----------------------------------------------------
+# v1 <-> v2 변환
+# ----------------------------------------------------
+
+def test_detect_version():
+    assert detect_version(V1) == 1
+    assert detect_version(V2) == 2
+    with pytest.raises(ValueError):
+        detect_version({"summary": "?"})
+
+
+def test_v1_round_trip_through_v2_is_lossless():
+    legacy = LegacyMeetingAnalysisResult.model_validate(V1)
+    converted = v1_to_v2(legacy)
+
+    assert converted.meeting_summary == V1["meeting_summary"]
+    [schedule] = converted.next_schedules
+    assert (schedule.next_schedule_date, schedule.start_time) == (date(2025, 11, 12), time(14, 30))
+    assert schedule.event_title == schedule.event_content == "마케팅 전략 검토"
+    assert v2_to_v1(converted) == legacy
+    assert to_v1(to_v2(V1)).model_dump(mode="json") == V1
+
+
+def test_v2_to_v1_keeps_the_first_schedule():
+    legacy = to_v1(V2)
+    assert legacy.event_details.event_date == date(2025, 11, 13)
+    assert legacy.event_details.event_subject == "배포 점검"
+    assert legacy.meeting_summary == V2["meeting_summary"]
+    # 되돌리면 첫 일정만 남고, 본문은 제목으로 채워집니다.
+    restored = to_v2(legacy)
+    assert [item.event_title for item in restored.next_schedules] == ["배포 점검"]
+    assert restored.next_schedules[0].event_content == "배포 점검"
+
+
+def test_v2_without_schedules_has_no_v1_form():
+    with pytest.raises(ValueError):
+        to_v1({"meeting_summary": "일정 없음", "next_schedules": []})
+
+
+def test_to_v2_and_to_v1_accept_models_and_dicts():
+    current = MeetingAnalysisResult.model_validate(V2)
+    legacy = LegacyMeetingAnalysisResult.model_validate(V1)
+    assert to_v2(current) is current
+    assert to_v1(legacy) is legacy
+    assert to_v2(V2) == current
+    assert to_v2(legacy) == to_v2(V1)
+    assert to_v2(V2).model_dump(mode="json") == V2
+
+
+# ----------------------------------------------------
+# 날짜/시간 필드
+# ----------------------------------------------------
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [("9:00", time(9, 0)), ("14:00:00", time(14, 0)), ("14시 30분", time(14, 30)), ("14시", time(14, 0))],
+)
+def test_time_formats(raw, expected):
+    data = {**V1, "event_details": {**V1["event_details"], "event_time": raw}}
+    assert to_v1(data).event_details.event_time == expected
+
+
+def test_datetime_string_keeps_the_date_part():
+    data = {**V1, "event_details": {**V1["event_details"], "event_date": "2025-11-12T00:00:00"}}
+    assert to_v1(data).event_details.event_date == date(2025, 11, 12)
+
+
+def test_missing_time_defaults_to_ten():
+    data = {**V1, "event_details": {"event_date": "2025-11-12", "event_subject": "회의"}}
+    assert to_v1(data).model_dump(mode="json")["event_details"]["event_time"] == "10:00"
+
+
+# ----------------------------------------------------
+# 검증 도우미
+# ----------------------------------------------------
+
+def test_validate_many_reports_only_bad_records():
+    bad = {"meeting_summary": "날짜 없음", "next_schedules": [{"event_title": "?", "event_content": "?"}]}
+    valid, errors = validate_many([V2, bad, V2], MeetingAnalysisResult)
+    assert len(valid) == 2
+    assert [index for index, _ in errors] == [1]
+
+
+def test_validate_many_json():
+    [result] = validate_many_json(json.dumps([V2], ensure_ascii=False), MeetingAnalysisResult)
+    assert result == MeetingAnalysisResult.model_validate(V2)
+    with pytest.raises(ValidationError):
+        validate_many_json(json.dumps([V1]), MeetingAnalysisResult)
+
+
+def test_schema_fingerprint_differs_per_version():
+    assert schema_fingerprint(MeetingAnalysisResult) == schema_fingerprint(MeetingAnalysisResult)
+    assert schema_fingerprint(MeetingAnalysisResult) != schema_fingerprint(LegacyMeetingAnalysisResult)
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from schedule_store import ScheduleStore
+
+
+def result(summary: str, *schedules) -> dict:
+    return {
+        "meeting_summary": summary,
+        "next_schedules": [
+            {"next_schedule_date": day, "start_time": time, "event_title": title, "event_content": f"{title} 내용"}
+            for day, time, title in schedules
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScheduleStore(str(tmp_path / "schedules.db"))
+    yield store
+    store.close()
+
+
+def test_ingest_is_idempotent(store):
+    data = result("주간 회의", ("2025-11-10", "10:00", "디자인 리뷰"))
+    meeting_id = store.ingest_result(data, user_id="kim")
+    assert meeting_id is not None
+    # 키 순서가 달라도 같은 결과로 봅니다.
+    assert store.ingest_result(json.loads(json.dumps(data, sort_keys=True)), user_id="kim") is None
+    # 다른 사용자의 같은 결과는 따로 저장합니다.
+    assert store.ingest_result(data, user_id="lee") is not None
+    assert store.stats()["meetings"] == 2
+    assert store.stats()["schedules"] == 2
+
+
+def test_ingest_v1_result(store):
+    meeting_id = store.ingest_result({
+        "meeting_summary": "v1 요약",
+        "event_details": {"event_date": "2025-11-12", "event_time": "14:00", "event_subject": "예산 정산"},
+    })
+    meeting = store.meeting(meeting_id)
+    assert meeting["meeting_summary"] == "v1 요약"
+    assert [(item["next_schedule_date"], item["start_time"], item["event_title"]) for item in meeting["next_schedules"]] == [
+        ("2025-11-12", "14:00", "예산 정산")
+    ]
+
+
+def test_query_range_is_inclusive_and_filters(store):
+    store.ingest_many([
+        (result("a", ("2025-11-09", "10:00", "이전"), ("2025-11-10", "09:00", "예산 정산")), "kim"),
+        (result("b", ("2025-11-16", "18:00", "예산 보고"), ("2025-11-17", "10:00", "이후")), "lee"),
+    ])
+    week = store.query(start="2025-11-10", end="2025-11-16")
+    assert [item["title"] for item in week["items"]] == ["예산 정산", "예산 보고"]
+    assert week["next_cursor"] is None
+    assert [item["title"] for item in store.query(start="2025-11-10", end="2025-11-16", user_id="lee")["items"]] == ["예산 보고"]
+    assert [item["title"] for item in store.query(title="예산")["items"]] == ["예산 정산", "예산 보고"]
+    assert store.query(title="없는 제목")["items"] == []
+
+
+def test_cursor_pages_cover_every_row_once(store):
+    schedules = [(f"2025-11-{10 + index % 5:02d}", f"{9 + index % 3:02d}:00", f"일정 {index}") for index in range(23)]
+    store.ingest_result(result("많은 일정", *schedules))
+
+    seen, cursor = [], None
+    while True:
+        page = store.query(start="2025-11-01", end="2025-11-30", limit=5, cursor=cursor)
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 23
+    assert len({item["id"] for item in seen}) == 23
+    keys = [(item["schedule_date"], item["start_time"], item["id"]) for item in seen]
+    assert keys == sorted(keys)
+
+
+def test_bad_cursor_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.query(cursor="not-a-cursor")
+
+
+def test_ingest_files_skips_broken_files(store, tmp_path):
+    good = tmp_path / "analysis_output_20251102_043658.json"
+    good.write_text(json.dumps(result("파일", ("2025-11-10", "10:00", "디자인 리뷰")), ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "analysis_output_20251103_000000.json").write_text("{broken", encoding="utf-8")
+
+    assert store.ingest_directory(str(tmp_path)) == {"added": 1, "skipped": 0, "failed": 1}
+    assert store.ingest_directory(str(tmp_path)) == {"added": 0, "skipped": 1, "failed": 1}
+    meeting = store.meeting(store.query()["items"][0]["meeting_id"])
+    assert meeting["analyzed_at"] == "2025-11-02T04:36:58"
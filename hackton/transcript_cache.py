@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# ----------------------------------------------------
+# STT 결과 디스크 캐시 (오디오 내용 해시 기반)
+# ----------------------------------------------------
+
+# 같은 녹음을 다시 분석하거나 Gemini 실패 후 재시도할 때 Whisper를 다시 돌리지 않도록,
+# 변환 결과를 (오디오 내용 해시 + 모델/언어/디코딩 옵션) 키로 저장합니다.
+# 파일 경로나 이름이 바뀌어도 내용이 같으면 캐시가 적중합니다.
+
+HASH_BLOCK_BYTES = 1024 * 1024
+
+# (실제 경로, 크기, 수정 시각) -> 해시. 같은 프로세스에서 같은 파일을 반복 해싱하지 않습니다.
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def audio_digest(audio_file_path: str) -> str:
+    """오디오 파일 내용의 SHA-256 해시(hex)를 반환합니다."""
+    stat = os.stat(audio_file_path)
+    memo_key = (os.path.realpath(audio_file_path), stat.st_size, stat.st_mtime_ns)
+    cached = _digest_memo.get(memo_key)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    with open(audio_file_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def cache_key(content_digest: str, settings: Dict[str, Any]) -> str:
+    """오디오 해시와 변환 설정(모델명, 언어, 디코딩 옵션 등)을 합친 캐시 키."""
+    material = json.dumps({"audio": content_digest, **settings}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def evict_lru(directory: str, max_bytes: int, suffix: str, keep: Optional[str] = None) -> int:
+    """directory 안의 suffix 파일 총 크기가 max_bytes 이하가 될 때까지 mtime이 오래된 것부터 지웁니다."""
+    entries = []
+    total = 0
+    with os.scandir(directory) as scan:
+        for item in scan:
+            if not item.name.endswith(suffix) or item.name.startswith(".tmp-") or item.path == keep:
+                continue
+            try:
+                stat = item.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, item.path))
+            total += stat.st_size
+    if keep is not None and os.path.exists(keep):
+        total += os.path.getsize(keep)
+    entries.sort()
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+class TranscriptCache:
+    """
+    항목 하나를 <key>.json 파일 하나로 저장하는 크기 제한 LRU 캐시.
+
+    - 쓰기는 임시 파일에 쓴 뒤 os.replace()로 교체하므로, 중간에 프로세스가 죽어도
+      깨진 항목이 남지 않습니다(여러 프로세스가 같은 디렉터리를 공유해도 안전).
+    - 적중 시 파일의 mtime을 갱신하고, 전체 크기가 max_bytes를 넘으면 mtime이
+      가장 오래된 항목부터 삭제합니다.
+    - ttl_seconds를 주면 저장된 지 그보다 오래된 항목은 적중으로 치지 않고 지웁니다.
+    """
+
+    def __init__(
+        self, directory: str, max_bytes: int = 512 * 1024 * 1024, ttl_seconds: Optional[float] = None
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        if self.ttl_seconds is not None and time.time() - entry.get("cached_at", 0) > self.ttl_seconds:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            self.expirations += 1
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        entry = {**entry, "cached_at": time.time()}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            self.evictions += evict_lru(self.directory, self.max_bytes, ".json")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }